@@ -1,4 +1,28 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
 class Config:
+    class Database:
+        # Per process: replicas x uvicorn workers x (POOL_SIZE + MAX_OVERFLOW) connections at most
+        # (twice that with ASYNC_READS, which has its own pool)
+        POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+        MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+        # Seconds a checkout waits for a free connection before failing
+        POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+        # Connections older than this are replaced (below the server / load balancer idle timeout)
+        POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+        # Test each connection on checkout so a dropped connection is replaced instead of failing a request
+        POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+        # pyodbc sends executemany() parameter sets in one round trip (bulk inserts / updates)
+        FAST_EXECUTEMANY = os.getenv("DB_FAST_EXECUTEMANY", "true").lower() == "true"
+        # Hot read endpoints (patients, highlights, vitals) run on an aioodbc engine with its own pool of the
+        # same size, so a request waiting on MSSQL does not hold a threadpool worker; falls back to the sync
+        # engine when this is off or aioodbc is not installed. Off by default until the aioodbc path has been
+        # verified against SQL Server
+        ASYNC_READS = os.getenv("DB_ASYNC_READS", "false").lower() == "true"
     class Vital:
         class Temperature:
             MIN_VALUE = 30
@@ -23,4 +47,82 @@ class Config:
         #     MAX_VALUE = 13
         class HeartRate:
             MIN_VALUE = 30
-            MAX_VALUE = 200
\ No newline at end of file
+            MAX_VALUE = 200
+        class Baseline:
+            # How VitalStrategy gets a patient's average vitals:
+            # "incremental": read the maintained PATIENT_VITAL_BASELINE row (whole history, no windowing)
+            # "aggregate": one AVG()/COUNT() query over the patient's vitals, optionally windowed below
+            MODE = os.getenv("VITAL_BASELINE_MODE", "incremental").lower()
+            # Aggregate mode only: limit the history to the last N readings and/or the last D days (0 = no limit)
+            WINDOW_READINGS = int(os.getenv("VITAL_BASELINE_WINDOW_READINGS", "0"))
+            WINDOW_DAYS = int(os.getenv("VITAL_BASELINE_WINDOW_DAYS", "0"))
+    class Outbox:
+        # "event": relay is woken when an outbox event commits (falls back to MAX_WAIT_SECONDS polling)
+        # "poll": relay polls every POLL_INTERVAL_SECONDS
+        RELAY_MODE = os.getenv("OUTBOX_RELAY_MODE", "event").lower()
+        BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+        POLL_INTERVAL_SECONDS = float(os.getenv("OUTBOX_POLL_INTERVAL_SECONDS", "2"))
+        MAX_WAIT_SECONDS = float(os.getenv("OUTBOX_MAX_WAIT_SECONDS", "5"))
+        # After a wake-up, wait this long so a burst of commits is published as one batch
+        LINGER_MS = int(os.getenv("OUTBOX_LINGER_MS", "20"))
+        CONFIRM_TIMEOUT_SECONDS = float(os.getenv("OUTBOX_CONFIRM_TIMEOUT_SECONDS", "30"))
+        # Events are partitioned into lanes by hash(aggregate_id); lanes publish in parallel
+        LANES = max(1, int(os.getenv("OUTBOX_LANES", "4")))
+        # How long a replica owns the events it claimed; must exceed CONFIRM_TIMEOUT_SECONDS
+        LEASE_SECONDS = int(os.getenv("OUTBOX_LEASE_SECONDS", "120"))
+        # Retention job: PUBLISHED events older than RETENTION_DAYS are purged (or archived, then purged)
+        # in chunks of PURGE_CHUNK_SIZE rows, one short transaction per chunk
+        RETENTION_DAYS = int(os.getenv("OUTBOX_RETENTION_DAYS", "7"))
+        ARCHIVE_ON_PURGE = os.getenv("OUTBOX_ARCHIVE_ON_PURGE", "false").lower() == "true"
+        PURGE_CHUNK_SIZE = int(os.getenv("OUTBOX_PURGE_CHUNK_SIZE", "1000"))
+        PURGE_MAX_CHUNKS = int(os.getenv("OUTBOX_PURGE_MAX_CHUNKS", "200"))
+        # "full": update events carry old_data, new_data and changes
+        # "compact": update events carry only changes plus entity_version (the entity's modified timestamp)
+        PAYLOAD_FORMAT = os.getenv("OUTBOX_PAYLOAD_FORMAT", "full").lower()
+        # Payloads at least this many bytes are stored zlib-compressed (0 disables)
+        COMPRESS_MIN_BYTES = int(os.getenv("OUTBOX_COMPRESS_MIN_BYTES", "2048"))
+    class Highlight:
+        # Seconds a highlight type lookup (Id, IsEnabled) is reused by the highlight engine;
+        # changes made through the highlight type endpoints invalidate it immediately
+        TYPE_CACHE_TTL_SECONDS = float(os.getenv("HIGHLIGHT_TYPE_CACHE_TTL_SECONDS", "60"))
+        # "sync": highlights are evaluated inside the clinical write (create_highlight_if_needed)
+        # "deferred": the write only queues a HIGHLIGHT_WORK_ITEMS row; HighlightQueueProcessor evaluates it
+        EVALUATION_MODE = os.getenv("HIGHLIGHT_EVALUATION_MODE", "sync").lower()
+        # Deferred mode: highlights lag their source records by at most about one poll interval
+        QUEUE_POLL_INTERVAL_SECONDS = float(os.getenv("HIGHLIGHT_QUEUE_POLL_INTERVAL_SECONDS", "2"))
+        QUEUE_BATCH_SIZE = int(os.getenv("HIGHLIGHT_QUEUE_BATCH_SIZE", "200"))
+        QUEUE_LEASE_SECONDS = int(os.getenv("HIGHLIGHT_QUEUE_LEASE_SECONDS", "120"))
+        QUEUE_MAX_RETRIES = int(os.getenv("HIGHLIGHT_QUEUE_MAX_RETRIES", "3"))
+        # Retention cleanup: rows per DELETE (one short transaction each), and per-run bounds on the number
+        # of chunks and seconds spent; the next run continues where a bounded run stopped
+        CLEANUP_CHUNK_SIZE = int(os.getenv("HIGHLIGHT_CLEANUP_CHUNK_SIZE", "1000"))
+        CLEANUP_MAX_CHUNKS = int(os.getenv("HIGHLIGHT_CLEANUP_MAX_CHUNKS", "500"))
+        CLEANUP_MAX_SECONDS = float(os.getenv("HIGHLIGHT_CLEANUP_MAX_SECONDS", "240"))
+    class Drift:
+        # "batch": drift notifications are collected (up to PREFETCH messages, or for BATCH_MAX_WAIT_MS after the
+        # first one), loaded with one IN query per record type and republished as one confirmed batch before
+        # the batch is acked
+        # "single": one notification at a time (one query and one publish each)
+        CONSUMER_MODE = os.getenv("DRIFT_CONSUMER_MODE", "batch").lower()
+        PREFETCH = int(os.getenv("DRIFT_PREFETCH", "200"))
+        BATCH_MAX_WAIT_MS = int(os.getenv("DRIFT_BATCH_MAX_WAIT_MS", "250"))
+        CONFIRM_TIMEOUT_SECONDS = float(os.getenv("DRIFT_CONFIRM_TIMEOUT_SECONDS", "30"))
+    class Producer:
+        # "pipelined": up to MAX_IN_FLIGHT publishes await their broker confirm at once (asynchronous connection,
+        # confirms matched by delivery tag, nacked messages republished up to NACK_MAX_RETRIES times)
+        # "blocking": one publish at a time, each waiting for its confirm
+        MODE = os.getenv("PRODUCER_MODE", "blocking").lower()
+        MAX_IN_FLIGHT = int(os.getenv("PRODUCER_MAX_IN_FLIGHT", "256"))
+        NACK_MAX_RETRIES = int(os.getenv("PRODUCER_NACK_MAX_RETRIES", "3"))
+        # Publish requests waiting for the producer thread; when full, publish() waits up to
+        # ENQUEUE_TIMEOUT_SECONDS for room (0 = drop at once) and counts the drop
+        QUEUE_SIZE = int(os.getenv("PRODUCER_QUEUE_SIZE", "10000"))
+        ENQUEUE_TIMEOUT_SECONDS = float(os.getenv("PRODUCER_ENQUEUE_TIMEOUT_SECONDS", "0"))
+    class ReferenceCache:
+        # Seconds a reference (lookup) list is served from the in-process cache (0 disables it);
+        # changes made through the list endpoints invalidate it immediately on every replica
+        TTL_SECONDS = float(os.getenv("REFERENCE_CACHE_TTL_SECONDS", "300"))
+        # Cached variants (pages / filters) kept per list
+        MAX_KEYS_PER_LIST = int(os.getenv("REFERENCE_CACHE_MAX_KEYS_PER_LIST", "64"))
+        # Publish invalidations to the other replicas over RabbitMQ (defaults to ENABLE_MESSAGING)
+        BROADCAST = os.getenv("REFERENCE_CACHE_BROADCAST", os.getenv("ENABLE_MESSAGING", "true")).lower() == "true"
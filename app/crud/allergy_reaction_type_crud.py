@@ -7,8 +7,16 @@ from ..schemas.allergy_reaction_type import (
 )
 from datetime import datetime
 from ..logger.logger_utils import log_crud_action, ActionType, serialize_data
+from ..services.reference_list_cache import cached_reference_page, invalidate_reference_list
+
+# Reference list cache entry (see services/reference_list_cache.py)
+REFERENCE_LIST_NAME = AllergyReactionType.__tablename__
 
 def get_all_reaction_types(db: Session, pageNo: int = 0, pageSize: int = 10):
+    return cached_reference_page(db, REFERENCE_LIST_NAME, (pageNo, pageSize), lambda: _get_reaction_types_page(db, pageNo, pageSize))
+
+
+def _get_reaction_types_page(db: Session, pageNo: int, pageSize: int):
     offset = pageNo * pageSize
     query = db.query(
         AllergyReactionType
@@ -41,6 +49,7 @@ def create_reaction_type(
     updated_data_dict = serialize_data(reaction_type.model_dump())
     db.add(db_reaction_type)
     db.commit()
+    invalidate_reference_list(REFERENCE_LIST_NAME)
     db.refresh(db_reaction_type)
 
     # Include the allergy reaction type name in the logs
@@ -96,6 +105,7 @@ def update_reaction_type(
 
         # Commit and refresh the object
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
         db.refresh(db_reaction_type)
 
         updated_data_dict = serialize_data(reaction_type.model_dump())
@@ -136,6 +146,7 @@ def delete_reaction_type(db: Session, allergy_reaction_type_id: int, modified_by
         db_reaction_type.ModifiedById = modified_by
 
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
 
         log_crud_action(
             action=ActionType.DELETE,
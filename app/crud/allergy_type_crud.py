@@ -5,8 +5,16 @@ from ..models.allergy_type_model import AllergyType
 from ..schemas.allergy_type import AllergyTypeCreate, AllergyTypeUpdate
 from datetime import datetime
 from ..logger.logger_utils import log_crud_action, ActionType, serialize_data
+from ..services.reference_list_cache import cached_reference_page, invalidate_reference_list
+
+# Reference list cache entry (see services/reference_list_cache.py)
+REFERENCE_LIST_NAME = AllergyType.__tablename__
 
 def get_all_allergy_types(db: Session, pageNo: int = 0, pageSize: int = 10):
+    return cached_reference_page(db, REFERENCE_LIST_NAME, (pageNo, pageSize), lambda: _get_allergy_types_page(db, pageNo, pageSize))
+
+
+def _get_allergy_types_page(db: Session, pageNo: int, pageSize: int):
     offset = pageNo * pageSize
     query = db.query(AllergyType).filter(AllergyType.IsDeleted == "0")
 
@@ -33,6 +41,7 @@ def create_allergy_type(db: Session, allergy_type: AllergyTypeCreate, created_by
     updated_data_dict = serialize_data(allergy_type.model_dump())
     db.add(db_allergy_type)
     db.commit()
+    invalidate_reference_list(REFERENCE_LIST_NAME)
     db.refresh(db_allergy_type)
 
     allergy_type_name = db_allergy_type.Value
@@ -80,6 +89,7 @@ def update_allergy_type(
         # Update the modifiedById field
         db_allergy_type.ModifiedById = modified_by
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
         db.refresh(db_allergy_type)
 
         updated_data_dict = serialize_data(allergy_type.model_dump())
@@ -122,6 +132,7 @@ def delete_allergy_type(db: Session, allergy_type_id: int, modified_by: str, use
         db_allergy_type.UpdatedDateTime = datetime.now()
         db_allergy_type.ModifiedById = modified_by
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
 
         log_crud_action(
             action=ActionType.DELETE,
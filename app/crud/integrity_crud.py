@@ -0,0 +1,116 @@
+"""
+Reads behind the /integrity endpoints used by the reconciliation service to detect data drift.
+
+Only the columns a reconciler compares are selected (id, last modified time and, where there is one,
+the patient id), in (modified time, id) order. Pages are fetched with a keyset cursor over that key, so a
+page costs the same however deep into the window it is, and a whole window can be streamed as a
+sequence of cursor pages (format=ndjson).
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, func, or_, text
+from sqlalchemy.orm import Session
+
+from ..messaging.sync_registry import SYNC_ENTITIES
+from ..models.patient_model import Patient
+from ..utils.pagination import decode_cursor, encode_cursor, paginate_query, seek_value
+
+
+class IntegritySource(NamedTuple):
+    record_type: str
+    id_column: Any
+    modified_column: Any
+    is_deleted_column: Any
+    patient_id_column: Optional[Any] = None
+
+
+# One source per synced record type (see app/messaging/sync_registry.py)
+INTEGRITY_SOURCES: Dict[str, IntegritySource] = {
+    record_type: IntegritySource(
+        record_type, entity.id_column, entity.modified_column, entity.is_deleted_column, entity.patient_id_column
+    )
+    for record_type, entity in SYNC_ENTITIES.items()
+}
+
+
+def _integrity_query(db: Session, source: IntegritySource, cutoff_time: datetime):
+    columns = [source.id_column.label("id"), source.modified_column.label("modified_date")]
+    if source.patient_id_column is not None:
+        columns.append(source.patient_id_column.label("patient_id"))
+    return (
+        db.query(*columns)
+        .filter(source.modified_column >= cutoff_time)
+        .order_by(source.modified_column.asc(), source.id_column.asc())
+    )
+
+
+def _seek(db: Session, source: IntegritySource, cursor: str):
+    last_modified, last_id = decode_cursor(cursor, 2, (str, int))
+    try:
+        last_modified = seek_value(db, source.modified_column, datetime.fromisoformat(last_modified))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    return or_(
+        source.modified_column > last_modified,
+        and_(source.modified_column == last_modified, source.id_column > last_id),
+    )
+
+
+def _to_record(source: IntegritySource, row) -> Dict[str, Any]:
+    record = {"id": row.id}
+    if source.patient_id_column is not None:
+        record["patient_id"] = row.patient_id
+    record.update({
+        "modified_date": row.modified_date.isoformat(),
+        "version_timestamp": int(row.modified_date.timestamp() * 1000),
+        "record_type": source.record_type,
+    })
+    return record
+
+
+def get_integrity_page(
+    db: Session,
+    record_type: str,
+    cutoff_time: datetime,
+    limit: int = 1000,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+) -> Tuple[List[Dict[str, Any]], Optional[int], bool, Optional[str]]:
+    """
+    One page of the records of record_type modified at or after cutoff_time.
+
+    - cursor: next_cursor of the previous page (keyset pagination, offset is ignored)
+    - offset: row offset, for callers that have not moved to cursors yet
+
+    The total comes back with the first page in the same statement; cursor pages reuse it.
+
+    Returns:
+        (records, total_count, has_more, next_cursor)
+    """
+    source = INTEGRITY_SOURCES[record_type]
+    query = _integrity_query(db, source, cutoff_time)
+    seek = _seek(db, source, cursor) if cursor else None
+
+    rows, total_count, _, has_more = paginate_query(
+        query, pageSize=limit, include_total=include_total, seek=seek, offset=offset
+    )
+
+    next_cursor = None
+    if has_more and rows:
+        next_cursor = encode_cursor(rows[-1].modified_date.isoformat(), rows[-1].id)
+    return [_to_record(source, row) for row in rows], total_count, has_more, next_cursor
+
+
+def count_integrity_records(db: Session, record_type: str, cutoff_time: datetime) -> int:
+    source = INTEGRITY_SOURCES[record_type]
+    return db.query(func.count(source.id_column)).filter(source.modified_column >= cutoff_time).scalar()
+
+
+def check_integrity_database(db: Session, since: datetime) -> bool:
+    """Run a trivial query (raises when the database is unreachable); True if any patient changed since `since`"""
+    db.execute(text("SELECT 1"))
+    return db.query(Patient.id).filter(Patient.modifiedDate >= since).first() is not None
@@ -0,0 +1,222 @@
+"""
+Hash digests of the integrity record types, so the reconciliation service can find drift without pulling
+every row.
+
+The id space is cut into buckets of bucket_size ids (bucket b holds ids b * bucket_size up to
+(b + 1) * bucket_size - 1), and buckets_per_range consecutive buckets make a range. Every level is a SHA-1
+over lines of text, so any service holding the same rows can compute the same hashes:
+
+- row:    "<id>|<modified time, ISO 8601 to the millisecond>|<isDeleted>"
+- bucket: the bucket's rows in id order, each followed by "\\n"
+- range:  "<bucket>:<bucket hash>\\n" for each non-empty bucket of the range, in bucket order
+- root:   "<range>:<range hash>\\n" for each non-empty range, in range order
+
+The reconciler compares the root and range hashes, drills into the buckets of the ranges that differ
+(get_bucket_digests) and fetches rows only for the buckets that differ (get_bucket_rows), so what it
+transfers follows the amount of drift rather than the size of the table.
+
+On SQL Server the bucket hashes are computed by the database (rows grouped by id / bucket_size, each
+bucket's row lines concatenated in id order with STRING_AGG and hashed with HASHBYTES), so only one row
+per bucket leaves the database. Other databases (e.g. SQLite in tests) read the rows and hash them here.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .integrity_crud import INTEGRITY_SOURCES, IntegritySource
+
+
+DIGEST_ALGORITHM = "sha1"
+DEFAULT_BUCKET_SIZE = 1024
+DEFAULT_BUCKETS_PER_RANGE = 64
+
+# Rows read per query while hashing an id range (keyset over id)
+DIGEST_READ_CHUNK_SIZE = 5000
+
+
+def bucket_bounds(bucket: int, bucket_size: int) -> Tuple[int, int]:
+    return bucket * bucket_size, (bucket + 1) * bucket_size - 1
+
+
+def digest_row_line(record_id: int, modified_date: datetime, is_deleted: Any) -> str:
+    return f"{record_id}|{modified_date.isoformat(timespec='milliseconds')}|{is_deleted}"
+
+
+def _combine(children: List[Dict[str, Any]], key: str) -> str:
+    digest = hashlib.sha1()
+    for child in children:
+        digest.update(f"{child[key]}:{child['hash']}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _iter_digest_rows(db: Session, source: IntegritySource, min_id: Optional[int], max_id: Optional[int]) -> Iterator[Any]:
+    """(id, modified_date, is_deleted) of every row with min_id <= id <= max_id, in id order, read in chunks"""
+    last_id = None
+    while True:
+        query = db.query(
+            source.id_column.label("id"),
+            source.modified_column.label("modified_date"),
+            source.is_deleted_column.label("is_deleted"),
+        )
+        if last_id is not None:
+            query = query.filter(source.id_column > last_id)
+        elif min_id is not None:
+            query = query.filter(source.id_column >= min_id)
+        if max_id is not None:
+            query = query.filter(source.id_column <= max_id)
+        rows = query.order_by(source.id_column.asc()).limit(DIGEST_READ_CHUNK_SIZE).all()
+
+        yield from rows
+        if len(rows) < DIGEST_READ_CHUNK_SIZE:
+            return
+        last_id = rows[-1].id
+
+
+def _bucket_digest_sql(source: IntegritySource, bucket_size: int, min_id: Optional[int], max_id: Optional[int]):
+    """SQL Server statement returning (bucket, row_count, hash) per non-empty bucket, hashed as digest_row_line does"""
+    table = source.id_column.table.name
+    id_col = f"[{source.id_column.name}]"
+    # A literal, not a parameter: SQL Server only matches the SELECT and GROUP BY expressions when they are identical
+    bucket = f"{id_col} / {int(bucket_size)}"
+    modified_col = f"[{source.modified_column.name}]"
+    is_deleted_col = f"[{source.is_deleted_column.name}]"
+    # "<id>|<yyyy-mm-ddThh:mi:ss.mmm>|<isDeleted>\n" (style 126 drops zero milliseconds, so they are added apart)
+    row_line = (
+        f"CONCAT(CAST({id_col} AS VARCHAR(20)), '|', CONVERT(VARCHAR(19), {modified_col}, 126), '.', "
+        f"RIGHT(CONCAT('00', DATEPART(MILLISECOND, {modified_col})), 3), '|', "
+        f"COALESCE(CAST({is_deleted_col} AS VARCHAR(16)), 'None'), CHAR(10))"
+    )
+    conditions = []
+    if min_id is not None:
+        conditions.append(f"{id_col} >= :min_id")
+    if max_id is not None:
+        conditions.append(f"{id_col} <= :max_id")
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return text(
+        f"SELECT {bucket} AS bucket, COUNT(*) AS row_count, "
+        f"LOWER(CONVERT(CHAR(40), HASHBYTES('SHA1', "
+        f"STRING_AGG(CAST({row_line} AS VARCHAR(MAX)), '') WITHIN GROUP (ORDER BY {id_col})), 2)) AS hash "
+        f"FROM [{table}] {where} "
+        f"GROUP BY {bucket} "
+        f"ORDER BY bucket"
+    )
+
+
+def get_bucket_digests(
+    db: Session,
+    record_type: str,
+    bucket_size: int = DEFAULT_BUCKET_SIZE,
+    min_id: Optional[int] = None,
+    max_id: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Hash of every non-empty bucket with ids between min_id and max_id (both inclusive, None = unbounded)"""
+    source = INTEGRITY_SOURCES[record_type]
+    if db.get_bind().dialect.name == "mssql":
+        params = {key: value for key, value in (("min_id", min_id), ("max_id", max_id)) if value is not None}
+        digests = []
+        for row in db.execute(_bucket_digest_sql(source, bucket_size, min_id, max_id), params).all():
+            bucket_min_id, bucket_max_id = bucket_bounds(row.bucket, bucket_size)
+            digests.append({
+                "bucket": row.bucket, "min_id": bucket_min_id, "max_id": bucket_max_id,
+                "row_count": row.row_count, "hash": row.hash,
+            })
+        return digests
+
+    buckets: List[Dict[str, Any]] = []
+    current = None
+    digest = None
+
+    for row in _iter_digest_rows(db, source, min_id, max_id):
+        bucket = row.id // bucket_size
+        if current is None or bucket != current["bucket"]:
+            if current is not None:
+                current["hash"] = digest.hexdigest()
+                buckets.append(current)
+            bucket_min_id, bucket_max_id = bucket_bounds(bucket, bucket_size)
+            current = {"bucket": bucket, "min_id": bucket_min_id, "max_id": bucket_max_id, "row_count": 0}
+            digest = hashlib.sha1()
+        digest.update(f"{digest_row_line(row.id, row.modified_date, row.is_deleted)}\n".encode("utf-8"))
+        current["row_count"] += 1
+
+    if current is not None:
+        current["hash"] = digest.hexdigest()
+        buckets.append(current)
+    return buckets
+
+
+def get_range_digests(
+    db: Session,
+    record_type: str,
+    bucket_size: int = DEFAULT_BUCKET_SIZE,
+    buckets_per_range: int = DEFAULT_BUCKETS_PER_RANGE,
+) -> Tuple[str, int, List[Dict[str, Any]]]:
+    """
+    Top of the digest tree: one hash per non-empty range of buckets_per_range buckets.
+
+    Returns:
+        (root_hash, row_count, ranges)
+    """
+    ranges: List[Dict[str, Any]] = []
+    range_size = bucket_size * buckets_per_range
+    row_count = 0
+
+    buckets = get_bucket_digests(db, record_type, bucket_size)
+    start = 0
+    while start < len(buckets):
+        range_index = buckets[start]["bucket"] // buckets_per_range
+        end = start
+        while end < len(buckets) and buckets[end]["bucket"] // buckets_per_range == range_index:
+            end += 1
+        range_buckets = buckets[start:end]
+        range_rows = sum(bucket["row_count"] for bucket in range_buckets)
+        ranges.append({
+            "range": range_index,
+            "min_id": range_index * range_size,
+            "max_id": (range_index + 1) * range_size - 1,
+            "row_count": range_rows,
+            "hash": _combine(range_buckets, "bucket"),
+        })
+        row_count += range_rows
+        start = end
+
+    return _combine(ranges, "range"), row_count, ranges
+
+
+def get_range_bucket_digests(
+    db: Session,
+    record_type: str,
+    range_index: int,
+    bucket_size: int = DEFAULT_BUCKET_SIZE,
+    buckets_per_range: int = DEFAULT_BUCKETS_PER_RANGE,
+) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    The buckets of one range (only that range's ids are read).
+
+    Returns:
+        (range_hash, buckets)
+    """
+    range_size = bucket_size * buckets_per_range
+    buckets = get_bucket_digests(
+        db, record_type, bucket_size, min_id=range_index * range_size, max_id=(range_index + 1) * range_size - 1
+    )
+    return _combine(buckets, "bucket"), buckets
+
+
+def get_bucket_rows(db: Session, record_type: str, bucket: int, bucket_size: int = DEFAULT_BUCKET_SIZE) -> List[Dict[str, Any]]:
+    """The rows of one bucket, in the form they are hashed in"""
+    source = INTEGRITY_SOURCES[record_type]
+    min_id, max_id = bucket_bounds(bucket, bucket_size)
+    return [
+        {
+            "id": row.id,
+            "modified_date": row.modified_date.isoformat(),
+            "version_timestamp": int(row.modified_date.timestamp() * 1000),
+            "is_deleted": str(row.is_deleted),
+            "record_type": source.record_type,
+        }
+        for row in _iter_digest_rows(db, source, min_id, max_id)
+    ]
@@ -1,12 +1,11 @@
 import logging
-import math
 from datetime import datetime
 
 from app.models.patient_highlight_model import PatientHighlight
 from fastapi import HTTPException
 from sqlalchemy.orm import Session, joinedload
 
-from app.services.highlight_helper import create_highlight_if_needed
+from app.services.highlight_helper import create_highlight_if_needed, queue_highlight_if_deferred
 
 from ..logger.logger_utils import ActionType, log_crud_action, serialize_data
 from ..models.allergy_reaction_type_model import AllergyReactionType
@@ -18,11 +17,11 @@ from ..schemas.patient_allergy_mapping import (
     PatientAllergyCreate,
     PatientAllergyUpdateReq,
 )
+from ..utils.pagination import paginate_query
 
 logger = logging.getLogger(__name__)
 
-def get_all_allergies(db: Session, pageNo: int = 0, pageSize: int = 10):
-    offset = pageNo * pageSize
+def get_all_allergies(db: Session, pageNo: int = 0, pageSize: int = 10, includeTotal: bool = True):
     query = db.query(
         PatientAllergyMapping.Patient_AllergyID,
         PatientAllergyMapping.PatientID,
@@ -46,10 +45,9 @@ def get_all_allergies(db: Session, pageNo: int = 0, pageSize: int = 10):
         PatientAllergyMapping.IsDeleted == "0"
     )
 
-    totalRecords = query.count()
-    totalPages = math.ceil(totalRecords / pageSize)
-
-    results = query.order_by(PatientAllergyMapping.Patient_AllergyID.desc()).offset(offset).limit(pageSize).all()
+    results, totalRecords, totalPages, _ = paginate_query(
+        query.order_by(PatientAllergyMapping.Patient_AllergyID.desc()), pageNo, pageSize, include_total=includeTotal
+    )
 
     patient_allergies = []
     for result in results:
@@ -77,8 +75,7 @@ def get_all_allergies(db: Session, pageNo: int = 0, pageSize: int = 10):
 
     return patient_allergies, totalRecords, totalPages
 
-def get_patient_allergies(db: Session, patient_id: int, pageNo: int = 0, pageSize: int = 10):
-    offset = pageNo * pageSize
+def get_patient_allergies(db: Session, patient_id: int, pageNo: int = 0, pageSize: int = 10, includeTotal: bool = True):
     query = db.query(
         PatientAllergyMapping.Patient_AllergyID,
         PatientAllergyMapping.PatientID,
@@ -103,10 +100,9 @@ def get_patient_allergies(db: Session, patient_id: int, pageNo: int = 0, pageSiz
         PatientAllergyMapping.IsDeleted == "0"
     )
 
-    totalRecords = query.count()
-    totalPages = math.ceil(totalRecords / pageSize)
-
-    results = query.order_by(PatientAllergyMapping.Patient_AllergyID.desc()).offset(offset).limit(pageSize).all()
+    results, totalRecords, totalPages, _ = paginate_query(
+        query.order_by(PatientAllergyMapping.Patient_AllergyID.desc()), pageNo, pageSize, include_total=includeTotal
+    )
 
     patient_allergies = []
     for result in results:
@@ -194,30 +190,36 @@ def create_patient_allergy(
     )
 
     db.add(new_allergy)
+    db.flush()  # Get ID before commit
+    # Deferred highlights: the work item commits together with the allergy
+    highlight_queued = queue_highlight_if_deferred(
+        db, "ALLERGY", new_allergy.PatientID, "PATIENT_ALLERGY_MAPPING", new_allergy.Patient_AllergyID, created_by
+    )
     db.commit()
     db.refresh(new_allergy)
     
     # Highlight integration - perform this after successful creation of Allergy mapping
-    allergy_with_relationships = db.query(PatientAllergyMapping).options(
-        joinedload(PatientAllergyMapping.allergy_type),
-        joinedload(PatientAllergyMapping.allergy_reaction_type)
-    ).filter(
-        PatientAllergyMapping.Patient_AllergyID == new_allergy.Patient_AllergyID
-    ).first()
-
-    try:
-        create_highlight_if_needed(
-            db=db,
-            source_record=allergy_with_relationships,  # Pass the record with relationships
-            type_code="ALLERGY",
-            patient_id=new_allergy.PatientID,
-            source_table="PATIENT_ALLERGY_MAPPING",
-            source_record_id=new_allergy.Patient_AllergyID,
-            created_by=created_by
-        )
-    except Exception as e:
-        # Log error but don't fail the allergy creation
-        logger.error(f"Failed to create highlight for allergy {new_allergy.Patient_AllergyID}: {e}")
+    if not highlight_queued:
+        allergy_with_relationships = db.query(PatientAllergyMapping).options(
+            joinedload(PatientAllergyMapping.allergy_type),
+            joinedload(PatientAllergyMapping.allergy_reaction_type)
+        ).filter(
+            PatientAllergyMapping.Patient_AllergyID == new_allergy.Patient_AllergyID
+        ).first()
+
+        try:
+            create_highlight_if_needed(
+                db=db,
+                source_record=allergy_with_relationships,  # Pass the record with relationships
+                type_code="ALLERGY",
+                patient_id=new_allergy.PatientID,
+                source_table="PATIENT_ALLERGY_MAPPING",
+                source_record_id=new_allergy.Patient_AllergyID,
+                created_by=created_by
+            )
+        except Exception as e:
+            # Log error but don't fail the allergy creation
+            logger.error(f"Failed to create highlight for allergy {new_allergy.Patient_AllergyID}: {e}")
 
     # Fetch patient name and allergy name for logging
     patient = db.query(Patient).filter(Patient.id == allergy_data.PatientID).first()
@@ -318,30 +320,36 @@ def update_patient_allergy(
     db_allergy.UpdatedDateTime = datetime.now()
     db_allergy.ModifiedById = modified_by  # Set the user who modified it
 
+    # Deferred highlights: the work item commits together with the allergy
+    highlight_queued = queue_highlight_if_deferred(
+        db, "ALLERGY", db_allergy.PatientID, "PATIENT_ALLERGY_MAPPING", db_allergy.Patient_AllergyID, modified_by
+    )
+
     # Commit the changes to the database
     db.commit()
     db.refresh(db_allergy)
 
     # Highlight integration - perform this after updating the Allergy mapping
-    allergy_with_relationships = db.query(PatientAllergyMapping).options(
-        joinedload(PatientAllergyMapping.allergy_type),
-        joinedload(PatientAllergyMapping.allergy_reaction_type)
-    ).filter(
-        PatientAllergyMapping.Patient_AllergyID == db_allergy.Patient_AllergyID
-    ).first()
-
-    try:
-        create_highlight_if_needed(
-            db=db,
-            source_record=allergy_with_relationships,
-            type_code="ALLERGY",
-            patient_id=db_allergy.PatientID,
-            source_table="PATIENT_ALLERGY_MAPPING",
-            source_record_id=db_allergy.Patient_AllergyID,
-            created_by=modified_by
-        )
-    except Exception as e:
-        logger.error(f"Failed to create/update highlight for allergy {db_allergy.Patient_AllergyID}: {e}")
+    if not highlight_queued:
+        allergy_with_relationships = db.query(PatientAllergyMapping).options(
+            joinedload(PatientAllergyMapping.allergy_type),
+            joinedload(PatientAllergyMapping.allergy_reaction_type)
+        ).filter(
+            PatientAllergyMapping.Patient_AllergyID == db_allergy.Patient_AllergyID
+        ).first()
+
+        try:
+            create_highlight_if_needed(
+                db=db,
+                source_record=allergy_with_relationships,
+                type_code="ALLERGY",
+                patient_id=db_allergy.PatientID,
+                source_table="PATIENT_ALLERGY_MAPPING",
+                source_record_id=db_allergy.Patient_AllergyID,
+                created_by=modified_by
+            )
+        except Exception as e:
+            logger.error(f"Failed to create/update highlight for allergy {db_allergy.Patient_AllergyID}: {e}")
 
     
     # Fetch patient name and allergy name for logging
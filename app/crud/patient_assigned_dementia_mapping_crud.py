@@ -1,4 +1,3 @@
-import math
 from datetime import datetime
 
 from fastapi import HTTPException
@@ -17,11 +16,11 @@ from ..schemas.patient_assigned_dementia_mapping import (
     PatientAssignedDementiaCreateResp,
     PatientAssignedDementiaUpdate,
 )
+from ..utils.pagination import paginate_query
 
 
 # Get all dementia assignments with pagination
-def get_all_assigned_dementias(db: Session, pageNo: int = 0, pageSize: int = 10):
-    offset = pageNo * pageSize
+def get_all_assigned_dementias(db: Session, pageNo: int = 0, pageSize: int = 10, includeTotal: bool = True):
     query = db.query(PatientAssignedDementiaMapping).options(
         joinedload(PatientAssignedDementiaMapping._dementia_stage)
     ).join(
@@ -31,10 +30,9 @@ def get_all_assigned_dementias(db: Session, pageNo: int = 0, pageSize: int = 10)
         PatientAssignedDementiaMapping.IsDeleted == "0"
     )
 
-    totalRecords = query.count()
-    totalPages = math.ceil(totalRecords / pageSize)
-
-    results = query.order_by(PatientAssignedDementiaMapping.id.desc()).offset(offset).limit(pageSize).all()
+    results, totalRecords, totalPages, _ = paginate_query(
+        query.order_by(PatientAssignedDementiaMapping.id.desc()), pageNo, pageSize, include_total=includeTotal
+    )
 
     assignments = []
     for r in results:
@@ -59,8 +57,7 @@ def get_all_assigned_dementias(db: Session, pageNo: int = 0, pageSize: int = 10)
     return assignments, totalRecords, totalPages
 
 # Get all dementia assignments for a patient with pagination
-def get_assigned_dementias(db: Session, patient_id: int, pageNo: int = 0, pageSize: int = 10):
-    offset = pageNo * pageSize
+def get_assigned_dementias(db: Session, patient_id: int, pageNo: int = 0, pageSize: int = 10, includeTotal: bool = True):
     query = db.query(PatientAssignedDementiaMapping).options(
         joinedload(PatientAssignedDementiaMapping._dementia_stage)
     ).join(
@@ -71,10 +68,9 @@ def get_assigned_dementias(db: Session, patient_id: int, pageNo: int = 0, pageSi
         PatientAssignedDementiaMapping.IsDeleted == "0"
     )
 
-    totalRecords = query.count()
-    totalPages = math.ceil(totalRecords / pageSize)
-
-    results = query.order_by(PatientAssignedDementiaMapping.id.desc()).offset(offset).limit(pageSize).all()
+    results, totalRecords, totalPages, _ = paginate_query(
+        query.order_by(PatientAssignedDementiaMapping.id.desc()), pageNo, pageSize, include_total=includeTotal
+    )
 
     # Convert to Pydantic model instances
     assignments = []
@@ -1,11 +1,10 @@
 import logging
-import math
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import cloudinary.uploader
 from fastapi import HTTPException, UploadFile
-from sqlalchemy import func, text
+from sqlalchemy import and_, or_, text
 from sqlalchemy.orm import Session, joinedload
 
 from app.models.patient_allocation_model import PatientAllocation
@@ -14,6 +13,7 @@ from ..logger.logger_utils import ActionType, log_crud_action, serialize_data
 from ..models.patient_model import Patient
 from ..schemas.patient import PatientCreate, PatientUpdate
 from ..services.outbox_service import generate_correlation_id, get_outbox_service
+from ..utils.pagination import decode_cursor, encode_cursor, paginate_query
 
 logger = logging.getLogger(__name__)
 
@@ -32,11 +32,11 @@ def get_patients_by_doctor(
     pageNo: int = 0, 
     pageSize: int = 10,
     name: Optional[str] = None,
-    isActive: Optional[str] = None
+    isActive: Optional[str] = None,
+    cursor: Optional[str] = None,
+    includeTotal: bool = True
 ):
     """Get all patients allocated to a specific doctor by doctorId (found in Patient Allocation table)"""
-    offset = pageNo * pageSize
-    
     # Query patients through the allocation relationship
     query = db.query(Patient).options(
         joinedload(Patient._preferred_language)
@@ -57,16 +57,7 @@ def get_patients_by_doctor(
     if isActive in ["0", "1"]:
         query = query.filter(Patient.isActive == isActive)
     
-    totalRecords = query.count()
-    totalPages = math.ceil(totalRecords / pageSize) if pageSize > 0 else 0
-    
-    db_patients = query.order_by(Patient.name.asc()).offset(offset).limit(pageSize).all()
-    
-    if db_patients and mask:
-        for db_patient in db_patients:
-            db_patient.nric = db_patient.mask_nric
-    
-    return db_patients, totalRecords, totalPages
+    return _paginate_patients(query, mask, pageNo, pageSize, cursor, includeTotal)
 
 
 def get_patients_by_supervisor(
@@ -76,11 +67,11 @@ def get_patients_by_supervisor(
     pageNo: int = 0, 
     pageSize: int = 10,
     name: Optional[str] = None,
-    isActive: Optional[str] = None
+    isActive: Optional[str] = None,
+    cursor: Optional[str] = None,
+    includeTotal: bool = True
 ):
     """Get all patients allocated to a specific supervisor by supervisorId (found in Patient Allocation table)"""
-    offset = pageNo * pageSize
-    
     # Query patients through the allocation relationship
     query = db.query(Patient).options(
         joinedload(Patient._preferred_language)
@@ -101,16 +92,7 @@ def get_patients_by_supervisor(
     if isActive in ["0", "1"]:
         query = query.filter(Patient.isActive == isActive)
     
-    totalRecords = query.count()
-    totalPages = math.ceil(totalRecords / pageSize) if pageSize > 0 else 0
-    
-    db_patients = query.order_by(Patient.name.asc()).offset(offset).limit(pageSize).all()
-    
-    if db_patients and mask:
-        for db_patient in db_patients:
-            db_patient.nric = db_patient.mask_nric
-    
-    return db_patients, totalRecords, totalPages
+    return _paginate_patients(query, mask, pageNo, pageSize, cursor, includeTotal)
 
 
 def get_patients_by_caregiver(
@@ -120,11 +102,11 @@ def get_patients_by_caregiver(
     pageNo: int = 0, 
     pageSize: int = 10,
     name: Optional[str] = None,
-    isActive: Optional[str] = None
+    isActive: Optional[str] = None,
+    cursor: Optional[str] = None,
+    includeTotal: bool = True
 ):
     """Get all patients allocated to a specific caregiver by caregiverId (found in PatientAllocation table)"""
-    offset = pageNo * pageSize
-    
     # Query patients through the allocation relationship
     query = db.query(Patient).options(
         joinedload(Patient._preferred_language)
@@ -145,16 +127,7 @@ def get_patients_by_caregiver(
     if isActive in ["0", "1"]:
         query = query.filter(Patient.isActive == isActive)
     
-    totalRecords = query.count()
-    totalPages = math.ceil(totalRecords / pageSize) if pageSize > 0 else 0
-    
-    db_patients = query.order_by(Patient.name.asc()).offset(offset).limit(pageSize).all()
-    
-    if db_patients and mask:
-        for db_patient in db_patients:
-            db_patient.nric = db_patient.mask_nric
-    
-    return db_patients, totalRecords, totalPages
+    return _paginate_patients(query, mask, pageNo, pageSize, cursor, includeTotal)
 
 
 def get_patients_by_guardian(
@@ -164,13 +137,13 @@ def get_patients_by_guardian(
     pageNo: int = 0, 
     pageSize: int = 10,
     name: Optional[str] = None,
-    isActive: Optional[str] = None
+    isActive: Optional[str] = None,
+    cursor: Optional[str] = None,
+    includeTotal: bool = True
 ):
     """Get all patients allocated to a specific guardian by guardianApplicationUserId (found in Patient Guardian table)"""
     from ..models.patient_guardian_model import PatientGuardian
     
-    offset = pageNo * pageSize
-    
     # Query patients through the allocation and guardian relationships
     # Need to check both guardianId and guardian2Id in PatientAllocation
     query = db.query(Patient).options(
@@ -195,16 +168,7 @@ def get_patients_by_guardian(
     if isActive in ["0", "1"]:
         query = query.filter(Patient.isActive == isActive)
     
-    totalRecords = query.count()
-    totalPages = math.ceil(totalRecords / pageSize) if pageSize > 0 else 0
-    
-    db_patients = query.order_by(Patient.name.asc()).offset(offset).limit(pageSize).all()
-    
-    if db_patients and mask:
-        for db_patient in db_patients:
-            db_patient.nric = db_patient.mask_nric
-    
-    return db_patients, totalRecords, totalPages
+    return _paginate_patients(query, mask, pageNo, pageSize, cursor, includeTotal)
 
 def get_patient(db: Session, patient_id: int, mask: bool = True):
     db_patient = (
@@ -217,6 +181,30 @@ def get_patient(db: Session, patient_id: int, mask: bool = True):
         db_patient.nric = db_patient.mask_nric
     return db_patient
 
+def get_patients_by_ids(db: Session, patient_ids: List[int], mask: bool = True):
+    """
+    Fetch several patients in one IN (...) query, returned in the order of patient_ids.
+
+    Ids that are repeated are returned once; ids that do not exist or are deleted are skipped.
+    """
+    unique_ids = list(dict.fromkeys(patient_ids))
+    if not unique_ids:
+        return []
+
+    db_patients = (
+        db.query(Patient)
+        .options(joinedload(Patient._preferred_language))
+        .filter(Patient.id.in_(unique_ids), Patient.isDeleted == "0")
+        .all()
+    )
+    patients_by_id = {db_patient.id: db_patient for db_patient in db_patients}
+
+    ordered = [patients_by_id[patient_id] for patient_id in unique_ids if patient_id in patients_by_id]
+    if mask:
+        for db_patient in ordered:
+            db_patient.nric = db_patient.mask_nric
+    return ordered
+
 def get_patient_include_deleted(db: Session, patient_id: int, include_deleted: str, mask: bool = True):
     db_patient = (
         db.query(Patient)
@@ -228,8 +216,7 @@ def get_patient_include_deleted(db: Session, patient_id: int, include_deleted: s
     return db_patient
 
 
-def get_patients(db: Session, mask: bool = True, pageNo: int = 0, pageSize: int = 10,name: Optional[str] = None,isActive: Optional[str] = None):
-    offset = pageNo * pageSize
+def get_patients(db: Session, mask: bool = True, pageNo: int = 0, pageSize: int = 10,name: Optional[str] = None,isActive: Optional[str] = None, cursor: Optional[str] = None, includeTotal: bool = True):
     query = db.query(Patient).options(joinedload(Patient._preferred_language)).filter(Patient.isDeleted == "0")
 
     # Apply name filter if provided (non-exact, case-insensitive match)
@@ -240,20 +227,45 @@ def get_patients(db: Session, mask: bool = True, pageNo: int = 0, pageSize: int
     if isActive in ["0", "1"]:
         query = query.filter(Patient.isActive == isActive)
 
-    totalRecords = (
-        db.query(func.count())
-        .select_from(Patient)
-        .filter(Patient.isDeleted == "0")
-        .scalar()
+    return _paginate_patients(query, mask, pageNo, pageSize, cursor, includeTotal)
+
+def _paginate_patients(query, mask: bool, pageNo: int, pageSize: int, cursor: Optional[str] = None, includeTotal: bool = True):
+    """
+    Paginate a filtered patient query ordered by (name, id).
+
+    - Offset mode (default): skips pageNo * pageSize rows.
+    - Cursor mode (cursor provided): seeks past the (name, id) encoded in the cursor, so the cost
+      of a page does not grow with how deep into the listing it is.
+
+    The total comes back with the page in the same statement (see paginate_query); pass
+    includeTotal=False to skip it. A nextCursor pointing at the last row of this page is returned
+    so callers can switch to cursor mode.
+
+    Returns:
+        (db_patients, totalRecords, totalPages, nextCursor)
+    """
+    query = query.order_by(Patient.name.asc(), Patient.id.asc())
+
+    seek = None
+    if cursor:
+        last_name, last_id = decode_cursor(cursor, 2, (str, int))
+        seek = or_(
+            Patient.name > last_name,
+            and_(Patient.name == last_name, Patient.id > last_id),
+        )
+
+    db_patients, totalRecords, totalPages, has_more = paginate_query(
+        query, pageNo, pageSize, include_total=includeTotal, seek=seek
     )
-    totalPages = math.ceil(totalRecords / pageSize)
 
-    db_patients = query.order_by(Patient.name.asc()).offset(offset).limit(pageSize).all()
+    nextCursor = None
+    if has_more and db_patients:
+        nextCursor = encode_cursor(db_patients[-1].name, db_patients[-1].id)
 
     if db_patients and mask:
         for db_patient in db_patients:
             db_patient.nric = db_patient.mask_nric
-    return db_patients, totalRecords, totalPages
+    return db_patients, totalRecords, totalPages, nextCursor
 
 def _patient_to_dict(patient) -> Dict[str, Any]:
     """Convert patient model to dictionary for messaging"""
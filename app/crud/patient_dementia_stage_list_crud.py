@@ -7,12 +7,20 @@ from ..schemas.patient_dementia_stage_list import (
     PatientDementiaStageListUpdate,
 )
 from ..logger.logger_utils import log_crud_action, ActionType, serialize_data
+from ..services.reference_list_cache import cached_reference_list, invalidate_reference_list
+
+# Reference list cache entry (see services/reference_list_cache.py)
+REFERENCE_LIST_NAME = PatientDementiaStageList.__tablename__
 
 def get_all_dementia_stage_list_entries(db: Session):
     try:
-        entries = db.query(PatientDementiaStageList).filter(
-            PatientDementiaStageList.IsDeleted == "0"
-        ).order_by(PatientDementiaStageList.DementiaStage.asc()).all()
+        entries = cached_reference_list(
+            db,
+            REFERENCE_LIST_NAME,
+            lambda: db.query(PatientDementiaStageList).filter(
+                PatientDementiaStageList.IsDeleted == "0"
+            ).order_by(PatientDementiaStageList.DementiaStage.asc()).all()
+        )
         if not entries:
             raise HTTPException(status_code=404, detail="No dementia stage list entries found.")
         return entries
@@ -65,6 +73,7 @@ def create_dementia_stage_list_entry(
     updated_data_dict = serialize_data({"DementiaStage": uppercase_stage})
     db.add(new_entry)
     db.commit()
+    invalidate_reference_list(REFERENCE_LIST_NAME)
     db.refresh(new_entry)
 
     # Retrieve the name of the dementia stage
@@ -144,6 +153,7 @@ def update_dementia_stage_list_entry(
 
     try:
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
         db.refresh(db_entry)
 
         updated_data_dict = serialize_data(update_data)
@@ -202,6 +212,7 @@ def delete_dementia_stage_list_entry(
 
     # Commit the transaction to save the changes
     db.commit()
+    invalidate_reference_list(REFERENCE_LIST_NAME)
     db.refresh(db_entry)
 
     log_crud_action(
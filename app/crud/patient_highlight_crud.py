@@ -1,17 +1,23 @@
 import logging
+import time
 from datetime import datetime
+from typing import List, Optional
 
 from fastapi import HTTPException
+from sqlalchemy import and_, delete, or_, select
 from sqlalchemy.orm import Session, joinedload
 
 from app.strategies.highlights.strategy_factory import HighlightStrategyFactory
 from app.utils.highlight_date_utils import calculate_business_days_ago
 
+from ..config import Config
 from ..logger.logger_utils import ActionType, log_crud_action, serialize_data
+from ..models.patient_allocation_model import PatientAllocation
 from ..models.patient_highlight_model import PatientHighlight
 from ..models.patient_highlight_type_model import PatientHighlightType
 from ..models.patient_model import Patient
 from ..schemas.patient_highlight import PatientHighlightCreate, PatientHighlightUpdate
+from ..utils.pagination import decode_cursor, encode_cursor, paginate_query, seek_value
 
 logger = logging.getLogger(__name__)
 
@@ -28,25 +34,29 @@ def _add_source_remarks_and_additional_fields(db: Session, highlights):
     
     factory = HighlightStrategyFactory()
     
+    # Group by type so each strategy loads all of its source records at once
+    # (a fixed number of queries per highlight type instead of two per highlight)
+    highlights_by_type = {}
     for highlight in highlights:
+        highlights_by_type.setdefault(highlight.highlight_type_code, []).append(highlight)
+    
+    for type_code, typed_highlights in highlights_by_type.items():
+        source_record_ids = [highlight.SourceRecordId for highlight in typed_highlights]
         try:
             # Get strategy for this highlight type
-            strategy = factory.get_strategy(highlight.highlight_type_code)
+            strategy = factory.get_strategy(type_code)
             
-            if strategy:
-                # Get source remarks
-                highlight.source_remarks = strategy.get_source_remarks(db, highlight.SourceRecordId)
-                
-                # Get additional fields
-                highlight.additional_fields = strategy.get_additional_fields(db, highlight.SourceRecordId)
-            else:
-                highlight.source_remarks = None
-                highlight.additional_fields = {}
+            # Get source remarks and additional fields
+            source_remarks = strategy.get_source_remarks_batch(db, source_record_ids)
+            additional_fields = strategy.get_additional_fields_batch(db, source_record_ids)
                 
         except Exception as e:
-            logger.error(f"Error getting data for highlight {highlight.Id}: {e}")
-            highlight.source_remarks = None
-            highlight.additional_fields = {}
+            logger.error(f"Error getting data for {type_code} highlights: {e}")
+            source_remarks, additional_fields = {}, {}
+        
+        for highlight in typed_highlights:
+            highlight.source_remarks = source_remarks.get(highlight.SourceRecordId)
+            highlight.additional_fields = additional_fields.get(highlight.SourceRecordId, {})
     
     return highlights
 
@@ -90,6 +100,79 @@ def get_enabled_highlights_by_patient(db: Session, patient_id: int):
     )
     return _add_source_remarks_and_additional_fields(db, highlights)
 
+def get_highlights_paginated(
+    db: Session,
+    pageNo: int = 0,
+    pageSize: int = 10,
+    since: Optional[datetime] = None,
+    patient_ids: Optional[List[int]] = None,
+    supervisor_id: Optional[str] = None,
+    enabled_only: bool = True,
+    cursor: Optional[str] = None,
+    includeTotal: bool = True
+):
+    """
+    One page of the highlight feed, newest first ((CreatedDate, Id) descending).
+    
+    All filters run in SQL, and only the highlights on the page are enriched, so the cost follows
+    the page size rather than the number of highlights:
+    - since: only highlights created at or after this time
+    - patient_ids: only highlights of these patients
+    - supervisor_id: only highlights of the patients actively allocated to this supervisor
+    - enabled_only: skip highlights whose type is deleted or disabled
+    - cursor: nextCursor of the previous page (keyset pagination, pageNo is ignored)
+    
+    Returns:
+        (highlights, totalRecords, totalPages, nextCursor)
+    """
+    query = db.query(PatientHighlight).options(joinedload(PatientHighlight._highlight_type)).filter(
+        PatientHighlight.IsDeleted == "0"
+    )
+    
+    if enabled_only:
+        query = query.join(PatientHighlightType, PatientHighlight.HighlightTypeId == PatientHighlightType.Id).filter(
+            PatientHighlightType.IsDeleted == "0", # Type not deleted
+            PatientHighlightType.IsEnabled == "1" # Type is enabled
+        )
+    
+    if since is not None:
+        query = query.filter(PatientHighlight.CreatedDate >= since)
+    
+    if patient_ids is not None:
+        query = query.filter(PatientHighlight.PatientId.in_(set(patient_ids)))
+    
+    if supervisor_id:
+        allocated_patient_ids = db.query(PatientAllocation.patientId).filter(
+            PatientAllocation.supervisorId == supervisor_id,
+            PatientAllocation.active == "Y",
+            PatientAllocation.isDeleted == "0"
+        )
+        query = query.filter(PatientHighlight.PatientId.in_(allocated_patient_ids))
+    
+    query = query.order_by(PatientHighlight.CreatedDate.desc(), PatientHighlight.Id.desc())
+    
+    seek = None
+    if cursor:
+        last_created, last_id = decode_cursor(cursor, 2, (str, int))
+        try:
+            last_created = seek_value(db, PatientHighlight.CreatedDate, datetime.fromisoformat(last_created))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+        seek = or_(
+            PatientHighlight.CreatedDate < last_created,
+            and_(PatientHighlight.CreatedDate == last_created, PatientHighlight.Id < last_id),
+        )
+    
+    highlights, totalRecords, totalPages, has_more = paginate_query(
+        query, pageNo, pageSize, include_total=includeTotal, seek=seek
+    )
+    
+    nextCursor = None
+    if has_more and highlights:
+        nextCursor = encode_cursor(highlights[-1].CreatedDate.isoformat(), highlights[-1].Id)
+    
+    return _add_source_remarks_and_additional_fields(db, highlights), totalRecords, totalPages, nextCursor
+
 def create_highlight(db: Session, highlight_data: PatientHighlightCreate, created_by: str, user_full_name:str):
     db_highlight = PatientHighlight(
         **highlight_data.model_dump(), CreatedById=created_by, ModifiedById=created_by
@@ -218,10 +301,10 @@ def delete_highlight(db: Session, highlight_id: int, modified_by: str,  user_ful
     return db_highlight
 
 
-def cleanup_old_highlights(db: Session):
+def cleanup_old_highlights(db: Session, chunk_size: Optional[int] = None, max_chunks: Optional[int] = None, max_seconds: Optional[float] = None):
     """
     HARD DELETE old highlights based on type-specific retention periods.
-    Each highlight type can have different retention (business days).
+    Each highlight type can have different retention (business days), see PatientHighlightType.RetentionDays.
     
     HARD DELETION: Permanently removes records from database (not soft delete).
     
@@ -244,9 +327,20 @@ def cleanup_old_highlights(db: Session):
       Highlight B (created Tuesday 9:00 AM):
         Tuesday 9:00 AM < Monday 23:59:59? NO -> KEPT
     
+    DELETION IN CHUNKS:
+    - Set-based DELETEs of at most chunk_size rows (the TOP (N) ids per type), each committed on its own,
+      so a backlog never becomes one long transaction holding locks on PATIENT_HIGHLIGHT
+    - A run stops after max_chunks chunks or max_seconds seconds ("complete": False); the next run
+      continues where it stopped
+    
     Returns:
-        dict: Summary of cleanup operation
+        dict: Summary of cleanup operation with per-type deleted counts
     """
+    chunk_size = chunk_size or Config.Highlight.CLEANUP_CHUNK_SIZE
+    max_chunks = max_chunks or Config.Highlight.CLEANUP_MAX_CHUNKS
+    max_seconds = max_seconds or Config.Highlight.CLEANUP_MAX_SECONDS
+    started = time.monotonic()
+    
     try:
         # Get all enabled highlight types
         highlight_types = db.query(PatientHighlightType).filter(
@@ -255,11 +349,13 @@ def cleanup_old_highlights(db: Session):
         ).all()
         
         total_deleted = 0
+        chunks = 0
+        complete = True
         details = []
         
         for highlight_type in highlight_types:
             # Get retention period for this type
-            retention_days = 3
+            retention_days = highlight_type.RetentionDays or 3
             
             # Calculate cutoff date (N business days ago)
             cutoff_date = calculate_business_days_ago(retention_days, country="SG")
@@ -273,41 +369,56 @@ def cleanup_old_highlights(db: Session):
                 microsecond=999999
             )
             
-            # Find old highlights of this type
-            # Note: We check both soft-deleted (IsDeleted='1') and active (IsDeleted='0')
+            # Note: We delete both soft-deleted (IsDeleted='1') and active (IsDeleted='0')
             # because we want to permanently delete ALL old highlights
-            old_highlights = db.query(PatientHighlight).filter(
-                PatientHighlight.HighlightTypeId == highlight_type.Id,
-                PatientHighlight.CreatedDate < cutoff_date
-            ).all()
-            
-            deleted_count = len(old_highlights)
-            deleted_ids = []
-            
-            # HARD DELETE each highlight (permanently remove from database)
-            for highlight in old_highlights:
-                deleted_ids.append(highlight.Id)
-                db.delete(highlight) # Hard Delete instead of setting IsDeleted=1
+            expired_ids = (
+                select(PatientHighlight.Id)
+                .where(
+                    PatientHighlight.HighlightTypeId == highlight_type.Id,
+                    PatientHighlight.CreatedDate < cutoff_date
+                )
+                .limit(chunk_size)
+                .scalar_subquery()
+            )
             
-            if deleted_count > 0:
-                details.append({
-                    "type": highlight_type.TypeName,
-                    "type_code": highlight_type.TypeCode,
-                    "retention_days": retention_days,
-                    "cutoff_date": cutoff_date.isoformat(),
-                    "deleted_count": deleted_count,
-                    "deleted_ids": deleted_ids
-                })
+            deleted_count = 0
+            while True:
+                if chunks >= max_chunks or time.monotonic() - started >= max_seconds:
+                    complete = False
+                    break
+                
+                deleted = db.execute(
+                    delete(PatientHighlight)
+                    .where(PatientHighlight.Id.in_(expired_ids))
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                db.commit()
+                chunks += 1
+                deleted_count += deleted
+                if deleted < chunk_size:
+                    break
             
+            details.append({
+                "type": highlight_type.TypeName,
+                "type_code": highlight_type.TypeCode,
+                "retention_days": retention_days,
+                "cutoff_date": cutoff_date.isoformat(),
+                "deleted_count": deleted_count
+            })
             total_deleted += deleted_count
+            
+            if not complete:
+                break
         
-        db.commit()
-        
+        logger.info(f"Highlight cleanup: deleted {total_deleted} highlights in {chunks} chunks (complete={complete})")
         return {
             "status": "success",
             "deletion_type": "Hard",
             "total_deleted": total_deleted,
-            "types_processed": len(highlight_types),
+            "types_processed": len(details),
+            "chunks": chunks,
+            "complete": complete,
+            "duration_seconds": round(time.monotonic() - started, 2),
             "details": details
         }
         
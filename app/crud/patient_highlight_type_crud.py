@@ -6,10 +6,18 @@ from sqlalchemy.orm import Session
 from ..logger.logger_utils import ActionType, log_crud_action, serialize_data
 from ..models.patient_highlight_type_model import PatientHighlightType
 from ..schemas.patient_highlight_type import HighlightTypeCreate, HighlightTypeUpdate
+from ..services.reference_list_cache import cached_reference_list, invalidate_reference_list
+
+# Reference list cache entry (see services/reference_list_cache.py)
+REFERENCE_LIST_NAME = PatientHighlightType.__tablename__
 
 
 def get_all_highlight_types(db: Session):
-    return db.query(PatientHighlightType).filter(PatientHighlightType.IsDeleted == "0").order_by(PatientHighlightType.TypeName.asc()).all()
+    return cached_reference_list(
+        db,
+        REFERENCE_LIST_NAME,
+        lambda: db.query(PatientHighlightType).filter(PatientHighlightType.IsDeleted == "0").order_by(PatientHighlightType.TypeName.asc()).all()
+    )
 
 def get_highlight_type_by_id(db: Session, highlight_type_id: int):
     return (
@@ -19,14 +27,19 @@ def get_highlight_type_by_id(db: Session, highlight_type_id: int):
     )
 
 def get_enabled_highlight_types(db: Session):
-    return (
-        db.query(PatientHighlightType)
-        .filter(
-            PatientHighlightType.IsDeleted == "0",
-            PatientHighlightType.IsEnabled == "1"
-        )
-        .order_by(PatientHighlightType.TypeName.asc())
-        .all()
+    return cached_reference_list(
+        db,
+        REFERENCE_LIST_NAME,
+        lambda: (
+            db.query(PatientHighlightType)
+            .filter(
+                PatientHighlightType.IsDeleted == "0",
+                PatientHighlightType.IsEnabled == "1"
+            )
+            .order_by(PatientHighlightType.TypeName.asc())
+            .all()
+        ),
+        key="enabled"
     )
 
 # Toggle highlight type IsEnabled field - for admin's use
@@ -58,6 +71,7 @@ def toggle_highlight_type_enabled(db: Session, highlight_type_id: int, modified_
     
     # Commit changes
     db.commit()
+    invalidate_reference_list(REFERENCE_LIST_NAME)
     db.refresh(db_highlight_type)
     
     # Log the action
@@ -111,6 +125,7 @@ def create_highlight_type(
     updated_data_dict = serialize_data(data)
     db.add(db_highlight_type)
     db.commit()
+    invalidate_reference_list(REFERENCE_LIST_NAME)
     db.refresh(db_highlight_type)
 
     log_crud_action(
@@ -173,6 +188,7 @@ def update_highlight_type(
         db_highlight_type.ModifiedById = modified_by
 
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
         db.refresh(db_highlight_type)
 
         updated_data_dict = serialize_data(update_data)
@@ -214,6 +230,7 @@ def delete_highlight_type(db: Session, highlight_type_id: int, modified_by: str,
             db_highlight_type.ModifiedDate = datetime.now()
 
             db.commit()
+            invalidate_reference_list(REFERENCE_LIST_NAME)
 
             log_crud_action(
                 action=ActionType.DELETE,
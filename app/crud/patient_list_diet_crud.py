@@ -4,11 +4,15 @@ from ..logger.logger_utils import log_crud_action, ActionType, serialize_data
 from ..models.patient_list_diet_model import PatientDietList
 from ..schemas.patient_list_diet import PatientDietListTypeCreate, PatientDietListTypeUpdate
 from datetime import datetime
+from ..services.reference_list_cache import cached_reference_list, invalidate_reference_list
+
+# Reference list cache entry (see services/reference_list_cache.py)
+REFERENCE_LIST_NAME = PatientDietList.__tablename__
 
 SYSTEM_USER_ID = "1"
 
 def get_all_diet_types(db: Session):
-    return db.query(PatientDietList).filter(PatientDietList.IsDeleted == "0").all()
+    return cached_reference_list(db, REFERENCE_LIST_NAME, lambda: db.query(PatientDietList).filter(PatientDietList.IsDeleted == "0").all())
 
 
 def get_diet_type_by_id(db: Session, diet_type_id: int):
@@ -25,6 +29,7 @@ def create_diet_type(db: Session, diet_type: PatientDietListTypeCreate, created_
     updated_data_dict = serialize_data(diet_type.model_dump())
     db.add(db_diet_type)
     db.commit()
+    invalidate_reference_list(REFERENCE_LIST_NAME)
     db.refresh(db_diet_type)
 
     log_crud_action(
@@ -69,6 +74,7 @@ def update_diet_type(
         db_diet_type.ModifiedById = modified_by
 
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
         db.refresh(db_diet_type)
         updated_data_dict = serialize_data(diet_type.model_dump())
 
@@ -109,6 +115,7 @@ def delete_diet_type(db: Session, diet_type_id: int, modified_by: str):
         db_diet_type.UpdatedDateTime = datetime.now()
         db_diet_type.ModifiedById = modified_by
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
 
         log_crud_action(
             action=ActionType.DELETE,
@@ -4,10 +4,14 @@ from sqlalchemy.orm import Session
 from ..logger.logger_utils import serialize_data, log_crud_action, ActionType
 from ..models.patient_list_education_model import PatientEducationList
 from ..schemas.patient_list_education import PatientEducationListTypeCreate, PatientEducationListTypeUpdate
+from ..services.reference_list_cache import cached_reference_list, invalidate_reference_list
+
+# Reference list cache entry (see services/reference_list_cache.py)
+REFERENCE_LIST_NAME = PatientEducationList.__tablename__
 
 SYSTEM_USER_ID = "1"
 def get_all_education_types(db: Session):
-    return db.query(PatientEducationList).filter(PatientEducationList.IsDeleted == "0").all()
+    return cached_reference_list(db, REFERENCE_LIST_NAME, lambda: db.query(PatientEducationList).filter(PatientEducationList.IsDeleted == "0").all())
 
 
 def get_education_type_by_id(db: Session, education_type_id: int):
@@ -24,6 +28,7 @@ def create_education_type(db: Session, education_type: PatientEducationListTypeC
     updated_data_dict = serialize_data(education_type.model_dump())
     db.add(db_education_type)
     db.commit()
+    invalidate_reference_list(REFERENCE_LIST_NAME)
     db.refresh(db_education_type)
 
     log_crud_action(
@@ -67,6 +72,7 @@ def update_education_type(
         db_education_type.ModifiedById = modified_by
 
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
         db.refresh(db_education_type)
 
         updated_data_dict = serialize_data(education_type.model_dump())
@@ -106,6 +112,7 @@ def delete_education_type(db: Session, education_type_id: int, modified_by: str)
         db_education_type.UpdatedDateTime = datetime.now()
         db_education_type.ModifiedById = modified_by
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
         log_crud_action(
             action=ActionType.DELETE,
             user=SYSTEM_USER_ID,
@@ -9,6 +9,10 @@ from ..schemas.patient_list_language import (
     PatientListLanguageCreate,
     PatientListLanguageUpdate,
 )
+from ..services.reference_list_cache import cached_reference_list, invalidate_reference_list
+
+# Reference list cache entry (see services/reference_list_cache.py)
+REFERENCE_LIST_NAME = PatientListLanguage.__tablename__
 
 
 def get_patient_list_language(db: Session, patient_list_language_id: int):
@@ -18,7 +22,7 @@ def get_patient_list_language(db: Session, patient_list_language_id: int):
     return db_patient_language
 
 def get_all_patient_list_language(db: Session):
-    return db.query(PatientListLanguage).filter(PatientListLanguage.isDeleted == "0").all()
+    return cached_reference_list(db, REFERENCE_LIST_NAME, lambda: db.query(PatientListLanguage).filter(PatientListLanguage.isDeleted == "0").all())
 
 def create_patient_list_language(
     db: Session, patient_language: PatientListLanguageCreate
@@ -38,6 +42,7 @@ def create_patient_list_language(
     updated_data_dict = serialize_data(patient_language.model_dump())
     db.add(db_language_item)
     db.commit()
+    invalidate_reference_list(REFERENCE_LIST_NAME)
     db.refresh(db_language_item)
 
     log_crud_action(
@@ -89,6 +94,7 @@ def update_patient_list_language(
     db_patient_language.modifiedDate = datetime.now()
 
     db.commit()
+    invalidate_reference_list(REFERENCE_LIST_NAME)
     db.refresh(db_patient_language)
 
     log_crud_action(
@@ -125,6 +131,7 @@ def delete_patient_list_language(db: Session, patient_language_id: int):
     db_patient_language.isDeleted = "1"
     db_patient_language.modifiedDate = datetime.now()
     db.commit()
+    invalidate_reference_list(REFERENCE_LIST_NAME)
     db.refresh(db_patient_language)
 
     log_crud_action(
@@ -4,10 +4,14 @@ from sqlalchemy.orm import Session
 from ..logger.logger_utils import serialize_data, log_crud_action, ActionType
 from ..models.patient_list_livewith_model import PatientLiveWithList
 from ..schemas.patient_list_livewith import PatientLiveWithListTypeCreate, PatientLiveWithListTypeUpdate
+from ..services.reference_list_cache import cached_reference_list, invalidate_reference_list
+
+# Reference list cache entry (see services/reference_list_cache.py)
+REFERENCE_LIST_NAME = PatientLiveWithList.__tablename__
 
 
 def get_all_livewith_types(db: Session):
-    return db.query(PatientLiveWithList).filter(PatientLiveWithList.IsDeleted == "0").all()
+    return cached_reference_list(db, REFERENCE_LIST_NAME, lambda: db.query(PatientLiveWithList).filter(PatientLiveWithList.IsDeleted == "0").all())
 
 
 def get_livewith_type_by_id(db: Session, livewith_type_id: int):
@@ -24,6 +28,7 @@ def create_livewith_type(db: Session, livewith_type: PatientLiveWithListTypeCrea
     updated_data_dict = serialize_data(livewith_type.model_dump())
     db.add(db_livewith_type)
     db.commit()
+    invalidate_reference_list(REFERENCE_LIST_NAME)
     db.refresh(db_livewith_type)
 
     log_crud_action(
@@ -68,6 +73,7 @@ def update_livewith_type(
         db_livewith_type.ModifiedById = modified_by
 
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
         db.refresh(db_livewith_type)
 
         updated_data_dict = serialize_data(livewith_type.model_dump())
@@ -108,6 +114,7 @@ def delete_livewith_type(db: Session, livewith_type_id: int, modified_by: str):
         db_livewith_type.UpdatedDateTime = datetime.now()
         db_livewith_type.ModifiedById = modified_by
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
 
         log_crud_action(
             action=ActionType.DELETE,
@@ -4,10 +4,14 @@ from sqlalchemy.orm import Session
 from ..logger.logger_utils import serialize_data, log_crud_action, ActionType
 from ..models.patient_list_occupation_model import PatientOccupationList
 from ..schemas.patient_list_occupation import PatientOccupationListTypeCreate, PatientOccupationListTypeUpdate
+from ..services.reference_list_cache import cached_reference_list, invalidate_reference_list
+
+# Reference list cache entry (see services/reference_list_cache.py)
+REFERENCE_LIST_NAME = PatientOccupationList.__tablename__
 
 
 def get_all_occupation_types(db: Session):
-    return db.query(PatientOccupationList).filter(PatientOccupationList.IsDeleted == "0").all()
+    return cached_reference_list(db, REFERENCE_LIST_NAME, lambda: db.query(PatientOccupationList).filter(PatientOccupationList.IsDeleted == "0").all())
 
 
 def get_occupation_type_by_id(db: Session, occupation_type_id: int):
@@ -24,6 +28,7 @@ def create_occupation_type(db: Session, occupation_type: PatientOccupationListTy
     updated_data_dict = serialize_data(occupation_type.model_dump())
     db.add(db_occupation_type)
     db.commit()
+    invalidate_reference_list(REFERENCE_LIST_NAME)
     db.refresh(db_occupation_type)
 
     log_crud_action(
@@ -67,6 +72,7 @@ def update_occupation_type(
         db_occupation_type.ModifiedById = modified_by
 
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
         db.refresh(db_occupation_type)
 
         updated_data_dict = serialize_data(occupation_type.model_dump())
@@ -106,6 +112,7 @@ def delete_occupation_type(db: Session, occupation_type_id: int, modified_by: st
         db_occupation_type.UpdatedDateTime = datetime.now()
         db_occupation_type.ModifiedById = modified_by
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
 
         log_crud_action(
             action=ActionType.DELETE,
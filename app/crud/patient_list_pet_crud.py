@@ -4,10 +4,14 @@ from sqlalchemy.orm import Session
 from ..logger.logger_utils import serialize_data, log_crud_action, ActionType
 from ..models.patient_list_pet_model import PatientPetList
 from ..schemas.patient_list_pet import PatientPetListTypeCreate, PatientPetListTypeUpdate
+from ..services.reference_list_cache import cached_reference_list, invalidate_reference_list
+
+# Reference list cache entry (see services/reference_list_cache.py)
+REFERENCE_LIST_NAME = PatientPetList.__tablename__
 
 
 def get_all_pet_types(db: Session):
-    return db.query(PatientPetList).filter(PatientPetList.IsDeleted == "0").all()
+    return cached_reference_list(db, REFERENCE_LIST_NAME, lambda: db.query(PatientPetList).filter(PatientPetList.IsDeleted == "0").all())
 
 
 def get_pet_type_by_id(db: Session, pet_type_id: int):
@@ -24,6 +28,7 @@ def create_pet_type(db: Session, pet_type: PatientPetListTypeCreate, created_by:
     updated_data_dict = serialize_data(pet_type.model_dump())
     db.add(db_pet_type)
     db.commit()
+    invalidate_reference_list(REFERENCE_LIST_NAME)
     db.refresh(db_pet_type)
 
     log_crud_action(
@@ -67,6 +72,7 @@ def update_pet_type(
         db_pet_type.ModifiedById = modified_by
 
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
         db.refresh(db_pet_type)
 
         updated_data_dict = serialize_data(pet_type.model_dump())
@@ -106,6 +112,7 @@ def delete_pet_type(db: Session, pet_type_id: int, modified_by: str):
         db_pet_type.UpdatedDateTime = datetime.now()
         db_pet_type.ModifiedById = modified_by
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
 
         log_crud_action(
             action=ActionType.DELETE,
@@ -4,10 +4,14 @@ from sqlalchemy.orm import Session
 from ..logger.logger_utils import serialize_data, log_crud_action, ActionType
 from ..models.patient_list_religion_model import PatientReligionList
 from ..schemas.patient_list_religion import PatientReligionListTypeCreate, PatientReligionListTypeUpdate
+from ..services.reference_list_cache import cached_reference_list, invalidate_reference_list
+
+# Reference list cache entry (see services/reference_list_cache.py)
+REFERENCE_LIST_NAME = PatientReligionList.__tablename__
 
 
 def get_all_religion_types(db: Session):
-    return db.query(PatientReligionList).filter(PatientReligionList.IsDeleted == "0").all()
+    return cached_reference_list(db, REFERENCE_LIST_NAME, lambda: db.query(PatientReligionList).filter(PatientReligionList.IsDeleted == "0").all())
 
 
 def get_religion_type_by_id(db: Session, religion_type_id: int):
@@ -24,6 +28,7 @@ def create_religion_type(db: Session, religion_type: PatientReligionListTypeCrea
     updated_data_dict = serialize_data(religion_type.model_dump())
     db.add(db_religion_type)
     db.commit()
+    invalidate_reference_list(REFERENCE_LIST_NAME)
     db.refresh(db_religion_type)
     log_crud_action(
         action=ActionType.CREATE,
@@ -66,6 +71,7 @@ def update_religion_type(
         db_religion_type.ModifiedById = modified_by
 
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
         db.refresh(db_religion_type)
 
         updated_data_dict = serialize_data(religion_type.model_dump())
@@ -105,6 +111,7 @@ def delete_religion_type(db: Session, religion_type_id: int, modified_by: str):
         db_religion_type.UpdatedDateTime = datetime.now()
         db_religion_type.ModifiedById = modified_by
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
         log_crud_action(
             action=ActionType.DELETE,
             user="1",
@@ -1,5 +1,4 @@
 import logging
-import math
 from datetime import datetime
 from typing import Any, Dict, Optional
 
@@ -8,7 +7,7 @@ from sqlalchemy import func
 from sqlalchemy.orm import Session, joinedload
 
 from app.models.patient_highlight_model import PatientHighlight
-from app.services.highlight_helper import create_highlight_if_needed
+from app.services.highlight_helper import create_highlight_if_needed, queue_highlight_if_deferred
 
 from ..logger.logger_utils import ActionType, log_crud_action, serialize_data
 from ..models.patient_medication_model import PatientMedication
@@ -19,6 +18,7 @@ from ..schemas.patient_medication import (
     PatientMedicationUpdate,
 )
 from ..services.outbox_service import generate_correlation_id, get_outbox_service
+from ..utils.pagination import paginate_query
 
 logger = logging.getLogger(__name__)
 
@@ -171,34 +171,20 @@ def _medication_to_dict(medication) -> Dict[str, Any]:
         return {}
 
 # Your existing get functions remain the same...
-def get_medications(db: Session, pageNo: int = 0, pageSize: int = 10):
-    offset = pageNo * pageSize
+def get_medications(db: Session, pageNo: int = 0, pageSize: int = 10, includeTotal: bool = True):
     query = db.query(PatientMedication).filter(PatientMedication.IsDeleted == '0')
-    totalRecords = query.count()
-    totalPages = math.ceil(totalRecords / pageSize)
-
-    db_medications = (
-        query.order_by(PatientMedication.Id.desc())
-             .offset(offset)
-             .limit(pageSize)
-             .all()
+    db_medications, totalRecords, totalPages, _ = paginate_query(
+        query.order_by(PatientMedication.Id.desc()), pageNo, pageSize, include_total=includeTotal
     )
     return db_medications, totalRecords, totalPages
 
-def get_patient_medications(db: Session, patient_id: int, pageNo: int = 0, pageSize: int = 100):
-    offset = pageNo * pageSize
+def get_patient_medications(db: Session, patient_id: int, pageNo: int = 0, pageSize: int = 100, includeTotal: bool = True):
     query = db.query(PatientMedication).filter(
         PatientMedication.PatientId == patient_id,
         PatientMedication.IsDeleted == '0'
     )
-    totalRecords = query.count()
-    totalPages = math.ceil(totalRecords / pageSize)
-
-    db_medications = (
-        query.order_by(PatientMedication.Id.desc()) 
-             .offset(offset)
-             .limit(pageSize)
-             .all()
+    db_medications, totalRecords, totalPages, _ = paginate_query(
+        query.order_by(PatientMedication.Id.desc()), pageNo, pageSize, include_total=includeTotal
     )
     return db_medications, totalRecords, totalPages
 
@@ -326,12 +312,16 @@ def create_medication(
             log_type= 'medication',
             is_system_config= False
         )
+        # Deferred highlights: the work item commits together with the medication
+        highlight_queued = queue_highlight_if_deferred(
+            db, "MEDICATION", new_medication.PatientId, "PATIENT_MEDICATION", new_medication.Id, created_by
+        )
         db.commit()
         db.refresh(new_medication)
         
         logger.info(f"Created medication {new_medication.Id} for patient {new_medication.PatientId} with outbox event {outbox_event.id} (correlation: {correlation_id})")
 
-        if medication_with_prescription:
+        if medication_with_prescription and not highlight_queued:
             try:
                 create_highlight_if_needed(
                     db=db,
@@ -542,13 +532,17 @@ def update_medication(
             log_type= 'medication',
             is_system_config= False,
         )
+        # Deferred highlights: the work item commits together with the medication
+        highlight_queued = queue_highlight_if_deferred(
+            db, "MEDICATION", db_medication.PatientId, "PATIENT_MEDICATION", medication_id, modified_by
+        )
         db.commit()
         db.refresh(db_medication)
         
         logger.info(f"Updated medication {db_medication.Id} for patient {db_medication.PatientId} with outbox event {outbox_event.id} (correlation: {correlation_id})")
 
         # Trigger patient highlights update after successsful update operation + logging
-        medication_with_prescription = _get_medication_with_prescription_name(db, medication_id)
+        medication_with_prescription = None if highlight_queued else _get_medication_with_prescription_name(db, medication_id)
         if medication_with_prescription:
             try:
                 create_highlight_if_needed(
@@ -566,7 +560,7 @@ def update_medication(
                 logger.error(f"Failed to create/update highlight for medication {medication_id}: {e}")
                 db.rollback()
                 # The medication update is already committed and safe
-        else:
+        elif not highlight_queued:
             logger.warning(f"Skipping highlight update for medication {medication_id} - prescription not loaded")
 
         return db_medication
@@ -12,13 +12,21 @@ from ..schemas.patient_mobility_mapping import (
     PatientMobilityUpdate,
 )
 from ..logger.logger_utils import log_crud_action, ActionType, serialize_data
+from ..services.reference_list_cache import cached_reference_list, invalidate_reference_list
+
+# Reference list cache entry (see services/reference_list_cache.py)
+REFERENCE_LIST_NAME = PatientMobilityList.__tablename__
 
 # CRUD for PATIENT_MOBILITY_LIST
 
 # Get all mobility list entries
 def get_all_mobility_list_entries(db: Session):
     try:
-        entries = db.query(PatientMobilityList).filter(PatientMobilityList.IsDeleted == "0").all()
+        entries = cached_reference_list(
+            db,
+            REFERENCE_LIST_NAME,
+            lambda: db.query(PatientMobilityList).filter(PatientMobilityList.IsDeleted == "0").all()
+        )
         if not entries:
             raise HTTPException(status_code=404, detail="No mobility list entries found.")
         return entries
@@ -48,6 +56,7 @@ def create_mobility_list_entry(db: Session, mobility_list_data: PatientMobilityL
     updated_data_dict = serialize_data(mobility_list_data.model_dump())
     db.add(new_entry)
     db.commit()
+    invalidate_reference_list(REFERENCE_LIST_NAME)
     db.refresh(new_entry)
 
     log_crud_action(
@@ -98,6 +107,7 @@ def update_mobility_list_entry(
     try:
         # Commit the transaction and refresh the entry
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
         db.refresh(db_entry)
 
         updated_data_dict = serialize_data(mobility_list_data.model_dump())
@@ -151,6 +161,7 @@ def delete_mobility_list_entry(db: Session, mobility_list_id: int, modified_by:
 
     # Commit the transaction to save the changes
     db.commit()
+    invalidate_reference_list(REFERENCE_LIST_NAME)
     db.refresh(db_entry)  # Refresh the entry to return the updated instance
 
     log_crud_action(
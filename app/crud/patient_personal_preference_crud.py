@@ -1,5 +1,4 @@
 import logging
-import math
 from datetime import datetime
 from typing import Optional
 
@@ -16,6 +15,7 @@ from ..schemas.patient_personal_preference import (
     PatientPersonalPreferenceCreate,
     PatientPersonalPreferenceUpdate,
 )
+from ..utils.pagination import paginate_query
 
 logger = logging.getLogger(__name__)
 
@@ -80,24 +80,17 @@ def get_preferences(
     db: Session,
     pageNo: int = 0,
     pageSize: int = 10,
+    includeTotal: bool = True,
 ):
     """Return all active patient preferences (all patients) with pagination."""
-    offset = pageNo * pageSize
-
     query = (
         db.query(PatientPersonalPreference)
         .options(joinedload(PatientPersonalPreference._preference_list))
         .filter(PatientPersonalPreference.IsDeleted == "0")
     )
 
-    totalRecords = query.count()
-    totalPages = math.ceil(totalRecords / pageSize) if pageSize > 0 else 0
-
-    items = (
-        query.order_by(PatientPersonalPreference.Id.asc())
-        .offset(offset)
-        .limit(pageSize)
-        .all()
+    items, totalRecords, totalPages, _ = paginate_query(
+        query.order_by(PatientPersonalPreference.Id.asc()), pageNo, pageSize, include_total=includeTotal
     )
     return items, totalRecords, totalPages
 
@@ -108,11 +101,10 @@ def get_patient_preferences(
     pageNo: int = 0,
     pageSize: int = 100,
     preference_type: Optional[str] = None,
+    includeTotal: bool = True,
 ):
     """Return all active preferences for a specific patient.
     Optionally filter by PreferenceType (LikesDislikes | Habit | Hobby)."""
-    offset = pageNo * pageSize
-
     query = (
         db.query(PatientPersonalPreference)
         .options(joinedload(PatientPersonalPreference._preference_list))
@@ -131,14 +123,8 @@ def get_patient_preferences(
             PatientPersonalPreferenceList.PreferenceType == preference_type
         )
 
-    totalRecords = query.count()
-    totalPages = math.ceil(totalRecords / pageSize) if pageSize > 0 else 0
-
-    items = (
-        query.order_by(PatientPersonalPreference.Id.asc())
-        .offset(offset)
-        .limit(pageSize)
-        .all()
+    items, totalRecords, totalPages, _ = paginate_query(
+        query.order_by(PatientPersonalPreference.Id.asc()), pageNo, pageSize, include_total=includeTotal
     )
     return items, totalRecords, totalPages
 
@@ -12,6 +12,10 @@ from ..schemas.patient_personal_preference_list import (
     PatientPersonalPreferenceListCreate,
     PatientPersonalPreferenceListUpdate,
 )
+from ..services.reference_list_cache import cached_reference_page, invalidate_reference_list
+
+# Reference list cache entry (see services/reference_list_cache.py)
+REFERENCE_LIST_NAME = PatientPersonalPreferenceList.__tablename__
 
 logger = logging.getLogger(__name__)
 
@@ -23,17 +27,35 @@ def get_preference_lists(
     pageSize: int = 100,
     preference_type: Optional[str] = None,
 ):
-    """Return all active preference list items with optional type filter and pagination."""
-    query = db.query(PatientPersonalPreferenceList).filter(
-        PatientPersonalPreferenceList.IsDeleted == "0"
-    )
-
+    """Return all active preference list items with optional type filter and pagination (cached per page and type)."""
     if preference_type and preference_type.upper() != "ALL":
         if preference_type not in VALID_PREFERENCE_TYPES:
             raise HTTPException(
                 status_code=400,
                 detail=f"Invalid preferenceType. Must be one of: ALL, {', '.join(VALID_PREFERENCE_TYPES)}",
             )
+    else:
+        preference_type = None
+
+    return cached_reference_page(
+        db,
+        REFERENCE_LIST_NAME,
+        (pageNo, pageSize, preference_type),
+        lambda: _get_preference_lists_page(db, pageNo, pageSize, preference_type),
+    )
+
+
+def _get_preference_lists_page(
+    db: Session,
+    pageNo: int,
+    pageSize: int,
+    preference_type: Optional[str],
+):
+    query = db.query(PatientPersonalPreferenceList).filter(
+        PatientPersonalPreferenceList.IsDeleted == "0"
+    )
+
+    if preference_type:
         query = query.filter(
             PatientPersonalPreferenceList.PreferenceType == preference_type
         )
@@ -115,6 +137,7 @@ def create_preference_list(
         )
         db.add(db_item)
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
         db.refresh(db_item)
 
         log_crud_action(
@@ -208,6 +231,7 @@ def update_preference_list(
         db_item.ModifiedByID = modified_by
 
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
         db.refresh(db_item)
 
         updated_data_dict = serialize_data(update_data)
@@ -267,6 +291,7 @@ def delete_preference_list(
         db_item.ModifiedByID = modified_by
 
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
         db.refresh(db_item)
         original_data['PreferenceName'] = db_item.PreferenceName
         original_data['PreferenceType'] = db_item.PreferenceType
@@ -7,7 +7,7 @@ from sqlalchemy import func
 from sqlalchemy.orm import Session, joinedload
 
 from app.models.patient_highlight_model import PatientHighlight
-from app.services.highlight_helper import create_highlight_if_needed
+from app.services.highlight_helper import create_highlight_if_needed, queue_highlight_if_deferred
 
 from ..logger.logger_utils import ActionType, log_crud_action, serialize_data
 from ..models.patient_model import Patient
@@ -97,6 +97,11 @@ def create_prescription(
 
         updated_data_dict = serialize_data(prescription_data.model_dump())
         db.add(new_prescription)
+        db.flush()  # Get ID before commit
+        # Deferred highlights: the work item commits together with the prescription
+        highlight_queued = queue_highlight_if_deferred(
+            db, "PRESCRIPTION", new_prescription.PatientId, "PATIENT_PRESCRIPTION", new_prescription.Id, created_by
+        )
         db.commit()
         db.refresh(new_prescription)
 
@@ -106,7 +111,7 @@ def create_prescription(
             PatientPrescription.Id == new_prescription.Id
         ).first()
         
-        if prescription_with_details:
+        if prescription_with_details and not highlight_queued:
             try:
                 create_highlight_if_needed(
                 db=db,
@@ -212,6 +217,10 @@ def update_prescription(
     db_prescription.ModifiedById = modified_by
 
     try:
+        # Deferred highlights: the work item commits together with the prescription
+        highlight_queued = queue_highlight_if_deferred(
+            db, "PRESCRIPTION", db_prescription.PatientId, "PATIENT_PRESCRIPTION", prescription_id, modified_by
+        )
         db.commit()
         db.refresh(db_prescription)
 
@@ -222,7 +231,7 @@ def update_prescription(
             PatientPrescription.Id == prescription_id
         ).first()
         
-        if prescription_with_details:
+        if prescription_with_details and not highlight_queued:
             try:
                 create_highlight_if_needed(
                     db=db,
@@ -9,10 +9,22 @@ from ..schemas.patient_prescription_list import (
     PatientPrescriptionListCreate,
     PatientPrescriptionListUpdate,
 )
+from ..services.reference_list_cache import cached_reference_page, invalidate_reference_list
+
+# Reference list cache entry (see services/reference_list_cache.py)
+REFERENCE_LIST_NAME = PatientPrescriptionList.__tablename__
 
 
 def get_prescription_lists(db: Session, pageNo: int = 0, pageSize: int = 100):
-    """Get all prescription list items with pagination"""
+    """Get all prescription list items with pagination (cached per page)"""
+    return cached_reference_page(
+        db,
+        REFERENCE_LIST_NAME,
+        (pageNo, pageSize),
+        lambda: _get_prescription_lists_page(db, pageNo, pageSize)
+    )
+
+def _get_prescription_lists_page(db: Session, pageNo: int, pageSize: int):
     query = db.query(PatientPrescriptionList)
     
     totalRecords = query.count()
@@ -66,6 +78,7 @@ def create_prescription_list(
 
         db.add(db_prescription_list)
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
         db.refresh(db_prescription_list)
 
         # Log the creation
@@ -131,6 +144,7 @@ def update_prescription_list(
         setattr(db_prescription_list, key, value)
 
     db.commit()
+    invalidate_reference_list(REFERENCE_LIST_NAME)
     db.refresh(db_prescription_list)
 
     updated_data_dict = serialize_data(update_data)
@@ -173,6 +187,7 @@ def delete_prescription_list(
 
         db_prescription_list.IsDeleted = True
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
         db.refresh(db_prescription_list)
 
         original_data_dict['Value'] = db_prescription_list.Value
@@ -1,5 +1,4 @@
 import logging
-import math
 from datetime import datetime
 
 from fastapi import HTTPException
@@ -11,42 +10,33 @@ from ..models.patient_problem_model import PatientProblem
 from ..models.patient_model import Patient
 from ..schemas.patient_problem import PatientProblemCreate, PatientProblemUpdate
 from ..services.highlight_helper import create_highlight_if_needed
+from ..utils.pagination import paginate_query
 
 logger = logging.getLogger(__name__)
 
 
-def get_problems(db: Session, pageNo: int = 0, pageSize: int = 10):
+def get_problems(db: Session, pageNo: int = 0, pageSize: int = 10, includeTotal: bool = True):
     """
     Get all patient problems with pagination.
     Uses joinedload to efficiently load problem_list relationship (ProblemName).
     """
-    offset = pageNo * pageSize
-    
     # Base query with joinedload for problem_list relationship
     query = db.query(PatientProblem).options(
         joinedload(PatientProblem.problem_list)
     ).filter(PatientProblem.IsDeleted == '0')
     
-    totalRecords = query.count()
-    totalPages = math.ceil(totalRecords / pageSize) if pageSize > 0 else 0
-
-    db_problems = (
-        query.order_by(PatientProblem.Id.desc())
-        .offset(offset)
-        .limit(pageSize)
-        .all()
+    db_problems, totalRecords, totalPages, _ = paginate_query(
+        query.order_by(PatientProblem.Id.desc()), pageNo, pageSize, include_total=includeTotal
     )
     
     return db_problems, totalRecords, totalPages
 
 
-def get_patient_problems(db: Session, patient_id: int, pageNo: int = 0, pageSize: int = 100):
+def get_patient_problems(db: Session, patient_id: int, pageNo: int = 0, pageSize: int = 100, includeTotal: bool = True):
     """
     Get all problems for a specific patient.
     Uses joinedload to efficiently load problem_list relationship (ProblemName).
     """
-    offset = pageNo * pageSize
-    
     # Base query with joinedload for problem_list relationship
     query = db.query(PatientProblem).options(
         joinedload(PatientProblem.problem_list)
@@ -55,14 +45,8 @@ def get_patient_problems(db: Session, patient_id: int, pageNo: int = 0, pageSize
         PatientProblem.IsDeleted == '0'
     )
     
-    totalRecords = query.count()
-    totalPages = math.ceil(totalRecords / pageSize) if pageSize > 0 else 0
-
-    db_problems = (
-        query.order_by(PatientProblem.Id.desc())
-        .offset(offset)
-        .limit(pageSize)
-        .all()
+    db_problems, totalRecords, totalPages, _ = paginate_query(
+        query.order_by(PatientProblem.Id.desc()), pageNo, pageSize, include_total=includeTotal
     )
     
     return db_problems, totalRecords, totalPages
@@ -135,7 +119,8 @@ def create_problem(
             patient_id=new_problem.PatientID,
             source_table="PATIENT_PROBLEM",
             source_record_id=new_problem.Id,
-            created_by=created_by
+            created_by=created_by,
+            commit=False
         )
 
         # Fetch patient name for logging
@@ -269,7 +254,8 @@ def update_problem(
             patient_id=db_problem.PatientID,
             source_table="PATIENT_PROBLEM",
             source_record_id=db_problem.Id,
-            created_by=modified_by
+            created_by=modified_by,
+            commit=False
         )
 
         # Fetch patient name for logging
@@ -357,7 +343,8 @@ def delete_problem(
             patient_id=db_problem.PatientID,
             source_table="PATIENT_PROBLEM",
             source_record_id=db_problem.Id,
-            created_by=modified_by
+            created_by=modified_by,
+            commit=False
         )
 
         # Fetch patient name
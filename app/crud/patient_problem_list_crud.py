@@ -9,10 +9,22 @@ from ..schemas.patient_problem_list import (
     PatientProblemListCreate,
     PatientProblemListUpdate,
 )
+from ..services.reference_list_cache import cached_reference_page, invalidate_reference_list
+
+# Reference list cache entry (see services/reference_list_cache.py)
+REFERENCE_LIST_NAME = PatientProblemList.__tablename__
 
 
 def get_problem_lists(db: Session, pageNo: int = 0, pageSize: int = 100):
-    """Get all problem list items with pagination"""
+    """Get all problem list items with pagination (cached per page)"""
+    return cached_reference_page(
+        db,
+        REFERENCE_LIST_NAME,
+        (pageNo, pageSize),
+        lambda: _get_problem_lists_page(db, pageNo, pageSize)
+    )
+
+def _get_problem_lists_page(db: Session, pageNo: int, pageSize: int):
     query = db.query(PatientProblemList).filter(PatientProblemList.IsDeleted == '0')
     
     totalRecords = query.count()
@@ -69,6 +81,7 @@ def create_problem_list(
         
         db.add(db_problem_list)
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
         db.refresh(db_problem_list)
 
         updated_data_dict = serialize_data(data)
@@ -140,6 +153,7 @@ def update_problem_list(
         db_problem_list.ModifiedByID = modified_by
 
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
         db.refresh(db_problem_list)
 
         updated_data_dict = serialize_data(update_data)
@@ -191,6 +205,7 @@ def delete_problem_list(
         db_problem_list.ModifiedByID = modified_by
         
         db.commit()
+        invalidate_reference_list(REFERENCE_LIST_NAME)
         db.refresh(db_problem_list)
 
         original_data_dict["ProblemName"] = db_problem_list.ProblemName
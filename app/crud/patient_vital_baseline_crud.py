@@ -0,0 +1,111 @@
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import Float, cast, func
+from sqlalchemy.orm import Session
+
+from ..models.patient_vital_baseline_model import PatientVitalBaseline
+from ..models.patient_vital_model import PatientVital
+
+logger = logging.getLogger(__name__)
+
+# HOLDLOCK also locks the key range of a patient without a baseline row, so a concurrent first vital of the
+# same patient waits for this transaction's insert instead of inserting the row a second time
+_FOR_UPDATE_HINT = "WITH (UPDLOCK, HOLDLOCK, ROWLOCK)"
+
+
+def get_vital_baseline(db: Session, patient_id: int, for_update: bool = False) -> Optional[PatientVitalBaseline]:
+    """Get a patient's baseline row; for_update locks it (or the missing row's key) until the transaction ends"""
+    query = db.query(PatientVitalBaseline)
+    if for_update:
+        query = query.with_hint(PatientVitalBaseline, _FOR_UPDATE_HINT, "mssql")
+    return query.filter(PatientVitalBaseline.PatientId == patient_id).first()
+
+
+def get_vital_baselines(db: Session, patient_ids: Iterable[int], for_update: bool = False) -> Dict[int, PatientVitalBaseline]:
+    """Get the baseline rows of many patients in one query, keyed by PatientId"""
+    query = db.query(PatientVitalBaseline)
+    if for_update:
+        query = query.with_hint(PatientVitalBaseline, _FOR_UPDATE_HINT, "mssql")
+    baselines = query.filter(
+        PatientVitalBaseline.PatientId.in_(set(patient_ids))
+    ).all()
+    return {baseline.PatientId: baseline for baseline in baselines}
+
+
+def build_vital_baseline(db: Session, patient_id: int) -> PatientVitalBaseline:
+    """
+    Create a patient's baseline row from the vitals already in the database (one aggregate query).
+    Used the first time a patient without a baseline row records, edits or deletes a vital.
+    """
+    # Summed as FLOAT, like the migration's backfill (SUM of an INT column is an INT and can overflow)
+    columns = [func.count(PatientVital.Id)] + [
+        func.sum(cast(getattr(PatientVital, metric), Float)) for metric in PatientVitalBaseline.METRICS
+    ]
+
+    row = db.query(*columns).filter(
+        PatientVital.PatientId == patient_id,
+        PatientVital.IsDeleted == '0'
+    ).one()
+
+    baseline = PatientVitalBaseline(PatientId=patient_id, RecordCount=row[0] or 0)
+    for i, metric in enumerate(PatientVitalBaseline.METRICS, start=1):
+        setattr(baseline, f"{metric}Sum", float(row[i] or 0))
+
+    db.add(baseline)
+    db.flush()
+    logger.info(f"Built vital baseline for patient {patient_id} from {baseline.RecordCount} vitals")
+    return baseline
+
+
+def apply_vital_to_baseline(
+    db: Session,
+    patient_id: int,
+    added: Optional[Dict[str, Optional[float]]] = None,
+    removed: Optional[Dict[str, Optional[float]]] = None
+) -> PatientVitalBaseline:
+    """
+    Add and/or remove one vital's readings (see PatientVitalBaseline.readings_of) on the patient's baseline.
+
+    Must run in the same transaction as the vital change, before that change is flushed: a missing
+    baseline row is built from the vitals currently in the database, which must not include it yet.
+    """
+    baseline = get_vital_baseline(db, patient_id, for_update=True)
+    if baseline is None:
+        baseline = build_vital_baseline(db, patient_id)
+
+    if removed is not None:
+        baseline.add_readings(removed, sign=-1)
+    if added is not None:
+        baseline.add_readings(added, sign=1)
+    return baseline
+
+
+def lock_vital_baselines(db: Session, patient_ids: Iterable[int]) -> Dict[int, PatientVitalBaseline]:
+    """
+    Lock the baseline rows of many patients, building the missing ones; keyed by PatientId.
+
+    Take the lock before anything else in the transaction reads these rows: the session's identity map
+    keeps the first values it loaded, so rows read earlier without a lock would not be refreshed here.
+    Same rule as apply_vital_to_baseline: call before the new vitals are flushed.
+    """
+    baselines = get_vital_baselines(db, patient_ids, for_update=True)
+    for patient_id in set(patient_ids) - baselines.keys():
+        baselines[patient_id] = build_vital_baseline(db, patient_id)
+    return baselines
+
+
+def apply_vitals_to_baselines(
+    db: Session,
+    added_by_patient: Dict[int, List[Dict[str, Optional[float]]]],
+    baselines: Optional[Dict[int, PatientVitalBaseline]] = None
+) -> None:
+    """
+    Batch version of apply_vital_to_baseline for new vitals: {patient_id: [readings, ...]}, on the rows
+    from lock_vital_baselines (locked here when not given). Same rule: call before the new vitals are flushed.
+    """
+    if baselines is None:
+        baselines = lock_vital_baselines(db, added_by_patient.keys())
+    for patient_id, readings_list in added_by_patient.items():
+        for readings in readings_list:
+            baselines[patient_id].add_readings(readings, sign=1)
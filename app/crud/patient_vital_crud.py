@@ -1,17 +1,23 @@
 import logging
 import math
 from datetime import datetime
+from typing import List
 
 from app.models.patient_highlight_model import PatientHighlight
+from app.models.patient_highlight_type_model import PatientHighlightType
 from fastapi import HTTPException
-from sqlalchemy import func
+from sqlalchemy import func, insert
 from sqlalchemy.orm import Session
 
 from app.services.highlight_helper import create_highlight_if_needed
+from app.services.highlight_queue_service import enqueue_highlight_evaluation, is_deferred_mode
+from app.strategies.highlights.vital_strategy import VitalStrategy
 
 from ..config import Config
 from ..logger.logger_utils import ActionType, log_crud_action, serialize_data
+from .patient_vital_baseline_crud import apply_vital_to_baseline, apply_vitals_to_baselines, lock_vital_baselines
 from ..models.patient_vital_model import PatientVital
+from ..models.patient_vital_baseline_model import PatientVitalBaseline
 from ..models.patient_model import Patient
 from ..schemas.patient_vital import (
     PatientVitalCreate,
@@ -84,20 +90,12 @@ def create_vital(
         )
 
         updated_data_dict = serialize_data(vital_data.model_dump())
+        if new_vital.IsDeleted != "1":
+            apply_vital_to_baseline(db, new_vital.PatientId, added=PatientVitalBaseline.readings_of(new_vital))
         db.add(new_vital)
-        db.commit()
-        db.refresh(new_vital)
+        db.flush()  # Assigns the vital Id for the highlight
 
-        # Fetch patient name for logging
-        try:
-            patient = db.query(Patient).filter(Patient.id == new_vital.PatientId).first()
-            patient_name = patient.name if patient else None
-        except Exception:
-            patient_name = None
-
-        updated_data_dict['PatientName'] = patient_name
-        
-        # Check if the new record needs to be inserted into Highlight table
+        # Check if the new record needs to be inserted into Highlight table (same transaction as the vital)
         try:
             logger.info(f"Checking if highlight needed for vital: PatientId={new_vital.PatientId}, VitalId={new_vital.Id}")
             
@@ -108,13 +106,26 @@ def create_vital(
                 patient_id=new_vital.PatientId,
                 source_table="PATIENT_VITAL",
                 source_record_id=new_vital.Id,
-                created_by=created_by
+                created_by=created_by,
+                commit=False
             )
             
             logger.info(f"Highlight check completed for vital: VitalId={new_vital.Id}")
             
         except Exception as e:
             logger.error(f"Failed to create highlight for vital {new_vital.Id}: {str(e)}", exc_info=True)
+
+        db.commit()
+        db.refresh(new_vital)
+
+        # Fetch patient name for logging
+        try:
+            patient = db.query(Patient).filter(Patient.id == new_vital.PatientId).first()
+            patient_name = patient.name if patient else None
+        except Exception:
+            patient_name = None
+
+        updated_data_dict['PatientName'] = patient_name
     
         log_crud_action(
             action=ActionType.CREATE,
@@ -139,6 +150,144 @@ def create_vital(
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
+# Create many vital records in one transaction (ward rounds, device uploads)
+def create_vitals_bulk(
+    db: Session,
+    vitals_data: List[PatientVitalCreate],
+    created_by: str,
+    user_full_name: str
+):
+    """
+    Creates many PatientVital records at once. Every reading is threshold-validated first and the
+    whole batch is rejected (400) if any fails. Then, in one transaction:
+    - patient baselines are computed once per patient (from their vitals before this batch) and
+      the VitalStrategy rules are evaluated for the whole batch in one pass
+    - vitals, their baseline updates and the resulting highlights are written with one commit
+      (highlights in a savepoint, so a highlight failure does not lose the vitals)
+    In deferred highlight mode the highlights are queued instead (HIGHLIGHT_WORK_ITEMS).
+    """
+    errors = []
+    for index, vital_data in enumerate(vitals_data):
+        try:
+            validate_vital_threshold(vital_data)
+        except ValueError as e:
+            errors.append(f"vitals[{index}]: {str(e)}")
+    if errors:
+        raise HTTPException(status_code=400, detail=errors)
+
+    try:
+        timestamp = datetime.now()
+        new_vitals = [
+            PatientVital(
+                **vital_data.model_dump(
+                    exclude={"CreatedDateTime", "ModifiedDateTime", "CreatedById", "ModifiedById"}
+                ),
+                CreatedDateTime=timestamp,
+                UpdatedDateTime=timestamp,
+                CreatedById=created_by,
+                ModifiedById=created_by,
+            )
+            for vital_data in vitals_data
+        ]
+        active_vitals = [vital for vital in new_vitals if vital.IsDeleted != "1"]
+
+        # Lock the baseline rows first, compute the baselines before the batch (once per patient) from
+        # those locked rows, then add the batch's own readings to them
+        strategy = VitalStrategy()
+        deferred = is_deferred_mode()
+        patient_ids = {vital.PatientId for vital in active_vitals}
+        baseline_rows = lock_vital_baselines(db, patient_ids)
+        baselines = {} if deferred else strategy.get_batch_baselines(db, patient_ids, baseline_rows)
+        added_by_patient = {}
+        for vital in active_vitals:
+            added_by_patient.setdefault(vital.PatientId, []).append(PatientVitalBaseline.readings_of(vital))
+        apply_vitals_to_baselines(db, added_by_patient, baseline_rows)
+
+        db.add_all(new_vitals)
+        db.flush()  # Assigns the vital Ids
+
+        highlight_count = 0
+        if deferred:
+            for vital in active_vitals:
+                enqueue_highlight_evaluation(db, "VITAL", "PATIENT_VITAL", vital.Id, vital.PatientId, created_by)
+        else:
+            try:
+                with db.begin_nested():
+                    highlight_count = _insert_vital_highlights_bulk(db, strategy, active_vitals, baselines, created_by)
+            except Exception as e:
+                logger.error(f"Failed to create highlights for bulk vitals: {str(e)}", exc_info=True)
+
+        vital_ids = [vital.Id for vital in new_vitals]
+        db.commit()
+        logger.info(f"Created {len(new_vitals)} vitals and {highlight_count} highlights in bulk")
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+    # Reload the committed rows in one query (instead of a refresh per vital)
+    vitals_by_id = {
+        vital.Id: vital
+        for vital in db.query(PatientVital).filter(PatientVital.Id.in_(vital_ids)).all()
+    }
+    patient_names = dict(
+        db.query(Patient.id, Patient.name).filter(
+            Patient.id.in_({vital_data.PatientId for vital_data in vitals_data})
+        ).all()
+    )
+
+    for vital_id, vital_data in zip(vital_ids, vitals_data):
+        patient_name = patient_names.get(vital_data.PatientId)
+        updated_data_dict = serialize_data(vital_data.model_dump())
+        updated_data_dict['PatientName'] = patient_name
+        log_crud_action(
+            action=ActionType.CREATE,
+            user=created_by,
+            user_full_name=user_full_name,
+            message=f"Added vital record for patient: {patient_name or 'Unknown'}",
+            table="PatientVital",
+            entity_id=vital_id,
+            original_data=None,
+            updated_data=updated_data_dict,
+            patient_id=vital_data.PatientId,
+            patient_full_name=patient_name,
+            log_type = "patient_info",
+            is_system_config = False,
+        )
+
+    return [vitals_by_id[vital_id] for vital_id in vital_ids]
+
+def _insert_vital_highlights_bulk(db: Session, strategy: VitalStrategy, vitals, baselines, created_by: str) -> int:
+    """Evaluate the batch against its baselines and insert the highlights in one statement"""
+    highlight_type = db.query(PatientHighlightType).filter(
+        PatientHighlightType.TypeCode == strategy.get_type_code(),
+        PatientHighlightType.IsDeleted == False
+    ).first()
+    if not highlight_type or not highlight_type.IsEnabled:
+        logger.info("Highlight type 'VITAL' is missing or disabled - no highlights for bulk vitals")
+        return 0
+
+    flags = strategy.evaluate_batch(vitals, [baselines[vital.PatientId][0] for vital in vitals])
+    timestamp = datetime.now()
+    rows = [
+        {
+            "PatientId": vital.PatientId,
+            "HighlightTypeId": highlight_type.Id,
+            "HighlightText": strategy.generate_highlight_text_for(vital, *baselines[vital.PatientId]),
+            "SourceTable": "PATIENT_VITAL",
+            "SourceRecordId": vital.Id,
+            "CreatedDate": timestamp,
+            "ModifiedDate": timestamp,
+            "IsDeleted": 0,
+            "CreatedById": created_by,
+            "ModifiedById": created_by,
+        }
+        for vital, flagged in zip(vitals, flags)
+        if flagged
+    ]
+    if rows:
+        db.execute(insert(PatientHighlight), rows)
+    return len(rows)
+
 # Update an existing vital record
 def update_vital(
     db: Session,
@@ -174,24 +323,22 @@ def update_vital(
 
         # Apply updates
         update_data = vital_data.model_dump(exclude_unset=True)
+        
+        # Move the vital's readings in the baseline(s) before the change is flushed
+        new_readings = {metric: update_data.get(metric, value) for metric, value in PatientVitalBaseline.readings_of(db_vital).items()}
+        apply_vital_to_baseline(db, db_vital.PatientId, removed=PatientVitalBaseline.readings_of(db_vital))
+        if update_data.get("IsDeleted", db_vital.IsDeleted) != "1":
+            apply_vital_to_baseline(db, update_data.get("PatientId", db_vital.PatientId), added=new_readings)
+        
         for key, value in update_data.items():
             setattr(db_vital, key, value)
 
         # Update metadata
         db_vital.ModifiedDateTime = datetime.now()
         db_vital.ModifiedById = modified_by
+        db.flush()
 
-        db.commit()
-        db.refresh(db_vital)
-
-        # Fetch patient name
-        try:
-            patient = db.query(Patient).filter(Patient.id == db_vital.PatientId).first()
-            patient_name = patient.name if patient else None
-        except Exception:
-            patient_name = None
-        
-        # Check if the new record needs to be inserted into Highlight table
+        # Check if the updated record needs a highlight (same transaction as the vital)
         try:
             logger.info(f"Checking if highlight needed for vital: PatientId={db_vital.PatientId}, VitalId={db_vital.Id}")
             
@@ -202,13 +349,24 @@ def update_vital(
                 patient_id=db_vital.PatientId,
                 source_table="PATIENT_VITAL",
                 source_record_id=db_vital.Id,
-                created_by=db_vital.CreatedById
+                created_by=db_vital.CreatedById,
+                commit=False
             )
             
             logger.info(f"Highlight check completed for vital: VitalId={db_vital.Id}")
             
         except Exception as e:
             logger.error(f"Failed to create highlight for vital {db_vital.Id}: {str(e)}", exc_info=True)
+
+        db.commit()
+        db.refresh(db_vital)
+
+        # Fetch patient name
+        try:
+            patient = db.query(Patient).filter(Patient.id == db_vital.PatientId).first()
+            patient_name = patient.name if patient else None
+        except Exception:
+            patient_name = None
         
 
         updated_data_dict = serialize_data(update_data)
@@ -271,6 +429,7 @@ def delete_vital(
     except Exception:
         original_data_dict = "{}"
 
+    apply_vital_to_baseline(db, db_vital.PatientId, removed=PatientVitalBaseline.readings_of(db_vital))
     db_vital.IsDeleted = "1"
     db_vital.ModifiedDateTime = datetime.now()
     db_vital.ModifiedById = modified_by
@@ -1,14 +1,27 @@
+import importlib.util
+import logging
 import os
 import sys
+import threading
+from contextlib import asynccontextmanager
+from typing import Union
+
 import sqlalchemy as sa
 from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, declarative_base
 from sqlalchemy.orm import sessionmaker
+from starlette.concurrency import run_in_threadpool
 from dotenv import load_dotenv
 
+from app.config import Config
+from app.utils.db_pool import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
+
 # Load environment variables from .env file
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 SERVICE_NAME = os.getenv("SERVICE_NAME")
 if SERVICE_NAME != "PATIENT":
     print("Please ensure you are using the correct .env file for PATIENT service!")
@@ -64,8 +77,29 @@ connection_url = sa.URL.create(
 # )
 ##############################################
 
-print(connection_url)
-engine = sa.create_engine(connection_url)
+def create_db_engine(**overrides):
+    """
+    Engine with the pool settings from Config.Database. The API, the outbox processor, the consumers
+    (all through SessionLocal) and the sync scripts share this one configuration.
+    """
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": Config.Database.POOL_SIZE,
+        "max_overflow": Config.Database.MAX_OVERFLOW,
+        "pool_timeout": Config.Database.POOL_TIMEOUT_SECONDS,
+        "pool_recycle": Config.Database.POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": Config.Database.POOL_PRE_PING,
+        "fast_executemany": Config.Database.FAST_EXECUTEMANY,
+    }
+    options.update(overrides)
+    return sa.create_engine(connection_url, **options)
+
+
+engine = create_db_engine()
+logger.info(
+    f"Database engine for {DB_SERVER}:{DB_DATABASE_PORT}/{DB_DATABASE} "
+    f"(pool_size={Config.Database.POOL_SIZE}, max_overflow={Config.Database.MAX_OVERFLOW})"
+)
 ##############################################################
 # print(DATABASE_URL)
 # engine = create_engine(DATABASE_URL, connect_args={"timeout": 30})
@@ -83,5 +117,94 @@ def get_db():
     finally:
         db.close()
 
+
+#====  Async read path ===
+# The hot read endpoints are `async def` and take their session from get_read_db: an AsyncSession on an
+# aioodbc engine when Config.Database.ASYNC_READS is on, otherwise a regular Session. run_read() runs the
+# existing (sync) CRUD function on either, so both paths share one implementation of every query.
+ReadSession = Union[AsyncSession, Session]
+
+_async_engine = None
+_async_session_factory = None
+_async_engine_lock = threading.Lock()
+
+AIOODBC_INSTALLED = importlib.util.find_spec("aioodbc") is not None
+if Config.Database.ASYNC_READS and not AIOODBC_INSTALLED:
+    logger.warning("DB_ASYNC_READS is on but aioodbc is not installed - read endpoints use the sync engine")
+
+
+def async_reads_enabled() -> bool:
+    return Config.Database.ASYNC_READS and AIOODBC_INSTALLED
+
+
+def get_async_engine():
+    """
+    The aioodbc engine of the async read path, created on first use (same URL and pool settings as the sync
+    engine). Returns None when async reads are disabled or aioodbc is not installed.
+    """
+    global _async_engine, _async_session_factory
+    if _async_engine is None and async_reads_enabled():
+        with _async_engine_lock:
+            if _async_engine is None:
+                _async_engine = create_async_engine(
+                    connection_url.set(drivername="mssql+aioodbc"),
+                    poolclass=InstrumentedAsyncAdaptedQueuePool,
+                    pool_size=Config.Database.POOL_SIZE,
+                    max_overflow=Config.Database.MAX_OVERFLOW,
+                    pool_timeout=Config.Database.POOL_TIMEOUT_SECONDS,
+                    pool_recycle=Config.Database.POOL_RECYCLE_SECONDS,
+                    pool_pre_ping=Config.Database.POOL_PRE_PING,
+                )
+                # Reads only: rows stay loaded after the session ends, so nothing lazy-loads outside the greenlet
+                _async_session_factory = async_sessionmaker(
+                    _async_engine, autoflush=False, expire_on_commit=False
+                )
+                logger.info(f"Async database engine for {DB_SERVER}:{DB_DATABASE_PORT}/{DB_DATABASE} (aioodbc)")
+    return _async_engine
+
+
+async def dispose_async_engine():
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine, _async_session_factory = None, None
+
+
+async def get_async_db():
+    if get_async_engine() is None:
+        raise RuntimeError("Async database engine is not available (DB_ASYNC_READS is off or aioodbc is missing)")
+    async with _async_session_factory() as db:
+        yield db
+
+
+async def get_read_db():
+    """Session for the async read endpoints: an AsyncSession when the async engine is available, else a Session"""
+    if get_async_engine() is not None:
+        async with _async_session_factory() as db:
+            yield db
+        return
+
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        await run_in_threadpool(db.close)
+
+
+# get_read_db as `async with read_session() as db:`, for reads outside a request's dependency scope
+# (a streamed response keeps reading after the endpoint has returned)
+read_session = asynccontextmanager(get_read_db)
+
+
+async def run_read(db: ReadSession, fn, *args, **kwargs):
+    """
+    Call a CRUD function fn(db, *args, **kwargs) without blocking the event loop: through
+    AsyncSession.run_sync (its queries are awaited on the aioodbc connection) or, on the sync fallback,
+    in the threadpool like a `def` endpoint.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
 def get_database_url():
     return connection_url
\ No newline at end of file
@@ -13,6 +13,7 @@ from sqlalchemy.exc import SQLAlchemyError  # For handling database-related erro
 from sqlalchemy.orm import clear_mappers
 
 from app.messaging.consumer_manager import create_patient_consumer_manager
+from app.messaging.producer_manager import get_producer_stats
 from app.models import (
     patient_photo_list_album_model,  # Import all models to ensure they are registered
 )
@@ -51,6 +52,7 @@ from app.routers import (
     allergy_reaction_type_router,
     allergy_type_router,
     cronjob_router,
+    integrity_digest_router,
     integrity_router,
     outbox_router,
     patient_allergy_mapping_router,
@@ -89,9 +91,12 @@ from app.routers import (
     patient_vital_router,
     social_history_sensitive_mapping_router,
 )
-from app.services.background_processor import get_processor
+from app.services.background_processor import get_highlight_processor, get_processor
+from app.services.highlight_queue_service import is_deferred_mode
+from app.services.reference_list_cache import get_reference_list_cache
 
-from .database import Base, engine
+from .database import Base, dispose_async_engine, engine, get_async_engine
+from .utils.db_pool import get_pool_stats
 
 load_dotenv()
 
@@ -157,6 +162,7 @@ async def combined_lifespan(app: FastAPI):
     Combined lifespan manager that handles both:
     1. Outbox processor
     2. Drift consumer
+    3. Highlight queue processor (deferred highlight evaluation only)
     """
     # Startup phase
     logger.info("=== Application Startup ===")
@@ -167,6 +173,13 @@ async def combined_lifespan(app: FastAPI):
     processor_task = asyncio.create_task(processor.start())
     logger.info("Outbox processor started")
     
+    # Start highlight queue processor
+    highlight_processor = get_highlight_processor()
+    highlight_processor_task = None
+    if is_deferred_mode():
+        logger.info("Starting highlight queue processor...")
+        highlight_processor_task = asyncio.create_task(highlight_processor.start())
+    
     # Start drift consumer
     logger.info("Starting drift consumer...")
     await asyncio.get_event_loop().run_in_executor(None, start_consumers)
@@ -185,6 +198,17 @@ async def combined_lifespan(app: FastAPI):
         await asyncio.get_event_loop().run_in_executor(None, stop_consumers)
         logger.info("Drift consumer stopped")
         
+        # Stop highlight queue processor
+        if highlight_processor_task:
+            await highlight_processor.stop()
+            if not highlight_processor_task.done():
+                highlight_processor_task.cancel()
+                try:
+                    await highlight_processor_task
+                except asyncio.CancelledError:
+                    pass
+            logger.info("Highlight queue processor stopped")
+        
         # Stop outbox processor
         logger.info("Stopping outbox processor...")
         await processor.stop()
@@ -196,6 +220,8 @@ async def combined_lifespan(app: FastAPI):
                 pass
         logger.info("Outbox processor stopped")
 
+        await dispose_async_engine()
+
 
 app = FastAPI(
     title="NTU FYP PEAR PATIENT SERVICE",
@@ -422,6 +448,12 @@ app.include_router(
     tags=["Integrity"],
 )
 
+app.include_router(
+    integrity_digest_router.router,
+    prefix=f"{API_VERSION_PREFIX}/integrity",
+    tags=["Integrity"],
+)
+
 app.include_router(
     outbox_router.router
 )
@@ -482,6 +514,15 @@ def health_check():
     except Exception as e:
         health_status["outbox_processor"] = f"error: {str(e)}"
     
+    # Check highlight queue processor status (deferred highlight evaluation)
+    if is_deferred_mode():
+        highlight_processor = get_highlight_processor()
+        health_status["highlight_queue_processor"] = "running" if highlight_processor.is_running() else "stopped"
+        health_status["highlight_queue_stats"] = highlight_processor.get_stats()
+    
+    # Reference list cache hit / miss counters
+    health_status["reference_cache"] = get_reference_list_cache().get_stats()
+    
     # Check drift consumer status
     if consumer_manager:
         try:
@@ -504,3 +545,26 @@ def health_check():
         health_status["status"] = "degraded"
     
     return health_status
+
+
+@app.get("/health/db-pool")
+def db_pool_metrics():
+    """
+    Connection pool metrics of this process: live counters (in_use, idle, overflow) and, since start,
+    checkout wait (avg / max), slow and overflow checkouts, timeouts and peak usage.
+    The async read engine's pool is reported under async_reads (null when the sync engine serves the reads).
+    """
+    stats = get_pool_stats(engine)
+    async_engine = get_async_engine()
+    stats["async_reads"] = get_pool_stats(async_engine.sync_engine) if async_engine is not None else None
+    return stats
+
+
+@app.get("/health/producer")
+def producer_metrics():
+    """
+    RabbitMQ producer metrics of this process, per producer (default, and one per outbox lane): queue depth,
+    messages in flight awaiting their confirm, confirm latency (avg / max), nacks, retries, failures and
+    drops on a full queue.
+    """
+    return get_producer_stats()
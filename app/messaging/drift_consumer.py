@@ -1,22 +1,30 @@
 import logging
 import threading
 import json
-import uuid
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from contextlib import contextmanager
 
+from app.config import Config
+
 from .rabbitmq_client import RabbitMQClient
 from .producer_manager import get_producer_manager
 
 logger = logging.getLogger(__name__)
 
+# Ids per IN (...) query in batch mode (SQL Server allows at most 2100 parameters per statement)
+DRIFT_IN_QUERY_CHUNK_SIZE = 1000
+
 
 class DriftConsumer:
     """
     Consumer for drift detection notifications from reconciliation service.
     
-    Handles drift by republishing UPDATE sync events for all entity types.
+    Handles drift by republishing UPDATE sync events for every record type in the sync registry
+    (app/messaging/sync_registry.py).
     Since we use soft deletes, there's no need for separate DELETE handlers.
+
+    In batch mode (Config.Drift.CONSUMER_MODE) notifications are handled in batches: one IN query per
+    record type, one confirmed batch publish, then one ack for the whole batch.
     """
     
     def __init__(self):
@@ -32,12 +40,10 @@ class DriftConsumer:
         self.producer_manager = get_producer_manager()
         self.exchange = 'patient.updates'
         
-        # Import models
-        from app.models.patient_model import Patient
-        from app.models.patient_medication_model import PatientMedication
+        # record_type -> SyncEntity (model, id column, serializer, routing key)
+        from .sync_registry import SYNC_ENTITIES
         
-        self.Patient = Patient
-        self.PatientMedication = PatientMedication
+        self.sync_entities = SYNC_ENTITIES
     
     @contextmanager
     def get_db_session(self):
@@ -79,8 +85,16 @@ class DriftConsumer:
                 durable=True
             )
             
-            self.client.consume(self.drift_queue, self._handle_message_wrapper)
-            logger.info(f"Drift consumer set up for queue: {self.drift_queue}")
+            if Config.Drift.CONSUMER_MODE == "batch":
+                self.client.consume_batch(
+                    self.drift_queue,
+                    self._handle_batch,
+                    prefetch_count=Config.Drift.PREFETCH,
+                    max_wait_ms=Config.Drift.BATCH_MAX_WAIT_MS
+                )
+            else:
+                self.client.consume(self.drift_queue, self._handle_message_wrapper)
+            logger.info(f"Drift consumer set up for queue: {self.drift_queue} ({Config.Drift.CONSUMER_MODE} mode)")
             
         except Exception as e:
             logger.error(f"Failed to setup drift consumer: {str(e)}")
@@ -142,37 +156,21 @@ class DriftConsumer:
             
             logger.info(f"Processing drift: {record_type} id={record_id} type={drift_type}")
             
-            # Map record types to handlers
-            handlers = {
-                "patient": (self.Patient, self._publish_patient_sync),
-                "patient_medication": (self.PatientMedication, self._publish_medication_sync),
-            }
-            
-            handler_info = handlers.get(record_type)
-            if not handler_info:
+            entity = self.sync_entities.get(record_type)
+            if not entity:
                 logger.warning(f"Unknown record_type: {record_type}")
                 return False
             
-            model_class, publish_func = handler_info
-            
             # Fetch the record (including soft-deleted ones for sync)
             with self.get_db_session() as db:
-                # Determine the ID column name based on the model
-                if record_type == "patient":
-                    record = db.query(model_class).filter(
-                        model_class.id == record_id
-                    ).first()
-                elif record_type == "patient_medication":
-                    record = db.query(model_class).filter(
-                        model_class.Id == record_id
-                    ).first()
+                record = entity.query(db).filter(entity.id_column == record_id).first()
                 
                 if not record:
                     logger.warning(f"{record_type} {record_id} not found in source - skipping sync")
                     return True  # Acknowledge - nothing to sync
                 
                 # Publish sync event with complete data
-                return publish_func(record)
+                return self._publish_sync(record_type, *entity.build_sync_message(record))
             
         except Exception as e:
             logger.error(f"Error processing drift message: {str(e)}")
@@ -180,6 +178,79 @@ class DriftConsumer:
             logger.error(f"Traceback: {traceback.format_exc()}")
             return False
     
+    def _handle_batch(self, messages: List[Dict[str, Any]]) -> List[bool]:
+        """
+        Process a batch of drift notifications; returns per message whether it can be acknowledged.
+
+        The referenced records are loaded with one IN query per record type, a record referenced by
+        several notifications is published once, and all sync events go out in one batch that waits
+        for the broker's confirms. Notifications whose sync event was not confirmed are requeued.
+        """
+        results = [False] * len(messages)
+        if self.shutdown_event and self.shutdown_event.is_set():
+            logger.info("Shutdown signal received")
+            return results
+        
+        try:
+            # record_type -> record_id -> indexes of the notifications that reference it
+            requested: Dict[str, Dict[Any, List[int]]] = {}
+            for i, message in enumerate(messages):
+                message_data = self._parse_message(message)
+                if not message_data:
+                    continue
+                record_type = message_data['record_type']
+                if record_type not in self.sync_entities:
+                    logger.warning(f"Unknown record_type: {record_type}")
+                    continue
+                try:
+                    record_id = int(message_data['record_id'])
+                except (TypeError, ValueError):
+                    logger.error(f"Invalid record_id for {record_type}: {message_data['record_id']}")
+                    continue
+                requested.setdefault(record_type, {}).setdefault(record_id, []).append(i)
+            
+            sync_messages: List[Tuple[str, Dict[str, Any]]] = []
+            sync_indexes: List[List[int]] = []
+            with self.get_db_session() as db:
+                for record_type, ids in requested.items():
+                    entity = self.sync_entities[record_type]
+                    records = {}
+                    id_list = list(ids)
+                    for start in range(0, len(id_list), DRIFT_IN_QUERY_CHUNK_SIZE):
+                        chunk = id_list[start:start + DRIFT_IN_QUERY_CHUNK_SIZE]
+                        for record in entity.query(db).filter(entity.id_column.in_(chunk)).all():
+                            records[entity.record_id(record)] = record
+                    
+                    for record_id, indexes in ids.items():
+                        record = records.get(record_id)
+                        if record is None:
+                            logger.warning(f"{record_type} {record_id} not found in source - skipping sync")
+                            for i in indexes:
+                                results[i] = True  # Acknowledge - nothing to sync
+                            continue
+                        sync_messages.append(entity.build_sync_message(record))
+                        sync_indexes.append(indexes)
+            
+            confirmed = self.producer_manager.publish_batch(
+                self.exchange, sync_messages, timeout=Config.Drift.CONFIRM_TIMEOUT_SECONDS
+            )
+            for indexes, success in zip(sync_indexes, confirmed):
+                for i in indexes:
+                    results[i] = bool(success)
+            
+            logger.info(
+                f"Processed drift batch: {len(messages)} notifications, {len(sync_messages)} sync events, "
+                f"{sum(1 for success in confirmed if success)} confirmed"
+            )
+        except Exception as e:
+            logger.error(f"Error processing drift batch: {str(e)}")
+            import traceback
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            results = [False] * len(messages)
+        
+        self._flush_logs()
+        return results
+    
     def _parse_message(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Parse and validate message structure"""
         try:
@@ -199,123 +270,18 @@ class DriftConsumer:
     
     # ========================
     # RECONCILER WILL TRIGGER THESE SYNC PUBLISHERS
-    # All use UPDATE event type with "new_data" field
+    # All use UPDATE event type with "new_data" field (see SyncEntity.build_sync_message)
     # ========================
     
-    def _publish_patient_sync(self, patient) -> bool:
-        """Publish patient sync event (UPDATE)"""
-        try:
-            correlation_id = str(uuid.uuid4())
-            
-            # Complete entity data in new_data
-            entity_data = {
-                "id": patient.id,
-                "name": patient.name,
-                "nric": patient.nric,
-                "address": patient.address,
-                "tempAddress": patient.tempAddress,
-                "homeNo": patient.homeNo,
-                "handphoneNo": patient.handphoneNo,
-                "gender": patient.gender,
-                "dateOfBirth": patient.dateOfBirth.isoformat() if patient.dateOfBirth else None,
-                "isApproved": patient.isApproved,
-                "preferredName": patient.preferredName,
-                "preferredLanguageId": patient.preferredLanguageId,
-                "updateBit": patient.updateBit,
-                "autoGame": patient.autoGame,
-                "startDate": patient.startDate.isoformat() if patient.startDate else None,
-                "endDate": patient.endDate.isoformat() if patient.endDate else None,
-                "isActive": patient.isActive,
-                "isRespiteCare": patient.isRespiteCare,
-                "privacyLevel": patient.privacyLevel,
-                "terminationReason": patient.terminationReason,
-                "inActiveReason": patient.inActiveReason,
-                "inActiveDate": patient.inActiveDate.isoformat() if patient.inActiveDate else None,
-                "profilePicture": patient.profilePicture,
-                "createdDate": patient.createdDate.isoformat() if patient.createdDate else None,
-                "modifiedDate": patient.modifiedDate.isoformat() if patient.modifiedDate else None,
-                "CreatedById": patient.CreatedById,
-                "ModifiedById": patient.ModifiedById,
-                "isDeleted": patient.isDeleted
-            }
-            
-            message = {
-                "correlation_id": correlation_id,
-                "event_type": "PATIENT_UPDATED",
-                "patient_id": patient.id,
-                "old_data": {},
-                "new_data": entity_data,
-                "changes": {},
-                "modified_by": patient.ModifiedById or "drift_reconciliation",
-                "modified_by_name": "Drift Reconciliation",
-                "timestamp": patient.modifiedDate.isoformat() if patient.modifiedDate else None,
-                "is_sync_event": True,
-                "sync_reason": "drift_detected"
-            }
-            
-            success = self.producer_manager.publish(
-                self.exchange, 
-                "patient.updated.sync", 
-                message
-            )
-            
-            if success:
-                logger.info(f"Published patient sync for id={patient.id}")
-            return success
-            
-        except Exception as e:
-            logger.error(f"Error publishing patient sync: {str(e)}")
-            return False
-
-    def _publish_medication_sync(self, medication) -> bool:
-        """Publish patient medication sync event (UPDATE)"""
+    def _publish_sync(self, record_type: str, routing_key: str, message: Dict[str, Any]) -> bool:
+        """Queue one sync event on the producer"""
         try:
-            correlation_id = str(uuid.uuid4())
-            
-            entity_data = {
-                "Id": medication.Id,
-                "PatientId": medication.PatientId,
-                "PrescriptionListId": medication.PrescriptionListId,
-                "AdministerTime": medication.AdministerTime,
-                "Dosage": medication.Dosage,
-                "Instruction": medication.Instruction,
-                "StartDate": medication.StartDate.isoformat() if medication.StartDate else None,
-                "EndDate": medication.EndDate.isoformat() if medication.EndDate else None,
-                "PrescriptionRemarks": medication.PrescriptionRemarks,
-                "IsDeleted": medication.IsDeleted,
-                "CreatedDateTime": medication.CreatedDateTime.isoformat() if medication.CreatedDateTime else None,
-                "UpdatedDateTime": medication.UpdatedDateTime.isoformat() if medication.UpdatedDateTime else None,
-                "CreatedById": medication.CreatedById,
-                "ModifiedById": medication.ModifiedById
-            }
-            
-            message = {
-                "correlation_id": correlation_id,
-                "event_type": "PATIENT_MEDICATION_UPDATED",
-                "medication_id": medication.Id,
-                "patient_id": medication.PatientId,
-                "old_data": {},
-                "new_data": entity_data,
-                "changes": {},
-                "modified_by": medication.ModifiedById or "drift_reconciliation",
-                "modified_by_name": "Drift Reconciliation",
-                "timestamp": medication.UpdatedDateTime.isoformat() if medication.UpdatedDateTime else None,
-                "is_sync_event": True,
-                "sync_reason": "drift_detected"
-            }
-            
-            success = self.producer_manager.publish(
-                self.exchange,
-                "patient.medication.updated.sync",
-                message
-            )
-            
+            success = self.producer_manager.publish(self.exchange, routing_key, message)
             if success:
-                logger.info(f"Published medication sync for id={medication.Id}")
+                logger.info(f"Published {record_type} sync - correlation: {message['correlation_id']}")
             return success
-            
         except Exception as e:
-            logger.error(f"Error publishing medication sync: {str(e)}")
+            logger.error(f"Error publishing {record_type} sync: {str(e)}")
             return False
     
     def get_health_status(self) -> Dict[str, Any]:
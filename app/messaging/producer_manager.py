@@ -1,14 +1,38 @@
+"""
+Publishing for all producers of the service, from one thread per ProducerManager.
+
+In pipelined mode (Config.Producer.MODE) the producer thread runs an asynchronous pika connection and keeps
+up to MAX_IN_FLIGHT publishes waiting for their broker confirm. The broker numbers the publishes of a
+confirm-mode channel 1, 2, ... (the delivery tag) and acks or nacks them by tag, optionally "up to and
+including" a tag (multiple), so ConfirmWindow maps tags back to the pending publishes. Nacked publishes
+are republished ahead of the rest, up to NACK_MAX_RETRIES times; publishes still unconfirmed when the
+connection drops are republished after reconnecting. Messages that share an ordering key are never in
+flight together, so a retry cannot overtake a later message of the same key.
+
+In blocking mode each publish waits for its confirm before the next one is sent.
+
+ProducerMetrics counts publishes, confirms, nacks, retries and drops and times confirms;
+get_producer_stats() backs GET /health/producer.
+"""
+
 import logging
 import threading
 import queue
 import time
-from typing import Dict, Any, Optional
+from collections import Counter, OrderedDict, deque
+from typing import Deque, Dict, Any, List, Optional, Set, Tuple
 from datetime import datetime
 
+import pika
+from pika import spec
+
+from app.config import Config
+
 from .rabbitmq_client import RabbitMQClient
 
 logger = logging.getLogger(__name__)
 
+
 class PublishRequest:
     """Encapsulates a publish request"""
     def __init__(self, exchange: str, routing_key: str, message: Dict[str, Any]):
@@ -16,24 +40,217 @@ class PublishRequest:
         self.routing_key = routing_key
         self.message = message
         self.timestamp = datetime.now()
-        
+
+
+class BatchPublishRequest:
+    """
+    Encapsulates a batch of messages published back-to-back by the producer thread.
+
+    Each message is confirmed by the broker before the next is sent (the channel is in confirm
+    mode). results[i] is True (confirmed), False (failed) or None (skipped because an earlier
+    message with the same ordering key failed). done is set once the whole batch is handled.
+
+    A caller that stops waiting abandons the request: its messages not sent yet are never sent.
+    """
+    def __init__(self, exchange: str, messages: List[Tuple[str, Dict[str, Any]]], ordering_keys: Optional[List[str]] = None):
+        self.exchange = exchange
+        self.messages = messages
+        self.ordering_keys = ordering_keys
+        self.results: List[Optional[bool]] = [None] * len(messages)
+        self.done = threading.Event()
+        self.timestamp = datetime.now()
+        # Pipelined mode: messages not yet confirmed / failed / skipped, and ordering keys that failed
+        self.pending = len(messages)
+        self.failed_keys: Set[str] = set()
+        self.sent = [False] * len(messages)
+        self.abandoned = False
+        self._lock = threading.Lock()
+
+    def start_send(self, index: int) -> bool:
+        """Mark message index as handed to the broker; False once the caller has abandoned the request"""
+        with self._lock:
+            if self.abandoned:
+                return False
+            self.sent[index] = True
+            return True
+
+    def abandon(self) -> List[Optional[bool]]:
+        """
+        Stop waiting for the batch and return its results so far. Messages not sent yet are never sent
+        (None); sent ones without a confirm count as failed (False), as they may or may not have arrived.
+        """
+        with self._lock:
+            self.abandoned = True
+            return [False if sent and result is None else result for sent, result in zip(self.sent, self.results)]
+
+
+class PendingPublish:
+    """One message on its way through the pipelined producer (in the backlog or awaiting its confirm)"""
+    __slots__ = ('exchange', 'routing_key', 'message', 'request', 'index', 'ordering_key', 'attempts', 'published_at')
+
+    def __init__(self, exchange: str, routing_key: str, message: Dict[str, Any],
+                 request: Optional[BatchPublishRequest] = None, index: Optional[int] = None,
+                 ordering_key: Optional[str] = None):
+        self.exchange = exchange
+        self.routing_key = routing_key
+        self.message = message
+        self.request = request
+        self.index = index
+        self.ordering_key = ordering_key
+        self.attempts = 0
+        self.published_at = None
+
+
+class ConfirmWindow:
+    """
+    Publishes awaiting their broker confirm, by delivery tag.
+
+    Tags are assigned in publish order starting at 1, as the broker does for each confirm-mode channel;
+    reset() starts over for a new channel.
+    """
+    def __init__(self):
+        self._entries: "OrderedDict[int, PendingPublish]" = OrderedDict()
+        self._ordering_keys: Counter = Counter()
+        self._next_tag = 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, entry: PendingPublish) -> int:
+        delivery_tag = self._next_tag
+        self._next_tag += 1
+        entry.published_at = time.monotonic()
+        self._entries[delivery_tag] = entry
+        if entry.ordering_key is not None:
+            self._ordering_keys[entry.ordering_key] += 1
+        return delivery_tag
+
+    def busy_keys(self) -> Set[str]:
+        """Ordering keys with a publish in flight"""
+        return set(self._ordering_keys)
+
+    def resolve(self, delivery_tag: int, multiple: bool) -> List[PendingPublish]:
+        """Remove and return the publishes an ack / nack refers to, in publish order"""
+        if multiple:
+            tags = []
+            for tag in self._entries:
+                if tag > delivery_tag:
+                    break
+                tags.append(tag)
+        else:
+            tags = [delivery_tag] if delivery_tag in self._entries else []
+        return [self._remove(tag) for tag in tags]
+
+    def reset(self) -> List[PendingPublish]:
+        """Remove and return every publish in flight (the channel is gone), in publish order"""
+        entries = [self._remove(tag) for tag in list(self._entries)]
+        self._next_tag = 1
+        return entries
+
+    def _remove(self, delivery_tag: int) -> PendingPublish:
+        entry = self._entries.pop(delivery_tag)
+        if entry.ordering_key is not None:
+            self._ordering_keys[entry.ordering_key] -= 1
+            if self._ordering_keys[entry.ordering_key] <= 0:
+                del self._ordering_keys[entry.ordering_key]
+        return entry
+
+
+class ProducerMetrics:
+    """Publish counters of one producer"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.published = 0
+        self.confirmed = 0
+        self.nacked = 0
+        self.retried = 0
+        self.republished_after_reconnect = 0
+        self.failed = 0
+        self.dropped_queue_full = 0
+        self.confirm_seconds_total = 0.0
+        self.confirm_seconds_max = 0.0
+        self.peak_in_flight = 0
+
+    def record_publish(self, in_flight: int) -> None:
+        with self._lock:
+            self.published += 1
+            self.peak_in_flight = max(self.peak_in_flight, in_flight)
+
+    def record_confirm(self, confirm_seconds: float) -> None:
+        with self._lock:
+            self.confirmed += 1
+            self.confirm_seconds_total += confirm_seconds
+            self.confirm_seconds_max = max(self.confirm_seconds_max, confirm_seconds)
+
+    def record_nack(self, retried: bool) -> None:
+        with self._lock:
+            self.nacked += 1
+            if retried:
+                self.retried += 1
+
+    def record_reconnect_republish(self, count: int) -> None:
+        with self._lock:
+            self.republished_after_reconnect += count
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failed += 1
+
+    def record_queue_full(self, count: int = 1) -> None:
+        with self._lock:
+            self.dropped_queue_full += count
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'published': self.published,
+                'confirmed': self.confirmed,
+                'nacked': self.nacked,
+                'retried': self.retried,
+                'republished_after_reconnect': self.republished_after_reconnect,
+                'failed': self.failed,
+                'dropped_queue_full': self.dropped_queue_full,
+                'confirm_latency_avg_ms': round(1000 * self.confirm_seconds_total / self.confirmed, 2) if self.confirmed else 0.0,
+                'confirm_latency_max_ms': round(1000 * self.confirm_seconds_max, 2),
+                'peak_in_flight': self.peak_in_flight,
+            }
+
 
 class ProducerManager:
     """
     Manages RabbitMQ connection for all producers.
-    Maintains a persistent connection and processes publish requests from a queue.
+    Maintains a persistent connection and processes publish requests from a queue
+    (pipelined or one confirm at a time, see Config.Producer.MODE).
     """
     
     def __init__(self, service_name: str = "patient-service", testing: bool = False):
         self.client = RabbitMQClient(service_name)
-        self.publish_queue = queue.Queue(maxsize=1000)
+        self.mode = Config.Producer.MODE
+        self.publish_queue = queue.Queue(maxsize=Config.Producer.QUEUE_SIZE)
         self.is_running = False
         self.producer_thread = None
         self.exchanges = set()  # Track declared exchanges
         self.testing = testing                  # When pytesting, threads will be daemon to prevent pytest hanging
+        self.metrics = ProducerMetrics()
+        
+        # Pipelined mode state, owned by the producer thread's I/O loop
+        self.max_in_flight = max(1, Config.Producer.MAX_IN_FLIGHT)
+        self.nack_max_retries = Config.Producer.NACK_MAX_RETRIES
+        self._connection = None
+        self._channel = None
+        self._channel_exchanges: Set[str] = set()  # Exchanges declared on the current channel
+        self._window = ConfirmWindow()
+        self._backlog: Deque[PendingPublish] = deque()  # Taken from the queue, not yet published
+        self._was_open = False
+        self._stopped = threading.Event()
         
     def declare_exchange(self, exchange: str, exchange_type: str = 'topic'):
         """Declare an exchange (idempotent)"""
+        if self.mode == "pipelined":
+            # Declared on the producer's own channel ahead of its first publish there
+            self.exchanges.add(exchange)
+            return
         try:
             self.client.ensure_connection()
             self.client.channel.exchange_declare(
@@ -54,9 +271,11 @@ class ProducerManager:
             return
         
         self.is_running = True
-        self.producer_thread = threading.Thread(target=self._producer_loop, daemon=self.testing)
+        self._stopped.clear()
+        target = self._pipelined_loop if self.mode == "pipelined" else self._producer_loop
+        self.producer_thread = threading.Thread(target=target, daemon=self.testing)
         self.producer_thread.start()
-        logger.info("Producer manager started")
+        logger.info(f"Producer manager started ({self.mode} mode)")
     
     def _producer_loop(self):
         """Main loop that maintains connection and processes publish requests"""
@@ -76,7 +295,10 @@ class ProducerManager:
                 # Process publish requests with timeout to allow heartbeats
                 try:
                     request = self.publish_queue.get(timeout=1.0)
-                    self._process_publish_request(request)
+                    if isinstance(request, BatchPublishRequest):
+                        self._process_batch_request(request)
+                    else:
+                        self._process_publish_request(request)
                 except queue.Empty:
                     pass
                 
@@ -103,22 +325,58 @@ class ProducerManager:
             if request.exchange not in self.exchanges:
                 self.declare_exchange(request.exchange)
             
-            # Publish the message
-            success = self.client.publish(
-                exchange=request.exchange,
-                routing_key=request.routing_key,
-                message=request.message
-            )
+            # Publish the message (returns once the broker has confirmed it)
+            success = self._publish_confirmed(request.exchange, request.routing_key, request.message)
             
             if success:
                 logger.info(f"Published to {request.exchange}/{request.routing_key} - correlation: {request.message.get('correlation_id', 'unknown')}")
-                time.sleep(0.2)
             else:
                 logger.error(f"Failed to publish to {request.exchange}/{request.routing_key} - correlation: {request.message.get('correlation_id', 'unknown')}")
         except Exception as e:
             logger.error(f"Error processing publish request: {str(e)}")
             raise
     
+    def _process_batch_request(self, request: BatchPublishRequest):
+        """Publish a batch, stopping an ordering key at its first failure"""
+        try:
+            self.client.ensure_connection()
+
+            if request.exchange not in self.exchanges:
+                self.declare_exchange(request.exchange)
+
+            failed_keys = set()
+            for i, (routing_key, message) in enumerate(request.messages):
+                key = request.ordering_keys[i] if request.ordering_keys else None
+                if key is not None and key in failed_keys:
+                    continue  # Leave for a later batch so this key stays in order
+                if not request.start_send(i):
+                    logger.warning(f"Batch to {request.exchange} abandoned by its caller - rest of the batch not published")
+                    break
+
+                success = self._publish_confirmed(request.exchange, routing_key, message)
+                request.results[i] = success
+                if not success and key is not None:
+                    failed_keys.add(key)
+
+            confirmed = sum(1 for result in request.results if result)
+            logger.info(f"Published batch to {request.exchange}: {confirmed}/{len(request.messages)} confirmed")
+        except Exception as e:
+            logger.error(f"Error processing batch publish request: {str(e)}")
+            raise
+        finally:
+            request.done.set()
+
+    def _publish_confirmed(self, exchange: str, routing_key: str, message: Dict[str, Any]) -> bool:
+        """Blocking publish, timed until the broker's confirm"""
+        started = time.monotonic()
+        self.metrics.record_publish(1)
+        success = self.client.publish(exchange=exchange, routing_key=routing_key, message=message)
+        if success:
+            self.metrics.record_confirm(time.monotonic() - started)
+        else:
+            self.metrics.record_failure()
+        return success
+
     def _send_heartbeat(self):
         """Send heartbeat to keep connection alive"""
         try:
@@ -166,6 +424,237 @@ class ProducerManager:
         logger.error("Failed to reconnect after all attempts")
         self.is_running = False
     
+    # ========================
+    # PIPELINED MODE
+    # Everything below runs on the producer thread's I/O loop, except _wake
+    # ========================
+
+    def _pipelined_loop(self):
+        """Run an asynchronous connection until stopped, reconnecting with backoff when it drops"""
+        logger.info("Starting pipelined producer loop...")
+        retry_delay = 1
+        
+        while self.is_running:
+            self._was_open = False
+            try:
+                self._connection = pika.SelectConnection(
+                    self.client.connection_parameters(),
+                    on_open_callback=self._on_connection_open,
+                    on_open_error_callback=self._on_connection_open_error,
+                    on_close_callback=self._on_connection_closed
+                )
+                self._connection.ioloop.start()  # Returns once the connection is closed
+            except Exception as e:
+                logger.error(f"Error in pipelined producer loop: {str(e)}")
+            
+            self._channel = None
+            self._requeue_in_flight()
+            if not self.is_running:
+                break
+            
+            retry_delay = 1 if self._was_open else min(retry_delay * 2, 30)
+            logger.warning(f"Producer connection lost - reconnecting in {retry_delay}s")
+            self._stopped.wait(retry_delay)
+        
+        self._abandon_pending()
+        self._connection = None
+        logger.info("Producer loop ended")
+    
+    def _on_connection_open(self, connection):
+        connection.channel(on_open_callback=self._on_channel_open)
+    
+    def _on_connection_open_error(self, connection, error):
+        logger.error(f"{self.client.service_name} producer failed to connect: {error}")
+        connection.ioloop.stop()
+    
+    def _on_connection_closed(self, connection, reason):
+        logger.warning(f"{self.client.service_name} producer connection closed: {reason}")
+        self._channel = None
+        connection.ioloop.stop()
+    
+    def _on_channel_open(self, channel):
+        channel.add_on_close_callback(self._on_channel_closed)
+        channel.confirm_delivery(
+            self._on_delivery_confirmation,
+            callback=lambda _frame: self._on_confirm_mode(channel)
+        )
+    
+    def _on_channel_closed(self, channel, reason):
+        logger.warning(f"{self.client.service_name} producer channel closed: {reason}")
+        self._channel = None
+        self._close_connection()
+    
+    def _on_confirm_mode(self, channel):
+        """The channel is in confirm mode: start publishing"""
+        self._channel = channel
+        self._channel_exchanges.clear()
+        self._was_open = True
+        logger.info(f"{self.client.service_name} producer connected (pipelined, up to {self.max_in_flight} in flight)")
+        self._tick()
+    
+    def _tick(self):
+        """Periodic pass, so requests queued while the I/O loop could not be woken are picked up"""
+        if self._connection is None or self._connection.is_closed:
+            return
+        self._drain()
+        if self.is_running:
+            self._connection.ioloop.call_later(1.0, self._tick)
+    
+    def _wake(self):
+        """Ask the I/O loop to publish what was just queued (safe from any thread)"""
+        connection = self._connection
+        if connection is None:
+            return
+        try:
+            connection.ioloop.add_callback_threadsafe(self._drain)
+        except Exception:
+            pass  # The I/O loop is not running (reconnecting); the next connection drains the queue
+    
+    def _close_connection(self):
+        connection = self._connection
+        if connection is None or connection.is_closing or connection.is_closed:
+            return
+        try:
+            connection.close()
+        except Exception as e:
+            logger.warning(f"Error closing producer connection: {str(e)}")
+            connection.ioloop.stop()
+    
+    def _pending_publishes(self, request) -> List[PendingPublish]:
+        if isinstance(request, BatchPublishRequest):
+            return [
+                PendingPublish(
+                    request.exchange, routing_key, message, request, i,
+                    request.ordering_keys[i] if request.ordering_keys else None
+                )
+                for i, (routing_key, message) in enumerate(request.messages)
+            ]
+        return [PendingPublish(request.exchange, request.routing_key, request.message,
+                               ordering_key=self._single_ordering_key(request))]
+    
+    @staticmethod
+    def _single_ordering_key(request: PublishRequest) -> str:
+        """Messages of one patient (else of one routing key) keep their order, as they did in blocking mode"""
+        patient_id = request.message.get('patient_id')
+        return f"patient:{patient_id}" if patient_id is not None else f"routing_key:{request.routing_key}"
+    
+    def _drain(self):
+        """Publish from the backlog (then the queue) until the confirm window is full"""
+        if not self.is_running:
+            self._close_connection()
+            return
+        channel = self._channel
+        if channel is None or not channel.is_open:
+            return
+        
+        # Take requests off the queue while there is room to publish them
+        while len(self._backlog) < self.max_in_flight:
+            try:
+                request = self.publish_queue.get_nowait()
+            except queue.Empty:
+                break
+            self._backlog.extend(self._pending_publishes(request))
+        
+        blocked = self._window.busy_keys()
+        waiting: Deque[PendingPublish] = deque()
+        while self._backlog and len(self._window) < self.max_in_flight:
+            entry = self._backlog.popleft()
+            key = entry.ordering_key
+            if key is not None and entry.request is not None and key in entry.request.failed_keys:
+                self._finish(entry, None)  # Leave for a later batch so this key stays in order
+                continue
+            if key is not None and key in blocked:
+                waiting.append(entry)  # Goes out once the key's message in flight is confirmed
+                continue
+            if entry.request is not None and not entry.request.start_send(entry.index):
+                self._finish(entry, None)  # The caller stopped waiting for this batch
+                continue
+            self._basic_publish(channel, entry)
+            if key is not None:
+                blocked.add(key)
+        waiting.extend(self._backlog)
+        self._backlog = waiting
+    
+    def _basic_publish(self, channel, entry: PendingPublish):
+        if entry.exchange not in self._channel_exchanges:
+            # The broker handles a channel's frames in order, so the publish can follow without waiting
+            channel.exchange_declare(exchange=entry.exchange, exchange_type='topic', durable=True)
+            self._channel_exchanges.add(entry.exchange)
+            self.exchanges.add(entry.exchange)
+        
+        # Tracked before sending, so a publish that fails with the channel is republished after reconnecting
+        self._window.add(entry)
+        self.metrics.record_publish(len(self._window))
+        channel.basic_publish(
+            exchange=entry.exchange,
+            routing_key=entry.routing_key,
+            body=self.client.message_body(entry.message),
+            properties=self.client.message_properties(entry.message.get('correlation_id', 'unknown'))
+        )
+    
+    def _on_delivery_confirmation(self, method_frame):
+        """Broker ack / nack of one publish, or of every publish up to a delivery tag (multiple)"""
+        method = method_frame.method
+        acked = isinstance(method, spec.Basic.Ack)
+        now = time.monotonic()
+        retries = []
+        
+        for entry in self._window.resolve(method.delivery_tag, method.multiple):
+            if acked:
+                self.metrics.record_confirm(now - entry.published_at)
+                self._finish(entry, True)
+            elif entry.attempts < self.nack_max_retries and not (entry.request and entry.request.abandoned):
+                entry.attempts += 1
+                self.metrics.record_nack(retried=True)
+                retries.append(entry)
+            else:
+                self.metrics.record_nack(retried=False)
+                self._finish(entry, False)
+        
+        if retries:
+            logger.warning(f"Broker nacked {len(retries)} messages - republishing")
+            # Ahead of everything not yet published, in their original order
+            self._backlog.extendleft(reversed(retries))
+        self._drain()
+    
+    def _finish(self, entry: PendingPublish, result: Optional[bool]):
+        """Record the outcome of a message: True (confirmed), False (failed) or None (skipped)"""
+        if result is False:
+            self.metrics.record_failure()
+            logger.error(f"Failed to publish to {entry.exchange}/{entry.routing_key} - correlation: {entry.message.get('correlation_id', 'unknown')}")
+        
+        request = entry.request
+        if request is None:
+            return
+        request.results[entry.index] = result
+        if result is False and entry.ordering_key is not None:
+            request.failed_keys.add(entry.ordering_key)
+        request.pending -= 1
+        if request.pending <= 0:
+            confirmed = sum(1 for r in request.results if r)
+            logger.info(f"Published batch to {request.exchange}: {confirmed}/{len(request.messages)} confirmed")
+            request.done.set()
+    
+    def _requeue_in_flight(self):
+        """The channel is gone: its unconfirmed publishes go out again, first, on the next one"""
+        entries = self._window.reset()
+        if entries:
+            logger.warning(f"Republishing {len(entries)} unconfirmed messages after reconnecting")
+            self.metrics.record_reconnect_republish(len(entries))
+            self._backlog.extendleft(reversed(entries))
+    
+    def _abandon_pending(self):
+        """The producer stopped: fail whatever was not confirmed so no caller waits on it"""
+        entries = self._window.reset() + list(self._backlog)
+        self._backlog.clear()
+        while True:
+            try:
+                entries.extend(self._pending_publishes(self.publish_queue.get_nowait()))
+            except queue.Empty:
+                break
+        for entry in entries:
+            self._finish(entry, False)
+    
     def _cleanup(self):
         """Clean up resources"""
         try:
@@ -193,15 +682,86 @@ class ProducerManager:
         
         try:
             request = PublishRequest(exchange, routing_key, message)
-            self.publish_queue.put_nowait(request)
+            timeout = Config.Producer.ENQUEUE_TIMEOUT_SECONDS
+            if timeout > 0:
+                self.publish_queue.put(request, timeout=timeout)
+            else:
+                self.publish_queue.put_nowait(request)
+            if self.mode == "pipelined":
+                self._wake()
             return True
         except queue.Full:
-            logger.error("Publish queue is full")
+            self.metrics.record_queue_full()
+            logger.error(f"Publish queue is full ({self.publish_queue.maxsize}) - dropped {exchange}/{routing_key}")
             return False
         except Exception as e:
             logger.error(f"Error queuing message: {str(e)}")
             return False
     
+    def publish_batch(
+        self,
+        exchange: str,
+        messages: List[Tuple[str, Dict[str, Any]]],
+        ordering_keys: Optional[List[str]] = None,
+        timeout: float = 30.0
+    ) -> List[Optional[bool]]:
+        """
+        Publish a batch of messages and wait for the broker to confirm them.
+        
+        Args:
+            exchange: The exchange to publish to
+            messages: List of (routing_key, message)
+            ordering_keys: Optional key per message (e.g. aggregate id). Once a message fails, later
+                messages with the same key are skipped so they are not delivered out of order
+            timeout: Seconds to wait for the producer thread to finish the batch
+            
+        Returns:
+            List[Optional[bool]]: Per message True (confirmed), False (failed) or None (not attempted).
+            After a timeout the batch is abandoned: messages not sent by then are never sent (None)
+            and sent but unconfirmed ones are reported as failed.
+        """
+        if not messages:
+            return []
+        if not self.is_running:
+            logger.error("Producer manager is not running")
+            return [False] * len(messages)
+        
+        request = BatchPublishRequest(exchange, messages, ordering_keys)
+        try:
+            self.publish_queue.put(request, timeout=timeout)
+        except queue.Full:
+            self.metrics.record_queue_full(len(messages))
+            logger.error(f"Publish queue is full ({self.publish_queue.maxsize}) - dropped a batch of {len(messages)}")
+            return [False] * len(messages)
+        if self.mode == "pipelined":
+            self._wake()
+        
+        if not request.done.wait(timeout):
+            logger.warning(f"Batch of {len(messages)} messages not confirmed within {timeout}s - abandoning the rest")
+            return request.abandon()
+        return list(request.results)
+    
+    def pending_count(self) -> int:
+        """Messages queued or published but not yet confirmed"""
+        return self.publish_queue.qsize() + len(self._backlog) + len(self._window)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Live queue / window state plus the publish counters since start"""
+        pipelined = self.mode == "pipelined"
+        channel = self._channel
+        stats = {
+            'mode': self.mode,
+            'running': self.is_running,
+            'connected': bool(channel is not None and channel.is_open) if pipelined else self.client.is_connected,
+            'queue_depth': self.publish_queue.qsize(),
+            'queue_size': self.publish_queue.maxsize,
+            'backlog': len(self._backlog),
+            'in_flight': len(self._window),
+            'max_in_flight': self.max_in_flight if pipelined else 1,
+        }
+        stats.update(self.metrics.snapshot())
+        return stats
+    
     def stop_producer(self, timeout: int = 10):
         """Stop the producer manager gracefully"""
         if not self.is_running:
@@ -210,12 +770,16 @@ class ProducerManager:
         
         logger.info("Stopping producer manager...")
 
-        # Wait until the queue is empty before stopping
-        while not self.publish_queue.empty():
-            logger.info(f"Waiting for {self.publish_queue.qsize()} messages to flush...")
+        # Wait until the queue is empty (and, pipelined, every publish confirmed) before stopping
+        deadline = time.monotonic() + timeout
+        while self.pending_count() > 0 and time.monotonic() < deadline:
+            logger.info(f"Waiting for {self.pending_count()} messages to flush...")
             time.sleep(0.2)
 
         self.is_running = False
+        self._stopped.set()
+        if self.mode == "pipelined":
+            self._wake()
         
         if self.producer_thread and self.producer_thread.is_alive():
             self.producer_thread.join(timeout=timeout)
@@ -242,6 +806,32 @@ def get_producer_manager(*, testing: bool = False) -> ProducerManager:
         
         return _producer_manager
 
+# Extra producers for the outbox dispatch lanes (lane 0 shares the singleton above).
+# Each lane has its own connection/channel, so lanes publish and wait for confirms in parallel.
+_lane_producers: Dict[int, ProducerManager] = {}
+
+def get_lane_producer_manager(lane: int) -> ProducerManager:
+    """Get or create the producer manager for an outbox dispatch lane"""
+    if lane == 0:
+        return get_producer_manager()
+    
+    with _lock:
+        if lane not in _lane_producers:
+            manager = ProducerManager(service_name=f"patient-service-lane-{lane}")
+            manager.start_producer()
+            _lane_producers[lane] = manager
+            logger.info(f"Created and started producer manager for outbox lane {lane}")
+        
+        return _lane_producers[lane]
+
+def get_producer_stats() -> Dict[str, Any]:
+    """Stats of the producer managers started so far (the singleton and the outbox lanes)"""
+    with _lock:
+        managers = {f"lane_{lane}": manager for lane, manager in _lane_producers.items()}
+        if _producer_manager is not None:
+            managers = {"default": _producer_manager, **managers}
+    return {name: manager.get_stats() for name, manager in managers.items()}
+
 def stop_producer_manager():
     """Stop the singleton producer manager"""
     global _producer_manager
@@ -250,4 +840,9 @@ def stop_producer_manager():
         if _producer_manager:
             _producer_manager.stop_producer()
             _producer_manager = None
-            logger.info("Stopped producer manager")
\ No newline at end of file
+            logger.info("Stopped producer manager")
+        
+        for lane, manager in list(_lane_producers.items()):
+            manager.stop_producer()
+            del _lane_producers[lane]
+            logger.info(f"Stopped producer manager for outbox lane {lane}")
\ No newline at end of file
@@ -4,7 +4,7 @@ import logging
 import os
 import time
 import threading
-from typing import Dict, Any, Callable
+from typing import Dict, Any, Callable, List
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -34,21 +34,41 @@ class RabbitMQClient:
         """Set the shutdown event for graceful shutdown"""
         self.shutdown_event = shutdown_event
     
+    def connection_parameters(self) -> pika.ConnectionParameters:
+        """Connection parameters of this service (shared by blocking and asynchronous connections)"""
+        credentials = pika.PlainCredentials(self.username, self.password)
+        return pika.ConnectionParameters(
+            host=self.host,
+            port=self.port,
+            virtual_host=self.virtual_host,
+            credentials=credentials,
+            heartbeat=30,
+            blocked_connection_timeout=300
+        )
+    
+    def message_body(self, message: Dict[str, Any]) -> str:
+        """JSON body of a published message: the message wrapped with timestamp and source service"""
+        return json.dumps({
+            'timestamp': datetime.now().isoformat(),
+            'source_service': self.service_name,
+            'data': message
+        }, default=str)
+    
+    def message_properties(self, correlation_id: str) -> pika.BasicProperties:
+        """Properties of a published message (persistent JSON)"""
+        return pika.BasicProperties(
+            delivery_mode=2,  # Persistent message
+            timestamp=int(time.time()),
+            content_type='application/json',
+            correlation_id=correlation_id,
+            message_id=f"{self.service_name}_{int(time.time() * 1000)}"
+        )
+    
     def connect(self, max_retries: int = 5) -> bool:
         """Connect to RabbitMQ with retry logic"""
         for attempt in range(max_retries):
             try:
-                credentials = pika.PlainCredentials(self.username, self.password)
-                parameters = pika.ConnectionParameters(
-                    host=self.host,
-                    port=self.port,
-                    virtual_host=self.virtual_host,
-                    credentials=credentials,
-                    heartbeat=30,
-                    blocked_connection_timeout=300
-                )
-                
-                self.connection = pika.BlockingConnection(parameters)
+                self.connection = pika.BlockingConnection(self.connection_parameters())
                 self.channel = self.connection.channel()
                 
                 # Enable publisher confirms for reliability
@@ -78,12 +98,6 @@ class RabbitMQClient:
         """
         Publish message with fault tolerance
         """
-        message_body = {
-            'timestamp': datetime.now().isoformat(),
-            'source_service': self.service_name,
-            'data': message
-        }
-        
         for attempt in range(max_retries):
             try:
                 self.ensure_connection()
@@ -97,14 +111,8 @@ class RabbitMQClient:
                 self.channel.basic_publish(
                     exchange=exchange,
                     routing_key=routing_key,
-                    body=json.dumps(message_body, default=str),
-                    properties=pika.BasicProperties(
-                        delivery_mode=2,  # Persistent message
-                        timestamp=int(time.time()),
-                        content_type='application/json',
-                        correlation_id=correlation_id,
-                        message_id=f"{self.service_name}_{int(time.time() * 1000)}"
-                    )
+                    body=self.message_body(message),
+                    properties=self.message_properties(correlation_id)
                     # Temporarily disabled mandatory=True to fix publish errors
                     # mandatory=True  # Ensure message is routed to a queue
                 )
@@ -165,6 +173,69 @@ class RabbitMQClient:
             logger.error(f"Failed to set up consumer: {str(e)}")
             raise
     
+    def consume_batch(self, queue_name: str, callback: Callable[[List[Dict[str, Any]]], List[bool]],
+                      prefetch_count: int, max_wait_ms: int):
+        """
+        Set up a consumer that hands messages to callback in batches: prefetch_count messages, or
+        whatever has arrived max_wait_ms after the first message of the batch.
+
+        callback(messages) returns one bool per message. A fully successful batch is acknowledged with
+        a single basic_ack(multiple=True); otherwise successes are acked and failures requeued one by one.
+        """
+        pending = []  # (delivery_tag, message) in delivery order
+        flush_timer = {'id': None}
+
+        def flush():
+            flush_timer['id'] = None
+            if not pending:
+                return
+            batch = list(pending)
+            pending.clear()
+            delivery_tags = [delivery_tag for delivery_tag, _ in batch]
+
+            try:
+                results = callback([message for _, message in batch])
+            except Exception as e:
+                logger.error(f"Error processing batch of {len(batch)} messages: {str(e)}")
+                results = [False] * len(batch)
+
+            if all(results):
+                self.channel.basic_ack(delivery_tag=delivery_tags[-1], multiple=True)
+                logger.info(f"{self.service_name} acknowledged batch of {len(batch)} messages")
+                return
+            for delivery_tag, success in zip(delivery_tags, results):
+                if success:
+                    self.channel.basic_ack(delivery_tag=delivery_tag)
+                else:
+                    self.channel.basic_nack(delivery_tag=delivery_tag, requeue=True)
+            logger.warning(f"{self.service_name} requeued {results.count(False)} of {len(batch)} messages")
+
+        def on_message(channel, method, properties, body):
+            try:
+                message = json.loads(body.decode('utf-8'))
+            except json.JSONDecodeError as e:
+                logger.error(f"Invalid JSON: {str(e)}")
+                channel.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+                return
+
+            pending.append((method.delivery_tag, message))
+            if len(pending) >= prefetch_count:
+                if flush_timer['id'] is not None:
+                    self.connection.remove_timeout(flush_timer['id'])
+                flush()
+            elif flush_timer['id'] is None:
+                flush_timer['id'] = self.connection.call_later(max_wait_ms / 1000, flush)
+
+        try:
+            self.ensure_connection()
+            self.channel.basic_qos(prefetch_count=prefetch_count)
+            self.channel.basic_consume(queue=queue_name, on_message_callback=on_message, auto_ack=False)
+            logger.info(f"{self.service_name} set up batch consumer for {queue_name} (prefetch={prefetch_count}, max_wait={max_wait_ms}ms)")
+
+        except Exception as e:
+            logger.error(f"Failed to set up batch consumer: {str(e)}")
+            raise
+
     def start_consuming(self):
         """Start consuming messages (blocking)"""
         try:
@@ -0,0 +1,101 @@
+import logging
+import threading
+from typing import Any, Dict
+
+from .rabbitmq_client import RabbitMQClient
+
+logger = logging.getLogger(__name__)
+
+
+class ReferenceCacheConsumer:
+    """
+    Consumer for reference list invalidations broadcast by the other replicas of this service.
+
+    Every replica binds its own exclusive, auto-deleted queue to patient.updates
+    (reference.invalidated.#), so each invalidation reaches all running replicas exactly once
+    and nothing piles up for replicas that are gone.
+    """
+
+    def __init__(self):
+        from app.services.reference_list_cache import (
+            INSTANCE_ID,
+            INVALIDATION_EXCHANGE,
+            INVALIDATION_ROUTING_PREFIX,
+            get_reference_list_cache,
+        )
+
+        self.client = RabbitMQClient("patient-reference-cache-consumer")
+        self.exchange = INVALIDATION_EXCHANGE
+        self.routing_key = f"{INVALIDATION_ROUTING_PREFIX}.#"
+        self.instance_id = INSTANCE_ID
+        self.cache = get_reference_list_cache()
+        self.shutdown_event = None
+        self.is_consuming = False
+
+    def set_shutdown_event(self, shutdown_event: threading.Event):
+        """Set the shutdown event for graceful shutdown"""
+        self.shutdown_event = shutdown_event
+        if self.client:
+            self.client.set_shutdown_event(shutdown_event)
+
+    def setup_consumer(self):
+        """Declare this replica's queue, bind it to the invalidation routing key and consume it"""
+        try:
+            self.client.connect()
+
+            self.client.channel.exchange_declare(
+                exchange=self.exchange,
+                exchange_type='topic',
+                durable=True
+            )
+            result = self.client.channel.queue_declare(queue='', exclusive=True, auto_delete=True)
+            queue_name = result.method.queue
+            self.client.channel.queue_bind(exchange=self.exchange, queue=queue_name, routing_key=self.routing_key)
+
+            self.client.consume(queue_name, self._handle_message)
+            logger.info(f"Reference cache consumer set up for {self.exchange}/{self.routing_key}")
+
+        except Exception as e:
+            logger.error(f"Failed to setup reference cache consumer: {str(e)}")
+            raise
+
+    def start_consuming(self):
+        """Start consuming messages"""
+        try:
+            self.setup_consumer()
+            logger.info("Starting reference cache consumer...")
+            self.is_consuming = True
+            self.client.start_consuming()
+        except Exception as e:
+            logger.error(f"Error starting reference cache consumer: {str(e)}")
+            raise
+        finally:
+            self.is_consuming = False
+
+    def stop(self):
+        """Stop the consumer gracefully"""
+        logger.info("Stopping reference cache consumer...")
+        self.is_consuming = False
+        if self.client:
+            self.client.stop_consuming()
+
+    def _handle_message(self, message: Dict[str, Any]) -> bool:
+        """Drop the named list from this replica's cache; always acknowledged (the TTL covers any miss)"""
+        data = message.get('data', {})
+        list_name = data.get('list_name')
+        if not list_name:
+            logger.warning("Reference list invalidation without list_name - ignoring")
+            return True
+
+        if data.get('origin') == self.instance_id:
+            return True  # Already invalidated locally by the write
+
+        self.cache.invalidate(list_name)
+        logger.info(f"Reference list {list_name} invalidated by {data.get('origin', 'unknown')}")
+        return True
+
+    def close(self):
+        """Close connections"""
+        if self.client:
+            self.client.close()
+            logger.info("Reference cache consumer connections closed")
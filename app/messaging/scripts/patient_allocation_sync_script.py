@@ -58,20 +58,21 @@ class PatientAllocationSyncScript(BaseScript):
             self.logger.info(f"App directory: {app_dir}")
             
             # Import database dependencies
-            from sqlalchemy.orm import sessionmaker, joinedload
-            from sqlalchemy import create_engine, func
-            from database import get_database_url
+            from sqlalchemy.orm import joinedload
+            from sqlalchemy import func
+            from app.database import SessionLocal
             from app.models.patient_allocation_model import PatientAllocation
             from app.models.patient_guardian_model import PatientGuardian
+            from app.messaging.sync_registry import SYNC_ENTITIES
             
             # Import messaging dependencies  
             from messaging.patient_allocation_publisher import get_patient_allocation_publisher
             
-            # Set up database
-            engine = create_engine(get_database_url())
-            self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+            # Set up database (shared engine and pool settings, see app/database.py)
+            self.SessionLocal = SessionLocal
             self.PatientAllocation = PatientAllocation
             self.PatientGuardian = PatientGuardian
+            self.sync_entity = SYNC_ENTITIES["patient_allocation"]
             self.func = func
             self.joinedload = joinedload
             
@@ -170,17 +171,8 @@ class PatientAllocationSyncScript(BaseScript):
     def _allocation_to_dict_with_guardian_info(self, allocation) -> Dict[str, Any]:
         """Convert patient allocation model to dictionary for messaging, including guardian information"""
         try:
-            allocation_dict = {}
-            
-            # Get all allocation table attributes
-            for column in allocation.__table__.columns:
-                value = getattr(allocation, column.name)
-                
-                # Convert datetime objects to ISO format strings
-                if hasattr(value, 'isoformat'):
-                    allocation_dict[column.name] = value.isoformat()
-                else:
-                    allocation_dict[column.name] = value
+            # All columns, dates as ISO format strings (serializer from the sync registry)
+            allocation_dict = self.sync_entity.serialize(allocation)
             
             # IMPORTANT: Extract guardian application user ID from the relationship
             guardian_user_id = None
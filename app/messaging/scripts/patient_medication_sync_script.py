@@ -58,20 +58,21 @@ class PatientMedicationSyncScript(BaseScript):
             self.logger.info(f"App directory: {app_dir}")
             
             # Import database dependencies
-            from sqlalchemy.orm import sessionmaker, joinedload
-            from sqlalchemy import create_engine, func
-            from database import get_database_url
+            from sqlalchemy.orm import joinedload
+            from sqlalchemy import func
+            from app.database import SessionLocal
             from app.models.patient_medication_model import PatientMedication
             from app.models.patient_prescription_list_model import PatientPrescriptionList
+            from app.messaging.sync_registry import SYNC_ENTITIES
             
             # Import messaging dependencies  
             from messaging.patient_medication_publisher import get_patient_medication_publisher
             
-            # Set up database
-            engine = create_engine(get_database_url())
-            self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+            # Set up database (shared engine and pool settings, see app/database.py)
+            self.SessionLocal = SessionLocal
             self.PatientMedication = PatientMedication
             self.PatientPrescriptionList = PatientPrescriptionList
+            self.sync_entity = SYNC_ENTITIES["patient_medication"]
             self.func = func
             self.joinedload = joinedload
             
@@ -170,17 +171,8 @@ class PatientMedicationSyncScript(BaseScript):
     def _medication_to_dict_with_prescription_name(self, medication) -> Dict[str, Any]:
         """Convert patient medication model to dictionary for messaging, including prescription name"""
         try:
-            medication_dict = {}
-            
-            # Get all medication table attributes
-            for column in medication.__table__.columns:
-                value = getattr(medication, column.name)
-                
-                # Convert datetime objects to ISO format strings
-                if hasattr(value, 'isoformat'):
-                    medication_dict[column.name] = value.isoformat()
-                else:
-                    medication_dict[column.name] = value
+            # All columns, dates as ISO format strings (serializer from the sync registry)
+            medication_dict = self.sync_entity.serialize(medication)
             
             # IMPORTANT: Extract prescription name from the relationship
             prescription_name = None
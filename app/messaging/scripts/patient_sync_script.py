@@ -56,18 +56,18 @@ class PatientSyncScript(BaseScript):
             self.logger.info(f"App directory: {app_dir}")
             
             # Import database dependencies
-            from sqlalchemy.orm import sessionmaker
-            from sqlalchemy import create_engine, func
-            from database import get_database_url
+            from sqlalchemy import func
+            from app.database import SessionLocal
             from app.models.patient_model import Patient
+            from app.messaging.sync_registry import SYNC_ENTITIES
             
             # Import messaging dependencies  
             from messaging.patient_publisher import get_patient_publisher
             
-            # Set up database
-            engine = create_engine(get_database_url())
-            self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+            # Set up database (shared engine and pool settings, see app/database.py)
+            self.SessionLocal = SessionLocal
             self.Patient = Patient
+            self.sync_entity = SYNC_ENTITIES["patient"]
             self.func = func
             
             # Set up messaging
@@ -145,17 +145,8 @@ class PatientSyncScript(BaseScript):
     def _patient_to_dict(self, patient) -> Dict[str, Any]:
         """Convert patient model to dictionary for messaging"""
         try:
-            patient_dict = {}
-            
-            # Get all patient attributes
-            for column in patient.__table__.columns:
-                value = getattr(patient, column.name)
-                
-                # Convert datetime objects to ISO format strings
-                if hasattr(value, 'isoformat'):
-                    patient_dict[column.name] = value.isoformat()
-                else:
-                    patient_dict[column.name] = value
+            # All columns, dates as ISO format strings (serializer from the sync registry)
+            patient_dict = self.sync_entity.serialize(patient)
             
             return patient_dict
             
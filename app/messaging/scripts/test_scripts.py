@@ -42,13 +42,10 @@ def test_database_connection():
     try:
         print("\\nTesting database connection...")
         
-        from sqlalchemy.orm import sessionmaker
-        from sqlalchemy import create_engine, func
-        from database import get_database_url
+        from sqlalchemy import func
+        from app.database import SessionLocal
         from app.models.patient import Patient
         
-        engine = create_engine(get_database_url())
-        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
         
         with SessionLocal() as db:
             count = db.query(func.count(Patient.id)).scalar()
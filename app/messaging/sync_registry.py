@@ -0,0 +1,161 @@
+"""
+Registry of the record types this service keeps in sync with other services.
+
+Each entry describes how to find a record (model, id column, last modified and isDeleted columns), how
+to turn it into event data and where its sync events go. The drift consumer, the /integrity endpoints and
+the sync scripts all read it, so a new record type gets drift repair, integrity reads and digests by adding
+one entry here.
+
+Event data holds every mapped column of the model, keyed by attribute name, with dates in ISO 8601. The
+serializer is compiled once per model from the mapper: one attrgetter fetches all the values of a record
+and only the date/time columns are converted.
+"""
+
+import uuid
+from operator import attrgetter
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import Date, DateTime, Time, inspect
+from sqlalchemy.orm import joinedload
+
+from app.models.patient_allocation_model import PatientAllocation
+from app.models.patient_medication_model import PatientMedication
+from app.models.patient_model import Patient
+
+
+def compile_serializer(model) -> Callable[[Any], Dict[str, Any]]:
+    """Dict of every mapped column of a model instance, with date/time values as ISO 8601 strings"""
+    column_attrs = inspect(model).column_attrs
+    keys = tuple(attr.key for attr in column_attrs)
+    temporal = tuple(
+        i for i, attr in enumerate(column_attrs)
+        if isinstance(attr.columns[0].type, (Date, DateTime, Time))
+    )
+    get_values = attrgetter(*keys)
+
+    def serialize(record) -> Dict[str, Any]:
+        values = get_values(record)
+        if len(keys) == 1:
+            values = (values,)
+        else:
+            values = list(values)
+        for i in temporal:
+            if values[i] is not None:
+                values[i] = values[i].isoformat()
+        return dict(zip(keys, values))
+
+    return serialize
+
+
+class SyncEntity:
+    """
+    One synced record type.
+
+    - id_field: message field that carries the record id ("patient_id" for patients)
+    - patient_id_column: owning patient, for child records
+    - load_options: loader options for the relationships read by extra_fields
+    - extra_fields: values that are not columns of the model (e.g. from relationships)
+    """
+
+    def __init__(
+        self,
+        record_type: str,
+        model,
+        id_column,
+        modified_column,
+        is_deleted_column,
+        routing_key: str,
+        event_type: str,
+        id_field: str,
+        patient_id_column=None,
+        load_options: Sequence[Any] = (),
+        extra_fields: Optional[Callable[[Any], Dict[str, Any]]] = None,
+    ):
+        self.record_type = record_type
+        self.model = model
+        self.id_column = id_column
+        self.modified_column = modified_column
+        self.is_deleted_column = is_deleted_column
+        self.routing_key = routing_key
+        self.event_type = event_type
+        self.id_field = id_field
+        self.patient_id_column = patient_id_column
+        self.load_options = tuple(load_options)
+        self.extra_fields = extra_fields
+        self.serialize = compile_serializer(model)
+
+    def query(self, db):
+        """Query for records of this type, with the relationships read by extra_fields eager-loaded"""
+        query = db.query(self.model)
+        if self.load_options:
+            query = query.options(*self.load_options)
+        return query
+
+    def record_id(self, record) -> Any:
+        return getattr(record, self.id_column.key)
+
+    def entity_data(self, record) -> Dict[str, Any]:
+        """Complete event data of a record: all columns plus extra_fields"""
+        data = self.serialize(record)
+        if self.extra_fields:
+            data.update(self.extra_fields(record))
+        return data
+
+    def build_sync_message(self, record) -> Tuple[str, Dict[str, Any]]:
+        """Routing key and message of a sync event (UPDATE) republishing the record as it is now"""
+        modified = getattr(record, self.modified_column.key)
+        message = {
+            "correlation_id": str(uuid.uuid4()),
+            "event_type": self.event_type,
+            self.id_field: self.record_id(record),
+        }
+        if self.patient_id_column is not None:
+            message["patient_id"] = getattr(record, self.patient_id_column.key)
+        message.update({
+            "old_data": {},
+            "new_data": self.entity_data(record),
+            "changes": {},
+            "modified_by": getattr(record, "ModifiedById", None) or "drift_reconciliation",
+            "modified_by_name": "Drift Reconciliation",
+            "timestamp": modified.isoformat() if modified else None,
+            "is_sync_event": True,
+            "sync_reason": "drift_detected"
+        })
+        return self.routing_key, message
+
+
+def _medication_extra_fields(medication) -> Dict[str, Any]:
+    prescription = medication.prescription_list
+    return {"PrescriptionName": prescription.Value if prescription else None}
+
+
+def _allocation_extra_fields(allocation) -> Dict[str, Any]:
+    guardian = allocation.guardian
+    return {"guardianApplicationUserId": guardian.guardianApplicationUserId if guardian else None}
+
+
+SYNC_ENTITIES: Dict[str, SyncEntity] = {
+    entity.record_type: entity
+    for entity in (
+        SyncEntity(
+            "patient", Patient, Patient.id, Patient.modifiedDate, Patient.isDeleted,
+            routing_key="patient.updated.sync", event_type="PATIENT_UPDATED", id_field="patient_id",
+        ),
+        SyncEntity(
+            "patient_medication", PatientMedication, PatientMedication.Id, PatientMedication.UpdatedDateTime,
+            PatientMedication.IsDeleted,
+            routing_key="patient.medication.updated.sync", event_type="PATIENT_MEDICATION_UPDATED",
+            id_field="medication_id", patient_id_column=PatientMedication.PatientId,
+            load_options=(joinedload(PatientMedication.prescription_list),),
+            extra_fields=_medication_extra_fields,
+        ),
+        SyncEntity(
+            "patient_allocation", PatientAllocation, PatientAllocation.id, PatientAllocation.modifiedDate,
+            PatientAllocation.isDeleted,
+            routing_key="patient.allocation.updated.sync", event_type="PATIENT_ALLOCATION_UPDATED",
+            id_field="allocation_id", patient_id_column=PatientAllocation.patientId,
+            load_options=(joinedload(PatientAllocation.guardian),),
+            extra_fields=_allocation_extra_fields,
+        ),
+    )
+}
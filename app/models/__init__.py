@@ -37,6 +37,8 @@ from .patient_problem_list_model import PatientProblemList
 from .patient_problem_model import PatientProblem
 from .patient_social_history_model import PatientSocialHistory
 from .patient_vital_model import PatientVital
+from .patient_vital_baseline_model import PatientVitalBaseline
+from .highlight_work_item_model import HighlightWorkItem
 from .social_history_sensitive_mapping_model import SocialHistorySensitiveMapping
 from .patient_personal_preference_list_model import PatientPersonalPreferenceList
 from .patient_personal_preference_model import PatientPersonalPreference
@@ -0,0 +1,52 @@
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import Column, DateTime, Index, Integer, String
+
+from app.database import Base
+
+
+class HighlightWorkStatus(str, Enum):
+    """Status enumeration"""
+    PENDING = "PENDING"
+    FAILED = "FAILED"
+
+
+class HighlightWorkItem(Base):
+    """
+    Deferred highlight evaluation of one source record (Config.Highlight.EVALUATION_MODE = "deferred").
+
+    Written in the same transaction as the clinical record, like an outbox event, and drained in batches
+    by HighlightQueueProcessor. Items are deleted once evaluated; FAILED items stay for inspection.
+    """
+    __tablename__ = "HIGHLIGHT_WORK_ITEMS"
+    __table_args__ = (
+        # Serves the worker's PENDING scan
+        Index("ix_HIGHLIGHT_WORK_ITEMS_status_id", "status", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    type_code = Column(String(50), nullable=False)
+    source_table = Column(String(50), nullable=False)
+    source_record_id = Column(Integer, nullable=False)
+    patient_id = Column(Integer, nullable=False)
+    requested_by = Column(String(450), nullable=False)
+    status = Column(String(20), nullable=False, default=HighlightWorkStatus.PENDING)
+    retry_count = Column(Integer, nullable=False, default=0)
+    error_message = Column(String(1000))
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+    # Lease taken by the worker instance evaluating this item (see HighlightQueueService.claim_batch)
+    claimed_by = Column(String(100))
+    lease_until = Column(DateTime)
+
+    def mark_failed(self, error: str, max_retries: int) -> None:
+        """Record a failed attempt; the item is retried until max_retries attempts failed"""
+        self.retry_count += 1
+        self.error_message = error[:1000] if error else None
+        if self.retry_count >= max_retries:
+            self.status = HighlightWorkStatus.FAILED
+        self.claimed_by = None
+        self.lease_until = None
+
+    def __repr__(self):
+        return f"<HighlightWorkItem(id={self.id}, type={self.type_code}, source={self.source_table}:{self.source_record_id})>"
@@ -5,7 +5,12 @@ from enum import Enum
 from app.database import Base
 import uuid
 import json
-from typing import Dict, Any
+import base64
+import zlib
+from typing import Dict, Any, Optional
+
+# Marks a payload stored as base64(zlib(json)); anything else is plain JSON
+COMPRESSED_PAYLOAD_PREFIX = "zlib:"
 
 
 class OutboxStatus(str, Enum):
@@ -21,6 +26,10 @@ class OutboxEvent(Base):
     Uses correlation_id for both traceability and deduplication.
     """
     __tablename__ = "OUTBOX_EVENTS"
+    __table_args__ = (
+        # Serves the relay's PENDING scan and the retention purge's PUBLISHED + age scan
+        Index("ix_OUTBOX_EVENTS_status_created_at", "status", "created_at"),
+    )
 
     id = Column(UNIQUEIDENTIFIER, primary_key=True, default=lambda: str(uuid.uuid4()))
     event_type = Column(String(100), nullable=False, index=True)
@@ -31,19 +40,33 @@ class OutboxEvent(Base):
     retry_count = Column(Integer, nullable=False, default=0)
     error_message = Column(String(1000))
     correlation_id = Column(String(100), nullable=False, unique=True, index=True)
-    created_at = Column(DateTime, nullable=False, default=datetime.now(), index=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.now, index=True)
     processed_at = Column(DateTime)
     created_by = Column(String(255), nullable=False)
+    # Lease taken by the relay instance publishing this event (see OutboxService.claim_batch)
+    claimed_by = Column(String(100))
+    lease_until = Column(DateTime, index=True)
 
-    def set_payload(self, data: Dict[str, Any]) -> None:
-        """Set payload as JSON string"""
-        self.payload = json.dumps(data, default=str, ensure_ascii=False)
+    def set_payload(self, data: Dict[str, Any], compress_min_bytes: Optional[int] = None) -> None:
+        """Set payload as JSON string, zlib-compressed when it is at least compress_min_bytes long"""
+        payload = json.dumps(data, default=str, ensure_ascii=False)
+        encoded = payload.encode("utf-8")
+        if compress_min_bytes and len(encoded) >= compress_min_bytes:
+            compressed = COMPRESSED_PAYLOAD_PREFIX + base64.b64encode(zlib.compress(encoded)).decode("ascii")
+            if len(compressed) < len(encoded):
+                payload = compressed
+        self.payload = payload
 
     def get_payload(self) -> Dict[str, Any]:
-        """Get payload as dictionary"""
+        """Get payload as dictionary (compressed payloads are decoded transparently)"""
+        if not self.payload:
+            return {}
         try:
-            return json.loads(self.payload) if self.payload else {}
-        except json.JSONDecodeError:
+            if self.payload.startswith(COMPRESSED_PAYLOAD_PREFIX):
+                raw = base64.b64decode(self.payload[len(COMPRESSED_PAYLOAD_PREFIX):])
+                return json.loads(zlib.decompress(raw).decode("utf-8"))
+            return json.loads(self.payload)
+        except (json.JSONDecodeError, ValueError, zlib.error):
             return {}
 
     def mark_published(self) -> None:
@@ -58,9 +81,34 @@ class OutboxEvent(Base):
         self.retry_count += 1
         self.error_message = error[:1000] if error else None
 
+    def release_claim(self) -> None:
+        """Give up the relay lease (after publishing, failing, or skipping the event)"""
+        self.claimed_by = None
+        self.lease_until = None
+
     def can_retry(self) -> bool:
         """Check if event can be retried (max 3 attempts)"""
         return self.retry_count < 3
 
     def __repr__(self):
-        return f"<OutboxEvent(id={self.id}, type={self.event_type}, correlation_id={self.correlation_id})>"
\ No newline at end of file
+        return f"<OutboxEvent(id={self.id}, type={self.event_type}, correlation_id={self.correlation_id})>"
+
+
+class OutboxEventArchive(Base):
+    """
+    Published outbox events moved out of OUTBOX_EVENTS by the retention job (when archiving is on),
+    so the live table only holds recent rows.
+    """
+    __tablename__ = "OUTBOX_EVENTS_ARCHIVE"
+
+    id = Column(UNIQUEIDENTIFIER, primary_key=True)
+    event_type = Column(String(100), nullable=False)
+    aggregate_id = Column(String(50), nullable=False, index=True)
+    payload = Column(Text, nullable=False)
+    routing_key = Column(String(200), nullable=False)
+    status = Column(String(20), nullable=False)
+    correlation_id = Column(String(100), nullable=False, index=True)
+    created_at = Column(DateTime, nullable=False, index=True)
+    processed_at = Column(DateTime)
+    created_by = Column(String(255), nullable=False)
+    archived_at = Column(DateTime, nullable=False, default=datetime.now)
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -9,6 +9,12 @@ from app.database import Base
 
 class PatientHighlight(Base):
     __tablename__ = "PATIENT_HIGHLIGHT"
+    __table_args__ = (
+        # Highlight feed: non-deleted highlights of the enabled types, newest first / created since a date
+        Index("IX_PATIENT_HIGHLIGHT_IsDeleted_HighlightTypeId_CreatedDate", "IsDeleted", "HighlightTypeId", "CreatedDate"),
+        # Retention cleanup: highlights of a type created before a cutoff (deleted or not)
+        Index("IX_PATIENT_HIGHLIGHT_HighlightTypeId_CreatedDate", "HighlightTypeId", "CreatedDate"),
+    )
 
     # Primary Key
     Id = Column(Integer, primary_key=True, index=True)
@@ -19,6 +19,7 @@ class PatientHighlightType(Base):
     
     # Configuration
     IsEnabled = Column(String(0), default="1", nullable=False, index=True)  # Admin can enable/disable
+    RetentionDays = Column(Integer, default=3, nullable=False)  # Business days a highlight is kept before cleanup
     
     # Audit Fields
     CreatedDate = Column(DateTime, nullable=False, default=datetime.now)
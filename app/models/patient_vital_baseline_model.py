@@ -0,0 +1,47 @@
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer
+
+from app.database import Base
+
+
+class PatientVitalBaseline(Base):
+    """
+    Running aggregate of a patient's non-deleted vital readings (count and sum per metric).
+
+    Maintained by create_vital / update_vital / delete_vital in the same transaction as the vital itself,
+    so a patient's averages are a single-row lookup instead of a scan of their whole vital history.
+    """
+    __tablename__ = "PATIENT_VITAL_BASELINE"
+
+    # PatientVital attributes tracked by the baseline
+    METRICS = ("Temperature", "SystolicBP", "DiastolicBP", "HeartRate", "SpO2", "BloodSugarLevel")
+
+    PatientId = Column(Integer, ForeignKey("PATIENT.id"), primary_key=True)
+    RecordCount = Column(Integer, nullable=False, default=0)
+
+    TemperatureSum = Column(Float, nullable=False, default=0)
+    SystolicBPSum = Column(Float, nullable=False, default=0)
+    DiastolicBPSum = Column(Float, nullable=False, default=0)
+    HeartRateSum = Column(Float, nullable=False, default=0)
+    SpO2Sum = Column(Float, nullable=False, default=0)
+    BloodSugarLevelSum = Column(Float, nullable=False, default=0)
+
+    ModifiedDate = Column(DateTime, nullable=False, default=datetime.now, onupdate=datetime.now)
+
+    @classmethod
+    def readings_of(cls, vital) -> Dict[str, Optional[float]]:
+        """Snapshot of the tracked readings of a vital (taken before an update overwrites them)"""
+        return {metric: getattr(vital, metric, None) for metric in cls.METRICS}
+
+    def add_readings(self, readings: Dict[str, Optional[float]], sign: int = 1) -> None:
+        """Add (sign=1) or remove (sign=-1) one vital's readings"""
+        self.RecordCount = (self.RecordCount or 0) + sign
+        for metric in self.METRICS:
+            value = readings.get(metric) or 0
+            setattr(self, f"{metric}Sum", (getattr(self, f"{metric}Sum") or 0) + sign * value)
+        self.ModifiedDate = datetime.now()
+
+    def __repr__(self):
+        return f"<PatientVitalBaseline(PatientId={self.PatientId}, RecordCount={self.RecordCount})>"
@@ -1,5 +1,5 @@
 # app/routers/allergy_type_router.py
-from fastapi import APIRouter, Depends, Query, HTTPException, Request
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from ..database import get_db
 from ..crud import allergy_type_crud as crud_allergy_type
@@ -11,12 +11,14 @@ from ..schemas.allergy_type import (
 from ..schemas.response import PaginatedResponse
 from ..auth.jwt_utils import extract_jwt_payload, get_user_id, get_full_name
 from ..logger.logger_utils import logger
+from ..utils.http_cache import not_modified_response
 
 router = APIRouter()
 
 @router.get("/get_allergy_types", response_model=PaginatedResponse[AllergyType], description="Get all paginated allergy types.")
 def get_allergy_types(
     request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     pageNo: int = Query(0, description="Page number (starting from 0)"),
     pageSize: int = Query(10, description="Number of records per page"),
@@ -29,6 +31,10 @@ def get_allergy_types(
     if not allergy_types:
         raise HTTPException(status_code=404, detail="No allergy types found")
 
+    not_modified = not_modified_response(request, response, allergy_types)
+    if not_modified:
+        return not_modified
+
     return PaginatedResponse(
         data=allergy_types,
         pageNo=pageNo,
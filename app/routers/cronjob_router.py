@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 
 from app.crud.patient_highlight_crud import cleanup_old_highlights
 from app.database import get_db
+from app.services.outbox_service import get_outbox_service
 
 router = APIRouter(prefix="/cronjobs", tags=["Cronjobs"])
 
@@ -14,4 +15,14 @@ def trigger_highlight_cleanup(db: Session = Depends(get_db)):
         "status": "success",
         "message": "Highlight cleanup executed successfully",
         "result": result
-    }
\ No newline at end of file
+    }
+
+
+@router.post("/outbox-retention/run")
+def trigger_outbox_retention():
+    result = get_outbox_service().purge_published_events()
+    return {
+        "status": "success",
+        "message": "Outbox retention executed successfully",
+        "result": result
+    }
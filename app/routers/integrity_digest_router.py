@@ -0,0 +1,116 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+
+from app.crud.integrity_crud import INTEGRITY_SOURCES
+from app.crud.integrity_digest_crud import (
+    DEFAULT_BUCKET_SIZE,
+    DEFAULT_BUCKETS_PER_RANGE,
+    DIGEST_ALGORITHM,
+    bucket_bounds,
+    get_bucket_rows,
+    get_range_bucket_digests,
+    get_range_digests,
+)
+from app.database import ReadSession, get_read_db, run_read
+
+router = APIRouter()
+
+RECORD_TYPE_PATTERN = f"^({'|'.join(INTEGRITY_SOURCES)})$"
+
+
+def _record_type_path():
+    return Path(..., pattern=RECORD_TYPE_PATTERN, description=f"One of: {', '.join(INTEGRITY_SOURCES)}")
+
+
+@router.get("/digest/{record_type}")
+async def get_integrity_digest(
+    record_type: str = _record_type_path(),
+    bucket_size: int = Query(DEFAULT_BUCKET_SIZE, ge=1, le=100000, description="Ids per bucket"),
+    buckets_per_range: int = Query(DEFAULT_BUCKETS_PER_RANGE, ge=1, le=4096, description="Buckets per range"),
+    db: ReadSession = Depends(get_read_db)
+):
+    """
+    Root hash and per-range hashes over (id, modified time, isDeleted) of a record type.
+    Compare these first; drill into /digest/{record_type}/ranges/{range} for the ranges that differ.
+    """
+    try:
+        root_hash, row_count, ranges = await run_read(
+            db, get_range_digests, record_type, bucket_size=bucket_size, buckets_per_range=buckets_per_range
+        )
+        return {
+            "service": "patient",
+            "record_type": record_type,
+            "algorithm": DIGEST_ALGORITHM,
+            "bucket_size": bucket_size,
+            "buckets_per_range": buckets_per_range,
+            "row_count": row_count,
+            "root_hash": root_hash,
+            "ranges": ranges,
+            "generated_at": datetime.now().isoformat()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Integrity digest failed: {str(e)}")
+
+
+@router.get("/digest/{record_type}/ranges/{range_index}")
+async def get_integrity_range_digest(
+    record_type: str = _record_type_path(),
+    range_index: int = Path(..., ge=0),
+    bucket_size: int = Query(DEFAULT_BUCKET_SIZE, ge=1, le=100000, description="Ids per bucket"),
+    buckets_per_range: int = Query(DEFAULT_BUCKETS_PER_RANGE, ge=1, le=4096, description="Buckets per range"),
+    db: ReadSession = Depends(get_read_db)
+):
+    """
+    Per-bucket hashes of one range. Fetch /digest/{record_type}/buckets/{bucket} for the buckets that differ.
+    """
+    try:
+        range_hash, buckets = await run_read(
+            db, get_range_bucket_digests, record_type, range_index,
+            bucket_size=bucket_size, buckets_per_range=buckets_per_range
+        )
+        range_size = bucket_size * buckets_per_range
+        return {
+            "service": "patient",
+            "record_type": record_type,
+            "algorithm": DIGEST_ALGORITHM,
+            "bucket_size": bucket_size,
+            "buckets_per_range": buckets_per_range,
+            "range": range_index,
+            "min_id": range_index * range_size,
+            "max_id": (range_index + 1) * range_size - 1,
+            "row_count": sum(bucket["row_count"] for bucket in buckets),
+            "hash": range_hash,
+            "buckets": buckets,
+            "generated_at": datetime.now().isoformat()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Integrity range digest failed: {str(e)}")
+
+
+@router.get("/digest/{record_type}/buckets/{bucket}")
+async def get_integrity_bucket_rows(
+    record_type: str = _record_type_path(),
+    bucket: int = Path(..., ge=0),
+    bucket_size: int = Query(DEFAULT_BUCKET_SIZE, ge=1, le=100000, description="Ids per bucket"),
+    db: ReadSession = Depends(get_read_db)
+):
+    """
+    The rows of one bucket (id, modified time, isDeleted), in id order, as they are hashed.
+    """
+    try:
+        records = await run_read(db, get_bucket_rows, record_type, bucket, bucket_size=bucket_size)
+        min_id, max_id = bucket_bounds(bucket, bucket_size)
+        return {
+            "service": "patient",
+            "record_type": record_type,
+            "bucket_size": bucket_size,
+            "bucket": bucket,
+            "min_id": min_id,
+            "max_id": max_id,
+            "row_count": len(records),
+            "records": records,
+            "generated_at": datetime.now().isoformat()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Integrity bucket read failed: {str(e)}")
@@ -1,63 +1,122 @@
+import json
+import logging
 from datetime import datetime, timedelta
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import text
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
 
-from app.database import get_db
-from app.models.patient_allocation_model import PatientAllocation
-from app.models.patient_medication_model import PatientMedication
-from app.models.patient_model import Patient
+from app.crud.integrity_crud import (
+    INTEGRITY_SOURCES,
+    check_integrity_database,
+    count_integrity_records,
+    get_integrity_page,
+)
+from app.database import ReadSession, get_read_db, read_session, run_read
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def _integrity_records_response(
+    db: ReadSession,
+    record_type: str,
+    endpoint: str,
+    hours_back: int,
+    limit: int,
+    offset: int,
+    cursor: Optional[str],
+    include_total: bool,
+    response_format: str,
+):
+    """
+    JSON: one page of the window (keyset cursor over (modified time, id), or a row offset).
+    NDJSON: the whole window from `cursor` on, one record per line, read in chunks of `limit` rows.
+    """
+    cutoff_time = datetime.now() - timedelta(hours=hours_back)
+
+    if response_format == "ndjson":
+        return StreamingResponse(
+            _stream_integrity_records(record_type, cutoff_time, limit, cursor),
+            media_type=NDJSON_MEDIA_TYPE,
+        )
+
+    records, total_count, has_more, next_cursor = await run_read(
+        db,
+        get_integrity_page,
+        record_type,
+        cutoff_time,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        include_total=include_total,
+    )
+    return {
+        "service": "patient",
+        "endpoint": endpoint,
+        "window_hours": hours_back,
+        "cutoff_time": cutoff_time.isoformat(),
+        "total_count": total_count,
+        "returned_count": len(records),
+        "limit": limit,
+        "offset": offset,
+        "has_more": has_more,
+        "next_cursor": next_cursor,
+        "records": records,
+        "generated_at": datetime.now().isoformat()
+    }
+
+
+async def _stream_integrity_records(record_type: str, cutoff_time: datetime, chunk_size: int, cursor: Optional[str]):
+    """
+    Yields the window as NDJSON, one chunk of cursor-paged rows at a time. Runs after the endpoint has
+    returned, so it reads through its own session. A failure aborts the response mid-stream, so the
+    client sees a truncated body rather than a window that silently ends early.
+    """
+    previous_cursor = cursor
+    async with read_session() as db:
+        while True:
+            try:
+                records, _, has_more, cursor = await run_read(
+                    db, get_integrity_page, record_type, cutoff_time, limit=chunk_size, cursor=cursor, include_total=False
+                )
+            except Exception as e:
+                logger.error(f"{record_type} integrity stream failed: {str(e)}")
+                raise
+            if records:
+                yield "".join(json.dumps(record) + "\n" for record in records)
+            if not has_more:
+                break
+            if cursor == previous_cursor:
+                # Would fetch the same page forever; abort so the client sees a truncated body
+                logger.error(f"{record_type} integrity stream did not advance past cursor {cursor}")
+                raise RuntimeError("Integrity stream cursor did not advance")
+            previous_cursor = cursor
+
+
 @router.get("/patient")
 async def get_patient_integrity(
     hours_back: int = Query(1, ge=1, le=168, description="Hours to look back (1-168)"),
-    limit: int = Query(1000, ge=1, le=5000, description="Max records to return"),
-    offset: int = Query(0, ge=0, description="Pagination offset"),
-    db: Session = Depends(get_db)
+    limit: int = Query(1000, ge=1, le=5000, description="Max records to return (rows per chunk when streaming)"),
+    offset: int = Query(0, ge=0, description="Pagination offset (ignored when cursor is provided)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous page (keyset pagination)"),
+    include_total: bool = Query(True, description="Set to false to skip computing total_count"),
+    response_format: str = Query("json", alias="format", pattern="^(json|ndjson)$", description="ndjson streams the whole window"),
+    db: ReadSession = Depends(get_read_db)
 ):
     """
-    Returns patient] IDs and their last modified timestamps.
+    Returns patient IDs and their last modified timestamps, ordered by (modifiedDate, id).
     Used by reconciliation service to detect data drift.
     """
     try:
-        cutoff_time = datetime.now() - timedelta(hours=hours_back)
-        
-        patients = db.query(Patient).filter(
-            Patient.modifiedDate >= cutoff_time
-        ).order_by(Patient.id).limit(limit).offset(offset).all()
-        
-        records = []
-        for patient in patients:
-            records.append({
-                "id": patient.id,
-                "modified_date": patient.modifiedDate.isoformat(),
-                "version_timestamp": int(patient.modifiedDate.timestamp() * 1000),
-                "record_type": "patient"
-            })
-        
-        # Get total count for pagination
-        total_count = db.query(Patient).filter(
-            Patient.modifiedDate >= cutoff_time
-        ).count()
-        
-        return {
-            "service": "patient",
-            "endpoint": "/integrity/patient",
-            "window_hours": hours_back,
-            "cutoff_time": cutoff_time.isoformat(),
-            "total_count": total_count,
-            "returned_count": len(records),
-            "limit": limit,
-            "offset": offset,
-            "has_more": (offset + len(records)) < total_count,
-            "records": records,
-            "generated_at": datetime.now().isoformat()
-        }
-        
+        return await _integrity_records_response(
+            db, "patient", "/integrity/patient", hours_back, limit, offset, cursor, include_total, response_format
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Patient integrity check failed: {str(e)}")
 
@@ -66,101 +125,42 @@ async def get_patient_medication_integrity(
     hours_back: int = Query(1, ge=1, le=168),
     limit: int = Query(1000, ge=1, le=5000),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous page (keyset pagination)"),
+    include_total: bool = Query(True, description="Set to false to skip computing total_count"),
+    response_format: str = Query("json", alias="format", pattern="^(json|ndjson)$", description="ndjson streams the whole window"),
+    db: ReadSession = Depends(get_read_db)
 ):
     """
-    Returns patient medications IDs and their last modified timestamps.
+    Returns patient medications IDs and their last modified timestamps, ordered by (UpdatedDateTime, Id).
     """
     try:
-        cutoff_time = datetime.now() - timedelta(hours=hours_back)
-        
-        # Query patient_medications modified in the time window
-        patient_medications = db.query(PatientMedication).filter(
-            PatientMedication.UpdatedDateTime >= cutoff_time
-        ).order_by(PatientMedication.Id).limit(limit).offset(offset).all()
-        
-        records = []
-        for med in patient_medications:
-            # Use UpdatedDateTime if available, otherwise created_date
-            last_modified = med.UpdatedDateTime or med.CreatedDateTime
-            
-            records.append({
-                "id": med.Id,
-                "patient_id": med.PatientId,
-                "modified_date": last_modified.isoformat(),
-                "version_timestamp": int(last_modified.timestamp() * 1000),
-                "record_type": "patient_medication"
-            })
-        
-        # Total count for pagination
-        total_count = db.query(PatientMedication).filter(
-            PatientMedication.UpdatedDateTime >= cutoff_time
-        ).count()
-        
-        return {
-            "service": "patient",
-            "endpoint": "/integrity/patient-medication",
-            "window_hours": hours_back,
-            "cutoff_time": cutoff_time.isoformat(),
-            "total_count": total_count,
-            "returned_count": len(records),
-            "limit": limit,
-            "offset": offset,
-            "has_more": (offset + len(records)) < total_count,
-            "records": records,
-            "generated_at": datetime.now().isoformat()
-        }
-        
+        return await _integrity_records_response(
+            db, "patient_medication", "/integrity/patient-medication", hours_back, limit, offset, cursor, include_total, response_format
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Patient medication integrity check failed: {str(e)}")
 
 @router.get("/patient-allocation")
 async def get_patient_allocation_integrity(
     hours_back: int = Query(1, ge=1, le=168, description="Hours to look back (1-168)"),
-    limit: int = Query(1000, ge=1, le=5000, description="Max records to return"),
-    offset: int = Query(0, ge=0, description="Pagination offset"),
-    db: Session = Depends(get_db)
+    limit: int = Query(1000, ge=1, le=5000, description="Max records to return (rows per chunk when streaming)"),
+    offset: int = Query(0, ge=0, description="Pagination offset (ignored when cursor is provided)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous page (keyset pagination)"),
+    include_total: bool = Query(True, description="Set to false to skip computing total_count"),
+    response_format: str = Query("json", alias="format", pattern="^(json|ndjson)$", description="ndjson streams the whole window"),
+    db: ReadSession = Depends(get_read_db)
 ):
     """
-    Returns patient allocation IDs and their last modified timestamps.
+    Returns patient allocation IDs and their last modified timestamps, ordered by (modifiedDate, id).
     """
     try:
-        
-        cutoff_time = datetime.now() - timedelta(hours=hours_back)
-        
-        allocations = db.query(PatientAllocation).filter(
-            PatientAllocation.modifiedDate >= cutoff_time
-        ).order_by(PatientAllocation.id).limit(limit).offset(offset).all()
-        
-        records = []
-        for allocation in allocations:
-            records.append({
-                "id": allocation.id,
-                "patient_id": allocation.patientId,
-                "modified_date": allocation.modifiedDate.isoformat(),
-                "version_timestamp": int(allocation.modifiedDate.timestamp() * 1000),
-                "record_type": "patient_allocation"
-            })
-        
-        # Get total count for pagination
-        total_count = db.query(PatientAllocation).filter(
-            PatientAllocation.modifiedDate >= cutoff_time
-        ).count()
-        
-        return {
-            "service": "patient",
-            "endpoint": "/integrity/patient-allocation",
-            "window_hours": hours_back,
-            "cutoff_time": cutoff_time.isoformat(),
-            "total_count": total_count,
-            "returned_count": len(records),
-            "limit": limit,
-            "offset": offset,
-            "has_more": (offset + len(records)) < total_count,
-            "records": records,
-            "generated_at": datetime.now().isoformat()
-        }
-        
+        return await _integrity_records_response(
+            db, "patient_allocation", "/integrity/patient-allocation", hours_back, limit, offset, cursor, include_total, response_format
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Patient allocation integrity check failed: {str(e)}")
 
@@ -168,7 +168,7 @@ async def get_patient_allocation_integrity(
 @router.get("/summary")
 async def get_integrity_summary(
     hours_back: int = Query(1, ge=1, le=168),
-    db: Session = Depends(get_db)
+    db: ReadSession = Depends(get_read_db)
 ):
     """
     Returns a summary of all patient-related record counts for the specified time window.
@@ -177,30 +177,18 @@ async def get_integrity_summary(
     try:
         cutoff_time = datetime.now() - timedelta(hours=hours_back)
         
-        # Count records in each table
-        patient_count = db.query(Patient).filter(
-            Patient.modifiedDate >= cutoff_time
-        ).count()
-        
-        patient_medication_count = db.query(PatientMedication).filter(
-            PatientMedication.UpdatedDateTime >= cutoff_time
-        ).count()
-        
-        patient_allocation_count = db.query(PatientAllocation).filter(
-            PatientAllocation.modifiedDate >= cutoff_time
-        ).count()
+        # Count records of each synced record type
+        record_counts = {}
+        for record_type in INTEGRITY_SOURCES:
+            record_counts[record_type] = await run_read(db, count_integrity_records, record_type, cutoff_time)
+        record_counts["total"] = sum(record_counts.values())
         
         return {
             "service": "patient",
             "endpoint": "/integrity/summary",
             "window_hours": hours_back,
             "cutoff_time": cutoff_time.isoformat(),
-            "record_counts": {
-                "patient": patient_count,
-                "patient_medication": patient_medication_count,
-                "patient_allocation": patient_allocation_count,
-                "total": (patient_count + patient_medication_count + patient_allocation_count)
-            },
+            "record_counts": record_counts,
             "generated_at": datetime.now().isoformat()
         }
         
@@ -209,24 +197,19 @@ async def get_integrity_summary(
 
 # Health check endpoint for the integrity system
 @router.get("/health")
-async def integrity_health_check(db: Session = Depends(get_db)):
+async def integrity_health_check(db: ReadSession = Depends(get_read_db)):
     """
     Health check endpoint to verify integrity system is working.
     """
     try:
-        # Test database connectivity
-        db.execute(text("SELECT 1"))
-        
-        # Get recent patient to verify data access
-        recent_patient = db.query(Patient).filter(
-            Patient.modifiedDate >= datetime.now() - timedelta(hours=24)
-        ).first()
+        # Test database connectivity and verify data access (any patient changed in the last 24 hours)
+        recent_data_available = await run_read(db, check_integrity_database, datetime.now() - timedelta(hours=24))
         
         return {
             "status": "healthy",
             "service": "patient",
             "database_connected": True,
-            "recent_data_available": recent_patient is not None,
+            "recent_data_available": recent_data_available,
             "timestamp": datetime.now().isoformat()
         }
         
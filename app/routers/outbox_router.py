@@ -56,7 +56,8 @@ async def get_stats(request: Request, require_auth: bool = True):
         
         return {
             "outbox": outbox_service.get_stats(),
-            "processor": processor.get_stats()
+            "processor": processor.get_stats(),
+            "dispatch": outbox_service.get_lane_stats()
         }
     except Exception as e:
         logger.error(f"Error getting stats: {str(e)}")
@@ -178,39 +179,22 @@ async def process_now(
 async def cleanup_old_events(
     request: Request,
     days: int = Query(7, description="Delete events older than this many days", ge=1, le=365),
+    archive: Optional[bool] = Query(None, description="Copy events to OUTBOX_EVENTS_ARCHIVE before deleting (defaults to OUTBOX_ARCHIVE_ON_PURGE)"),
     require_auth: bool = True
 ):
-    """Clean up old processed events"""
+    """Clean up old processed events (chunked, see OutboxService.purge_published_events)"""
     _ = extract_jwt_payload(request, require_auth)
     try:
-        from ..database import SessionLocal
-        from ..models.outbox_model import OutboxStatus
-        from datetime import timedelta
+        outbox_service = get_outbox_service()
+        result = outbox_service.purge_published_events(older_than_days=days, archive=archive)
         
-        db = SessionLocal()
-        try:
-            cutoff_date = datetime.now() - timedelta(days=days)
-            
-            # Delete old published events
-            deleted_events = db.query(OutboxEvent).filter(
-                OutboxEvent.status == OutboxStatus.PUBLISHED,
-                OutboxEvent.created_at < cutoff_date
-            ).all()
-            
-            for event in deleted_events:
-                db.delete(event)
-            
-            db.commit()
-            count = len(deleted_events)
-            
-            return {
-                "message": f"Cleaned up {count} old events",
-                "deleted_count": count,
-                "cutoff_date": cutoff_date.isoformat()
-            }
-        finally:
-            db.close()
-            
+        return {
+            "message": f"Cleaned up {result['purged']} old events",
+            "deleted_count": result['purged'],
+            "archived_count": result['archived'],
+            "complete": result['complete'],
+            "cutoff_date": result['cutoff_date']
+        }
     except Exception as e:
         logger.error(f"Error in cleanup: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to cleanup events")
@@ -18,11 +18,12 @@ def get_all_patient_allergies(
     db: Session = Depends(get_db),
     pageNo: int = Query(0, description="Page number (starting from 0)"),
     pageSize: int = Query(10, description="Number of records per page"),
+    includeTotal: bool = Query(True, description="Set to false to skip computing totalRecords/totalPages"),
     require_auth: bool = True
 ):
     _ = extract_jwt_payload(request, require_auth)
 
-    allergies, totalRecords, totalPages = patient_allergy_mapping_crud.get_all_allergies(db, pageNo, pageSize)
+    allergies, totalRecords, totalPages = patient_allergy_mapping_crud.get_all_allergies(db, pageNo, pageSize, includeTotal)
 
     if not allergies:
         raise HTTPException(status_code=404, detail="No allergies found")
@@ -46,11 +47,12 @@ def get_patient_allergy(
     db: Session = Depends(get_db),
     pageNo: int = Query(0, description="Page number (starting from 0)"),
     pageSize: int = Query(10, description="Number of records per page"),
+    includeTotal: bool = Query(True, description="Set to false to skip computing totalRecords/totalPages"),
     require_auth: bool = True
 ):
     _ = extract_jwt_payload(request, require_auth)
 
-    allergies, totalRecords, totalPages = patient_allergy_mapping_crud.get_patient_allergies(db, patient_id, pageNo, pageSize)
+    allergies, totalRecords, totalPages = patient_allergy_mapping_crud.get_patient_allergies(db, patient_id, pageNo, pageSize, includeTotal)
 
     if not allergies:
         raise HTTPException(status_code=404, detail="No allergies found for this patient")
@@ -24,10 +24,11 @@ def get_all_assigned_dementias(
     db: Session = Depends(get_db),
     pageNo: int = Query(0, description="Page number (starting from 0)"),
     pageSize: int = Query(10, description="Number of records per page"),
+    includeTotal: bool = Query(True, description="Set to false to skip computing totalRecords/totalPages"),
     require_auth: bool = True
 ):
     _ = extract_jwt_payload(request, require_auth)
-    assignments, totalRecords, totalPages = crud_assigned_dementia.get_all_assigned_dementias(db, pageNo, pageSize)
+    assignments, totalRecords, totalPages = crud_assigned_dementia.get_all_assigned_dementias(db, pageNo, pageSize, includeTotal)
 
     if not assignments:
         raise HTTPException(status_code=404, detail="No assigned dementias found")
@@ -51,10 +52,11 @@ def get_assigned_dementias(
     db: Session = Depends(get_db),
     pageNo: int = Query(0, description="Page number (starting from 0)"),
     pageSize: int = Query(10, description="Number of records per page"),
+    includeTotal: bool = Query(True, description="Set to false to skip computing totalRecords/totalPages"),
     require_auth: bool = True
 ):
     _ = extract_jwt_payload(request, require_auth)
-    assignments, totalRecords, totalPages = crud_assigned_dementia.get_assigned_dementias(db, patient_id, pageNo, pageSize)
+    assignments, totalRecords, totalPages = crud_assigned_dementia.get_assigned_dementias(db, patient_id, pageNo, pageSize, includeTotal)
 
     if not assignments:
         raise HTTPException(status_code=404, detail=f"No assigned dementias found for patient with ID {patient_id}")
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from ..database import get_db
 from ..crud import patient_dementia_stage_list_crud as crud_dementia_stage
@@ -8,6 +8,7 @@ from ..schemas.patient_dementia_stage_list import (
     PatientDementiaStageListUpdate,
 )
 from ..auth.jwt_utils import extract_jwt_payload, get_user_id, get_full_name
+from ..utils.http_cache import not_modified_response
 
 router = APIRouter()
 
@@ -18,11 +19,13 @@ router = APIRouter()
 )
 def get_all_dementia_stage_lists(
     request: Request, 
+    response: Response,
     db: Session = Depends(get_db), 
     require_auth: bool = True
 ):
     _ = extract_jwt_payload(request, require_auth)
-    return crud_dementia_stage.get_all_dementia_stage_list_entries(db)
+    dementia_stages = crud_dementia_stage.get_all_dementia_stage_list_entries(db)
+    return not_modified_response(request, response, dementia_stages) or dementia_stages
 
 
 @router.get(
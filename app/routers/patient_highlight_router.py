@@ -1,5 +1,8 @@
 # app/routers/patient_highlight_router.py
-from fastapi import APIRouter, Depends, HTTPException, Request
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 
 from ..auth.jwt_utils import extract_jwt_payload, get_full_name, get_user_id
@@ -10,62 +13,100 @@ from ..crud.patient_highlight_crud import (
     get_enabled_highlights,
     get_enabled_highlights_by_patient,
     get_highlights_by_patient,
+    get_highlights_paginated,
     update_highlight,
 )
-from ..database import get_db
+from ..database import ReadSession, get_db, get_read_db, run_read
 from ..logger.logger_utils import logger
 from ..schemas.patient_highlight import (
     PatientHighlight,
     PatientHighlightCreate,
     PatientHighlightUpdate,
 )
+from ..schemas.response import PaginatedResponse
 
 router = APIRouter()
 
 @router.get("/Highlight/get_all_highlights", response_model=list[PatientHighlight], description="Get all highlights.")
-def get_all_patient_highlights(
+async def get_all_patient_highlights(
     request: Request,
-    db: Session = Depends(get_db),
+    db: ReadSession = Depends(get_read_db),
     require_auth: bool = True  # Default to True
 ):
     _ = extract_jwt_payload(request, require_auth)
     # No logging for this read operation
-    return get_all_highlights(db)
+    return await run_read(db, get_all_highlights)
 
 @router.get("/Highlight/get_highlights_by_patient/{patient_id}", response_model=list[PatientHighlight], description="Get highlights by patient ID.")
-def get_patient_highlights(
+async def get_patient_highlights(
     request: Request,
     patient_id: int,
-    db: Session = Depends(get_db),
+    db: ReadSession = Depends(get_read_db),
     require_auth: bool = True  # Default to True
 ):
     _ = extract_jwt_payload(request, require_auth)
     # No logging for this read operation
-    highlights = get_highlights_by_patient(db, patient_id)
+    highlights = await run_read(db, get_highlights_by_patient, patient_id)
     if not highlights:
         raise HTTPException(status_code=404, detail="No highlights found for the patient")
     return highlights
 
 @router.get("/Highlight/get_enabled_highlights", response_model=list[PatientHighlight], description="Get all highlights where IsDeleted=0 and the type's IsEnabled=1.")
-def get_all_enabled_highlights(
+async def get_all_enabled_highlights(
     request: Request,
-    db: Session = Depends(get_db),
+    db: ReadSession = Depends(get_read_db),
     require_auth: bool = True  # Default to True
 ):
     
     _ = extract_jwt_payload(request, require_auth)
-    return get_enabled_highlights(db)
+    return await run_read(db, get_enabled_highlights)
+
+@router.get("/Highlight/get_highlights_paginated", response_model=PaginatedResponse[PatientHighlight], description="Get a page of highlights, newest first, optionally filtered by creation time and patients.")
+async def get_patient_highlights_paginated(
+    request: Request,
+    since: Optional[datetime] = Query(None, description="Only highlights created at or after this time"),
+    patientIds: Optional[List[int]] = Query(None, description="Only highlights of these patients"),
+    supervisorId: Optional[str] = Query(None, description="Only highlights of the patients allocated to this supervisor"),
+    enabledOnly: bool = Query(True, description="Only highlights whose type is enabled"),
+    pageNo: int = Query(0, description="Page number (starting from 0)"),
+    pageSize: int = Query(20, description="Number of records per page", ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="nextCursor from a previous page. When provided, keyset pagination is used and pageNo is ignored"),
+    includeTotal: bool = Query(True, description="Set to false to skip computing totalRecords/totalPages"),
+    db: ReadSession = Depends(get_read_db),
+    require_auth: bool = True  # Default to True
+):
+    _ = extract_jwt_payload(request, require_auth)
+    highlights, totalRecords, totalPages, nextCursor = await run_read(
+        db,
+        get_highlights_paginated,
+        pageNo=pageNo,
+        pageSize=pageSize,
+        since=since,
+        patient_ids=patientIds,
+        supervisor_id=supervisorId,
+        enabled_only=enabledOnly,
+        cursor=cursor,
+        includeTotal=includeTotal
+    )
+    return PaginatedResponse(
+        data=[PatientHighlight.model_validate(highlight) for highlight in highlights],
+        pageNo=pageNo,
+        pageSize=pageSize,
+        totalRecords=totalRecords,
+        totalPages=totalPages,
+        nextCursor=nextCursor
+    )
 
 @router.get("/Highlight/get_enabled_highlights_by_patient/{patient_id}", response_model=list[PatientHighlight], description="Get enabled highlights for a specific patient.")
-def get_patient_enabled_highlights(
+async def get_patient_enabled_highlights(
     request: Request,
     patient_id: int,
-    db: Session = Depends(get_db),
+    db: ReadSession = Depends(get_read_db),
     require_auth: bool = True  # Default to True
 ):
     
     _ = extract_jwt_payload(request, require_auth)
-    highlights = get_enabled_highlights_by_patient(db, patient_id)
+    highlights = await run_read(db, get_enabled_highlights_by_patient, patient_id)
     if not highlights:
         raise HTTPException(status_code=404, detail="No enabled highlights found for the patient")
     return highlights
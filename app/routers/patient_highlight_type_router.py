@@ -1,5 +1,5 @@
 # app/routers/patient_highlight_type_router.py
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
 from ..auth.jwt_utils import extract_jwt_payload, get_full_name, get_user_id
@@ -11,22 +11,26 @@ from ..schemas.patient_highlight_type import (
     HighlightTypeCreate,
     HighlightTypeUpdate,
 )
+from ..utils.http_cache import not_modified_response
 
 router = APIRouter()
 
 @router.get("/HighlightType/get_highlight_types", response_model=list[HighlightType], description="Get all highlight types.")
 def get_highlight_types(
     request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     require_auth: bool = True  # Default to True
 ):
     _ = extract_jwt_payload(request, require_auth)
     # No logging for this read operation
-    return crud_highlight_type.get_all_highlight_types(db)
+    highlight_types = crud_highlight_type.get_all_highlight_types(db)
+    return not_modified_response(request, response, highlight_types) or highlight_types
 
 @router.get("/HighlightType/get_enabled_highlight_types", response_model=list[HighlightType], description="Get all enabled highlight types (IsEnabled = 1).")
 def get_enabled_highlight_types(
     request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     require_auth: bool = True  # Default to True
 ):
@@ -35,7 +39,8 @@ def get_enabled_highlight_types(
     This filters out disabled types that admins have turned off.
     """
     _ = extract_jwt_payload(request, require_auth)
-    return crud_highlight_type.get_enabled_highlight_types(db)
+    highlight_types = crud_highlight_type.get_enabled_highlight_types(db)
+    return not_modified_response(request, response, highlight_types) or highlight_types
 
 @router.patch("/HighlightType/toggle_highlight_type_enabled/{highlight_type_id}", response_model=HighlightType, description="Toggle the IsEnabled status of a highlight type.")
 def toggle_highlight_type_enabled(
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from ..database import get_db
 from ..auth.jwt_utils import extract_jwt_payload, get_user_id
@@ -8,12 +8,14 @@ from ..schemas.patient_list_diet import (
     PatientDietListTypeCreate,
     PatientDietListTypeUpdate
 )
+from ..utils.http_cache import not_modified_response
 
 router = APIRouter()
 
 @router.get("/get_diet_types", response_model=list[PatientDietListType], description="Get all diet types.")
-def get_diet_types(db: Session = Depends(get_db)):
-    return crud_diet_type.get_all_diet_types(db)
+def get_diet_types(request: Request, response: Response, db: Session = Depends(get_db)):
+    diet_types = crud_diet_type.get_all_diet_types(db)
+    return not_modified_response(request, response, diet_types) or diet_types
 
 @router.get("/get_diet_type/{diet_type_id}", response_model=PatientDietListType, description="Get diet type by ID.")
 def get_diet_type(diet_type_id: int, db: Session = Depends(get_db)):
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from ..database import get_db
 from ..crud import patient_list_education_crud as crud_education_type
@@ -7,12 +7,14 @@ from ..schemas.patient_list_education import (
     PatientEducationListTypeCreate,
     PatientEducationListTypeUpdate
 )
+from ..utils.http_cache import not_modified_response
 
 router = APIRouter()
 
 @router.get("/get_education_types", response_model=list[PatientEducationListType], description="Get all education types.")
-def get_education_types(db: Session = Depends(get_db)):
-    return crud_education_type.get_all_education_types(db)
+def get_education_types(request: Request, response: Response, db: Session = Depends(get_db)):
+    education_types = crud_education_type.get_all_education_types(db)
+    return not_modified_response(request, response, education_types) or education_types
 
 @router.get("/get_education_type/{education_type_id}", response_model=PatientEducationListType, description="Get education type by ID.")
 def get_education_type(education_type_id: int, db: Session = Depends(get_db)):
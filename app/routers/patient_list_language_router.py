@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from ..database import get_db
 from ..schemas.patient_list_language import PatientListLanguage, PatientListLanguageCreate, PatientListLanguageUpdate
 from ..crud import patient_list_language_crud
+from ..utils.http_cache import not_modified_response
 router = APIRouter()
 
 @router.get("/PatientListLanguage/{patient_list_language_id}", response_model=PatientListLanguage, description="Get Language by ID")
@@ -11,8 +12,9 @@ def get_patient_list_language(patient_list_language_id: int, db: Session = Depen
    
 
 @router.get("/PatientListLanguage/", response_model=list[PatientListLanguage], description="Get all Languages")
-def get_all_patient_list_language(db: Session = Depends(get_db)):
-    return patient_list_language_crud.get_all_patient_list_language(db)
+def get_all_patient_list_language(request: Request, response: Response, db: Session = Depends(get_db)):
+    languages = patient_list_language_crud.get_all_patient_list_language(db)
+    return not_modified_response(request, response, languages) or languages
 
 @router.post("/PatientListLanguage/add", response_model=PatientListLanguage, description="Create Language")
 def create_patient_list_language(patient_list_language: PatientListLanguageCreate, db: Session = Depends(get_db)):
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from ..database import get_db
 from ..crud import patient_list_livewith_crud as crud_livewith_type
@@ -7,12 +7,14 @@ from ..schemas.patient_list_livewith import (
     PatientLiveWithListTypeCreate,
     PatientLiveWithListTypeUpdate
 )
+from ..utils.http_cache import not_modified_response
 
 router = APIRouter()
 
 @router.get("/get_livewith_types", response_model=list[PatientLiveWithListType], description="Get all livewith types.")
-def get_livewith_types(db: Session = Depends(get_db)):
-    return crud_livewith_type.get_all_livewith_types(db)
+def get_livewith_types(request: Request, response: Response, db: Session = Depends(get_db)):
+    livewith_types = crud_livewith_type.get_all_livewith_types(db)
+    return not_modified_response(request, response, livewith_types) or livewith_types
 
 @router.get("/get_livewith_type/{livewith_type_id}", response_model=PatientLiveWithListType, description="Get livewith type by ID.")
 def get_livewith_type(livewith_type_id: int, db: Session = Depends(get_db)):
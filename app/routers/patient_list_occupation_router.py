@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from ..database import get_db
 from ..crud import patient_list_occupation_crud as crud_occupation_type
@@ -7,12 +7,14 @@ from ..schemas.patient_list_occupation import (
     PatientOccupationListTypeCreate,
     PatientOccupationListTypeUpdate
 )
+from ..utils.http_cache import not_modified_response
 
 router = APIRouter()
 
 @router.get("/get_occupation_types", response_model=list[PatientOccupationListType], description="Get all occupation types.")
-def get_occupation_types(db: Session = Depends(get_db)):
-    return crud_occupation_type.get_all_occupation_types(db)
+def get_occupation_types(request: Request, response: Response, db: Session = Depends(get_db)):
+    occupation_types = crud_occupation_type.get_all_occupation_types(db)
+    return not_modified_response(request, response, occupation_types) or occupation_types
 
 @router.get("/get_occupation_type/{occupation_type_id}", response_model=PatientOccupationListType, description="Get occupation type by ID.")
 def get_occupation_type(occupation_type_id: int, db: Session = Depends(get_db)):
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from ..database import get_db
 from ..crud import patient_list_pet_crud as crud_pet_type
@@ -7,12 +7,14 @@ from ..schemas.patient_list_pet import (
     PatientPetListTypeCreate,
     PatientPetListTypeUpdate
 )
+from ..utils.http_cache import not_modified_response
 
 router = APIRouter()
 
 @router.get("/get_pet_types", response_model=list[PatientPetListType], description="Get all pet types.")
-def get_pet_types(db: Session = Depends(get_db)):
-    return crud_pet_type.get_all_pet_types(db)
+def get_pet_types(request: Request, response: Response, db: Session = Depends(get_db)):
+    pet_types = crud_pet_type.get_all_pet_types(db)
+    return not_modified_response(request, response, pet_types) or pet_types
 
 @router.get("/get_pet_type/{pet_type_id}", response_model=PatientPetListType, description="Get pet type by ID.")
 def get_pet_type(pet_type_id: int, db: Session = Depends(get_db)):
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from ..database import get_db
 from ..crud import patient_list_religion_crud as crud_religion_type
@@ -7,12 +7,14 @@ from ..schemas.patient_list_religion import (
     PatientReligionListTypeCreate,
     PatientReligionListTypeUpdate
 )
+from ..utils.http_cache import not_modified_response
 
 router = APIRouter()
 
 @router.get("/get_religion_types", response_model=list[PatientReligionListType], description="Get all religion types.")
-def get_religion_types(db: Session = Depends(get_db)):
-    return crud_religion_type.get_all_religion_types(db)
+def get_religion_types(request: Request, response: Response, db: Session = Depends(get_db)):
+    religion_types = crud_religion_type.get_all_religion_types(db)
+    return not_modified_response(request, response, religion_types) or religion_types
 
 @router.get("/get_religion_type/{religion_type_id}", response_model=PatientReligionListType, description="Get religion type by ID.")
 def get_religion_type(religion_type_id: int, db: Session = Depends(get_db)):
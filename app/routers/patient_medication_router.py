@@ -18,11 +18,12 @@ def get_medications(
     request: Request,
     pageNo: int = 0,
     pageSize: int = 100,
+    includeTotal: bool = True,
     db: Session = Depends(get_db),
     require_auth: bool = True
 ):
     _ = extract_jwt_payload(request, require_auth)
-    db_medications, totalRecords, totalPages = crud_medication.get_medications(db, pageNo=pageNo, pageSize=pageSize)
+    db_medications, totalRecords, totalPages = crud_medication.get_medications(db, pageNo=pageNo, pageSize=pageSize, includeTotal=includeTotal)
     patient_medications = [PatientMedication.model_validate(p) for p in db_medications]
     return PaginatedResponse(
         data=patient_medications,
@@ -39,6 +40,7 @@ def get_patient_medications(
     patient_id: int,
     pageNo: int = 0,
     pageSize: int = 100,
+    includeTotal: bool = True,
     db: Session = Depends(get_db),
     require_auth: bool = True
 ):
@@ -47,7 +49,8 @@ def get_patient_medications(
         db,
         patient_id,
         pageNo=pageNo,
-        pageSize=pageSize
+        pageSize=pageSize,
+        includeTotal=includeTotal
     )
     patient_medications = [PatientMedication.model_validate(p) for p in db_medications]
     return PaginatedResponse(
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from ..database import get_db
 from ..crud import patient_mobility_list_crud as crud_mobility_list, patient_mobility_list_crud as crud_mobility
@@ -6,6 +6,7 @@ from ..schemas import patient_mobility_mapping as schemas_mobility
 from ..schemas import patient_mobility_list as schemas_mobility_list
 from ..auth.jwt_utils import extract_jwt_payload, get_user_id, get_full_name
 from ..logger.logger_utils import logger
+from ..utils.http_cache import not_modified_response
 
 router = APIRouter()
 
@@ -13,10 +14,11 @@ router = APIRouter()
 
 # Get all mobility list entries
 @router.get("/Mobility/List", response_model=list[schemas_mobility_list.PatientMobilityList])
-def get_all_mobility_lists(request: Request, db: Session = Depends(get_db), require_auth: bool = True):
+def get_all_mobility_lists(request: Request, response: Response, db: Session = Depends(get_db), require_auth: bool = True):
     _ = extract_jwt_payload(request, require_auth)
 
-    return crud_mobility_list.get_all_mobility_list_entries(db)
+    mobility_lists = crud_mobility_list.get_all_mobility_list_entries(db)
+    return not_modified_response(request, response, mobility_lists) or mobility_lists
 
 # Get a single mobility list entry by ID
 @router.get("/Mobility/List/{mobility_list_id}", response_model=schemas_mobility_list.PatientMobilityList)
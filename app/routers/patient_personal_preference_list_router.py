@@ -1,6 +1,6 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
 from ..auth.jwt_utils import extract_jwt_payload, get_full_name, get_user_id
@@ -12,6 +12,7 @@ from ..schemas.patient_personal_preference_list import (
     PatientPersonalPreferenceListUpdate,
 )
 from ..schemas.response import PaginatedResponse, SingleResponse
+from ..utils.http_cache import not_modified_response
 
 router = APIRouter()
 
@@ -24,6 +25,7 @@ VALID_PREFERENCE_TYPES = ("LikesDislikes", "Habit", "Hobby")
 )
 def get_preference_lists(
     request: Request,
+    response: Response,
     pageNo: int = Query(default=0, ge=0),
     pageSize: int = Query(default=100, ge=1, le=500),
     preferenceType: Optional[str] = Query(
@@ -42,6 +44,10 @@ def get_preference_lists(
         preference_type=preferenceType,
     )
 
+    not_modified = not_modified_response(request, response, items)
+    if not_modified:
+        return not_modified
+
     return PaginatedResponse(
         data=[PatientPersonalPreferenceList.model_validate(i) for i in items],
         pageNo=pageNo,
@@ -24,13 +24,14 @@ def get_preferences(
     request: Request,
     pageNo: int = Query(default=0, ge=0),
     pageSize: int = Query(default=10, ge=1, le=200),
+    includeTotal: bool = True,
     db: Session = Depends(get_db),
     require_auth: bool = True,
 ):
     _ = extract_jwt_payload(request, require_auth)
 
     items, totalRecords, totalPages = crud_pref.get_preferences(
-        db, pageNo=pageNo, pageSize=pageSize
+        db, pageNo=pageNo, pageSize=pageSize, includeTotal=includeTotal
     )
 
     return PaginatedResponse(
@@ -55,6 +56,7 @@ def get_patient_preferences(
         default=None,
         description="Filter by preference type: LikesDislikes | Habit | Hobby. Leaving blank returns all types.",
     ),
+    includeTotal: bool = True,
     db: Session = Depends(get_db),
     require_auth: bool = True,
 ):
@@ -66,6 +68,7 @@ def get_patient_preferences(
         pageNo=pageNo,
         pageSize=pageSize,
         preference_type=preferenceType,
+        includeTotal=includeTotal,
     )
 
     return PaginatedResponse(
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
 from ..auth.jwt_utils import extract_jwt_payload, get_full_name, get_user_id
@@ -10,6 +10,7 @@ from ..schemas.patient_prescription_list import (
     PatientPrescriptionListUpdate,
 )
 from ..schemas.response import PaginatedResponse, SingleResponse
+from ..utils.http_cache import not_modified_response
 
 router = APIRouter()
 
@@ -17,6 +18,7 @@ router = APIRouter()
 @router.get("/PrescriptionList", response_model=PaginatedResponse[PatientPrescriptionList])
 def get_prescription_lists(
     request: Request,
+    response: Response,
     pageNo: int = 0,
     pageSize: int = 100,
     db: Session = Depends(get_db),
@@ -28,6 +30,9 @@ def get_prescription_lists(
         pageNo=pageNo, 
         pageSize=pageSize
     )
+    not_modified = not_modified_response(request, response, db_prescription_lists)
+    if not_modified:
+        return not_modified
     prescription_lists = [PatientPrescriptionList.model_validate(p) for p in db_prescription_lists]
     return PaginatedResponse(
         data=prescription_lists,
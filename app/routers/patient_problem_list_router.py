@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
 from ..auth.jwt_utils import extract_jwt_payload, get_full_name, get_user_id
@@ -10,6 +10,7 @@ from ..schemas.patient_problem_list import (
     PatientProblemListUpdate,
 )
 from ..schemas.response import PaginatedResponse, SingleResponse
+from ..utils.http_cache import not_modified_response
 
 router = APIRouter()
 
@@ -17,6 +18,7 @@ router = APIRouter()
 @router.get("/ProblemList", response_model=PaginatedResponse[PatientProblemList])
 def get_problem_lists(
     request: Request,
+    response: Response,
     pageNo: int = 0,
     pageSize: int = 100,
     db: Session = Depends(get_db),
@@ -30,6 +32,10 @@ def get_problem_lists(
         pageSize=pageSize
     )
     
+    not_modified = not_modified_response(request, response, db_problem_lists)
+    if not_modified:
+        return not_modified
+    
     problem_lists = [PatientProblemList.model_validate(p) for p in db_problem_lists]
     
     return PaginatedResponse(
@@ -22,6 +22,7 @@ def get_problems(
     request: Request,
     pageNo: int = 0,
     pageSize: int = 10,
+    includeTotal: bool = True,
     db: Session = Depends(get_db),
     require_auth: bool = True
 ):
@@ -30,7 +31,8 @@ def get_problems(
     db_problems, totalRecords, totalPages = crud_problem.get_problems(
         db, 
         pageNo=pageNo, 
-        pageSize=pageSize
+        pageSize=pageSize,
+        includeTotal=includeTotal
     )
     
     # Convert to response schema with ProblemName from loaded relationship
@@ -56,6 +58,7 @@ def get_patient_problems(
     patient_id: int,
     pageNo: int = 0,
     pageSize: int = 100,
+    includeTotal: bool = True,
     db: Session = Depends(get_db),
     require_auth: bool = True
 ):
@@ -65,7 +68,8 @@ def get_patient_problems(
         db,
         patient_id=patient_id,
         pageNo=pageNo,
-        pageSize=pageSize
+        pageSize=pageSize,
+        includeTotal=includeTotal
     )
     
     # Convert to response schema with ProblemName from loaded relationship
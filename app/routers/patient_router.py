@@ -1,27 +1,27 @@
-from typing import Optional
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
 from sqlalchemy.orm import Session
 
 from ..auth.jwt_utils import extract_jwt_payload, get_full_name, get_user_id
 from ..crud import patient_crud as crud_patient
-from ..database import get_db
-from ..schemas.patient import Patient, PatientCreate, PatientUpdate
+from ..database import ReadSession, get_db, get_read_db, run_read
+from ..schemas.patient import Patient, PatientBatchRequest, PatientCreate, PatientUpdate
 from ..schemas.response import PaginatedResponse, SingleResponse
 
 router = APIRouter()
 
 @router.get("/patients/{patient_id}", response_model=SingleResponse[Patient])
-def read_patient(patient_id: int, request: Request, require_auth: bool = True, db: Session = Depends(get_db), mask: bool = True):
+async def read_patient(patient_id: int, request: Request, require_auth: bool = True, db: ReadSession = Depends(get_read_db), mask: bool = True):
     _ = extract_jwt_payload(request, require_auth)
-    db_patient = crud_patient.get_patient(db=db, patient_id=patient_id, mask=mask)
+    db_patient = await run_read(db, crud_patient.get_patient, patient_id=patient_id, mask=mask)
     if db_patient is None:
         raise HTTPException(status_code=404, detail="Patient not found")
     patient = Patient.model_validate(db_patient)
     return SingleResponse(data = patient)
 
 @router.get("/patients/", response_model=PaginatedResponse[Patient])
-def read_patients(
+async def read_patients(
     request: Request,
     name: Optional[str] = Query(None, description="Filter patients by name (non-exact match)", include_in_schema=True),
     isActive: Optional[str] = Query(None, description="Filter patients by isActive (0 or 1)", include_in_schema=True),
@@ -29,15 +29,17 @@ def read_patients(
     mask: bool = Query(True, description="Mask sensitive data"),
     pageNo: int = Query(0, description="Page number (starting from 0)"),
     pageSize: int = Query(10, description="Number of records per page"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="nextCursor from a previous page. When provided, keyset pagination is used and pageNo is ignored"),
+    includeTotal: bool = Query(True, description="Set to false to skip computing totalRecords/totalPages"),
+    db: ReadSession = Depends(get_read_db),
 ):
     _ = extract_jwt_payload(request, require_auth)
-    db_patients, totalRecords, totalPages = crud_patient.get_patients(db=db, pageNo=pageNo, pageSize=pageSize, mask=mask, name=name, isActive = isActive)
+    db_patients, totalRecords, totalPages, nextCursor = await run_read(db, crud_patient.get_patients, pageNo=pageNo, pageSize=pageSize, mask=mask, name=name, isActive = isActive, cursor=cursor, includeTotal=includeTotal)
     patients = [Patient.model_validate(patient) for patient in db_patients]
-    return PaginatedResponse(data=patients, pageNo=pageNo, pageSize=pageSize, totalRecords= totalRecords, totalPages=totalPages)
+    return PaginatedResponse(data=patients, pageNo=pageNo, pageSize=pageSize, totalRecords= totalRecords, totalPages=totalPages, nextCursor=nextCursor)
 
 @router.get("/patients/by-doctor/{doctor_id}", response_model=PaginatedResponse[Patient])
-def get_patients_by_doctor_id(
+async def get_patients_by_doctor_id(
     doctor_id: str,
     request: Request,
     name: Optional[str] = Query(None, description="Filter patients by name (non-exact match)", include_in_schema=True),
@@ -46,19 +48,24 @@ def get_patients_by_doctor_id(
     mask: bool = Query(True, description="Mask sensitive data"),
     pageNo: int = Query(0, description="Page number (starting from 0)"),
     pageSize: int = Query(10, description="Number of records per page"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="nextCursor from a previous page. When provided, keyset pagination is used and pageNo is ignored"),
+    includeTotal: bool = Query(True, description="Set to false to skip computing totalRecords/totalPages"),
+    db: ReadSession = Depends(get_read_db),
 ):
     """Get all patients allocated to a specific doctor"""
     _ = extract_jwt_payload(request, require_auth)
     
-    db_patients, totalRecords, totalPages = crud_patient.get_patients_by_doctor(
-        db=db, 
+    db_patients, totalRecords, totalPages, nextCursor = await run_read(
+        db,
+        crud_patient.get_patients_by_doctor,
         doctor_id=doctor_id, 
         mask=mask, 
         pageNo=pageNo, 
         pageSize=pageSize,
         name=name,
-        isActive=isActive
+        isActive=isActive,
+        cursor=cursor,
+        includeTotal=includeTotal
     )
     
     patients = [Patient.model_validate(patient) for patient in db_patients]
@@ -67,11 +74,12 @@ def get_patients_by_doctor_id(
         pageNo=pageNo, 
         pageSize=pageSize, 
         totalRecords=totalRecords, 
-        totalPages=totalPages
+        totalPages=totalPages,
+        nextCursor=nextCursor
     )
 
 @router.get("/patients/by-supervisor/{supervisor_id}", response_model=PaginatedResponse[Patient])
-def get_patients_by_supervisor_id(
+async def get_patients_by_supervisor_id(
     supervisor_id: str,
     request: Request,
     name: Optional[str] = Query(None, description="Filter patients by name (non-exact match)", include_in_schema=True),
@@ -80,19 +88,24 @@ def get_patients_by_supervisor_id(
     mask: bool = Query(True, description="Mask sensitive data"),
     pageNo: int = Query(0, description="Page number (starting from 0)"),
     pageSize: int = Query(10, description="Number of records per page"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="nextCursor from a previous page. When provided, keyset pagination is used and pageNo is ignored"),
+    includeTotal: bool = Query(True, description="Set to false to skip computing totalRecords/totalPages"),
+    db: ReadSession = Depends(get_read_db),
 ):
     """Get all patients allocated to a specific supervisor"""
     _ = extract_jwt_payload(request, require_auth)
     
-    db_patients, totalRecords, totalPages = crud_patient.get_patients_by_supervisor(
-        db=db, 
+    db_patients, totalRecords, totalPages, nextCursor = await run_read(
+        db,
+        crud_patient.get_patients_by_supervisor,
         supervisor_id=supervisor_id, 
         mask=mask, 
         pageNo=pageNo, 
         pageSize=pageSize,
         name=name,
-        isActive=isActive
+        isActive=isActive,
+        cursor=cursor,
+        includeTotal=includeTotal
     )
     
     patients = [Patient.model_validate(patient) for patient in db_patients]
@@ -101,11 +114,12 @@ def get_patients_by_supervisor_id(
         pageNo=pageNo, 
         pageSize=pageSize, 
         totalRecords=totalRecords, 
-        totalPages=totalPages
+        totalPages=totalPages,
+        nextCursor=nextCursor
     )
     
 @router.get("/patients/by-caregiver/{caregiver_id}", response_model=PaginatedResponse[Patient])
-def get_patients_by_caregiver_id(
+async def get_patients_by_caregiver_id(
     caregiver_id: str,
     request: Request,
     name: Optional[str] = Query(None, description="Filter patients by name (non-exact match)", include_in_schema=True),
@@ -114,19 +128,24 @@ def get_patients_by_caregiver_id(
     mask: bool = Query(True, description="Mask sensitive data"),
     pageNo: int = Query(0, description="Page number (starting from 0)"),
     pageSize: int = Query(10, description="Number of records per page"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="nextCursor from a previous page. When provided, keyset pagination is used and pageNo is ignored"),
+    includeTotal: bool = Query(True, description="Set to false to skip computing totalRecords/totalPages"),
+    db: ReadSession = Depends(get_read_db),
 ):
     """Get all patients allocated to a specific caregiver"""
     _ = extract_jwt_payload(request, require_auth)
     
-    db_patients, totalRecords, totalPages = crud_patient.get_patients_by_caregiver(
-        db=db, 
+    db_patients, totalRecords, totalPages, nextCursor = await run_read(
+        db,
+        crud_patient.get_patients_by_caregiver,
         caregiver_id=caregiver_id, 
         mask=mask, 
         pageNo=pageNo, 
         pageSize=pageSize,
         name=name,
-        isActive=isActive
+        isActive=isActive,
+        cursor=cursor,
+        includeTotal=includeTotal
     )
     
     patients = [Patient.model_validate(patient) for patient in db_patients]
@@ -135,11 +154,12 @@ def get_patients_by_caregiver_id(
         pageNo=pageNo, 
         pageSize=pageSize, 
         totalRecords=totalRecords, 
-        totalPages=totalPages
+        totalPages=totalPages,
+        nextCursor=nextCursor
     )
 
 @router.get("/patients/by-guardian/{guardian_application_user_id}", response_model=PaginatedResponse[Patient])
-def get_patients_by_guardian_application_user_id(
+async def get_patients_by_guardian_application_user_id(
     guardian_application_user_id: str,
     request: Request,
     name: Optional[str] = Query(None, description="Filter patients by name (non-exact match)", include_in_schema=True),
@@ -148,19 +168,24 @@ def get_patients_by_guardian_application_user_id(
     mask: bool = Query(True, description="Mask sensitive data"),
     pageNo: int = Query(0, description="Page number (starting from 0)"),
     pageSize: int = Query(10, description="Number of records per page"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="nextCursor from a previous page. When provided, keyset pagination is used and pageNo is ignored"),
+    includeTotal: bool = Query(True, description="Set to false to skip computing totalRecords/totalPages"),
+    db: ReadSession = Depends(get_read_db),
 ):
     """Get all patients allocated to a specific guardian by their application user ID"""
     _ = extract_jwt_payload(request, require_auth)
     
-    db_patients, totalRecords, totalPages = crud_patient.get_patients_by_guardian(
-        db=db, 
+    db_patients, totalRecords, totalPages, nextCursor = await run_read(
+        db,
+        crud_patient.get_patients_by_guardian,
         guardian_application_user_id=guardian_application_user_id, 
         mask=mask, 
         pageNo=pageNo, 
         pageSize=pageSize,
         name=name,
-        isActive=isActive
+        isActive=isActive,
+        cursor=cursor,
+        includeTotal=includeTotal
     )
     
     patients = [Patient.model_validate(patient) for patient in db_patients]
@@ -169,9 +194,24 @@ def get_patients_by_guardian_application_user_id(
         pageNo=pageNo, 
         pageSize=pageSize, 
         totalRecords=totalRecords, 
-        totalPages=totalPages
+        totalPages=totalPages,
+        nextCursor=nextCursor
     )
 
+@router.post("/patients/batch", response_model=SingleResponse[List[Patient]])
+def read_patients_batch(
+    batch: PatientBatchRequest,
+    request: Request,
+    require_auth: bool = Query(True, description="Require authentication"),
+    mask: bool = Query(True, description="Mask sensitive data"),
+    db: Session = Depends(get_db),
+):
+    """Get several patients by id in one call. Results keep the order of patientIds; missing ids are omitted."""
+    _ = extract_jwt_payload(request, require_auth)
+    db_patients = crud_patient.get_patients_by_ids(db=db, patient_ids=batch.patientIds, mask=mask)
+    patients = [Patient.model_validate(patient) for patient in db_patients]
+    return SingleResponse(data=patients)
+
 @router.post("/patients/add", response_model=SingleResponse[Patient])
 def create_patient(patient: PatientCreate, request: Request, require_auth: bool = True, db: Session = Depends(get_db)):
     payload = extract_jwt_payload(request, require_auth)
@@ -3,31 +3,31 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
-from app.services.highlight_helper import create_highlight_if_needed
-
 from ..auth.jwt_utils import extract_jwt_payload, get_full_name, get_user_id
 from ..crud import patient_vital_crud as crud_vital
-from ..database import get_db
+from ..database import ReadSession, get_db, get_read_db, run_read
 from ..schemas.patient_vital import (
     PatientVital,
+    PatientVitalBulkCreate,
     PatientVitalCreate,
     PatientVitalDelete,
     PatientVitalUpdate,
 )
 from ..schemas.response import PaginatedResponse, SingleResponse
+from typing import List
 
 router = APIRouter()
 
 # Get the latest vital record for a patient
 @router.get("/Vital", response_model=SingleResponse[PatientVital])
-def get_latest_vital(
+async def get_latest_vital(
     request: Request,
     patient_id: int,
-    db: Session = Depends(get_db),
+    db: ReadSession = Depends(get_read_db),
     require_auth: bool = True
 ):
     _ = extract_jwt_payload(request, require_auth)  # You can also capture the user, if needed
-    db_vital = crud_vital.get_latest_vital(db, patient_id)
+    db_vital = await run_read(db, crud_vital.get_latest_vital, patient_id)
     if not db_vital:
         raise HTTPException(status_code=404, detail="Vital record not found")
 
@@ -36,17 +36,18 @@ def get_latest_vital(
 
 # Get a paginated list of vital records for a patient
 @router.get("/Vital/list", response_model=PaginatedResponse[PatientVital])
-def get_vital_list(
+async def get_vital_list(
     request: Request,
     patient_id: int,
     pageNo: int = 0,
     pageSize: int = 100,
-    db: Session = Depends(get_db),
+    db: ReadSession = Depends(get_read_db),
     require_auth: bool = True
 ):
     _ = extract_jwt_payload(request, require_auth)
-    vitals, totalRecords, totalPages = crud_vital.get_vital_list(
-        db=db,
+    vitals, totalRecords, totalPages = await run_read(
+        db,
+        crud_vital.get_vital_list,
         patient_id=patient_id,
         pageNo=pageNo,
         pageSize=pageSize
@@ -77,6 +78,23 @@ def create_vital(
     
     return SingleResponse(data=vital_data)
 
+# Create many vital records in one call (ward rounds, device uploads)
+@router.post("/Vital/bulk", response_model=SingleResponse[List[PatientVital]])
+def create_vitals_bulk(
+    request: Request,
+    batch: PatientVitalBulkCreate,
+    db: Session = Depends(get_db),
+    require_auth: bool = True
+):
+    payload = extract_jwt_payload(request, require_auth)
+    user_id = get_user_id(payload) or "anonymous"
+    user_full_name = get_full_name(payload) or "Anonymous User"
+
+    db_vitals = crud_vital.create_vitals_bulk(db, batch.vitals, user_id, user_full_name)
+    vitals = [PatientVital.model_validate(db_vital) for db_vital in db_vitals]
+
+    return SingleResponse(data=vitals)
+
 # Update an existing vital record
 @router.put("/Vital/update/{vital_id}", response_model=SingleResponse[PatientVital])
 def update_vital(
@@ -94,19 +112,8 @@ def update_vital(
     if not db_vital:
         raise HTTPException(status_code=404, detail="Vital record not found")
 
+    # update_vital re-evaluates the vital's highlight in the same transaction
     vital_data = PatientVital.model_validate(db_vital)
-    
-    # Calling Highlight function to see if a highlight needs to be created
-    create_highlight_if_needed(
-        db=db,
-        source_record=vital_data,
-        type_code="VITAL",
-        patient_id=vital_data.PatientId,
-        source_table="VITAL",
-        created_by=user_id
-    )
-    
-    
     return SingleResponse(data=vital_data)
 
 # Soft delete a vital record
@@ -1,6 +1,6 @@
 import re
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -49,3 +49,14 @@ class Patient(PatientBase):
     ModifiedById: str = Field(json_schema_extra={"example": "1"})
     preferred_language: Optional[str] = None
     model_config = {"from_attributes": True}
+
+
+MAX_PATIENT_BATCH_SIZE = 200
+
+class PatientBatchRequest(BaseModel):
+    patientIds: List[int] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_PATIENT_BATCH_SIZE,
+        json_schema_extra={"example": [1, 2, 3]},
+    )  # Results are returned in this order; unknown or deleted ids are skipped
@@ -1,6 +1,6 @@
 from pydantic import BaseModel,Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class PatientVitalBase(BaseModel):
     IsDeleted: Optional[str] = '0'
@@ -24,6 +24,11 @@ class PatientVitalUpdate(PatientVitalBase):
     ModifiedById: str = Field(json_schema_extra={"example": "1"})
     UpdatedDateTime: Optional[datetime] = None
 
+MAX_VITAL_BULK_SIZE = 500
+
+class PatientVitalBulkCreate(BaseModel):
+    vitals: List[PatientVitalCreate] = Field(..., min_length=1, max_length=MAX_VITAL_BULK_SIZE)
+
 class PatientVitalDelete(BaseModel):
     Id: int
 
@@ -9,5 +9,6 @@ class PaginatedResponse(BaseModel, Generic[T]):
     data: List[T]
     pageNo: int
     pageSize: int
-    totalRecords: int
-    totalPages: int
+    totalRecords: Optional[int] = None  # None when the caller passed includeTotal=false
+    totalPages: Optional[int] = None
+    nextCursor: Optional[str] = None  # Opaque keyset cursor for the next page (only set by endpoints that support cursor mode)
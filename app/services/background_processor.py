@@ -1,29 +1,50 @@
 import asyncio
 import logging
 import signal
+import time
 from datetime import datetime
 from typing import Optional
 
+from ..config import Config
+from ..services.highlight_queue_service import get_highlight_queue_service
 from ..services.outbox_service import get_outbox_service
 
 logger = logging.getLogger(__name__)
 
 
 class OutboxProcessor:
-    """Background processor for outbox events"""
+    """
+    Background processor for outbox events.
     
-    def __init__(self, poll_interval: int = 2, batch_size: int = 10):
-        self.poll_interval = poll_interval
-        self.batch_size = batch_size
+    Relay modes (Config.Outbox.RELAY_MODE):
+    - "event": sleeps until an outbox event commits in this process (or MAX_WAIT_SECONDS passes,
+      to pick up events from other replicas and retries), then publishes a batch
+    - "poll": publishes a batch every poll_interval seconds
+    In both modes a full batch is followed immediately by the next one until the backlog drains.
+    """
+    
+    def __init__(self, poll_interval: Optional[float] = None, batch_size: Optional[int] = None, relay_mode: Optional[str] = None):
+        self.poll_interval = poll_interval if poll_interval is not None else Config.Outbox.POLL_INTERVAL_SECONDS
+        self.batch_size = batch_size if batch_size is not None else Config.Outbox.BATCH_SIZE
+        self.relay_mode = relay_mode or Config.Outbox.RELAY_MODE
+        self.max_wait = Config.Outbox.MAX_WAIT_SECONDS
+        self.linger = Config.Outbox.LINGER_MS / 1000
         self.outbox_service = get_outbox_service()
         self._running = False
         self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
         
         # Simple stats
         self.stats = {
+            'relay_mode': self.relay_mode,
+            'batch_size': self.batch_size,
             'total_processed': 0,
             'total_successful': 0,
             'total_failed': 0,
+            'batches': 0,
+            'wakeups': 0,
+            'last_batch_ms': None,
             'last_run': None,
             'status': 'stopped'
         }
@@ -36,7 +57,12 @@ class OutboxProcessor:
         
         self._running = True
         self.stats['status'] = 'running'
-        logger.info(f"Starting outbox processor (poll_interval={self.poll_interval}s, batch_size={self.batch_size})")
+        logger.info(f"Starting outbox processor (mode={self.relay_mode}, poll_interval={self.poll_interval}s, batch_size={self.batch_size})")
+        
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        if self.relay_mode == "event":
+            self.outbox_service.add_commit_listener(self.notify)
         
         # Set up signal handlers
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -54,6 +80,13 @@ class OutboxProcessor:
         finally:
             self._running = False
             self.stats['status'] = 'stopped'
+            self.outbox_service.remove_commit_listener(self.notify)
+    
+    def notify(self):
+        """Wake the relay (safe to call from any thread, e.g. a request's after-commit hook)"""
+        if self._loop is None or self._wakeup is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._wakeup.set)
     
     async def stop(self):
         """Stop the processor"""
@@ -80,6 +113,7 @@ class OutboxProcessor:
         """Main processing loop"""
         while self._running:
             try:
+                started = time.monotonic()
                 # Process events in thread pool to avoid blocking
                 successful, failed = await asyncio.to_thread(
                     self.outbox_service.process_pending_events,
@@ -91,17 +125,36 @@ class OutboxProcessor:
                 self.stats['total_successful'] += successful
                 self.stats['total_failed'] += failed
                 self.stats['last_run'] = datetime.now().isoformat()
-                
                 if successful > 0 or failed > 0:
+                    self.stats['batches'] += 1
+                    self.stats['last_batch_ms'] = round((time.monotonic() - started) * 1000, 1)
                     logger.info(f"Processed {successful + failed} events - Success: {successful}, Failed: {failed}")
                 
+                # Backlog: go straight on to the next batch
+                if successful + failed >= self.batch_size:
+                    continue
+                
                 # Wait for next cycle
-                await asyncio.sleep(self.poll_interval)
+                await self._wait_for_work()
                 
             except Exception as e:
                 logger.error(f"Error in processing loop: {str(e)}")
                 await asyncio.sleep(min(self.poll_interval, 30))  # Back off on errors
     
+    async def _wait_for_work(self):
+        if self.relay_mode != "event":
+            await asyncio.sleep(self.poll_interval)
+            return
+        
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self.max_wait)
+            self.stats['wakeups'] += 1
+            if self.linger > 0:
+                await asyncio.sleep(self.linger)  # Let a burst of commits land in one batch
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+    
     def get_stats(self) -> dict:
         """Get processor statistics"""
         return self.stats.copy()
@@ -111,8 +164,109 @@ class OutboxProcessor:
         return self._running
 
 
+class HighlightQueueProcessor:
+    """
+    Background worker for deferred highlight evaluation (Config.Highlight.EVALUATION_MODE = "deferred").
+    
+    Drains HIGHLIGHT_WORK_ITEMS in batches every poll_interval seconds (straight on while a backlog
+    remains), so highlights trail their clinical records by roughly one poll interval.
+    """
+    
+    def __init__(self, poll_interval: Optional[float] = None, batch_size: Optional[int] = None):
+        self.poll_interval = poll_interval if poll_interval is not None else Config.Highlight.QUEUE_POLL_INTERVAL_SECONDS
+        self.batch_size = batch_size if batch_size is not None else Config.Highlight.QUEUE_BATCH_SIZE
+        self.queue_service = get_highlight_queue_service()
+        self._running = False
+        self._task: Optional[asyncio.Task] = None
+        
+        self.stats = {
+            'batch_size': self.batch_size,
+            'poll_interval': self.poll_interval,
+            'total_evaluated': 0,
+            'total_failed': 0,
+            'batches': 0,
+            'last_batch_ms': None,
+            'last_run': None,
+            'status': 'stopped'
+        }
+    
+    async def start(self):
+        """Start the worker"""
+        if self._running:
+            logger.warning("Highlight queue processor already running")
+            return
+        
+        self._running = True
+        self.stats['status'] = 'running'
+        logger.info(f"Starting highlight queue processor (poll_interval={self.poll_interval}s, batch_size={self.batch_size})")
+        
+        self._task = asyncio.create_task(self._process_loop())
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            logger.info("Highlight queue processor cancelled")
+        except Exception as e:
+            logger.error(f"Highlight queue processor error: {str(e)}")
+        finally:
+            self._running = False
+            self.stats['status'] = 'stopped'
+    
+    async def stop(self):
+        """Stop the worker"""
+        if not self._running:
+            return
+        
+        logger.info("Stopping highlight queue processor...")
+        self._running = False
+        self.stats['status'] = 'stopping'
+        
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+    
+    async def _process_loop(self):
+        """Main processing loop"""
+        while self._running:
+            try:
+                started = time.monotonic()
+                evaluated, failed = await asyncio.to_thread(
+                    self.queue_service.process_pending_items,
+                    self.batch_size
+                )
+                
+                self.stats['total_evaluated'] += evaluated
+                self.stats['total_failed'] += failed
+                self.stats['last_run'] = datetime.now().isoformat()
+                if evaluated > 0 or failed > 0:
+                    self.stats['batches'] += 1
+                    self.stats['last_batch_ms'] = round((time.monotonic() - started) * 1000, 1)
+                    logger.info(f"Evaluated {evaluated} queued highlights - Failed: {failed}")
+                
+                # Backlog: go straight on to the next batch
+                if evaluated + failed >= self.batch_size:
+                    continue
+                
+                await asyncio.sleep(self.poll_interval)
+                
+            except Exception as e:
+                logger.error(f"Error in highlight queue loop: {str(e)}")
+                await asyncio.sleep(min(self.poll_interval * 5, 30))  # Back off on errors
+    
+    def get_stats(self) -> dict:
+        """Get worker statistics"""
+        return self.stats.copy()
+    
+    def is_running(self) -> bool:
+        """Check if worker is running"""
+        return self._running
+
+
 # Global processor instance
 _processor: Optional[OutboxProcessor] = None
+_highlight_processor: Optional[HighlightQueueProcessor] = None
 
 
 def get_processor() -> OutboxProcessor:
@@ -123,6 +277,14 @@ def get_processor() -> OutboxProcessor:
     return _processor
 
 
+def get_highlight_processor() -> HighlightQueueProcessor:
+    """Get or create highlight queue processor instance"""
+    global _highlight_processor
+    if _highlight_processor is None:
+        _highlight_processor = HighlightQueueProcessor()
+    return _highlight_processor
+
+
 # FastAPI lifespan integration
 async def outbox_lifespan(app):
     """FastAPI lifespan context manager for outbox processor"""
@@ -160,9 +322,11 @@ async def run_standalone():
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     
+    # A standalone process never sees the API's commits, so it can only poll
     processor = OutboxProcessor(
         poll_interval=args.poll_interval,
-        batch_size=args.batch_size
+        batch_size=args.batch_size,
+        relay_mode="poll"
     )
     
     try:
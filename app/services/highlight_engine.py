@@ -0,0 +1,188 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_, insert, or_, update
+from sqlalchemy.orm import Session, load_only
+
+from app.config import Config
+from app.models.patient_highlight_model import PatientHighlight
+from app.models.patient_highlight_type_model import PatientHighlightType
+from app.services.reference_list_cache import get_reference_list_cache
+from app.strategies.highlights.strategy_factory import HighlightStrategyFactory
+
+logger = logging.getLogger(__name__)
+
+
+class HighlightCandidate(NamedTuple):
+    """A source record to evaluate for a highlight"""
+    source_table: str
+    source_record_id: int
+    record: Any
+    # Defaults to the record's PatientId / PatientID
+    patient_id: Optional[int] = None
+
+
+class HighlightTypeInfo(NamedTuple):
+    """Snapshot of a PATIENT_HIGHLIGHT_TYPE row (safe to share across sessions)"""
+    Id: int
+    TypeCode: str
+    IsEnabled: bool
+
+
+# TypeCode -> (expires_at, HighlightTypeInfo or None when the type does not exist)
+_type_cache: Dict[str, Tuple[float, Optional[HighlightTypeInfo]]] = {}
+_type_cache_lock = threading.Lock()
+
+
+def get_highlight_type(db: Session, type_code: str) -> Optional[HighlightTypeInfo]:
+    """Look up a highlight type by code, cached for Config.Highlight.TYPE_CACHE_TTL_SECONDS"""
+    now = time.monotonic()
+    with _type_cache_lock:
+        cached = _type_cache.get(type_code)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    highlight_type = db.query(PatientHighlightType).filter(
+        PatientHighlightType.TypeCode == type_code,
+        PatientHighlightType.IsDeleted == False
+    ).first()
+    info = None
+    if highlight_type:
+        # IsEnabled is a BIT, but may come back as "0"/"1" depending on the driver
+        is_enabled = highlight_type.IsEnabled not in (False, None, "0")
+        info = HighlightTypeInfo(highlight_type.Id, highlight_type.TypeCode, is_enabled)
+
+    with _type_cache_lock:
+        _type_cache[type_code] = (now + Config.Highlight.TYPE_CACHE_TTL_SECONDS, info)
+    return info
+
+
+def invalidate_highlight_type_cache(type_code: Optional[str] = None) -> None:
+    """Drop one cached highlight type (or all of them) after it was created, changed or deleted"""
+    with _type_cache_lock:
+        if type_code is None:
+            _type_cache.clear()
+        else:
+            _type_cache.pop(type_code, None)
+
+
+# Highlight type changes (made here or on another replica) reach the engine through the reference list cache
+get_reference_list_cache().add_invalidation_listener(PatientHighlightType.__tablename__, invalidate_highlight_type_cache)
+
+
+def _get_existing_highlights(db: Session, keys: Iterable[Tuple[str, int]]) -> Dict[Tuple[str, int], int]:
+    """Active highlight Id per (SourceTable, SourceRecordId), in one query"""
+    ids_by_table: Dict[str, set] = {}
+    for source_table, source_record_id in keys:
+        ids_by_table.setdefault(source_table, set()).add(source_record_id)
+    if not ids_by_table:
+        return {}
+
+    highlights = db.query(PatientHighlight).options(
+        load_only(PatientHighlight.Id, PatientHighlight.SourceTable, PatientHighlight.SourceRecordId)
+    ).filter(
+        or_(*[
+            and_(PatientHighlight.SourceTable == source_table, PatientHighlight.SourceRecordId.in_(record_ids))
+            for source_table, record_ids in ids_by_table.items()
+        ]),
+        PatientHighlight.IsDeleted == 0
+    ).all()
+
+    existing = {}
+    for highlight in highlights:
+        existing.setdefault((highlight.SourceTable, highlight.SourceRecordId), highlight.Id)
+    return existing
+
+
+def apply_highlights(
+    db: Session,
+    type_code: str,
+    candidates: List[HighlightCandidate],
+    modified_by: str
+) -> Dict[str, int]:
+    """
+    Batch version of create_highlight_if_needed: evaluates many source records of one highlight type
+    and creates, updates or deletes (IsDeleted=1) their highlights with one bulk statement each.
+
+    Runs in the caller's transaction - nothing is committed here.
+
+    Returns:
+        {"created": n, "updated": n, "deleted": n}
+    """
+    counts = {"created": 0, "updated": 0, "deleted": 0}
+    # Last candidate wins when a source record appears more than once
+    candidates = list({(c.source_table, c.source_record_id): c for c in candidates}.values())
+    if not candidates:
+        return counts
+
+    highlight_type = get_highlight_type(db, type_code)
+    if not highlight_type:
+        logger.warning(f"Highlight type not found for code: {type_code}")
+        return counts
+
+    # Sessions run with autoflush off: make the caller's pending changes visible to the queries below
+    db.flush()
+    existing = _get_existing_highlights(db, [(c.source_table, c.source_record_id) for c in candidates])
+    now = datetime.now()
+    new_rows, updated_rows, deleted_ids = [], [], []
+
+    if not highlight_type.IsEnabled:
+        # Disabled type: only remove the highlights these records already have
+        logger.info(f"Highlight type '{type_code}' is DISABLED (IsEnabled=0). Deleting {len(existing)} existing highlights.")
+        deleted_ids = list(existing.values())
+    else:
+        # One strategy instance per batch (strategies keep per-call state, so they are not shared across requests)
+        factory = HighlightStrategyFactory()
+        if not factory.has_strategy(type_code):
+            logger.warning(f"No strategy found for type_code: {type_code}")
+            return counts
+        strategy = factory.get_strategy(type_code)
+
+        for candidate in candidates:
+            existing_id = existing.get((candidate.source_table, candidate.source_record_id))
+            should_highlight = strategy.should_generate_highlight(candidate.record, db=db)
+
+            if should_highlight and existing_id is None:
+                patient_id = candidate.patient_id
+                if patient_id is None:
+                    patient_id = getattr(candidate.record, "PatientId", None) or getattr(candidate.record, "PatientID", None)
+                new_rows.append({
+                    "PatientId": patient_id,
+                    "HighlightTypeId": highlight_type.Id,
+                    "HighlightText": strategy.generate_highlight_text(candidate.record),
+                    "SourceTable": candidate.source_table,
+                    "SourceRecordId": candidate.source_record_id,
+                    "CreatedDate": now,
+                    "ModifiedDate": now,
+                    "IsDeleted": 0,
+                    "CreatedById": modified_by,
+                    "ModifiedById": modified_by,
+                })
+            elif should_highlight:
+                updated_rows.append({
+                    "Id": existing_id,
+                    "HighlightText": strategy.generate_highlight_text(candidate.record),
+                    "ModifiedDate": now,
+                    "ModifiedById": modified_by,
+                })
+            elif existing_id is not None:
+                deleted_ids.append(existing_id)
+
+    if new_rows:
+        db.execute(insert(PatientHighlight), new_rows)
+    if updated_rows:
+        # ORM bulk UPDATE by primary key (executemany)
+        db.execute(update(PatientHighlight), updated_rows)
+    if deleted_ids:
+        db.execute(
+            update(PatientHighlight)
+            .where(PatientHighlight.Id.in_(deleted_ids))
+            .values(IsDeleted=1, ModifiedDate=now, ModifiedById=modified_by)
+        )
+
+    counts.update(created=len(new_rows), updated=len(updated_rows), deleted=len(deleted_ids))
+    logger.info(f"Highlights for {len(candidates)} {type_code} records: {counts}")
+    return counts
@@ -0,0 +1,185 @@
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from ..config import Config
+from ..models.highlight_work_item_model import HighlightWorkItem, HighlightWorkStatus
+from ..strategies.highlights.strategy_factory import HighlightStrategyFactory
+from .highlight_engine import HighlightCandidate, apply_highlights
+
+logger = logging.getLogger(__name__)
+
+
+def is_deferred_mode() -> bool:
+    """True when highlights are evaluated by the queue worker instead of inside the write"""
+    return Config.Highlight.EVALUATION_MODE == "deferred"
+
+
+def enqueue_highlight_evaluation(
+    db: Session,
+    type_code: str,
+    source_table: str,
+    source_record_id: int,
+    patient_id: int,
+    requested_by: str
+) -> HighlightWorkItem:
+    """Queue a highlight evaluation in the caller's transaction (nothing is committed here)"""
+    item = HighlightWorkItem(
+        type_code=type_code,
+        source_table=source_table,
+        source_record_id=source_record_id,
+        patient_id=patient_id,
+        requested_by=requested_by,
+        status=HighlightWorkStatus.PENDING,
+        retry_count=0,
+        created_at=datetime.now()
+    )
+    db.add(item)
+    return item
+
+
+class HighlightQueueService:
+    """Drains HIGHLIGHT_WORK_ITEMS in batches through the highlight engine"""
+
+    def __init__(self):
+        self.instance_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"[:100]
+
+    def process_pending_items(self, batch_size: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Evaluate one batch of queued items.
+
+        Items are grouped per (type_code, requested_by); each group's source records are loaded with one
+        IN query and applied with apply_highlights in a savepoint, so one failing group does not undo the
+        others. Evaluated items are deleted, failed ones retried up to Config.Highlight.QUEUE_MAX_RETRIES.
+
+        Returns:
+            (evaluated, failed) item counts
+        """
+        from ..database import SessionLocal
+
+        batch_size = batch_size or Config.Highlight.QUEUE_BATCH_SIZE
+        db = SessionLocal()
+        try:
+            items = self.claim_batch(db, batch_size)
+            if not items:
+                return 0, 0
+
+            groups: Dict[Tuple[str, str], List[HighlightWorkItem]] = {}
+            for item in items:
+                groups.setdefault((item.type_code, item.requested_by), []).append(item)
+
+            factory = HighlightStrategyFactory()
+            done: List[HighlightWorkItem] = []
+            failed = 0
+            for (type_code, requested_by), group in groups.items():
+                try:
+                    with db.begin_nested():
+                        strategy = factory.get_strategy(type_code)
+                        records = strategy.load_source_records(db, [item.source_record_id for item in group])
+                        candidates = [
+                            HighlightCandidate(item.source_table, item.source_record_id, records[item.source_record_id], item.patient_id)
+                            for item in group
+                            if item.source_record_id in records
+                        ]
+                        missing = len(group) - len(candidates)
+                        if missing:
+                            logger.warning(f"{missing} queued {type_code} highlight evaluations refer to missing source records")
+                        apply_highlights(db, type_code, candidates, requested_by)
+                    done.extend(group)
+                except Exception as e:
+                    logger.error(f"Deferred highlight evaluation failed for {len(group)} {type_code} items: {str(e)}")
+                    for item in group:
+                        item.mark_failed(str(e), Config.Highlight.QUEUE_MAX_RETRIES)
+                    failed += len(group)
+
+            if done:
+                db.query(HighlightWorkItem).filter(
+                    HighlightWorkItem.id.in_([item.id for item in done])
+                ).delete(synchronize_session=False)
+            db.commit()
+            return len(done), failed
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def claim_batch(self, db: Session, batch_size: int) -> List[HighlightWorkItem]:
+        """
+        Lease up to batch_size pending items to this worker instance (same scheme as
+        OutboxService.claim_batch): rows another replica is claiming are skipped with READPAST.
+
+        Returns:
+            Claimed items in queue order
+        """
+        now = datetime.now()
+        candidate_ids = [
+            row.id for row in db.query(HighlightWorkItem.id)
+            .with_hint(HighlightWorkItem, "WITH (UPDLOCK, ROWLOCK, READPAST)", "mssql")
+            .filter(
+                HighlightWorkItem.status == HighlightWorkStatus.PENDING,
+                or_(HighlightWorkItem.lease_until.is_(None), HighlightWorkItem.lease_until < now)
+            )
+            .order_by(HighlightWorkItem.id.asc())
+            .limit(batch_size)
+            .all()
+        ]
+
+        if not candidate_ids:
+            db.commit()
+            return []
+
+        db.query(HighlightWorkItem).filter(HighlightWorkItem.id.in_(candidate_ids)).update(
+            {
+                HighlightWorkItem.claimed_by: self.instance_id,
+                HighlightWorkItem.lease_until: now + timedelta(seconds=Config.Highlight.QUEUE_LEASE_SECONDS)
+            },
+            synchronize_session=False
+        )
+        db.commit()
+
+        return db.query(HighlightWorkItem).filter(
+            HighlightWorkItem.id.in_(candidate_ids),
+            HighlightWorkItem.claimed_by == self.instance_id
+        ).order_by(HighlightWorkItem.id.asc()).all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth per status and the age of the oldest pending item (the current consistency lag)"""
+        from ..database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            counts = dict(
+                db.query(HighlightWorkItem.status, func.count(HighlightWorkItem.id))
+                .group_by(HighlightWorkItem.status)
+                .all()
+            )
+            oldest_pending = db.query(func.min(HighlightWorkItem.created_at)).filter(
+                HighlightWorkItem.status == HighlightWorkStatus.PENDING
+            ).scalar()
+
+            return {
+                'mode': Config.Highlight.EVALUATION_MODE,
+                'pending': counts.get(HighlightWorkStatus.PENDING, 0),
+                'failed': counts.get(HighlightWorkStatus.FAILED, 0),
+                'oldest_pending_seconds': round((datetime.now() - oldest_pending).total_seconds(), 1) if oldest_pending else None
+            }
+        finally:
+            db.close()
+
+
+# Singleton instance
+_highlight_queue_service = None
+
+def get_highlight_queue_service() -> HighlightQueueService:
+    """Get singleton highlight queue service"""
+    global _highlight_queue_service
+    if _highlight_queue_service is None:
+        _highlight_queue_service = HighlightQueueService()
+    return _highlight_queue_service
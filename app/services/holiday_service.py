@@ -10,7 +10,8 @@ logger = logging.getLogger(__name__)
 class HolidayService:
     """
     Holiday service that uses PyPI's Holiday Library.
-    This service is called once every highlight hard deletion cronjob execution to load holidays for the year.
+    Used to build the process-wide business-day calendar (app/utils/business_calendar.py), which loads
+    holidays once per process instead of once per cronjob execution.
     """
     def __init__(self, country: str = "SG", years: list = None):
         self.country = country
@@ -0,0 +1,101 @@
+import logging
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+
+from ..config import Config
+from ..messaging.producer_manager import ProducerManager, get_lane_producer_manager
+from ..models.outbox_model import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+
+def lane_for(aggregate_id: str, lane_count: int) -> int:
+    """
+    Stable lane index for an aggregate.
+    crc32 (not hash()) so every process and replica maps an aggregate to the same lane.
+    """
+    return zlib.crc32(str(aggregate_id).encode("utf-8")) % lane_count
+
+
+class OutboxDispatcher:
+    """
+    Publishes a batch of outbox events over K parallel lanes.
+
+    Events are partitioned by hash(aggregate_id), so all events of one aggregate (e.g. one patient)
+    land in the same lane and keep their created_at order, while unrelated aggregates publish in
+    parallel. Each lane publishes through its own producer connection.
+    """
+
+    def __init__(
+        self,
+        lane_count: Optional[int] = None,
+        producer_factory: Callable[[int], ProducerManager] = get_lane_producer_manager,
+        exchange: str = "patient.updates",
+    ):
+        self.lane_count = lane_count or Config.Outbox.LANES
+        self.producer_factory = producer_factory
+        self.exchange = exchange
+        self._executor = ThreadPoolExecutor(max_workers=self.lane_count, thread_name_prefix="outbox-lane")
+        self._lock = threading.Lock()
+        self.lane_stats: List[Dict[str, int]] = [
+            {"lane": lane, "published": 0, "failed": 0, "skipped": 0, "last_batch_size": 0}
+            for lane in range(self.lane_count)
+        ]
+
+    def dispatch(self, events: Sequence[OutboxEvent], timeout: float) -> List[Optional[bool]]:
+        """
+        Publish events (already in created_at order) and wait for the broker confirms.
+
+        Returns:
+            Per event True (confirmed), False (failed) or None (not attempted; an earlier event of
+            the same aggregate failed)
+        """
+        lanes: Dict[int, List[int]] = {}
+        for index, event in enumerate(events):
+            lanes.setdefault(lane_for(event.aggregate_id, self.lane_count), []).append(index)
+
+        futures = {
+            lane: self._executor.submit(self._publish_lane, lane, [events[i] for i in indexes], timeout)
+            for lane, indexes in lanes.items()
+        }
+
+        results: List[Optional[bool]] = [None] * len(events)
+        for lane, future in futures.items():
+            try:
+                lane_results = future.result()
+            except Exception as e:
+                logger.error(f"Outbox lane {lane} failed: {str(e)}")
+                lane_results = [False] * len(lanes[lane])
+            for index, result in zip(lanes[lane], lane_results):
+                results[index] = result
+            self._record(lane, lane_results)
+        return results
+
+    def _publish_lane(self, lane: int, events: List[OutboxEvent], timeout: float) -> List[Optional[bool]]:
+        producer = self.producer_factory(lane)
+        return producer.publish_batch(
+            exchange=self.exchange,
+            messages=[(event.routing_key, event.get_payload()) for event in events],
+            ordering_keys=[event.aggregate_id for event in events],
+            timeout=timeout,
+        )
+
+    def _record(self, lane: int, lane_results: List[Optional[bool]]):
+        with self._lock:
+            stats = self.lane_stats[lane]
+            stats["published"] += sum(1 for result in lane_results if result)
+            stats["failed"] += sum(1 for result in lane_results if result is False)
+            stats["skipped"] += sum(1 for result in lane_results if result is None)
+            stats["last_batch_size"] = len(lane_results)
+
+    def get_stats(self, pending_by_aggregate: Optional[Dict[str, int]] = None) -> Dict:
+        """Lane counters, plus per-lane backlog when given pending counts per aggregate_id"""
+        backlog = [0] * self.lane_count
+        for aggregate_id, count in (pending_by_aggregate or {}).items():
+            backlog[lane_for(aggregate_id, self.lane_count)] += count
+
+        with self._lock:
+            lanes = [dict(stats, backlog=backlog[stats["lane"]]) for stats in self.lane_stats]
+        return {"lane_count": self.lane_count, "lanes": lanes}
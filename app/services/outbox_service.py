@@ -1,15 +1,57 @@
+from sqlalchemy import and_, event as sa_event, func, insert, or_, select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import Dict, Any, List, Tuple
+from datetime import datetime, timedelta
+from typing import Dict, Any, Callable, List, Optional, Tuple
 import json
 import logging
+import os
+import socket
 import uuid
 
-from ..models.outbox_model import OutboxEvent, OutboxStatus
+from ..config import Config
+from ..models.outbox_model import OutboxEvent, OutboxEventArchive, OutboxStatus
 from ..messaging.producer_manager import get_producer_manager
+from .outbox_dispatcher import OutboxDispatcher
 
 logger = logging.getLogger(__name__)
 
+_PENDING_OUTBOX_FLAG = "outbox_events_pending"
+
+
+def _awaiting_publish():
+    """Events the relay still has to publish: PENDING ones, and FAILED ones with attempts left"""
+    return and_(
+        OutboxEvent.status.in_((OutboxStatus.PENDING, OutboxStatus.FAILED)),
+        OutboxEvent.retry_count < 3
+    )
+
+
+@sa_event.listens_for(Session, "after_commit")
+def _wake_relay_after_commit(session):
+    if session.info.pop(_PENDING_OUTBOX_FLAG, False) and _outbox_service is not None:
+        _outbox_service._notify_commit()
+
+
+@sa_event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session, previous_transaction):
+    session.info.pop(_PENDING_OUTBOX_FLAG, None)
+
+
+def compact_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compact form of an update event payload: drops the old_data / new_data entity copies and keeps
+    only the changes, plus entity_version (the entity's modified timestamp) so consumers can tell
+    which version of the entity the changes lead to. Payloads without changes are returned as-is.
+    """
+    if 'changes' not in payload or not ({'old_data', 'new_data'} & payload.keys()):
+        return payload
+    
+    compact = {key: value for key, value in payload.items() if key not in ('old_data', 'new_data')}
+    compact['payload_format'] = 'compact'
+    compact['entity_version'] = payload.get('timestamp')
+    return compact
+
 
 class OutboxService:
     """
@@ -18,6 +60,26 @@ class OutboxService:
     
     def __init__(self):
         self.producer_manager = get_producer_manager()
+        self.dispatcher = OutboxDispatcher()
+        # Identifies this relay in OutboxEvent.claimed_by (pod hostname is unique per replica)
+        self.instance_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"[:100]
+        self._commit_listeners: List[Callable[[], None]] = []
+    
+    def add_commit_listener(self, listener: Callable[[], None]) -> None:
+        """Register a callback run after a transaction that created outbox events commits"""
+        if listener not in self._commit_listeners:
+            self._commit_listeners.append(listener)
+    
+    def remove_commit_listener(self, listener: Callable[[], None]) -> None:
+        if listener in self._commit_listeners:
+            self._commit_listeners.remove(listener)
+    
+    def _notify_commit(self) -> None:
+        for listener in list(self._commit_listeners):
+            try:
+                listener()
+            except Exception as e:
+                logger.error(f"Outbox commit listener failed: {str(e)}")
     
     def create_event(
         self,
@@ -53,10 +115,14 @@ class OutboxService:
                 created_by=created_by
             )
             
-            outbox_event.set_payload(payload)
+            if Config.Outbox.PAYLOAD_FORMAT == "compact":
+                payload = compact_payload(payload)
+            outbox_event.set_payload(payload, compress_min_bytes=Config.Outbox.COMPRESS_MIN_BYTES)
             
             db.add(outbox_event)
             db.flush()  # Get ID without committing
+            if isinstance(db, Session):
+                db.info[_PENDING_OUTBOX_FLAG] = True  # Wake the relay once this transaction commits
             
             logger.debug(f"Created outbox event: {outbox_event.id} (correlation: {correlation_id})")
             return outbox_event
@@ -79,6 +145,13 @@ class OutboxService:
         """
         Process pending outbox events.
         
+        The batch is split into lanes by hash(aggregate_id) and the lanes publish in parallel (see
+        OutboxDispatcher). Each message is confirmed by the broker before the event is marked
+        PUBLISHED. Ordering is kept per aggregate_id: an aggregate always uses the same lane, and
+        once an event fails, later events of the same aggregate in the batch stay PENDING for the
+        next run instead of overtaking it. The failed event is FAILED but still retryable, so the next
+        run claims it again ahead of them (until its attempts are used up).
+        
         Args:
             batch_size: Number of events to process
             
@@ -92,46 +165,25 @@ class OutboxService:
         
         db = SessionLocal()
         try:
-            # Get pending events - ORDERED BY created_at for proper sequencing
-            pending_events = db.query(OutboxEvent).filter(
-                OutboxEvent.status == OutboxStatus.PENDING
-            ).filter(
-                OutboxEvent.retry_count < 3
-            ).order_by(OutboxEvent.created_at.asc()).limit(batch_size).all()  # ASC for sequential processing
-            
-            for i, event in enumerate(pending_events, 1):
-                logger.info(f"Processing event {i}/{len(pending_events)}: {event.correlation_id[:8]}...")
-                
-                try:
-                    # Publish to message queue
-                    payload = event.get_payload()
-                    logger.info(f"Publishing event {event.id} (correlation: {event.correlation_id}) to exchange")
-                    logger.debug(f"Payload: {payload.get('event_type')} for patient {payload.get('patient_id')}")
-                    
-                    success = self.producer_manager.publish(
-                        exchange='patient.updates',  # Fixed exchange for simplicity
-                        routing_key=event.routing_key,
-                        message=payload
-                    )
-                    
-                    if success:
-                        event.mark_published()
-                        successful += 1
-                        logger.info(f"Successfully published event {event.id} (correlation: {event.correlation_id})")
-                        
-                        # Add small delay between messages to ensure proper sequencing
-                        if i < len(pending_events):  # Don't delay after the last message
-                            import time
-                            time.sleep(0.5)
-                    else:
-                        event.mark_failed("Failed to publish to message queue")
-                        failed += 1
-                        logger.warning(f"Failed to publish event {event.id} (correlation: {event.correlation_id})")
-                
-                except Exception as e:
-                    event.mark_failed(f"Error: {str(e)}")
+            pending_events = self.claim_batch(db, batch_size)
+            
+            if not pending_events:
+                return 0, 0
+            
+            logger.info(f"Publishing batch of {len(pending_events)} outbox events over {self.dispatcher.lane_count} lanes")
+            results = self.dispatcher.dispatch(pending_events, timeout=Config.Outbox.CONFIRM_TIMEOUT_SECONDS)
+            
+            for event, result in zip(pending_events, results):
+                if result:
+                    event.mark_published()
+                    successful += 1
+                elif result is False:
+                    event.mark_failed("Failed to publish to message queue")
                     failed += 1
-                    logger.error(f"Error processing event {event.id}: {str(e)}")
+                    logger.warning(f"Failed to publish event {event.id} (correlation: {event.correlation_id})")
+                # None: not attempted (earlier event of the same aggregate failed, or the batch timed out
+                # before it was sent - it never will be) - stays PENDING
+                event.release_claim()
             
             # Commit all status updates
             db.commit()
@@ -147,23 +199,200 @@ class OutboxService:
         
         return successful, failed
     
+    def claim_batch(self, db: Session, batch_size: int) -> List[OutboxEvent]:
+        """
+        Lease up to batch_size pending events to this relay instance so replicas take disjoint batches.
+        FAILED events with attempts left are claimed again too, in created_at order, so a failed event
+        is retried before the later events of its aggregate are published.
+        
+        1. In one short transaction, pick unleased (or lease-expired) pending rows with
+           WITH (UPDLOCK, ROWLOCK, READPAST) - rows another replica is claiming are skipped, not waited
+           on - and stamp them with claimed_by / lease_until.
+        2. Aggregates that currently have live leases held by another replica are not picked, and any
+           claimed event with an earlier pending (or retryable failed) event of the same aggregate that
+           this instance does not own is released again, so per-aggregate order holds across replicas.
+        
+        Returns:
+            Claimed events in created_at order
+        """
+        now = datetime.now()
+        busy_aggregates = db.query(OutboxEvent.aggregate_id).filter(
+            _awaiting_publish(),
+            OutboxEvent.lease_until >= now,
+            OutboxEvent.claimed_by != self.instance_id
+        )
+        
+        candidate_ids = [
+            row.id for row in db.query(OutboxEvent.id)
+            .with_hint(OutboxEvent, "WITH (UPDLOCK, ROWLOCK, READPAST)", "mssql")
+            .filter(
+                _awaiting_publish(),
+                or_(OutboxEvent.lease_until.is_(None), OutboxEvent.lease_until < now),
+                ~OutboxEvent.aggregate_id.in_(busy_aggregates)
+            )
+            .order_by(OutboxEvent.created_at.asc())  # ASC for sequential processing
+            .limit(batch_size)
+            .all()
+        ]
+        
+        if not candidate_ids:
+            db.commit()
+            return []
+        
+        db.query(OutboxEvent).filter(OutboxEvent.id.in_(candidate_ids)).update(
+            {
+                OutboxEvent.claimed_by: self.instance_id,
+                OutboxEvent.lease_until: now + timedelta(seconds=Config.Outbox.LEASE_SECONDS)
+            },
+            synchronize_session=False
+        )
+        db.commit()
+        
+        events = db.query(OutboxEvent).filter(
+            OutboxEvent.id.in_(candidate_ids),
+            OutboxEvent.claimed_by == self.instance_id
+        ).order_by(OutboxEvent.created_at.asc()).all()
+        
+        # Earliest unpublished (pending or retryable failed) event per aggregate that is not ours
+        # (another replica got it first, or READPAST skipped it)
+        foreign_heads = dict(
+            db.query(OutboxEvent.aggregate_id, func.min(OutboxEvent.created_at))
+            .filter(
+                _awaiting_publish(),
+                OutboxEvent.aggregate_id.in_({event.aggregate_id for event in events}),
+                or_(OutboxEvent.claimed_by.is_(None), OutboxEvent.claimed_by != self.instance_id)
+            )
+            .group_by(OutboxEvent.aggregate_id)
+            .all()
+        ) if events else {}
+        
+        claimed = []
+        released = 0
+        for event in events:
+            head = foreign_heads.get(event.aggregate_id)
+            if head is not None and head <= event.created_at:
+                event.release_claim()
+                released += 1
+            else:
+                claimed.append(event)
+        if released:
+            # Persisted with the publish results by the caller's commit
+            logger.info(f"Released {released} claimed outbox events queued behind another replica's events")
+        
+        return claimed
+    
     def get_stats(self) -> Dict[str, Any]:
-        """Get simple statistics"""
+        """Get simple statistics (one grouped COUNT over the status index)"""
+        from ..database import SessionLocal
+        
+        db = SessionLocal()
+        try:
+            counts = dict(
+                db.query(OutboxEvent.status, func.count(OutboxEvent.id))
+                .group_by(OutboxEvent.status)
+                .all()
+            )
+            
+            return {
+                'total': sum(counts.values()),
+                'pending': counts.get(OutboxStatus.PENDING, 0),
+                'published': counts.get(OutboxStatus.PUBLISHED, 0),
+                'failed': counts.get(OutboxStatus.FAILED, 0)
+            }
+        finally:
+            db.close()
+    
+    def get_lane_stats(self) -> Dict[str, Any]:
+        """Get dispatch lane counters and the pending backlog of each lane"""
+        from ..database import SessionLocal
+        
+        db = SessionLocal()
+        try:
+            pending_by_aggregate = dict(
+                db.query(OutboxEvent.aggregate_id, func.count(OutboxEvent.id))
+                .filter(OutboxEvent.status == OutboxStatus.PENDING)
+                .group_by(OutboxEvent.aggregate_id)
+                .all()
+            )
+            return self.dispatcher.get_stats(pending_by_aggregate)
+        finally:
+            db.close()
+    
+    def purge_published_events(
+        self,
+        older_than_days: Optional[int] = None,
+        archive: Optional[bool] = None,
+        chunk_size: Optional[int] = None,
+        max_chunks: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Retention job: delete (optionally archive first) PUBLISHED events older than older_than_days.
+        
+        Rows go in chunks of chunk_size, each chunk its own short transaction, so the purge never holds
+        long locks against the relay. Stops after max_chunks; the next run continues where it left off.
+        """
         from ..database import SessionLocal
         
+        older_than_days = older_than_days if older_than_days is not None else Config.Outbox.RETENTION_DAYS
+        archive = archive if archive is not None else Config.Outbox.ARCHIVE_ON_PURGE
+        chunk_size = chunk_size or Config.Outbox.PURGE_CHUNK_SIZE
+        max_chunks = max_chunks or Config.Outbox.PURGE_MAX_CHUNKS
+        cutoff_date = datetime.now() - timedelta(days=older_than_days)
+        
+        purged = 0
+        chunks = 0
+        complete = False
         db = SessionLocal()
         try:
-            total = db.query(OutboxEvent).count()
-            pending = db.query(OutboxEvent).filter(OutboxEvent.status == OutboxStatus.PENDING).count()
-            published = db.query(OutboxEvent).filter(OutboxEvent.status == OutboxStatus.PUBLISHED).count()
-            failed = db.query(OutboxEvent).filter(OutboxEvent.status == OutboxStatus.FAILED).count()
+            while chunks < max_chunks:
+                ids = [
+                    row.id for row in db.query(OutboxEvent.id)
+                    .with_hint(OutboxEvent, "WITH (ROWLOCK, READPAST)", "mssql")
+                    .filter(
+                        OutboxEvent.status == OutboxStatus.PUBLISHED,
+                        OutboxEvent.created_at < cutoff_date
+                    )
+                    .order_by(OutboxEvent.created_at.asc())
+                    .limit(chunk_size)
+                    .all()
+                ]
+                if not ids:
+                    complete = True
+                    break
+                
+                if archive:
+                    columns = [
+                        'id', 'event_type', 'aggregate_id', 'payload', 'routing_key', 'status',
+                        'correlation_id', 'created_at', 'processed_at', 'created_by'
+                    ]
+                    db.execute(
+                        insert(OutboxEventArchive).from_select(
+                            columns + ['archived_at'],
+                            select(*[getattr(OutboxEvent, column) for column in columns], func.now())
+                            .where(OutboxEvent.id.in_(ids))
+                        )
+                    )
+                
+                purged += db.query(OutboxEvent).filter(
+                    OutboxEvent.id.in_(ids)
+                ).delete(synchronize_session=False)
+                db.commit()
+                chunks += 1
+                if len(ids) < chunk_size:
+                    complete = True  # A short chunk took the last rows past the cutoff
+                    break
             
+            logger.info(f"Outbox retention: {'archived and ' if archive else ''}purged {purged} events older than {cutoff_date.isoformat()} in {chunks} chunks")
             return {
-                'total': total,
-                'pending': pending,
-                'published': published,
-                'failed': failed
+                'purged': purged,
+                'archived': purged if archive else 0,
+                'chunks': chunks,
+                'complete': complete,
+                'cutoff_date': cutoff_date.isoformat()
             }
+        except Exception:
+            db.rollback()
+            raise
         finally:
             db.close()
     
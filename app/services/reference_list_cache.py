@@ -0,0 +1,221 @@
+"""
+Process-wide read-through cache for reference (lookup) lists: PATIENT_LIST_*, ALLERGY_TYPE,
+ALLERGY_REACTION_TYPE, the mobility / dementia stage / prescription / problem / personal preference
+lists and PATIENT_HIGHLIGHT_TYPE.
+
+Lists are cached by table name (plus a key for paginated or filtered variants) for
+Config.ReferenceCache.TTL_SECONDS. The list CRUDs call invalidate_reference_list() after every committed
+create / update / delete, which drops the list here and publishes the invalidation to the other replicas
+(patient.updates exchange, routing key reference.invalidated.<table>, consumed by ReferenceCacheConsumer).
+A lost broadcast only delays the change by at most one TTL.
+
+Cached rows are detached from the session that loaded them and shared between requests: read them,
+never modify them.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.exc import NoInspectionAvailable
+from sqlalchemy.orm import Session
+
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+
+INVALIDATION_EXCHANGE = 'patient.updates'
+INVALIDATION_ROUTING_PREFIX = 'reference.invalidated'
+
+# Identifies this process in broadcasts so it can ignore its own invalidations
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def _row_state(row: Any) -> Any:
+    """Column values of a mapped row (other values as they are) for the ETag"""
+    try:
+        mapper = sa_inspect(row).mapper
+    except NoInspectionAvailable:
+        return row
+    return {attr.key: getattr(row, attr.key) for attr in mapper.column_attrs}
+
+
+def compute_etag(rows: Sequence[Any], extra: Sequence[Any] = ()) -> str:
+    """Strong ETag from the rows' content, so every replica holding the same rows sends the same tag"""
+    body = json.dumps([[_row_state(row) for row in rows], list(extra)], default=str, sort_keys=True)
+    return f'"{hashlib.sha1(body.encode("utf-8")).hexdigest()}"'
+
+
+class ReferenceList(list):
+    """A cached reference list; etag is computed on first use and reused while the list stays cached"""
+
+    def __init__(self, rows: Sequence[Any] = (), extra: Sequence[Any] = ()):
+        super().__init__(rows)
+        self._extra = tuple(extra)
+        self._etag: Optional[str] = None
+
+    @property
+    def etag(self) -> str:
+        if self._etag is None:
+            self._etag = compute_etag(self, self._extra)
+        return self._etag
+
+
+class ReferenceListCache:
+    """TTL cache of reference lists keyed by (list name, variant key), with explicit invalidation"""
+
+    def __init__(self, ttl_seconds: float, max_keys_per_list: int = 64):
+        self.ttl_seconds = ttl_seconds
+        self.max_keys_per_list = max_keys_per_list
+        self._entries: Dict[str, "OrderedDict[Hashable, Tuple[float, Any]]"] = {}
+        # Bumped by every invalidation; a load that started before one is not stored
+        self._generations: Dict[str, int] = {}
+        self._listeners: Dict[str, List[Callable[[], None]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, name: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Cached value of (name, key), calling loader() on a miss or once the entry is older than the TTL"""
+        if self.ttl_seconds <= 0:
+            return loader()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(name, {}).get(key)
+            if entry is not None and now - entry[0] < self.ttl_seconds:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generations.setdefault(name, 0)
+
+        value = loader()
+
+        with self._lock:
+            if self._generations.get(name) == generation:
+                entries = self._entries.setdefault(name, OrderedDict())
+                entries[key] = (now, value)
+                entries.move_to_end(key)
+                while len(entries) > self.max_keys_per_list:
+                    entries.popitem(last=False)
+        return value
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Drop one list (every variant) or, with no name, everything; runs the matching listeners"""
+        with self._lock:
+            names = [name] if name else list(self._generations)
+            for list_name in names:
+                self._generations[list_name] = self._generations.get(list_name, 0) + 1
+                self._entries.pop(list_name, None)
+            self.invalidations += 1
+            listeners = [
+                listener
+                for list_name, callbacks in self._listeners.items()
+                if name is None or list_name == name
+                for listener in callbacks
+            ]
+
+        for listener in listeners:
+            try:
+                listener()
+            except Exception as e:
+                logger.error(f"Reference list invalidation listener failed: {str(e)}")
+
+    def add_invalidation_listener(self, name: str, listener: Callable[[], None]) -> None:
+        """Call listener whenever list name is invalidated (locally or by a broadcast)"""
+        with self._lock:
+            self._listeners.setdefault(name, []).append(listener)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'ttl_seconds': self.ttl_seconds,
+                'lists': {name: len(entries) for name, entries in self._entries.items()},
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+            }
+
+
+def _detach(db: Session, rows: Sequence[Any]) -> None:
+    """Detach loaded rows so they outlive the request's session and are not expired by its commits"""
+    for row in rows:
+        if row in db:
+            db.expunge(row)
+
+
+def cached_reference_list(db: Session, name: str, loader: Callable[[], Sequence[Any]], key: Hashable = None) -> ReferenceList:
+    """Read-through helper for a whole list: loader() runs the list query on a miss"""
+    def load() -> ReferenceList:
+        rows = loader()
+        _detach(db, rows)
+        return ReferenceList(rows)
+
+    return get_reference_list_cache().get(name, key, load)
+
+
+def cached_reference_page(
+    db: Session,
+    name: str,
+    key: Hashable,
+    loader: Callable[[], Tuple[Sequence[Any], int, int]]
+) -> Tuple[ReferenceList, int, int]:
+    """Read-through helper for a paginated list: loader() returns (rows, totalRecords, totalPages)"""
+    def load() -> Tuple[ReferenceList, int, int]:
+        rows, total_records, total_pages = loader()
+        _detach(db, rows)
+        return ReferenceList(rows, extra=(total_records, total_pages)), total_records, total_pages
+
+    return get_reference_list_cache().get(name, key, load)
+
+
+def invalidate_reference_list(name: str) -> None:
+    """Drop a list after a committed change and tell the other replicas to do the same"""
+    get_reference_list_cache().invalidate(name)
+    if Config.ReferenceCache.BROADCAST:
+        _broadcast_invalidation(name)
+
+
+def _broadcast_invalidation(name: str) -> None:
+    try:
+        from ..messaging.producer_manager import get_producer_manager
+
+        message = {
+            'correlation_id': str(uuid.uuid4()),
+            'event_type': 'REFERENCE_LIST_INVALIDATED',
+            'list_name': name,
+            'origin': INSTANCE_ID,
+            'timestamp': datetime.now().isoformat()
+        }
+        if not get_producer_manager().publish(INVALIDATION_EXCHANGE, f"{INVALIDATION_ROUTING_PREFIX}.{name}", message):
+            logger.warning(f"Reference list invalidation for {name} was not queued; other replicas refresh after the TTL")
+    except Exception as e:
+        logger.error(f"Failed to broadcast reference list invalidation for {name}: {str(e)}")
+
+
+# Singleton instance
+_reference_list_cache = None
+_reference_list_cache_lock = threading.Lock()
+
+def get_reference_list_cache() -> ReferenceListCache:
+    """Get singleton reference list cache"""
+    global _reference_list_cache
+    if _reference_list_cache is None:
+        with _reference_list_cache_lock:
+            if _reference_list_cache is None:
+                _reference_list_cache = ReferenceListCache(
+                    Config.ReferenceCache.TTL_SECONDS,
+                    Config.ReferenceCache.MAX_KEYS_PER_LIST
+                )
+    return _reference_list_cache
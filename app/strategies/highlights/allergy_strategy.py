@@ -1,4 +1,5 @@
-from typing import Any, Dict, Optional
+import logging
+from typing import Any, Dict, List, Optional
 
 from sqlalchemy.orm import Session, joinedload
 
@@ -6,6 +7,8 @@ from app.models.patient_allergy_mapping_model import PatientAllergyMapping
 
 from .base_strategy import HighlightStrategy
 
+logger = logging.getLogger(__name__)
+
 
 class AllergyStrategy(HighlightStrategy):
     """Strategy for generating highlights from allergies"""
@@ -80,7 +83,7 @@ class AllergyStrategy(HighlightStrategy):
             
         except Exception as e:
             # Log error but don't fail the entire request
-            print(f"Error getting allergy source value: {e}")
+            logger.error(f"Error getting allergy source value: {e}", exc_info=True)
             return None
         
     def get_additional_fields(self, db: Session, source_record_id: int) -> Dict[str, Any]:
@@ -105,23 +108,69 @@ class AllergyStrategy(HighlightStrategy):
             if not allergy_mapping:
                 return {}
             
-            # Extract the fields you want
-            additional_fields = {}
-            
-            # Get allergy type (from ALLERGY_TYPE.Value)
-            if allergy_mapping.allergy_type:
-                additional_fields["allergy_type"] = allergy_mapping.allergy_type.Value
-            else:
-                additional_fields["allergy_type"] = None
+            return self._to_additional_fields(allergy_mapping)
             
-            # Get reaction type (from ALLERGY_REACTION_TYPE.Value)
-            if allergy_mapping.allergy_reaction_type:
-                additional_fields["allergy_reaction_type"] = allergy_mapping.allergy_reaction_type.Value
-            else:
-                additional_fields["allergy_reaction_type"] = None
+        except Exception as e:
+            logger.error(f"Error getting allergy additional fields: {e}", exc_info=True)
+            return {}
+    
+    def get_source_remarks_batch(self, db: Session, source_record_ids: List[int]) -> Dict[int, Optional[str]]:
+        """Get AllergyRemarks for many allergy mappings in one query"""
+        try:
+            rows = db.query(
+                PatientAllergyMapping.Patient_AllergyID,
+                PatientAllergyMapping.AllergyRemarks
+            ).filter(
+                PatientAllergyMapping.Patient_AllergyID.in_(set(source_record_ids))
+            ).all()
+            return {row.Patient_AllergyID: row.AllergyRemarks for row in rows}
             
-            return additional_fields
+        except Exception as e:
+            logger.error(f"Error getting allergy source values: {e}", exc_info=True)
+            return {}
+    
+    def get_additional_fields_batch(self, db: Session, source_record_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Get allergy-specific additional fields for many allergy mappings in one query"""
+        try:
+            allergy_mappings = db.query(PatientAllergyMapping).options(
+                joinedload(PatientAllergyMapping.allergy_type),
+                joinedload(PatientAllergyMapping.allergy_reaction_type)
+            ).filter(
+                PatientAllergyMapping.Patient_AllergyID.in_(set(source_record_ids))
+            ).all()
+            return {
+                allergy_mapping.Patient_AllergyID: self._to_additional_fields(allergy_mapping)
+                for allergy_mapping in allergy_mappings
+            }
             
         except Exception as e:
-            print(f"Error getting allergy additional fields: {e}")
-            return {}
\ No newline at end of file
+            logger.error(f"Error getting allergy additional fields: {e}", exc_info=True)
+            return {}
+    
+    def load_source_records(self, db: Session, source_record_ids: List[int]) -> Dict[int, Any]:
+        """Load allergies (including soft-deleted ones) for highlight evaluation, in one query"""
+        allergies = db.query(PatientAllergyMapping).options(
+            joinedload(PatientAllergyMapping.allergy_type),
+            joinedload(PatientAllergyMapping.allergy_reaction_type)
+        ).filter(
+            PatientAllergyMapping.Patient_AllergyID.in_(set(source_record_ids))
+        ).all()
+        return {allergy.Patient_AllergyID: allergy for allergy in allergies}
+    
+    def _to_additional_fields(self, allergy_mapping: PatientAllergyMapping) -> Dict[str, Any]:
+        # Extract the fields you want
+        additional_fields = {}
+        
+        # Get allergy type (from ALLERGY_TYPE.Value)
+        if allergy_mapping.allergy_type:
+            additional_fields["allergy_type"] = allergy_mapping.allergy_type.Value
+        else:
+            additional_fields["allergy_type"] = None
+        
+        # Get reaction type (from ALLERGY_REACTION_TYPE.Value)
+        if allergy_mapping.allergy_reaction_type:
+            additional_fields["allergy_reaction_type"] = allergy_mapping.allergy_reaction_type.Value
+        else:
+            additional_fields["allergy_reaction_type"] = None
+        
+        return additional_fields
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from sqlalchemy.orm import Session, joinedload
 
@@ -18,6 +18,11 @@ class HighlightStrategy(ABC):
     3. generate_highlight_text() - Display text
     4. get_source_value() - Raw data retrieval for details view
     5. get_additional_fields() - Get type-specific additional fields
+    
+    get_source_remarks_batch() / get_additional_fields_batch() are the list versions used by highlight
+    listings. They default to calling the single-record methods per id; strategies override them to
+    load all records in one query. load_source_records() reloads source records for the deferred
+    highlight queue.
     Each strategy corresponds to a specific type of highlight, e.g. Vital, Allergy, Medication, etc.
     """
     
@@ -69,4 +74,32 @@ class HighlightStrategy(ABC):
         
         Each strategy can return different fields based on its type - depends on what the front-end team needs for their front-end.
         """
-        pass
\ No newline at end of file
+        pass
+    
+    def get_source_remarks_batch(self, db: Session, source_record_ids: List[int]) -> Dict[int, Optional[str]]:
+        """
+        Batch version of get_source_remarks(), keyed by source record id.
+        Ids with no source record are left out of the result.
+        """
+        return {
+            source_record_id: self.get_source_remarks(db, source_record_id)
+            for source_record_id in set(source_record_ids)
+        }
+    
+    def get_additional_fields_batch(self, db: Session, source_record_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Batch version of get_additional_fields(), keyed by source record id.
+        Ids with no source record are left out of the result.
+        """
+        return {
+            source_record_id: self.get_additional_fields(db, source_record_id)
+            for source_record_id in set(source_record_ids)
+        }
+    
+    def load_source_records(self, db: Session, source_record_ids: List[int]) -> Dict[int, Any]:
+        """
+        Load the source records behind source_record_ids, keyed by id, with whatever relationships
+        should_generate_highlight() / generate_highlight_text() need. Soft-deleted records are included
+        (their highlights must be removed). Used by the deferred highlight queue.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support deferred highlight evaluation")
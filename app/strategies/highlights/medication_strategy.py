@@ -1,4 +1,5 @@
-from typing import Any, Dict, Optional
+import logging
+from typing import Any, Dict, List, Optional
 
 from sqlalchemy.orm import Session, joinedload
 
@@ -6,6 +7,8 @@ from app.models.patient_medication_model import PatientMedication
 
 from .base_strategy import HighlightStrategy
 
+logger = logging.getLogger(__name__)
+
 
 class MedicationStrategy(HighlightStrategy):
     """Strategy for generating highlights from high-risk medications"""
@@ -62,7 +65,7 @@ class MedicationStrategy(HighlightStrategy):
             return None
             
         except Exception as e:
-            print(f"Error getting medication source remarks: {e}")
+            logger.error(f"Error getting medication source remarks: {e}", exc_info=True)
             return None
 
     def get_additional_fields(self, db: Session, source_record_id: int) -> Dict[str, Any]:
@@ -90,33 +93,74 @@ class MedicationStrategy(HighlightStrategy):
             if not medication:
                 return {}
             
-            # Extract the fields you want
-            additional_fields = {}
-            
-            # Get prescription name (from PATIENT_PRESCRIPTION_LIST.Value)
-            if medication.prescription_list:
-                additional_fields["prescription_name"] = medication.prescription_list.Value
-            else:
-                additional_fields["prescription_name"] = None
-            
-            # Get medication details
-            additional_fields["dosage"] = medication.Dosage
-            additional_fields["instruction"] = medication.Instruction
-            additional_fields["administer_time"] = medication.AdministerTime
+            return self._to_additional_fields(medication)
             
-            # Convert dates to ISO format strings
-            if medication.StartDate:
-                additional_fields["start_date"] = medication.StartDate.isoformat()
-            else:
-                additional_fields["start_date"] = None
-                
-            if medication.EndDate:
-                additional_fields["end_date"] = medication.EndDate.isoformat()
-            else:
-                additional_fields["end_date"] = None
+        except Exception as e:
+            logger.error(f"Error getting medication additional fields: {e}", exc_info=True)
+            return {}
+    
+    def get_source_remarks_batch(self, db: Session, source_record_ids: List[int]) -> Dict[int, Optional[str]]:
+        """Get PrescriptionRemarks for many medications in one query"""
+        try:
+            rows = db.query(
+                PatientMedication.Id,
+                PatientMedication.PrescriptionRemarks
+            ).filter(
+                PatientMedication.Id.in_(set(source_record_ids))
+            ).all()
+            return {row.Id: row.PrescriptionRemarks for row in rows}
             
-            return additional_fields
+        except Exception as e:
+            logger.error(f"Error getting medication source remarks: {e}", exc_info=True)
+            return {}
+    
+    def get_additional_fields_batch(self, db: Session, source_record_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Get medication-specific additional fields for many medications in one query"""
+        try:
+            medications = db.query(PatientMedication).options(
+                joinedload(PatientMedication.prescription_list)
+            ).filter(
+                PatientMedication.Id.in_(set(source_record_ids))
+            ).all()
+            return {medication.Id: self._to_additional_fields(medication) for medication in medications}
             
         except Exception as e:
-            print(f"Error getting medication additional fields: {e}")
-            return {}
\ No newline at end of file
+            logger.error(f"Error getting medication additional fields: {e}", exc_info=True)
+            return {}
+    
+    def load_source_records(self, db: Session, source_record_ids: List[int]) -> Dict[int, Any]:
+        """Load medications (including soft-deleted ones) for highlight evaluation, in one query"""
+        medications = db.query(PatientMedication).options(
+            joinedload(PatientMedication.prescription_list)
+        ).filter(
+            PatientMedication.Id.in_(set(source_record_ids))
+        ).all()
+        return {medication.Id: medication for medication in medications}
+    
+    def _to_additional_fields(self, medication: PatientMedication) -> Dict[str, Any]:
+        # Extract the fields you want
+        additional_fields = {}
+        
+        # Get prescription name (from PATIENT_PRESCRIPTION_LIST.Value)
+        if medication.prescription_list:
+            additional_fields["prescription_name"] = medication.prescription_list.Value
+        else:
+            additional_fields["prescription_name"] = None
+        
+        # Get medication details
+        additional_fields["dosage"] = medication.Dosage
+        additional_fields["instruction"] = medication.Instruction
+        additional_fields["administer_time"] = medication.AdministerTime
+        
+        # Convert dates to ISO format strings
+        if medication.StartDate:
+            additional_fields["start_date"] = medication.StartDate.isoformat()
+        else:
+            additional_fields["start_date"] = None
+            
+        if medication.EndDate:
+            additional_fields["end_date"] = medication.EndDate.isoformat()
+        else:
+            additional_fields["end_date"] = None
+        
+        return additional_fields
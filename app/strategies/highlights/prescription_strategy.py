@@ -1,4 +1,5 @@
-from typing import Any, Dict, Optional
+import logging
+from typing import Any, Dict, List, Optional
 
 from sqlalchemy.orm import Session, joinedload
 
@@ -6,6 +7,8 @@ from app.models.patient_prescription_model import PatientPrescription
 
 from .base_strategy import HighlightStrategy
 
+logger = logging.getLogger(__name__)
+
 
 class PrescriptionStrategy(HighlightStrategy):
     """Strategy for generating highlights from chronic or high-risk prescriptions"""
@@ -68,7 +71,7 @@ class PrescriptionStrategy(HighlightStrategy):
             return None
             
         except Exception as e:
-            print(f"Error getting prescription source remarks: {e}")
+            logger.error(f"Error getting prescription source remarks: {e}", exc_info=True)
             return None
     
     def get_additional_fields(self, db: Session, source_record_id: int) -> Dict[str, Any]:
@@ -98,35 +101,76 @@ class PrescriptionStrategy(HighlightStrategy):
             if not prescription:
                 return {}
             
-            # Extract fields
-            additional_fields = {}
-            
-            # Get prescription name from PATIENT_PRESCRIPTION_LIST
-            if prescription.prescription_list:
-                additional_fields["prescription_name"] = prescription.prescription_list.Value
-            else:
-                additional_fields["prescription_name"] = None
-            
-            # Get prescription details
-            additional_fields["dosage"] = prescription.Dosage
-            additional_fields["frequency_per_day"] = prescription.FrequencyPerDay
-            additional_fields["instruction"] = prescription.Instruction
-            additional_fields["is_after_meal"] = prescription.IsAfterMeal
-            additional_fields["status"] = prescription.Status
+            return self._to_additional_fields(prescription)
             
-            # Convert dates to ISO format
-            if prescription.StartDate:
-                additional_fields["start_date"] = prescription.StartDate.isoformat()
-            else:
-                additional_fields["start_date"] = None
-            
-            if prescription.EndDate:
-                additional_fields["end_date"] = prescription.EndDate.isoformat()
-            else:
-                additional_fields["end_date"] = None
+        except Exception as e:
+            logger.error(f"Error getting prescription additional fields: {e}", exc_info=True)
+            return {}
+    
+    def get_source_remarks_batch(self, db: Session, source_record_ids: List[int]) -> Dict[int, Optional[str]]:
+        """Get PrescriptionRemarks for many prescriptions in one query"""
+        try:
+            rows = db.query(
+                PatientPrescription.Id,
+                PatientPrescription.PrescriptionRemarks
+            ).filter(
+                PatientPrescription.Id.in_(set(source_record_ids))
+            ).all()
+            return {row.Id: row.PrescriptionRemarks for row in rows}
             
-            return additional_fields
+        except Exception as e:
+            logger.error(f"Error getting prescription source remarks: {e}", exc_info=True)
+            return {}
+    
+    def get_additional_fields_batch(self, db: Session, source_record_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Get prescription-specific additional fields for many prescriptions in one query"""
+        try:
+            prescriptions = db.query(PatientPrescription).options(
+                joinedload(PatientPrescription.prescription_list)
+            ).filter(
+                PatientPrescription.Id.in_(set(source_record_ids))
+            ).all()
+            return {prescription.Id: self._to_additional_fields(prescription) for prescription in prescriptions}
             
         except Exception as e:
-            print(f"Error getting prescription additional fields: {e}")
-            return {}
\ No newline at end of file
+            logger.error(f"Error getting prescription additional fields: {e}", exc_info=True)
+            return {}
+    
+    def load_source_records(self, db: Session, source_record_ids: List[int]) -> Dict[int, Any]:
+        """Load prescriptions (including soft-deleted ones) for highlight evaluation, in one query"""
+        prescriptions = db.query(PatientPrescription).options(
+            joinedload(PatientPrescription.prescription_list)
+        ).filter(
+            PatientPrescription.Id.in_(set(source_record_ids))
+        ).all()
+        return {prescription.Id: prescription for prescription in prescriptions}
+    
+    def _to_additional_fields(self, prescription: PatientPrescription) -> Dict[str, Any]:
+        # Extract fields
+        additional_fields = {}
+        
+        # Get prescription name from PATIENT_PRESCRIPTION_LIST
+        if prescription.prescription_list:
+            additional_fields["prescription_name"] = prescription.prescription_list.Value
+        else:
+            additional_fields["prescription_name"] = None
+        
+        # Get prescription details
+        additional_fields["dosage"] = prescription.Dosage
+        additional_fields["frequency_per_day"] = prescription.FrequencyPerDay
+        additional_fields["instruction"] = prescription.Instruction
+        additional_fields["is_after_meal"] = prescription.IsAfterMeal
+        additional_fields["status"] = prescription.Status
+        
+        # Convert dates to ISO format
+        if prescription.StartDate:
+            additional_fields["start_date"] = prescription.StartDate.isoformat()
+        else:
+            additional_fields["start_date"] = None
+        
+        if prescription.EndDate:
+            additional_fields["end_date"] = prescription.EndDate.isoformat()
+        else:
+            additional_fields["end_date"] = None
+        
+        return additional_fields
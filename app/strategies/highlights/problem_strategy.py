@@ -1,5 +1,5 @@
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from sqlalchemy.orm import Session, joinedload
 
@@ -74,16 +74,55 @@ class ProblemStrategy(HighlightStrategy):
             if not problem:
                 return {}
             
-            # Build response with all relevant details
-            result = {
-                "problem_name": problem.problem_list.ProblemName if problem.problem_list else None,
-                "date_of_diagnosis": problem.DateOfDiagnosis.isoformat() if problem.DateOfDiagnosis else None,
-                "source_of_information": problem.SourceOfInformation,
-                "problem_remarks": problem.ProblemRemarks
-            }
+            return self._to_additional_fields(problem)
             
-            return result
+        except Exception as e:
+            logger.error(f"Error getting problem additional fields: {e}")
+            return {}
+    
+    def get_source_remarks_batch(self, db: Session, source_record_ids: List[int]) -> Dict[int, Optional[str]]:
+        """Get ProblemRemarks for many problems in one query"""
+        try:
+            rows = db.query(
+                PatientProblem.Id,
+                PatientProblem.ProblemRemarks
+            ).filter(
+                PatientProblem.Id.in_(set(source_record_ids))
+            ).all()
+            return {row.Id: row.ProblemRemarks for row in rows}
+            
+        except Exception as e:
+            logger.error(f"Error getting problem source remarks: {e}")
+            return {}
+    
+    def get_additional_fields_batch(self, db: Session, source_record_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Get problem-specific additional fields for many problems in one query"""
+        try:
+            problems = db.query(PatientProblem).options(
+                joinedload(PatientProblem.problem_list)
+            ).filter(
+                PatientProblem.Id.in_(set(source_record_ids))
+            ).all()
+            return {problem.Id: self._to_additional_fields(problem) for problem in problems}
             
         except Exception as e:
             logger.error(f"Error getting problem additional fields: {e}")
-            return {}
\ No newline at end of file
+            return {}
+    
+    def load_source_records(self, db: Session, source_record_ids: List[int]) -> Dict[int, Any]:
+        """Load problems (including soft-deleted ones) for highlight evaluation, in one query"""
+        problems = db.query(PatientProblem).options(
+            joinedload(PatientProblem.problem_list)
+        ).filter(
+            PatientProblem.Id.in_(set(source_record_ids))
+        ).all()
+        return {problem.Id: problem for problem in problems}
+    
+    def _to_additional_fields(self, problem: PatientProblem) -> Dict[str, Any]:
+        # Build response with all relevant details
+        return {
+            "problem_name": problem.problem_list.ProblemName if problem.problem_list else None,
+            "date_of_diagnosis": problem.DateOfDiagnosis.isoformat() if problem.DateOfDiagnosis else None,
+            "source_of_information": problem.SourceOfInformation,
+            "problem_remarks": problem.ProblemRemarks
+        }
@@ -1,9 +1,13 @@
 import logging
-from typing import Any, Dict, Optional
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
 
+from sqlalchemy import Float, cast, func
 from sqlalchemy.orm import Session
 
 from app.config import Config
+from app.crud.patient_vital_baseline_crud import get_vital_baseline, get_vital_baselines
+from app.models.patient_vital_baseline_model import PatientVitalBaseline
 from app.models.patient_vital_model import PatientVital
 
 from .base_strategy import HighlightStrategy
@@ -32,6 +36,31 @@ class VitalStrategy(HighlightStrategy):
     # Minimum number of historical records needed to calculate personalized thresholds
     MIN_RECORDS_FOR_AVERAGE = 3
     
+    # (baseline key, PatientVital attribute, tolerance, low_only) - the checks of should_generate_highlight,
+    # as data for the batch evaluation
+    THRESHOLD_RULES = (
+        ('temperature', 'Temperature', TEMPERATURE_TOLERANCE, False),
+        ('systolic_bp', 'SystolicBP', SYSTOLIC_BP_TOLERANCE, False),
+        ('diastolic_bp', 'DiastolicBP', DIASTOLIC_BP_TOLERANCE, False),
+        ('heart_rate', 'HeartRate', HEART_RATE_TOLERANCE, False),
+        ('blood_sugar', 'BloodSugarLevel', BLOOD_SUGAR_TOLERANCE, False),
+        ('spo2', 'SpO2', SPO2_TOLERANCE, True),  # Only low SpO2 is abnormal
+    )
+    
+    # Session.info key for averages already computed in this request (should_generate_highlight and
+    # generate_highlight_text both need them)
+    AVERAGES_MEMO_KEY = "vital_baseline_averages"
+    
+    # Baseline key -> PatientVital column, for the aggregate (batch) path
+    BASELINE_COLUMNS = {
+        'temperature': PatientVital.Temperature,
+        'systolic_bp': PatientVital.SystolicBP,
+        'diastolic_bp': PatientVital.DiastolicBP,
+        'heart_rate': PatientVital.HeartRate,
+        'blood_sugar': PatientVital.BloodSugarLevel,
+        'spo2': PatientVital.SpO2,
+    }
+    
     _db_session: Optional[Session] = None
     
     def _get_default_baselines(self) -> Dict[str, float]:
@@ -47,11 +76,36 @@ class VitalStrategy(HighlightStrategy):
             'spo2': self.DEFAULT_SPO2
         }
     
-    def _get_patient_vital_averages(self, db: Session, patient_id: int, current_vital_id: int) -> Optional[Dict[str, float]]:
+    def _get_patient_vital_averages(self, db: Session, patient_id: int, current_vital_id: int, current_vital: Optional[PatientVital] = None) -> Optional[Dict[str, float]]:
+        """
+        Calculate average vital signs for a patient based on their historical records (excluding the current vital).
+        
+        Uses Config.Vital.Baseline.MODE and is memoized for the life of the db session (one request).
+        """
+        memo = db.info.setdefault(self.AVERAGES_MEMO_KEY, {}) if isinstance(getattr(db, "info", None), dict) else {}
+        key = (patient_id, current_vital_id)
+        if key not in memo:
+            memo[key] = self._compute_patient_vital_averages(db, patient_id, current_vital_id, current_vital)
+        return memo[key]
+    
+    def _compute_patient_vital_averages(self, db: Session, patient_id: int, current_vital_id: int, current_vital: Optional[PatientVital] = None) -> Optional[Dict[str, float]]:
         """
-        Calculate average vital signs for a patient based on their historical records.
+        - aggregate mode: one AVG()/COUNT() query, windowed to the last N readings / D days if configured
+        - incremental mode: the patient's maintained baseline (PATIENT_VITAL_BASELINE) with the current vital
+          taken back out of it; patients without a baseline row fall back to scanning their vital history
         """
         try:
+            if Config.Vital.Baseline.MODE == "aggregate":
+                return self._get_aggregate_vital_averages(db, patient_id, current_vital_id)
+            
+            if current_vital is not None:
+                baseline = get_vital_baseline(db, patient_id)
+                if baseline is not None:
+                    averages = self._averages_excluding(self._totals_from_baseline(baseline), current_vital)
+                    if averages is None:
+                        logger.info(f"Patient {patient_id} has too few past vitals - will use default clinical baselines (need {self.MIN_RECORDS_FOR_AVERAGE})")
+                    return averages
+            
             # Get all past vitals for this patient (Excluding current one and deleted records)
             past_vitals = db.query(PatientVital).filter(
                 PatientVital.PatientId == patient_id,
@@ -112,6 +166,92 @@ class VitalStrategy(HighlightStrategy):
             logger.error(f"Error calculating vital averages for patient {patient_id}: {e}", exc_info=True)
             return None
     
+    def _get_aggregate_vital_averages(self, db: Session, patient_id: int, current_vital_id: Optional[int]) -> Optional[Dict[str, float]]:
+        """
+        Averages computed by the database in one grouped query (no PatientVital rows are loaded),
+        over the last WINDOW_READINGS readings and/or WINDOW_DAYS days when those are set.
+        """
+        window_readings = Config.Vital.Baseline.WINDOW_READINGS
+        window_days = Config.Vital.Baseline.WINDOW_DAYS
+        
+        history = db.query(PatientVital.Id, *self.BASELINE_COLUMNS.values()).filter(
+            PatientVital.PatientId == patient_id,
+            PatientVital.IsDeleted == '0'
+        )
+        if current_vital_id is not None:
+            history = history.filter(PatientVital.Id != current_vital_id)  # Exclude current record
+        if window_days > 0:
+            history = history.filter(PatientVital.CreatedDateTime >= datetime.now() - timedelta(days=window_days))
+        if window_readings > 0:
+            history = history.order_by(PatientVital.CreatedDateTime.desc(), PatientVital.Id.desc()).limit(window_readings)
+        history = history.subquery()
+        
+        row = db.query(
+            func.count(history.c.Id),
+            *[func.avg(cast(history.c[column.key], Float)) for column in self.BASELINE_COLUMNS.values()]
+        ).one()
+        
+        record_count = row[0]
+        if record_count < self.MIN_RECORDS_FOR_AVERAGE:
+            logger.info(f"Patient {patient_id} has only {record_count} past vitals in the baseline window - will use default clinical baselines (need {self.MIN_RECORDS_FOR_AVERAGE})")
+            return None
+        
+        return {
+            key: float(average)
+            for key, average in zip(self.BASELINE_COLUMNS, row[1:])
+            if average is not None
+        }
+    
+    def get_batch_baselines(
+        self, db: Session, patient_ids, baseline_rows: Optional[Dict[int, PatientVitalBaseline]] = None
+    ) -> Dict[int, Tuple[Dict[str, float], str]]:
+        """
+        Baselines for a batch of new vitals, computed once per patient from their vitals already in the
+        database (the batch itself is not part of them). Call before the batch is flushed.
+        
+        baseline_rows: the patients' PATIENT_VITAL_BASELINE rows as locked by the caller (incremental mode);
+        read here when not given.
+        
+        Returns:
+            {patient_id: (baselines, baseline_source)} with baseline_source "avg" or "normal"
+        """
+        patient_ids = set(patient_ids)
+        if Config.Vital.Baseline.MODE == "aggregate":
+            averages_by_patient = {
+                patient_id: self._get_aggregate_vital_averages(db, patient_id, None)
+                for patient_id in patient_ids
+            }
+        else:
+            if baseline_rows is not None:
+                totals = {patient_id: self._totals_from_baseline(baseline_rows[patient_id]) for patient_id in patient_ids}
+            else:
+                totals = self._get_patient_vital_totals(db, patient_ids)
+            averages_by_patient = {
+                patient_id: self._averages_from_totals(totals.get(patient_id))
+                for patient_id in patient_ids
+            }
+        
+        return {
+            patient_id: (averages, "avg") if averages else (self._get_default_baselines(), "normal")
+            for patient_id, averages in averages_by_patient.items()
+        }
+    
+    def evaluate_batch(self, vitals: List[Any], baselines: List[Dict[str, float]]) -> List[bool]:
+        """
+        Same decision as should_generate_highlight() for many vitals at once: one column-wise pass per
+        threshold rule over the readings and their baselines.
+        """
+        flags = [False] * len(vitals)
+        for key, attribute, tolerance, low_only in self.THRESHOLD_RULES:
+            readings = [getattr(vital, attribute, None) for vital in vitals]
+            centers = [patient_baselines.get(key) for patient_baselines in baselines]
+            for i, (reading, center) in enumerate(zip(readings, centers)):
+                if flags[i] or reading is None or center is None:
+                    continue
+                if reading < center - tolerance or (not low_only and reading > center + tolerance):
+                    flags[i] = True
+        return flags
+    
     def get_type_code(self) -> str:
         """Return type code that matches database"""
         return "VITAL"
@@ -141,7 +281,7 @@ class VitalStrategy(HighlightStrategy):
             baselines = self._get_default_baselines()
         else:
             # Try to get patient's historical averages
-            averages = self._get_patient_vital_averages(db, vital_record.PatientId, vital_record.Id)
+            averages = self._get_patient_vital_averages(db, vital_record.PatientId, vital_record.Id, vital_record)
             
             if not averages:
                 # New patient - use default baselines
@@ -222,8 +362,6 @@ class VitalStrategy(HighlightStrategy):
         
         Use the db session stored from should_generate_highlight() to get patient's averages or default baselines.
         """
-        parts = []
-        
         # Get baselines (personalized or default)
         if not hasattr(vital_record, 'PatientId') or not vital_record.PatientId:
             baselines = self._get_default_baselines()
@@ -236,7 +374,8 @@ class VitalStrategy(HighlightStrategy):
             averages = self._get_patient_vital_averages(
                 self._db_session, 
                 vital_record.PatientId, 
-                vital_record.Id
+                vital_record.Id,
+                vital_record
             )
             
             if averages:
@@ -246,6 +385,15 @@ class VitalStrategy(HighlightStrategy):
                 baselines = self._get_default_baselines()
                 baseline_source = "normal"
         
+        return self.generate_highlight_text_for(vital_record, baselines, baseline_source)
+    
+    def generate_highlight_text_for(self, vital_record, baselines: Dict[str, float], baseline_source: str) -> str:
+        """
+        Highlight text for a vital judged against the given baselines
+        (baseline_source: "avg" for personalized averages, "normal" for default baselines).
+        """
+        parts = []
+        
         # Temperature with specific message
         if hasattr(vital_record, 'Temperature') and vital_record.Temperature is not None and 'temperature' in baselines:
             temp = vital_record.Temperature
@@ -337,7 +485,7 @@ class VitalStrategy(HighlightStrategy):
             return None
             
         except Exception as e:
-            print(f"Error getting vital source value: {e}")
+            logger.error(f"Error getting vital source value: {e}", exc_info=True)
             return None
         
     def get_additional_fields(self, db: Session, source_record_id: int) -> Dict[str, Any]:
@@ -363,26 +511,155 @@ class VitalStrategy(HighlightStrategy):
                 return {}
             
             # Get patient averages or default baselines
-            averages = self._get_patient_vital_averages(db, vital.PatientId, vital.Id)
-            
-            # Return all vital measurements
-            result = {
-                "systolic_bp": vital.SystolicBP,
-                "diastolic_bp": vital.DiastolicBP,
-                "temperature": vital.Temperature,
-                "heart_rate": vital.HeartRate,
-                "spo2": vital.SpO2,
-                "blood_sugar_level": vital.BloodSugarLevel
-            }
+            averages = self._get_patient_vital_averages(db, vital.PatientId, vital.Id, vital)
             
-            # Add patient averages or default baselines - here we define what baseline we used for this patient
-            if averages:
-                result["patient_averages"] = averages # For patients with prior vital history, return their averages
-            else:
-                result["default_baselines"] = self._get_default_baselines() # For patients with no prior vital history, return default baselines
+            return self._to_additional_fields(vital, averages)
+            
+        except Exception as e:
+            logger.error(f"Error getting vital additional fields: {e}", exc_info=True)
+            return {}
+    
+    def get_source_remarks_batch(self, db: Session, source_record_ids: List[int]) -> Dict[int, Optional[str]]:
+        """Get VitalRemarks for many vitals in one query"""
+        try:
+            rows = db.query(
+                PatientVital.Id,
+                PatientVital.VitalRemarks
+            ).filter(
+                PatientVital.Id.in_(set(source_record_ids))
+            ).all()
+            return {row.Id: row.VitalRemarks for row in rows}
             
-            return result
+        except Exception as e:
+            logger.error(f"Error getting vital source values: {e}", exc_info=True)
+            return {}
+    
+    def get_additional_fields_batch(self, db: Session, source_record_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get vital-specific additional fields for many vitals.
+        
+        Two queries in total: the vitals themselves, and the patients' baselines, from which each vital's
+        averages are derived by taking that vital's own reading back out (patients without a baseline
+        row cost one more grouped SUM/COUNT query).
+        """
+        try:
+            vitals = db.query(PatientVital).filter(
+                PatientVital.Id.in_(set(source_record_ids))
+            ).all()
+            if not vitals:
+                return {}
+            
+            if Config.Vital.Baseline.MODE == "aggregate":
+                # Windowed averages differ per vital, so each costs one aggregate query
+                return {
+                    vital.Id: self._to_additional_fields(vital, self._get_patient_vital_averages(db, vital.PatientId, vital.Id, vital))
+                    for vital in vitals
+                }
+            
+            totals = self._get_patient_vital_totals(db, {vital.PatientId for vital in vitals})
+            
+            return {
+                vital.Id: self._to_additional_fields(vital, self._averages_excluding(totals.get(vital.PatientId), vital))
+                for vital in vitals
+            }
             
         except Exception as e:
-            print(f"Error getting vital additional fields: {e}")
-            return {}
\ No newline at end of file
+            logger.error(f"Error getting vital additional fields: {e}", exc_info=True)
+            return {}
+    
+    def _get_patient_vital_totals(self, db: Session, patient_ids) -> Dict[int, Dict[str, Any]]:
+        """
+        Per patient: number of non-deleted vitals, plus (sum, count) of the non-null readings per baseline key.
+        """
+        baselines = get_vital_baselines(db, patient_ids)
+        totals = {patient_id: self._totals_from_baseline(baseline) for patient_id, baseline in baselines.items()}
+        
+        missing_patient_ids = set(patient_ids) - baselines.keys()
+        if not missing_patient_ids:
+            return totals
+        
+        columns = [func.count(PatientVital.Id)]
+        for column in self.BASELINE_COLUMNS.values():
+            columns += [func.sum(cast(column, Float)), func.count(column)]
+        
+        rows = db.query(PatientVital.PatientId, *columns).filter(
+            PatientVital.PatientId.in_(missing_patient_ids),
+            PatientVital.IsDeleted == '0'
+        ).group_by(PatientVital.PatientId).all()
+        
+        for patient_id, record_count, *aggregates in rows:
+            totals[patient_id] = {
+                'records': record_count,
+                'fields': {
+                    key: (aggregates[2 * i] or 0, aggregates[2 * i + 1])
+                    for i, key in enumerate(self.BASELINE_COLUMNS)
+                }
+            }
+        return totals
+    
+    def _totals_from_baseline(self, baseline: PatientVitalBaseline) -> Dict[str, Any]:
+        # Vital readings are NOT NULL, so every metric is counted once per record
+        return {
+            'records': baseline.RecordCount,
+            'fields': {
+                key: (getattr(baseline, f"{column.key}Sum"), baseline.RecordCount)
+                for key, column in self.BASELINE_COLUMNS.items()
+            }
+        }
+    
+    def _averages_from_totals(self, patient_totals: Optional[Dict[str, Any]]) -> Optional[Dict[str, float]]:
+        """Averages over all of the patient's counted vitals, or None when there are fewer than MIN_RECORDS_FOR_AVERAGE"""
+        if not patient_totals or patient_totals['records'] < self.MIN_RECORDS_FOR_AVERAGE:
+            return None
+        return {
+            key: float(total) / count
+            for key, (total, count) in patient_totals['fields'].items()
+            if count > 0
+        }
+    
+    def _averages_excluding(self, patient_totals: Optional[Dict[str, Any]], vital: PatientVital) -> Optional[Dict[str, float]]:
+        """
+        Same result as _get_patient_vital_averages(): averages over the patient's other non-deleted vitals,
+        or None when there are fewer than MIN_RECORDS_FOR_AVERAGE of them.
+        """
+        if not patient_totals:
+            return None
+        
+        counted = vital.IsDeleted == '0'  # The vital itself is part of the totals unless deleted
+        if patient_totals['records'] - counted < self.MIN_RECORDS_FOR_AVERAGE:
+            return None
+        
+        averages = {}
+        for key, (total, count) in patient_totals['fields'].items():
+            reading = getattr(vital, self.BASELINE_COLUMNS[key].key)
+            if counted and reading is not None:
+                total, count = total - reading, count - 1
+            if count > 0:
+                averages[key] = float(total) / count
+        return averages
+    
+    def load_source_records(self, db: Session, source_record_ids: List[int]) -> Dict[int, Any]:
+        """Load vitals (including soft-deleted ones) for highlight evaluation, in one query"""
+        vitals = db.query(PatientVital).filter(
+            PatientVital.Id.in_(set(source_record_ids))
+        ).all()
+        return {vital.Id: vital for vital in vitals}
+    
+    def _to_additional_fields(self, vital: PatientVital, averages: Optional[Dict[str, float]]) -> Dict[str, Any]:
+        # Return all vital measurements
+        result = {
+            "systolic_bp": vital.SystolicBP,
+            "diastolic_bp": vital.DiastolicBP,
+            "temperature": vital.Temperature,
+            "heart_rate": vital.HeartRate,
+            "spo2": vital.SpO2,
+            "blood_sugar_level": vital.BloodSugarLevel
+        }
+        
+        # Add patient averages or default baselines - here we define what baseline we used for this patient
+        if averages:
+            result["patient_averages"] = averages # For patients with prior vital history, return their averages
+        else:
+            result["default_baselines"] = self._get_default_baselines() # For patients with no prior vital history, return default baselines
+        
+        return result
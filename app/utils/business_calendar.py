@@ -0,0 +1,109 @@
+"""
+Process-wide business-day calendar.
+
+Business days = all days except weekends (Saturday and Sunday) and the country's public holidays.
+The calendar is built once per country (lazily, on first use) as a sorted list of business-day ordinals
+covering several years, so "N business days ago / ahead" is a bisect (O(log n)) and never calls the
+holidays library on a hot path. Used by the highlight retention cleanup; available to any other
+date-based feature (e.g. medication schedules) through get_business_calendar().
+"""
+
+import logging
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Years kept around the current year; the calendar is rebuilt when "today" gets within a year of its edge
+WINDOW_YEARS_BACK = 2
+WINDOW_YEARS_AHEAD = 3
+
+
+class BusinessDayCalendar:
+    """Sorted business-day ordinals for [start_year, end_year] with bisect-based queries"""
+
+    def __init__(self, start_year: int, end_year: int, holiday_dates: Iterable[date] = ()):
+        self.start_year = start_year
+        self.end_year = end_year
+        holiday_ordinals = {holiday.toordinal() for holiday in holiday_dates}
+        first = date(start_year, 1, 1).toordinal()
+        last = date(end_year, 12, 31).toordinal()
+        # date.fromordinal(1) is a Monday, so (ordinal - 1) % 7 is the weekday (Saturday=5, Sunday=6)
+        self._ordinals = [
+            ordinal for ordinal in range(first, last + 1)
+            if (ordinal - 1) % 7 < 5 and ordinal not in holiday_ordinals
+        ]
+
+    def covers(self, day: date) -> bool:
+        """True when day lies inside the calendar's window"""
+        return self.start_year <= day.year <= self.end_year
+
+    def is_business_day(self, day: date) -> bool:
+        """True when day is neither a weekend nor a public holiday"""
+        ordinal = day.toordinal()
+        index = bisect_left(self._ordinals, ordinal)
+        return index < len(self._ordinals) and self._ordinals[index] == ordinal
+
+    def business_days_ago(self, business_days: int, from_date: Optional[date] = None) -> date:
+        """The date N business days before from_date (default today); from_date itself is not counted"""
+        from_date = from_date or date.today()
+        index = bisect_left(self._ordinals, from_date.toordinal()) - business_days
+        if index < 0 or not self.covers(from_date):
+            raise ValueError(f"{business_days} business days before {from_date} is outside the calendar window")
+        return date.fromordinal(self._ordinals[index])
+
+    def business_days_ahead(self, business_days: int, from_date: Optional[date] = None) -> date:
+        """The date N business days after from_date (default today); from_date itself is not counted"""
+        from_date = from_date or date.today()
+        index = bisect_right(self._ordinals, from_date.toordinal()) + business_days - 1
+        if index >= len(self._ordinals) or not self.covers(from_date):
+            raise ValueError(f"{business_days} business days after {from_date} is outside the calendar window")
+        return date.fromordinal(self._ordinals[index])
+
+    def business_days_between(self, start: date, end: date) -> int:
+        """Number of business days in [start, end)"""
+        return bisect_left(self._ordinals, end.toordinal()) - bisect_left(self._ordinals, start.toordinal())
+
+
+_calendars: Dict[str, BusinessDayCalendar] = {}
+_calendars_lock = threading.Lock()
+
+
+def get_business_calendar(country: str = "SG") -> BusinessDayCalendar:
+    """Get the process-wide calendar of a country, building (or sliding) its window when needed"""
+    today = date.today()
+    calendar = _calendars.get(country)
+    if calendar and calendar.covers(today - timedelta(days=366)) and calendar.covers(today + timedelta(days=366)):
+        return calendar
+
+    with _calendars_lock:
+        calendar = _calendars.get(country)
+        if calendar and calendar.covers(today - timedelta(days=366)) and calendar.covers(today + timedelta(days=366)):
+            return calendar
+
+        from app.services.holiday_service import HolidayService
+
+        years = list(range(today.year - WINDOW_YEARS_BACK, today.year + WINDOW_YEARS_AHEAD + 1))
+        holiday_dates = HolidayService(country=country, years=years).get_all_holidays()
+        calendar = BusinessDayCalendar(years[0], years[-1], holiday_dates)
+        if not holiday_dates:
+            # The holiday load failed (HolidayService falls back to no holidays): serve this weekend-only
+            # calendar to this caller but build it again next time instead of keeping it for the process
+            logger.warning(f"No holidays loaded for {country} - business-day calendar not cached")
+            return calendar
+        _calendars[country] = calendar
+        logger.info(f"Built business-day calendar for {country} ({years[0]}-{years[-1]}, {len(holiday_dates)} holidays)")
+        return calendar
+
+
+def business_days_ago(business_days: int, from_date: Optional[date] = None, country: str = "SG") -> date:
+    """The date N business days before from_date (default today)"""
+    return get_business_calendar(country).business_days_ago(business_days, from_date)
+
+
+def business_days_ahead(business_days: int, from_date: Optional[date] = None, country: str = "SG") -> date:
+    """The date N business days after from_date (default today)"""
+    return get_business_calendar(country).business_days_ahead(business_days, from_date)
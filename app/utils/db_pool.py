@@ -0,0 +1,115 @@
+"""
+Instrumented connection pool for the MSSQL engine.
+
+InstrumentedQueuePool is a QueuePool that records how long each checkout waited for a connection
+(including overflow creation and pre-ping), how many checkouts timed out, and the peak number of
+connections in use / in overflow; InstrumentedAsyncAdaptedQueuePool does the same for the aioodbc
+engine of the async read path. get_pool_stats() combines those with the pool's live counters;
+it backs GET /health/db-pool so the pool can be sized from real numbers
+(replicas x uvicorn workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) must stay under the server's limit).
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+# Checkout waits at or above this are counted as slow
+SLOW_CHECKOUT_SECONDS = 0.1
+
+
+class PoolMetrics:
+    """Checkout counters of one pool (kept across engine.dispose())"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.slow_checkouts = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.peak_in_use = 0
+        self.peak_overflow = 0
+
+    def record_checkout(self, wait_seconds: float, in_use: int, overflow: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+            if wait_seconds >= SLOW_CHECKOUT_SECONDS:
+                self.slow_checkouts += 1
+            if overflow > 0:
+                self.overflow_checkouts += 1
+            self.peak_in_use = max(self.peak_in_use, in_use)
+            self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'checkout_wait_avg_ms': round(1000 * self.wait_seconds_total / self.checkouts, 2) if self.checkouts else 0.0,
+                'checkout_wait_max_ms': round(1000 * self.wait_seconds_max, 2),
+                'slow_checkouts': self.slow_checkouts,
+                'overflow_checkouts': self.overflow_checkouts,
+                'timeouts': self.timeouts,
+                'peak_in_use': self.peak_in_use,
+                'peak_overflow': self.peak_overflow,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records checkout wait time, timeouts and peak usage in self.metrics"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start, self.checkedout(), max(0, self.overflow()))
+        return connection
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedQueuePool):
+    """InstrumentedQueuePool with the asyncio queue of AsyncAdaptedQueuePool (for create_async_engine)"""
+
+    _is_asyncio = AsyncAdaptedQueuePool._is_asyncio
+    _queue_class = AsyncAdaptedQueuePool._queue_class
+    _dialect = AsyncAdaptedQueuePool._dialect
+
+
+def get_pool_stats(engine) -> Dict[str, Any]:
+    """Live pool counters plus the checkout metrics of an engine's pool"""
+    pool = engine.pool
+    stats: Dict[str, Any] = {'pool_class': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            'pool_size': pool.size(),
+            'max_overflow': pool._max_overflow,
+            'timeout_seconds': pool.timeout(),
+            'in_use': pool.checkedout(),
+            'idle': pool.checkedin(),
+            'overflow': max(0, pool.overflow()),
+        })
+    metrics = getattr(pool, 'metrics', None)
+    if metrics is not None:
+        stats.update(metrics.snapshot())
+    return stats
@@ -0,0 +1,31 @@
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison (RFC 9110 13.1.2): W/"x" matches "x"
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def not_modified_response(request: Request, response: Response, items: Any) -> Optional[Response]:
+    """
+    ETag / If-None-Match handling for a cached reference list (anything with an etag attribute).
+
+    Returns the 304 response to send when the client's copy is current; otherwise sets the ETag header
+    on the normal response and returns None. Cache-Control: no-cache makes clients revalidate every time.
+    """
+    etag = getattr(items, "etag", None)
+    if not etag:
+        return None
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,208 @@
+"""
+This file contains the shared pagination helpers used by the list CRUDs.
+
+- paginate_query: fetches a page and its total in a single statement by adding COUNT(*) OVER()
+  to the page query, so a list request costs one round trip instead of a COUNT plus a SELECT.
+- Keyset (seek) cursors: an opaque, URL-safe token that encodes the sort key of the last row on a
+  page (e.g. (name, id) for patients). The next page is fetched with WHERE (sort key) > (cursor
+  values) instead of OFFSET, so the database never has to scan and discard the preceding rows.
+  A seek filter would also restrict the window count, so cursor pages take their total from a
+  short-lived count cache that the first (offset) page seeds.
+"""
+
+import base64
+import json
+import math
+import os
+import threading
+import time
+from collections import namedtuple
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import cast, func
+from sqlalchemy.engine import Row
+
+
+TOTAL_COUNT_LABEL = "pagination_total_count"
+
+# How long a total computed for a listing is reused by the cursor pages that follow it
+COUNT_CACHE_TTL_SECONDS = float(os.getenv("PAGINATION_COUNT_CACHE_TTL_SECONDS", "30"))
+COUNT_CACHE_MAX_ENTRIES = 1024
+
+_count_cache: Dict[Tuple[str, str], Tuple[float, int]] = {}
+_count_cache_lock = threading.Lock()
+
+
+class Page(NamedTuple):
+    items: List[Any]
+    totalRecords: Optional[int]  # None when the caller opted out of the total
+    totalPages: Optional[int]
+    hasMore: bool
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort key values of the last row on a page into an opaque cursor.
+
+    Example:
+        encode_cursor("Alice Tan", 42) -> "WyJBbGljZSBUYW4iLCA0Ml0"
+    """
+    raw = json.dumps(list(values), default=str, ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, expected_length: int, types: Optional[Tuple[type, ...]] = None) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor back into its sort key values.
+
+    types: expected type of each value (e.g. (str, int) for a (name, id) cursor), so a tampered cursor
+    is rejected here instead of failing in the database.
+
+    Raises:
+        HTTPException(400): If the cursor is malformed, does not hold expected_length values or
+            holds a value of the wrong type
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+    if not isinstance(values, list) or len(values) != expected_length:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    if types is not None and not all(type(value) is expected for value, expected in zip(values, types)):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    return values
+
+
+def seek_value(db, column, value: Any):
+    """
+    A cursor value to compare with column in a seek filter, bound as the column's type.
+
+    pyodbc sends Python datetimes as DATETIME2. SQL Server (compatibility level 130+) compares that
+    with a DATETIME column by converting the column exactly (.123 becomes .1233333), so a value read
+    from the column would no longer equal itself and rows tied on it would be skipped or repeated.
+    """
+    if db.get_bind().dialect.name == "mssql":
+        return cast(value, column.type)
+    return value
+
+
+def paginate_query(
+    query,
+    pageNo: int = 0,
+    pageSize: int = 10,
+    include_total: bool = True,
+    seek=None,
+    offset: Optional[int] = None,
+) -> Page:
+    """
+    Fetch one page of an already ordered query together with its total.
+
+    Args:
+        query: Filtered and ordered SQLAlchemy query (entity or column query)
+        pageNo: Page number (starting from 0), ignored when seek is given
+        pageSize: Number of records per page
+        include_total: When False, no total is computed (totalRecords / totalPages are None)
+        seek: Optional keyset filter clause; replaces OFFSET and takes the total from the count cache
+        offset: Rows to skip, for callers that page by row offset (defaults to pageNo * pageSize)
+
+    Rows are fetched with one extra look-ahead row to work out hasMore. Single-entity (or
+    single-column) queries return the entity itself; multi-column queries return their rows.
+    """
+    limit = pageSize + 1
+    totalRecords = None
+    skip = pageNo * pageSize if offset is None else offset
+
+    if seek is not None:
+        rows = query.filter(seek).limit(limit).all()
+        totalRecords = cached_count(query) if include_total else None
+    elif include_total:
+        rows = (
+            query.add_columns(func.count().over().label(TOTAL_COUNT_LABEL))
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        if rows:
+            totalRecords = rows[0][-1]
+        elif skip > 0:
+            # Page past the end: the window has no row to report the total on
+            totalRecords = query.order_by(None).count()
+        else:
+            totalRecords = 0
+        rows = [_without_total(row) for row in rows]
+        _store_count(query, totalRecords)
+    else:
+        rows = query.offset(skip).limit(limit).all()
+    rows = [_unwrap_row(row) for row in rows]
+
+    hasMore = len(rows) > pageSize
+    items = rows[:pageSize]
+
+    totalPages = None
+    if totalRecords is not None:
+        totalPages = math.ceil(totalRecords / pageSize) if pageSize > 0 else 0
+    return Page(items, totalRecords, totalPages, hasMore)
+
+
+def _without_total(row):
+    """Drop the trailing COUNT(*) OVER() column, keeping the names of the remaining columns."""
+    values = tuple(row)[:-1]
+    fields = getattr(row, "_fields", None)
+    if fields is None:
+        return values
+    return _row_type(tuple(fields[:-1]))(*values)
+
+
+@lru_cache(maxsize=256)
+def _row_type(fields: Tuple[str, ...]):
+    return namedtuple("PageRow", fields, rename=True)
+
+
+def _unwrap_row(row):
+    """Return the entity or value itself for single-entity and single-column rows."""
+    if isinstance(row, (Row, tuple)) and len(row) == 1:
+        return row[0]
+    return row
+
+
+def cached_count(query) -> int:
+    """Return the row count of a query, reusing a recent result for the same statement."""
+    key = _count_key(query)
+    now = time.monotonic()
+    with _count_cache_lock:
+        entry = _count_cache.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+
+    total = query.order_by(None).count()
+    _store_count(query, total, key)
+    return total
+
+
+def clear_count_cache():
+    with _count_cache_lock:
+        _count_cache.clear()
+
+
+def _store_count(query, total: int, key: Optional[Tuple[str, str]] = None):
+    if COUNT_CACHE_TTL_SECONDS <= 0:
+        return
+    key = key or _count_key(query)
+    with _count_cache_lock:
+        if len(_count_cache) >= COUNT_CACHE_MAX_ENTRIES:
+            now = time.monotonic()
+            for stale in [k for k, (expires, _) in _count_cache.items() if expires <= now]:
+                del _count_cache[stale]
+            if len(_count_cache) >= COUNT_CACHE_MAX_ENTRIES:
+                _count_cache.clear()
+        _count_cache[key] = (time.monotonic() + COUNT_CACHE_TTL_SECONDS, total)
+
+
+def _count_key(query) -> Tuple[str, str]:
+    """Cache key for a query: its SQL (without ORDER BY) plus its bound parameter values."""
+    compiled = query.order_by(None).statement.compile()
+    return str(compiled), repr(sorted(compiled.params.items()))
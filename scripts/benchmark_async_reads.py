@@ -0,0 +1,98 @@
+"""
+Load benchmark for the read endpoints served by the async read path.
+
+Sends the same concurrent GET load to one or more running instances of the service and prints
+throughput and latency percentiles for each, e.g. to compare a sync and an async deployment:
+
+    DB_ASYNC_READS=false uvicorn app.main:app --port 8001
+    DB_ASYNC_READS=true  uvicorn app.main:app --port 8002
+    python scripts/benchmark_async_reads.py http://localhost:8001 http://localhost:8002 \
+        --concurrency 200 --requests 4000
+
+With the sync engine every in-flight request holds one of the threadpool's workers (40 by default)
+while it waits on MSSQL, so throughput flattens once the concurrency passes the threadpool size;
+on the async path it keeps rising until the connection pool (DB_POOL_SIZE + DB_MAX_OVERFLOW) or
+the database becomes the limit. Run it from a machine other than the service's so the client does
+not compete with it for CPU.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+DEFAULT_PATHS = [
+    "/patients/1?require_auth=false",
+    "/patients/?require_auth=false&pageSize=20",
+    "/Highlight/get_highlights_paginated?require_auth=false&pageSize=20",
+    "/Vital/list?patient_id=1&require_auth=false&pageSize=20",
+]
+
+
+async def run_load(base_url: str, paths, concurrency: int, total_requests: int, timeout: float):
+    latencies = []
+    errors = 0
+    next_request = 0
+
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        timeout=timeout,
+        limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+    ) as client:
+
+        async def worker():
+            nonlocal next_request, errors
+            while next_request < total_requests:
+                path = paths[next_request % len(paths)]
+                next_request += 1
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code >= 500:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        # Warm up the connection pools before measuring
+        await asyncio.gather(*(client.get(path) for path in paths))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": elapsed,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": 1000 * statistics.median(latencies),
+        "p95_ms": 1000 * latencies[int(0.95 * (len(latencies) - 1))],
+        "p99_ms": 1000 * latencies[int(0.99 * (len(latencies) - 1))],
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Concurrent load benchmark for the read endpoints")
+    parser.add_argument("base_urls", nargs="+", help="Base URL of each instance to benchmark")
+    parser.add_argument("--path", action="append", dest="paths", help="Endpoint to request (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=100, help="Requests in flight at once")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per instance")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    args = parser.parse_args()
+
+    paths = args.paths or DEFAULT_PATHS
+    print(f"{args.requests} requests, concurrency {args.concurrency}, paths: {', '.join(paths)}")
+    print(f"{'instance':<32}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for base_url in args.base_urls:
+        result = await run_load(base_url, paths, args.concurrency, args.requests, args.timeout)
+        print(
+            f"{base_url:<32}{result['rps']:>10.1f}{result['p50_ms']:>10.1f}"
+            f"{result['p95_ms']:>10.1f}{result['p99_ms']:>10.1f}{result['errors']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,13 @@
+-- ============================================================
+-- OUTBOX_EVENTS lease columns
+-- Each outbox relay replica claims a batch by stamping
+-- claimed_by / lease_until before publishing, so replicas
+-- publish disjoint batches instead of the same PENDING rows.
+-- ============================================================
+
+ALTER TABLE OUTBOX_EVENTS ADD claimed_by  VARCHAR(100) NULL;
+ALTER TABLE OUTBOX_EVENTS ADD lease_until DATETIME     NULL;
+GO
+
+CREATE INDEX ix_OUTBOX_EVENTS_lease_until
+    ON OUTBOX_EVENTS(lease_until);
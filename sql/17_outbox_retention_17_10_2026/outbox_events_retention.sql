@@ -0,0 +1,29 @@
+-- ============================================================
+-- OUTBOX_EVENTS retention
+-- (status, created_at) index for the relay's PENDING scan and
+-- the chunked purge of old PUBLISHED rows, plus an archive
+-- table the purge copies rows into when archiving is enabled.
+-- ============================================================
+
+CREATE INDEX ix_OUTBOX_EVENTS_status_created_at
+    ON OUTBOX_EVENTS(status, created_at);
+GO
+
+CREATE TABLE OUTBOX_EVENTS_ARCHIVE (
+    id             UNIQUEIDENTIFIER NOT NULL PRIMARY KEY,
+    event_type     VARCHAR(100)     NOT NULL,
+    aggregate_id   VARCHAR(50)      NOT NULL,
+    payload        VARCHAR(MAX)     NOT NULL,
+    routing_key    VARCHAR(200)     NOT NULL,
+    status         VARCHAR(20)      NOT NULL,
+    correlation_id VARCHAR(100)     NOT NULL,
+    created_at     DATETIME         NOT NULL,
+    processed_at   DATETIME         NULL,
+    created_by     VARCHAR(255)     NOT NULL,
+    archived_at    DATETIME         NOT NULL
+);
+GO
+
+CREATE INDEX ix_OUTBOX_EVENTS_ARCHIVE_aggregate_id   ON OUTBOX_EVENTS_ARCHIVE(aggregate_id);
+CREATE INDEX ix_OUTBOX_EVENTS_ARCHIVE_correlation_id ON OUTBOX_EVENTS_ARCHIVE(correlation_id);
+CREATE INDEX ix_OUTBOX_EVENTS_ARCHIVE_created_at     ON OUTBOX_EVENTS_ARCHIVE(created_at);
@@ -0,0 +1,9 @@
+-- ============================================================
+-- PATIENT_HIGHLIGHT feed index
+-- Serves the paginated highlight feed: non-deleted highlights
+-- of the enabled types, newest first / created since a date.
+-- ============================================================
+
+CREATE INDEX IX_PATIENT_HIGHLIGHT_IsDeleted_HighlightTypeId_CreatedDate
+    ON PATIENT_HIGHLIGHT(IsDeleted, HighlightTypeId, CreatedDate)
+    INCLUDE (PatientId);
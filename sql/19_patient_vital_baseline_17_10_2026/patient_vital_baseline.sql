@@ -0,0 +1,45 @@
+-- ============================================================
+-- PATIENT_VITAL_BASELINE
+-- Running count / sum of each patient's
+-- non-deleted vital readings, maintained by the vital CRUD.
+-- VitalStrategy reads its averages from here instead of
+-- scanning the patient's whole vital history.
+-- ============================================================
+
+CREATE TABLE PATIENT_VITAL_BASELINE (
+    PatientId            INT      NOT NULL PRIMARY KEY,
+    RecordCount          INT      NOT NULL DEFAULT 0,
+    TemperatureSum       FLOAT    NOT NULL DEFAULT 0,
+    SystolicBPSum        FLOAT    NOT NULL DEFAULT 0,
+    DiastolicBPSum       FLOAT    NOT NULL DEFAULT 0,
+    HeartRateSum         FLOAT    NOT NULL DEFAULT 0,
+    SpO2Sum              FLOAT    NOT NULL DEFAULT 0,
+    BloodSugarLevelSum   FLOAT    NOT NULL DEFAULT 0,
+    ModifiedDate         DATETIME NOT NULL DEFAULT GETDATE(),
+
+    CONSTRAINT FK_PatientVitalBaseline_Patient
+        FOREIGN KEY (PatientId) REFERENCES PATIENT(id)
+);
+GO
+
+-- Backfill from existing vitals (patients without a row are also built on their next vital change)
+INSERT INTO PATIENT_VITAL_BASELINE (
+    PatientId, RecordCount,
+    TemperatureSum,
+    SystolicBPSum,
+    DiastolicBPSum,
+    HeartRateSum,
+    SpO2Sum,
+    BloodSugarLevelSum
+)
+SELECT
+    PatientId, COUNT(*),
+    SUM(CAST(Temperature AS FLOAT)),
+    SUM(CAST(SystolicBP AS FLOAT)),
+    SUM(CAST(DiastolicBP AS FLOAT)),
+    SUM(CAST(HeartRate AS FLOAT)),
+    SUM(CAST(SpO2 AS FLOAT)),
+    SUM(CAST(BloodSugarLevel AS FLOAT))
+FROM PATIENT_VITAL
+WHERE IsDeleted = '0' AND PatientId IS NOT NULL
+GROUP BY PatientId;
@@ -0,0 +1,27 @@
+-- ============================================================
+-- HIGHLIGHT_WORK_ITEMS
+-- Deferred highlight evaluation queue (HIGHLIGHT_EVALUATION_MODE
+-- = deferred). Clinical writes insert a row in their own
+-- transaction; HighlightQueueProcessor claims rows in batches
+-- (claimed_by / lease_until), evaluates them and deletes them.
+-- ============================================================
+
+CREATE TABLE HIGHLIGHT_WORK_ITEMS (
+    id               INT IDENTITY(1,1) NOT NULL PRIMARY KEY,
+    type_code        VARCHAR(50)   NOT NULL,
+    source_table     VARCHAR(50)   NOT NULL,
+    source_record_id INT           NOT NULL,
+    patient_id       INT           NOT NULL,
+    requested_by     VARCHAR(450)  NOT NULL,
+    status           VARCHAR(20)   NOT NULL DEFAULT 'PENDING',
+    retry_count      INT           NOT NULL DEFAULT 0,
+    error_message    VARCHAR(1000) NULL,
+    created_at       DATETIME      NOT NULL DEFAULT GETDATE(),
+    claimed_by       VARCHAR(100)  NULL,
+    lease_until      DATETIME      NULL
+);
+GO
+
+CREATE INDEX ix_HIGHLIGHT_WORK_ITEMS_status_id
+    ON HIGHLIGHT_WORK_ITEMS(status, id);
+GO
@@ -0,0 +1,17 @@
+-- ============================================================
+-- PATIENT_HIGHLIGHT retention
+-- RetentionDays: business days a highlight type's highlights
+-- are kept before the daily cleanup hard-deletes them
+-- (previously hardcoded to 3 for every type).
+-- The index serves the cleanup's chunked
+-- DELETE ... WHERE HighlightTypeId = ? AND CreatedDate < cutoff.
+-- ============================================================
+
+ALTER TABLE PATIENT_HIGHLIGHT_TYPE
+    ADD RetentionDays INT NOT NULL
+    CONSTRAINT DF_PATIENT_HIGHLIGHT_TYPE_RetentionDays DEFAULT 3;
+GO
+
+CREATE INDEX IX_PATIENT_HIGHLIGHT_HighlightTypeId_CreatedDate
+    ON PATIENT_HIGHLIGHT(HighlightTypeId, CreatedDate);
+GO
@@ -0,0 +1,22 @@
+-- ============================================================
+-- Integrity (reconciliation) keyset indexes
+-- The /integrity endpoints read id, modified time and patient
+-- id of the rows changed since a cutoff, in (modified time, id)
+-- order, one keyset page at a time. These indexes cover those
+-- reads, so a page is a seek plus a short range scan instead
+-- of a scan of the whole table.
+-- ============================================================
+
+CREATE INDEX IX_PATIENT_modifiedDate_id
+    ON PATIENT(modifiedDate, id);
+GO
+
+CREATE INDEX IX_PATIENT_MEDICATION_UpdatedDateTime_Id
+    ON PATIENT_MEDICATION(UpdatedDateTime, Id)
+    INCLUDE (PatientId);
+GO
+
+CREATE INDEX IX_PATIENT_ALLOCATION_modifiedDate_id
+    ON PATIENT_ALLOCATION(modifiedDate, id)
+    INCLUDE (patientId);
+GO
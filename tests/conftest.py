@@ -18,4 +18,18 @@ def dump_thread_stacks():
 def debug_threads_and_stacks():
     yield
     print("\n=== Remaining threads at pytest end ===")
-    dump_thread_stacks()
\ No newline at end of file
+    dump_thread_stacks()
+@pytest.fixture(autouse=True)
+def clear_highlight_type_cache():
+    # The highlight engine caches highlight types per process; start every test from the database (mock)
+    from app.services.highlight_engine import invalidate_highlight_type_cache
+    invalidate_highlight_type_cache()
+    yield
+
+@pytest.fixture(autouse=True)
+def reference_list_cache(monkeypatch):
+    # Reference lists are cached per process; start every test empty and never broadcast invalidations
+    from app.services import reference_list_cache
+    reference_list_cache.get_reference_list_cache().invalidate()
+    monkeypatch.setattr(reference_list_cache, "_broadcast_invalidation", lambda name: None)
+    yield
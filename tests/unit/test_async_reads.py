@@ -0,0 +1,90 @@
+import asyncio
+from datetime import datetime, timedelta
+from unittest import mock
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app import database
+from app.crud import patient_crud
+from app.crud.integrity_crud import get_integrity_page
+from app.models.patient_allocation_model import PatientAllocation
+from app.routers.patient_router import read_patient
+from app.utils.db_pool import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
+from tests.utils.mock_db import get_db_session_mock
+
+
+def test_run_read_runs_the_crud_function_through_run_sync_on_an_async_session():
+    """On the async path the (sync) CRUD function is handed to AsyncSession.run_sync"""
+    async_db = mock.MagicMock(spec=AsyncSession)
+    async_db.run_sync = mock.AsyncMock(return_value="patient")
+
+    result = asyncio.run(database.run_read(async_db, patient_crud.get_patient, 1, mask=False))
+
+    assert result == "patient"
+    async_db.run_sync.assert_awaited_once_with(patient_crud.get_patient, 1, mask=False)
+
+
+def test_run_read_on_a_real_async_session(monkeypatch):
+    """A sync CRUD function runs unchanged through run_read on an AsyncSession from get_read_db (aiosqlite)"""
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        now = datetime.now()
+        async with engine.begin() as connection:
+            await connection.run_sync(PatientAllocation.__table__.create)
+            for allocation_id in (1, 2, 3):
+                await connection.execute(PatientAllocation.__table__.insert().values(
+                    id=allocation_id, patientId=100 + allocation_id, active="Y", isDeleted="0",
+                    doctorId="D1", gameTherapistId="G1", supervisorId="S1", caregiverId="C1", guardianId=1,
+                    createdDate=now, modifiedDate=now, CreatedById="1", ModifiedById="1",
+                ))
+        monkeypatch.setattr(database, "get_async_engine", lambda: engine)
+        monkeypatch.setattr(database, "_async_session_factory", async_sessionmaker(engine, expire_on_commit=False))
+        try:
+            async with database.read_session() as db:
+                assert isinstance(db, AsyncSession)
+                return await database.run_read(
+                    db, get_integrity_page, "patient_allocation", now - timedelta(hours=1), limit=2, include_total=False
+                )
+        finally:
+            await engine.dispose()
+
+    records, _, has_more, next_cursor = asyncio.run(scenario())
+
+    assert [record["id"] for record in records] == [1, 2]
+    assert has_more and next_cursor
+
+
+def test_get_read_db_falls_back_to_a_sync_session(monkeypatch):
+    """Without the async engine the read endpoints get a regular Session, closed after the request"""
+    db = get_db_session_mock()
+    monkeypatch.setattr(database, "get_async_engine", lambda: None)
+    monkeypatch.setattr(database, "SessionLocal", lambda: db)
+
+    async def request():
+        dependency = database.get_read_db()
+        session = await dependency.__anext__()
+        await dependency.aclose()
+        return session
+
+    assert asyncio.run(request()) is db
+    db.close.assert_called_once()
+
+
+def test_read_patient_endpoint_on_the_sync_fallback():
+    """The async endpoint runs the sync CRUD in the threadpool and validates the row as before"""
+    db = get_db_session_mock()
+    db_patient = mock.MagicMock(id=1)
+    request = mock.MagicMock()
+
+    with mock.patch("app.routers.patient_router.extract_jwt_payload"), \
+         mock.patch.object(patient_crud, "get_patient", return_value=db_patient) as get_patient, \
+         mock.patch("app.routers.patient_router.Patient.model_validate", return_value="validated"):
+        response = asyncio.run(read_patient(1, request, require_auth=False, db=db, mask=True))
+
+    get_patient.assert_called_once_with(db, patient_id=1, mask=True)
+    assert response.data == "validated"
+
+
+def test_async_pool_is_instrumented_with_an_asyncio_queue():
+    assert issubclass(InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool)
+    assert InstrumentedAsyncAdaptedQueuePool._is_asyncio
@@ -0,0 +1,69 @@
+from datetime import date
+from unittest import mock
+
+import pytest
+
+from app.utils import business_calendar
+from app.utils.business_calendar import BusinessDayCalendar
+
+# 2026-08-10 (Monday) is a public holiday in this test calendar
+HOLIDAY = date(2026, 8, 10)
+
+
+@pytest.fixture
+def calendar():
+    return BusinessDayCalendar(2025, 2027, [HOLIDAY])
+
+
+def test_business_days_ago_skips_weekends_and_holidays(calendar):
+    """Should count back over weekends and holidays, not counting the start date"""
+    # Thursday 2026-08-13 -> Wed, Tue, (Mon holiday), Fri
+    assert calendar.business_days_ago(3, date(2026, 8, 13)) == date(2026, 8, 7)
+    # Monday -> previous Friday
+    assert calendar.business_days_ago(1, date(2026, 8, 17)) == date(2026, 8, 14)
+    # Starting on a weekend
+    assert calendar.business_days_ago(1, date(2026, 8, 16)) == date(2026, 8, 14)
+
+
+def test_business_days_ahead_and_between(calendar):
+    """Should count forward the same way and count business days in a half-open range"""
+    assert calendar.business_days_ahead(1, date(2026, 8, 7)) == date(2026, 8, 11)
+    assert calendar.business_days_ahead(5, date(2026, 8, 7)) == date(2026, 8, 17)
+    assert calendar.business_days_between(date(2026, 8, 7), date(2026, 8, 14)) == 4
+    assert calendar.is_business_day(date(2026, 8, 11))
+    assert not calendar.is_business_day(HOLIDAY)
+    assert not calendar.is_business_day(date(2026, 8, 15))
+
+
+def test_business_days_outside_window_raise(calendar):
+    """Should refuse dates beyond the calendar window instead of returning a wrong answer"""
+    with pytest.raises(ValueError):
+        calendar.business_days_ago(5, date(2025, 1, 2))
+    with pytest.raises(ValueError):
+        calendar.business_days_ahead(1, date(2028, 1, 3))
+
+
+def test_get_business_calendar_is_built_once_per_country():
+    """Should load holidays once per process and reuse the calendar afterwards"""
+    with mock.patch.dict(business_calendar._calendars, clear=True), \
+         mock.patch("app.services.holiday_service.HolidayService") as holiday_service_cls:
+        holiday_service_cls.return_value.get_all_holidays.return_value = {HOLIDAY}
+        first = business_calendar.get_business_calendar("SG")
+        second = business_calendar.get_business_calendar("SG")
+
+    assert first is second
+    holiday_service_cls.assert_called_once()
+    assert not first.is_business_day(HOLIDAY)
+
+
+def test_get_business_calendar_retries_a_failed_holiday_load():
+    """A calendar built without holidays (failed load) is not cached, so the next call loads them again"""
+    with mock.patch.dict(business_calendar._calendars, clear=True), \
+         mock.patch("app.services.holiday_service.HolidayService") as holiday_service_cls:
+        holiday_service_cls.return_value.get_all_holidays.side_effect = [set(), {HOLIDAY}]
+        first = business_calendar.get_business_calendar("SG")
+        second = business_calendar.get_business_calendar("SG")
+
+    assert first.is_business_day(HOLIDAY)
+    assert not second.is_business_day(HOLIDAY)
+    assert holiday_service_cls.call_count == 2
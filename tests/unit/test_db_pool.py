@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.utils.db_pool import InstrumentedQueuePool, get_pool_stats
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_pool_stats_track_in_use_overflow_and_timeouts(engine):
+    """Checkouts beyond pool_size count as overflow; a checkout past max_overflow times out and is counted"""
+    first = engine.connect()
+    second = engine.connect()
+    first.execute(text("SELECT 1"))
+
+    stats = get_pool_stats(engine)
+    assert stats["in_use"] == 2
+    assert stats["overflow"] == 1
+    assert stats["overflow_checkouts"] == 1
+
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+
+    second.close()
+    first.close()
+
+    stats = get_pool_stats(engine)
+    assert stats["checkouts"] == 2
+    assert stats["timeouts"] == 1
+    assert stats["peak_in_use"] == 2
+    assert stats["in_use"] == 0
+
+
+def test_pool_metrics_survive_dispose(engine):
+    """engine.dispose() recreates the pool; the counters carry over"""
+    with engine.connect():
+        pass
+    engine.dispose()
+    with engine.connect():
+        pass
+
+    assert isinstance(engine.pool, InstrumentedQueuePool)
+    assert get_pool_stats(engine)["checkouts"] == 2
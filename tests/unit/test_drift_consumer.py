@@ -0,0 +1,139 @@
+from datetime import datetime
+from unittest import mock
+
+import pytest
+
+from app.messaging.drift_consumer import DriftConsumer
+from app.messaging.rabbitmq_client import RabbitMQClient
+from app.messaging.sync_registry import SYNC_ENTITIES
+from app.models.patient_allocation_model import PatientAllocation
+from app.models.patient_guardian_model import PatientGuardian
+from app.models.patient_model import Patient
+
+
+def _drift(record_type, record_id):
+    return {"data": {"record_type": record_type, "record_id": record_id, "drift_type": "missing"}}
+
+
+@pytest.fixture
+def consumer():
+    with mock.patch("app.messaging.drift_consumer.RabbitMQClient"), \
+         mock.patch("app.messaging.drift_consumer.get_producer_manager"):
+        consumer = DriftConsumer()
+    consumer.producer_manager = mock.MagicMock()
+    consumer.SessionLocal = mock.MagicMock()
+    return consumer
+
+
+def test_batch_loads_each_record_once_and_maps_confirms_back(consumer):
+    """One IN query per type; duplicates publish once; missing records are acked; failed confirms are requeued"""
+    now = datetime(2026, 10, 17, 9, 0)
+    patients = [
+        Patient(id=1, name="A", nric="S1234567A", modifiedDate=now, ModifiedById="1"),
+        Patient(id=2, name="B", nric="S7654321B", modifiedDate=now, ModifiedById="1"),
+    ]
+    db = consumer.SessionLocal.return_value
+    db.query.return_value.filter.return_value.all.return_value = patients
+    consumer.producer_manager.publish_batch.return_value = [True, False]
+
+    results = consumer._handle_batch([
+        _drift("patient", 1),
+        _drift("patient", "2"),
+        _drift("patient", 1),
+        _drift("patient", 3),
+        _drift("unknown_type", 1),
+    ])
+
+    assert results == [True, False, True, True, False]
+    db.query.assert_called_once_with(Patient)
+    exchange, sync_messages = consumer.producer_manager.publish_batch.call_args[0]
+    assert exchange == "patient.updates"
+    assert [(routing_key, message["patient_id"]) for routing_key, message in sync_messages] == [
+        ("patient.updated.sync", 1),
+        ("patient.updated.sync", 2),
+    ]
+    db.close.assert_called_once()
+
+
+def test_allocation_drift_is_repaired_from_the_registry(consumer):
+    """patient_allocation drift republishes every column plus the guardian's user id, dates in ISO 8601"""
+    modified = datetime(2026, 10, 17, 9, 30)
+    allocation = PatientAllocation(
+        id=5, patientId=7, active="Y", isDeleted="0", guardianId=3, doctorId="D1",
+        createdDate=modified, modifiedDate=modified, CreatedById="1", ModifiedById="2",
+    )
+    allocation.guardian = PatientGuardian(id=3, guardianApplicationUserId="guardian-user")
+    db = consumer.SessionLocal.return_value
+    db.query.return_value.options.return_value.filter.return_value.first.return_value = allocation
+    consumer.producer_manager.publish.return_value = True
+
+    assert consumer._process_drift_message(_drift("patient_allocation", 5))
+
+    db.query.assert_called_once_with(PatientAllocation)
+    exchange, routing_key, message = consumer.producer_manager.publish.call_args[0]
+    assert (exchange, routing_key) == ("patient.updates", "patient.allocation.updated.sync")
+    assert (message["event_type"], message["allocation_id"], message["patient_id"]) == ("PATIENT_ALLOCATION_UPDATED", 5, 7)
+    assert message["timestamp"] == "2026-10-17T09:30:00"
+    assert message["new_data"]["modifiedDate"] == "2026-10-17T09:30:00"
+    assert message["new_data"]["guardianApplicationUserId"] == "guardian-user"
+    assert set(message["new_data"]) == {column.name for column in PatientAllocation.__table__.columns} | {"guardianApplicationUserId"}
+
+
+def test_patient_sync_keeps_the_published_fields():
+    """The compiled serializer emits the same patient fields the hand-written sync event used to"""
+    patient = Patient(id=1, name="A", dateOfBirth=datetime(1950, 1, 2), isDeleted=0)
+
+    routing_key, message = SYNC_ENTITIES["patient"].build_sync_message(patient)
+
+    assert routing_key == "patient.updated.sync"
+    assert message["patient_id"] == 1 and "medication_id" not in message
+    assert message["new_data"]["dateOfBirth"] == "1950-01-02T00:00:00"
+    assert list(message["new_data"]) == [
+        "id", "name", "nric", "address", "tempAddress", "homeNo", "handphoneNo", "gender", "dateOfBirth",
+        "isApproved", "preferredName", "preferredLanguageId", "updateBit", "autoGame", "startDate", "endDate",
+        "isActive", "isRespiteCare", "privacyLevel", "terminationReason", "inActiveReason", "inActiveDate",
+        "profilePicture", "createdDate", "modifiedDate", "CreatedById", "ModifiedById", "isDeleted",
+    ]
+
+
+def test_consume_batch_acks_a_full_batch_at_once(monkeypatch):
+    """The batch is flushed at prefetch_count messages and acked with one multiple=True ack"""
+    monkeypatch.setenv("RABBITMQ_PORT", "5672")
+    client = RabbitMQClient("test")
+    client.ensure_connection = mock.MagicMock()
+    client.channel = mock.MagicMock()
+    client.connection = mock.MagicMock()
+    callback = mock.MagicMock(side_effect=lambda messages: [True] * len(messages))
+
+    client.consume_batch("queue", callback, prefetch_count=3, max_wait_ms=100)
+    client.channel.basic_qos.assert_called_once_with(prefetch_count=3)
+    on_message = client.channel.basic_consume.call_args.kwargs["on_message_callback"]
+
+    for delivery_tag in (1, 2, 3):
+        on_message(client.channel, mock.MagicMock(delivery_tag=delivery_tag), None, b'{"data": {}}')
+
+    client.connection.call_later.assert_called_once()
+    client.connection.remove_timeout.assert_called_once_with(client.connection.call_later.return_value)
+    callback.assert_called_once_with([{"data": {}}] * 3)
+    client.channel.basic_ack.assert_called_once_with(delivery_tag=3, multiple=True)
+
+
+def test_consume_batch_requeues_only_the_failures(monkeypatch):
+    """A partially failed batch acks its successes and requeues its failures one by one"""
+    monkeypatch.setenv("RABBITMQ_PORT", "5672")
+    client = RabbitMQClient("test")
+    client.ensure_connection = mock.MagicMock()
+    client.channel = mock.MagicMock()
+    client.connection = mock.MagicMock()
+
+    client.consume_batch("queue", lambda messages: [True, False], prefetch_count=10, max_wait_ms=100)
+    on_message = client.channel.basic_consume.call_args.kwargs["on_message_callback"]
+    on_message(client.channel, mock.MagicMock(delivery_tag=1), None, b'{"data": {}}')
+    on_message(client.channel, mock.MagicMock(delivery_tag=2), None, b'{"data": {}}')
+
+    # The max-wait timer fires
+    flush = client.connection.call_later.call_args[0][1]
+    flush()
+
+    client.channel.basic_ack.assert_called_once_with(delivery_tag=1)
+    client.channel.basic_nack.assert_called_once_with(delivery_tag=2, requeue=True)
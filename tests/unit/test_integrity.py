@@ -0,0 +1,182 @@
+import asyncio
+import hashlib
+import json
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import database
+from app.crud.integrity_crud import get_integrity_page
+from app.crud.integrity_digest_crud import (
+    digest_row_line,
+    get_bucket_digests,
+    get_bucket_rows,
+    get_range_bucket_digests,
+    get_range_digests,
+)
+from app.models.patient_allocation_model import PatientAllocation
+from app.routers import integrity_router
+from app.utils.pagination import clear_count_cache
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    PatientAllocation.__table__.create(engine)
+    now = datetime.now()
+    with engine.begin() as connection:
+        for allocation_id in range(1, 8):
+            connection.execute(PatientAllocation.__table__.insert().values(
+                id=allocation_id, patientId=100 + allocation_id, active="Y", isDeleted="0",
+                doctorId="D1", gameTherapistId="G1", supervisorId="S1", caregiverId="C1", guardianId=1,
+                createdDate=now, modifiedDate=now - timedelta(minutes=allocation_id % 3),
+                CreatedById="1", ModifiedById="1",
+            ))
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(database, "SessionLocal", factory)
+    monkeypatch.setattr(database, "get_async_engine", lambda: None)
+    clear_count_cache()
+    yield factory
+    engine.dispose()
+
+
+def test_keyset_pages_cover_the_window_in_modified_order(session_factory):
+    """Cursor pages follow (modifiedDate, id) without gaps or repeats; the first page carries the total"""
+    db = session_factory()
+    cutoff_time = datetime.now() - timedelta(hours=1)
+
+    records, total_count, has_more, cursor = get_integrity_page(db, "patient_allocation", cutoff_time, limit=3)
+    assert (total_count, has_more) == (7, True)
+    assert set(records[0]) == {"id", "patient_id", "modified_date", "version_timestamp", "record_type"}
+
+    ids = [record["id"] for record in records]
+    while cursor:
+        records, total_count, has_more, cursor = get_integrity_page(
+            db, "patient_allocation", cutoff_time, limit=3, cursor=cursor
+        )
+        ids += [record["id"] for record in records]
+
+    assert ids == [2, 5, 1, 4, 7, 3, 6]
+    assert total_count == 7
+    db.close()
+
+
+def test_ndjson_streams_the_whole_window(session_factory):
+    """format=ndjson returns every record of the window, one JSON object per line"""
+    app = FastAPI()
+    app.include_router(integrity_router.router, prefix="/integrity")
+
+    response = TestClient(app).get("/integrity/patient-allocation", params={"limit": 2, "format": "ndjson"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == [2, 5, 1, 4, 7, 3, 6]
+    assert lines[0]["patient_id"] == 102
+
+
+def test_ndjson_stream_pages_through_rows_sharing_one_modified_time(session_factory):
+    """More rows than a chunk share one modifiedDate (e.g. after a bulk update); each is streamed once"""
+    db = session_factory()
+    db.query(PatientAllocation).update({PatientAllocation.modifiedDate: datetime(2026, 10, 17, 9, 30, 0, 123000)})
+    db.commit()
+    db.close()
+    app = FastAPI()
+    app.include_router(integrity_router.router, prefix="/integrity")
+
+    with mock.patch("app.routers.integrity_router.datetime") as router_datetime:
+        router_datetime.now.return_value = datetime(2026, 10, 17, 10, 0)
+        response = TestClient(app).get("/integrity/patient-allocation", params={"limit": 2, "format": "ndjson"})
+
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == [1, 2, 3, 4, 5, 6, 7]
+
+
+def test_ndjson_stream_aborts_when_the_cursor_does_not_advance(session_factory):
+    """A page that hands back the cursor it was given ends the stream with an error instead of looping"""
+    async def stream():
+        return [chunk async for chunk in integrity_router._stream_integrity_records(
+            "patient_allocation", datetime.now() - timedelta(hours=1), 2, "c1"
+        )]
+
+    page = ([{"id": 1}], None, True, "c1")
+    with mock.patch("app.routers.integrity_router.get_integrity_page", return_value=page), \
+         pytest.raises(RuntimeError):
+        asyncio.run(stream())
+
+
+def test_sql_server_seek_binds_the_cursor_as_datetime():
+    """On SQL Server the cursor's modified time is cast to the column type before it is compared"""
+    from sqlalchemy.dialects import mssql
+    from app.utils.pagination import encode_cursor
+
+    db = mock.MagicMock()
+    db.get_bind.return_value.dialect.name = "mssql"
+    with mock.patch("app.crud.integrity_crud.paginate_query", return_value=([], None, None, False)) as paginate:
+        get_integrity_page(db, "patient_allocation", datetime(2026, 10, 17), cursor=encode_cursor("2026-10-17T09:30:00.123000", 4))
+
+    seek_sql = str(paginate.call_args.kwargs["seek"].compile(dialect=mssql.dialect()))
+    assert seek_sql.count("CAST(") == 2 and "AS DATETIME)" in seek_sql
+
+
+def test_digest_changes_only_along_the_path_of_a_changed_row(session_factory):
+    """Updating one row changes its bucket, its range and the root; the other hashes stay equal"""
+    db = session_factory()
+    root_before, row_count, ranges_before = get_range_digests(db, "patient_allocation", bucket_size=2, buckets_per_range=2)
+    buckets_before = get_bucket_digests(db, "patient_allocation", bucket_size=2)
+    assert row_count == 7
+    assert [r["range"] for r in ranges_before] == [0, 1]
+
+    db.query(PatientAllocation).filter(PatientAllocation.id == 5).update({"isDeleted": "1"})
+    db.commit()
+
+    root_after, _, ranges_after = get_range_digests(db, "patient_allocation", bucket_size=2, buckets_per_range=2)
+    range_hash, buckets_after = get_range_bucket_digests(db, "patient_allocation", 1, bucket_size=2, buckets_per_range=2)
+
+    assert root_after != root_before
+    assert [r["hash"] == b["hash"] for r, b in zip(ranges_after, ranges_before)] == [True, False]
+    assert range_hash == ranges_after[1]["hash"]
+    changed = [bucket["bucket"] for bucket in buckets_after if bucket not in buckets_before]
+    assert changed == [2]
+    assert [row["is_deleted"] for row in get_bucket_rows(db, "patient_allocation", 2, bucket_size=2)] == ["0", "1"]
+    db.close()
+
+
+def test_bucket_hash_is_reproducible_from_the_rows():
+    """A bucket hash is the SHA-1 of its row lines, so the reconciler can compute it on its side"""
+    modified = datetime(2026, 10, 17, 9, 30, 0, 123000)
+    rows = [mock.MagicMock(id=8, modified_date=modified, is_deleted=0)]
+    db = mock.MagicMock()
+    query = db.query.return_value
+    query.filter.return_value = query
+    query.order_by.return_value.limit.return_value.all.return_value = rows
+
+    [bucket] = get_bucket_digests(db, "patient", bucket_size=4)
+
+    assert digest_row_line(8, modified, 0) == "8|2026-10-17T09:30:00.123|0"
+    assert bucket == {
+        "bucket": 2, "min_id": 8, "max_id": 11, "row_count": 1,
+        "hash": hashlib.sha1(b"8|2026-10-17T09:30:00.123|0\n").hexdigest(),
+    }
+
+
+def test_sql_server_hashes_buckets_in_the_database():
+    """On SQL Server only one (bucket, row_count, hash) row per bucket is read, grouped and hashed by the query"""
+    db = mock.MagicMock()
+    db.get_bind.return_value.dialect.name = "mssql"
+    db.execute.return_value.all.return_value = [mock.MagicMock(bucket=3, row_count=2, hash="ab" * 20)]
+
+    buckets = get_bucket_digests(db, "patient_allocation", bucket_size=4, min_id=8, max_id=15)
+
+    assert buckets == [{"bucket": 3, "min_id": 12, "max_id": 15, "row_count": 2, "hash": "ab" * 20}]
+    statement, params = db.execute.call_args[0]
+    sql = str(statement)
+    assert "GROUP BY [id] / 4" in sql
+    assert "HASHBYTES('SHA1', STRING_AGG(" in sql and "WITHIN GROUP (ORDER BY [id])" in sql
+    assert params == {"min_id": 8, "max_id": 15}
+    db.query.assert_not_called()
@@ -0,0 +1,73 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from app.models.outbox_model import COMPRESSED_PAYLOAD_PREFIX, OutboxEvent
+from app.services.outbox_service import OutboxService, compact_payload
+
+
+def _update_payload():
+    record = {f'field_{i}': f'value {i} ' * 10 for i in range(40)}
+    return {
+        'event_type': 'PATIENT_UPDATED',
+        'patient_id': 1,
+        'old_data': record,
+        'new_data': dict(record, field_0='changed'),
+        'changes': {'field_0': {'old': record['field_0'], 'new': 'changed'}},
+        'timestamp': '2026-10-17T10:00:00',
+        'correlation_id': 'abc',
+    }
+
+
+def test_large_payload_stored_compressed_and_decoded_transparently():
+    """Should zlib-compress payloads over the threshold and return the original dict from get_payload"""
+    payload = _update_payload()
+    event = OutboxEvent()
+
+    event.set_payload(payload, compress_min_bytes=1024)
+
+    assert event.payload.startswith(COMPRESSED_PAYLOAD_PREFIX)
+    assert len(event.payload) < len(json.dumps(payload)) / 2
+    assert event.get_payload() == payload
+
+
+def test_small_payload_stored_as_plain_json():
+    """Should keep payloads under the threshold (and legacy rows) as readable JSON"""
+    event = OutboxEvent()
+
+    event.set_payload({'patient_id': 1}, compress_min_bytes=1024)
+
+    assert event.payload == '{"patient_id": 1}'
+    assert event.get_payload() == {'patient_id': 1}
+
+
+def test_compact_payload_keeps_changes_and_version_only():
+    """Should drop the old/new entity copies and reference the entity version instead"""
+    compact = compact_payload(_update_payload())
+
+    assert 'old_data' not in compact and 'new_data' not in compact
+    assert compact['changes'] == {'field_0': {'old': 'value 0 ' * 10, 'new': 'changed'}}
+    assert compact['entity_version'] == '2026-10-17T10:00:00'
+    assert compact['payload_format'] == 'compact'
+    # Created / deleted events have no changes and are left untouched
+    assert compact_payload({'patient_id': 1, 'patient_data': {}}) == {'patient_id': 1, 'patient_data': {}}
+
+
+def test_create_event_uses_configured_payload_format():
+    """Should store the compact form when OUTBOX_PAYLOAD_FORMAT is compact"""
+    db = MagicMock()
+
+    with patch('app.services.outbox_service.get_producer_manager'), \
+         patch('app.services.outbox_service.Config.Outbox.PAYLOAD_FORMAT', 'compact'):
+        event = OutboxService().create_event(
+            db=db,
+            event_type='PATIENT_UPDATED',
+            aggregate_id=1,
+            payload=_update_payload(),
+            routing_key='patient.updated.1',
+            correlation_id='abc',
+            created_by='user',
+        )
+
+    assert 'new_data' not in event.get_payload()
+    assert event.get_payload()['entity_version'] == '2026-10-17T10:00:00'
+    db.add.assert_called_once_with(event)
@@ -0,0 +1,260 @@
+import asyncio
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.messaging.producer_manager import BatchPublishRequest, ProducerManager
+from app.services.background_processor import OutboxProcessor
+from app.services.outbox_dispatcher import OutboxDispatcher, lane_for
+from app.services.outbox_service import OutboxService
+
+
+@pytest.fixture
+def producer():
+    with patch('app.messaging.producer_manager.RabbitMQClient') as mock_client_cls:
+        manager = ProducerManager(testing=True)
+        manager.exchanges.add('patient.updates')
+        yield manager, mock_client_cls.return_value
+
+
+def test_batch_request_skips_rest_of_failed_aggregate(producer):
+    """Should stop publishing an aggregate after its first failure but carry on with others"""
+    manager, client = producer
+    client.publish.side_effect = [False, True, True]
+
+    request = BatchPublishRequest(
+        'patient.updates',
+        [('patient.updated.1', {'n': 1}), ('patient.updated.2', {'n': 2}), ('patient.updated.1', {'n': 3}), ('patient.updated.2', {'n': 4})],
+        ordering_keys=['1', '2', '1', '2'],
+    )
+    manager._process_batch_request(request)
+
+    assert request.results == [False, True, None, True]
+    assert request.done.is_set()
+    assert client.publish.call_count == 3
+
+
+def test_batch_request_stops_once_abandoned(producer):
+    """Should not publish the rest of a batch whose caller stopped waiting"""
+    manager, client = producer
+    request = BatchPublishRequest('patient.updates', [('patient.updated.1', {}), ('patient.updated.2', {})])
+
+    def publish_then_time_out(**kwargs):
+        request.abandon()
+        return True
+
+    client.publish.side_effect = publish_then_time_out
+    manager._process_batch_request(request)
+
+    assert client.publish.call_count == 1
+    assert request.results == [True, None]
+    assert request.done.is_set()
+
+
+def test_publish_batch_when_not_running(producer):
+    """Should report every message as failed if the producer thread is not running"""
+    manager, _ = producer
+
+    assert manager.publish_batch('patient.updates', [('a', {}), ('b', {})]) == [False, False]
+
+
+def _make_event(aggregate_id):
+    event = MagicMock(aggregate_id=aggregate_id, routing_key=f"patient.updated.{aggregate_id}")
+    event.get_payload.return_value = {'patient_id': aggregate_id}
+    return event
+
+
+def test_process_pending_events_maps_batch_results():
+    """Should mark confirmed events published, failed events failed and leave skipped events pending"""
+    events = [_make_event('1'), _make_event('2'), _make_event('1')]
+    db = MagicMock()
+
+    with patch('app.services.outbox_service.get_producer_manager'), \
+         patch('app.database.SessionLocal', return_value=db):
+        service = OutboxService()
+        service.claim_batch = MagicMock(return_value=events)
+        service.dispatcher.dispatch = MagicMock(return_value=[False, True, None])
+        successful, failed = service.process_pending_events(batch_size=10)
+
+    assert (successful, failed) == (1, 1)
+    events[0].mark_failed.assert_called_once()
+    events[1].mark_published.assert_called_once()
+    events[2].mark_published.assert_not_called()
+    events[2].mark_failed.assert_not_called()
+    service.claim_batch.assert_called_once_with(db, 10)
+    for event in events:
+        event.release_claim.assert_called_once()  # Lease handed back whatever the outcome
+    db.commit.assert_called_once()
+
+
+def _claim_queries(candidate_ids, events, heads):
+    """db whose queries, in claim_batch order, return the given candidate ids, claimed events and foreign heads"""
+    busy, candidates, update, claimed, foreign = (MagicMock() for _ in range(5))
+    candidates.with_hint.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = [
+        MagicMock(id=event_id) for event_id in candidate_ids
+    ]
+    claimed.filter.return_value.order_by.return_value.all.return_value = events
+    foreign.filter.return_value.group_by.return_value.all.return_value = heads
+    db = MagicMock()
+    db.query.side_effect = [busy, candidates, update, claimed, foreign]
+    return db, candidates, foreign
+
+
+def _sql(*criteria):
+    return " ".join(str(c.compile(compile_kwargs={'literal_binds': True})) for c in criteria)
+
+
+def test_claim_batch_claims_failed_events_again_ahead_of_their_aggregate():
+    """A FAILED event with attempts left is claimed again, so it is retried before later events of its aggregate"""
+    failed = MagicMock(aggregate_id='1', created_at=datetime(2024, 1, 1, 10, 0))
+    later = MagicMock(aggregate_id='1', created_at=datetime(2024, 1, 1, 10, 1))
+    db, candidates, _ = _claim_queries(['f', 'l'], [failed, later], [])
+
+    with patch('app.services.outbox_service.get_producer_manager'):
+        claimed = OutboxService().claim_batch(db, 10)
+
+    assert claimed == [failed, later]
+    candidate_filter = _sql(*candidates.with_hint.return_value.filter.call_args.args)
+    assert "'PENDING', 'FAILED'" in candidate_filter and "retry_count < 3" in candidate_filter
+
+
+def test_claim_batch_releases_events_behind_a_failed_event_it_did_not_claim():
+    """An earlier retryable FAILED event of the aggregate that is not ours holds back the events we claimed"""
+    event = MagicMock(aggregate_id='1', created_at=datetime(2024, 1, 1, 10, 1))
+    other = MagicMock(aggregate_id='2', created_at=datetime(2024, 1, 1, 10, 2))
+    db, _, foreign = _claim_queries(['e', 'o'], [event, other], [('1', datetime(2024, 1, 1, 10, 0))])
+
+    with patch('app.services.outbox_service.get_producer_manager'):
+        claimed = OutboxService().claim_batch(db, 10)
+
+    assert claimed == [other]
+    event.release_claim.assert_called_once()
+    head_filter = _sql(*foreign.filter.call_args.args)
+    assert "'PENDING', 'FAILED'" in head_filter and "retry_count < 3" in head_filter
+
+
+def test_dispatcher_keeps_aggregate_in_one_lane():
+    """Should partition by aggregate_id so each aggregate's events stay together and in order"""
+    producers = {}
+
+    def producer_factory(lane):
+        producer = producers.setdefault(lane, MagicMock())
+        producer.publish_batch.side_effect = lambda exchange, messages, ordering_keys, timeout: [True] * len(messages)
+        return producer
+
+    dispatcher = OutboxDispatcher(lane_count=4, producer_factory=producer_factory)
+    events = [_make_event(str(i % 6)) for i in range(30)]
+
+    results = dispatcher.dispatch(events, timeout=1)
+
+    assert results == [True] * 30
+    for lane, producer in producers.items():
+        keys = producer.publish_batch.call_args.kwargs['ordering_keys']
+        assert all(lane_for(key, 4) == lane for key in keys)
+        for aggregate_id in set(keys):
+            payloads = [m for (_, m), key in zip(producer.publish_batch.call_args.kwargs['messages'], keys) if key == aggregate_id]
+            assert len(payloads) == 5
+
+    stats = dispatcher.get_stats({'0': 2, '1': 3})
+    assert stats['lane_count'] == 4
+    assert sum(lane['published'] for lane in stats['lanes']) == 30
+    assert sum(lane['backlog'] for lane in stats['lanes']) == 5
+
+
+def test_processor_woken_by_commit_notification():
+    """Should run a batch as soon as it is notified instead of waiting for the fallback poll"""
+    outbox_service = MagicMock()
+    outbox_service.process_pending_events.return_value = (0, 0)
+
+    async def scenario():
+        with patch('app.services.background_processor.get_outbox_service', return_value=outbox_service):
+            processor = OutboxProcessor(batch_size=10, relay_mode="event")
+        processor.max_wait = 60
+        processor.linger = 0
+        task = asyncio.create_task(processor.start())
+        await asyncio.sleep(0.05)
+        assert outbox_service.process_pending_events.call_count == 1
+
+        processor.notify()
+        await asyncio.sleep(0.05)
+        assert outbox_service.process_pending_events.call_count == 2
+        assert processor.get_stats()['wakeups'] == 1
+
+        await processor.stop()
+        await task
+
+    with patch('app.services.background_processor.signal.signal'):
+        asyncio.run(scenario())
+    outbox_service.add_commit_listener.assert_called_once()
+    outbox_service.remove_commit_listener.assert_called_once()
+
+
+def test_purge_published_events_deletes_in_chunks():
+    """Should delete old published events one chunk per transaction until none are left"""
+    db = MagicMock()
+    id_query = db.query.return_value.with_hint.return_value.filter.return_value.order_by.return_value.limit.return_value
+    id_query.all.side_effect = [
+        [MagicMock(id='a'), MagicMock(id='b')],
+        [MagicMock(id='c')],
+        [],
+    ]
+    db.query.return_value.filter.return_value.delete.side_effect = [2, 1]
+
+    with patch('app.services.outbox_service.get_producer_manager'), \
+         patch('app.database.SessionLocal', return_value=db):
+        service = OutboxService()
+        result = service.purge_published_events(older_than_days=7, archive=False, chunk_size=2, max_chunks=10)
+
+    assert result['purged'] == 3
+    assert result['archived'] == 0
+    assert result['chunks'] == 2
+    assert result['complete'] is True
+    assert db.commit.call_count == 2
+    db.execute.assert_not_called()
+    db.close.assert_called_once()
+
+
+def test_purge_published_events_archives_and_stops_at_max_chunks():
+    """Should copy each chunk to the archive before deleting and report an incomplete run at max_chunks"""
+    db = MagicMock()
+    id_query = db.query.return_value.with_hint.return_value.filter.return_value.order_by.return_value.limit.return_value
+    id_query.all.return_value = [MagicMock(id='a')]
+    db.query.return_value.filter.return_value.delete.return_value = 1
+
+    with patch('app.services.outbox_service.get_producer_manager'), \
+         patch('app.database.SessionLocal', return_value=db):
+        service = OutboxService()
+        result = service.purge_published_events(older_than_days=7, archive=True, chunk_size=1, max_chunks=3)
+
+    assert result == dict(result, purged=3, archived=3, chunks=3, complete=False)
+    assert db.execute.call_count == 3
+    assert db.commit.call_count == 3
+
+
+def test_purge_published_events_complete_when_last_allowed_chunk_drains():
+    """A short chunk means nothing is left past the cutoff, even when it is the last chunk allowed"""
+    db = MagicMock()
+    id_query = db.query.return_value.with_hint.return_value.filter.return_value.order_by.return_value.limit.return_value
+    id_query.all.side_effect = [[MagicMock(id='a'), MagicMock(id='b')], [MagicMock(id='c')]]
+    db.query.return_value.filter.return_value.delete.side_effect = [2, 1]
+
+    with patch('app.services.outbox_service.get_producer_manager'), \
+         patch('app.database.SessionLocal', return_value=db):
+        service = OutboxService()
+        result = service.purge_published_events(older_than_days=7, archive=False, chunk_size=2, max_chunks=2)
+
+    assert result == dict(result, purged=3, chunks=2, complete=True)
+
+
+def test_get_stats_uses_single_grouped_query():
+    """Should build all status counts from one GROUP BY query"""
+    db = MagicMock()
+    db.query.return_value.group_by.return_value.all.return_value = [('PENDING', 4), ('PUBLISHED', 10)]
+
+    with patch('app.services.outbox_service.get_producer_manager'), \
+         patch('app.database.SessionLocal', return_value=db):
+        stats = OutboxService().get_stats()
+
+    assert stats == {'total': 14, 'pending': 4, 'published': 10, 'failed': 0}
+    db.query.assert_called_once()
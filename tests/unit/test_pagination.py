@@ -0,0 +1,137 @@
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils.pagination import (
+    clear_count_cache,
+    decode_cursor,
+    encode_cursor,
+    paginate_query,
+)
+
+
+def test_cursor_round_trip():
+    """Test case for encoding and decoding a keyset cursor."""
+    cursor = encode_cursor("Alice Tan", 42)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, 2) == ["Alice Tan", 42]
+
+
+def test_decode_cursor_invalid_token():
+    """Test case for decoding a malformed cursor."""
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor("not-a-cursor!!", 2)
+
+    assert exc_info.value.status_code == 400
+
+
+def test_decode_cursor_wrong_length():
+    """Test case for decoding a cursor with the wrong number of values."""
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(encode_cursor("Alice Tan"), 2)
+
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.parametrize("values", [("a", "x"), (1, 2), ("a", True), ("a", None)])
+def test_decode_cursor_wrong_value_types(values):
+    """Test case for decoding a tampered cursor whose values have the wrong types."""
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(encode_cursor(*values), 2, (str, int))
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "Invalid pagination cursor"
+
+
+def _mock_query(rows):
+    query = MagicMock()
+    query.order_by.return_value = query
+    query.add_columns.return_value = query
+    query.filter.return_value = query
+    query.offset.return_value = query
+    query.limit.return_value = query
+    query.all.return_value = rows
+    return query
+
+
+def test_paginate_query_total_from_window_function():
+    """Test case for taking the total from the COUNT(*) OVER() column of the page rows."""
+    query = _mock_query([("a", 5), ("b", 5), ("c", 5)])
+
+    items, totalRecords, totalPages, hasMore = paginate_query(query, pageNo=0, pageSize=2)
+
+    assert items == ["a", "b"]
+    assert totalRecords == 5
+    assert totalPages == 3
+    assert hasMore is True
+    query.limit.assert_called_once_with(3)
+    query.count.assert_not_called()
+
+
+def test_paginate_query_without_total():
+    """Test case for skipping the total when include_total is False."""
+    query = _mock_query(["a", "b"])
+
+    items, totalRecords, totalPages, hasMore = paginate_query(query, pageNo=1, pageSize=2, include_total=False)
+
+    assert items == ["a", "b"]
+    assert totalRecords is None
+    assert totalPages is None
+    assert hasMore is False
+    query.add_columns.assert_not_called()
+    query.offset.assert_called_once_with(2)
+
+
+def test_paginate_query_past_last_page_falls_back_to_count():
+    """Test case for a page past the end, where no row carries the window total."""
+    query = _mock_query([])
+    query.count.return_value = 4
+
+    items, totalRecords, totalPages, hasMore = paginate_query(query, pageNo=5, pageSize=2)
+
+    assert items == []
+    assert totalRecords == 4
+    assert totalPages == 2
+    assert hasMore is False
+
+
+def test_paginate_query_seek_uses_cached_count():
+    """Test case for cursor pages reusing the total computed for the first page."""
+    clear_count_cache()
+    query = _mock_query([("a", 3), ("b", 3)])
+    paginate_query(query, pageNo=0, pageSize=2)
+
+    query.all.return_value = ["c"]
+    items, totalRecords, _, hasMore = paginate_query(query, pageSize=2, seek=MagicMock())
+
+    assert items == ["c"]
+    assert totalRecords == 3
+    assert hasMore is False
+    query.count.assert_not_called()
+    clear_count_cache()
+
+
+def test_paginate_query_row_shapes_match_across_modes():
+    """Test case for counted, uncounted and seek pages returning rows of the same shape."""
+    from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine
+    from sqlalchemy.orm import Session
+
+    clear_count_cache()
+    engine = create_engine("sqlite://")
+    items = Table("items", MetaData(), Column("id", Integer, primary_key=True), Column("name", String))
+    items.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.execute(items.insert(), [{"id": i, "name": f"item {i}"} for i in range(1, 4)])
+
+        for columns, expected in [((items.c.id,), 2), ((items.c.id, items.c.name), (2, "item 2"))]:
+            query = db.query(*columns).order_by(items.c.id)
+            counted = paginate_query(query, pageNo=1, pageSize=1).items
+            uncounted = paginate_query(query, pageNo=1, pageSize=1, include_total=False).items
+            seek = paginate_query(query, pageSize=1, seek=items.c.id > 1).items
+
+            assert counted == uncounted == seek == [expected]
+        assert counted[0].id == 2 and counted[0].name == "item 2"
+    engine.dispose()
+    clear_count_cache()
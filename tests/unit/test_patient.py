@@ -0,0 +1,65 @@
+import pytest
+from unittest import mock
+
+from app.crud.patient_crud import get_patients_by_ids
+from tests.utils.mock_db import get_db_session_mock
+
+
+@pytest.fixture
+def db_session_mock():
+    """Fixture to mock the database session."""
+    return get_db_session_mock()
+
+
+def _make_patient(patient_id, nric):
+    patient = mock.MagicMock(id=patient_id, nric=nric)
+    patient.mask_nric = "*****" + nric[-4:]
+    return patient
+
+
+def _mock_query(db_session_mock, patients):
+    mock_query = mock.MagicMock()
+    mock_query.options.return_value = mock_query
+    mock_query.filter.return_value = mock_query
+    mock_query.all.return_value = patients
+    db_session_mock.query.return_value = mock_query
+    return mock_query
+
+
+def test_get_patients_by_ids_keeps_input_order(db_session_mock):
+    """Test case for returning a batch of patients in the order of the requested ids."""
+    patients = [_make_patient(1, "S1234567A"), _make_patient(2, "S7654321B"), _make_patient(3, "S1111111C")]
+    mock_query = _mock_query(db_session_mock, patients)
+
+    result = get_patients_by_ids(db_session_mock, [3, 1, 99, 3, 2], mask=False)
+
+    assert [p.id for p in result] == [3, 1, 2]
+    assert result[0].nric == "S1111111C"
+    mock_query.all.assert_called_once()
+
+
+def test_get_patients_by_ids_masks_nric(db_session_mock):
+    """Test case for masking the nric of every patient in the batch."""
+    _mock_query(db_session_mock, [_make_patient(1, "S1234567A")])
+
+    result = get_patients_by_ids(db_session_mock, [1])
+
+    assert result[0].nric == "*****567A"
+
+
+def test_get_patients_by_ids_empty(db_session_mock):
+    """Test case for an empty id list, which should not hit the database."""
+    assert get_patients_by_ids(db_session_mock, []) == []
+    db_session_mock.query.assert_not_called()
+
+
+def test_get_patients_rejects_tampered_cursor(db_session_mock):
+    """A cursor whose id is not an integer is rejected before it reaches the query"""
+    from fastapi import HTTPException
+    from app.crud.patient_crud import get_patients
+    from app.utils.pagination import encode_cursor
+
+    with pytest.raises(HTTPException) as exc_info:
+        get_patients(db_session_mock, cursor=encode_cursor("a", "x"))
+
+    assert exc_info.value.status_code == 400
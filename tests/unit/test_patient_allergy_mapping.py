@@ -39,9 +39,6 @@ USER_FULL_NAME = "TEST_NAME"
 def test_get_all_allergies(db_session_mock):
     """Test case for retrieving all patient allergies with pagination."""
 
-    # Mock `count()` to simulate total records
-    db_session_mock.query.return_value.join.return_value.join.return_value.filter.return_value.count.return_value = 2
-
     # Mock query results
     mock_results = [
         MagicMock(
@@ -72,8 +69,8 @@ def test_get_all_allergies(db_session_mock):
         ),
     ]
 
-    # Mock `.all()`
-    db_session_mock.query.return_value.join.return_value.join.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = mock_results
+    # Mock `.all()`: each row carries the COUNT(*) OVER() total as its last column
+    db_session_mock.query.return_value.join.return_value.join.return_value.filter.return_value.order_by.return_value.add_columns.return_value.offset.return_value.limit.return_value.all.return_value = [(row, 2) for row in mock_results]
 
     # 🔹 Act: Call function
     result, totalRecords, totalPages = get_all_allergies(db_session_mock, pageNo=0, pageSize=2)
@@ -96,9 +93,6 @@ def test_get_patient_allergies(db_session_mock):
 
     patient_id = 1
 
-    # Mock `count()` to return total records
-    db_session_mock.query.return_value.join.return_value.join.return_value.filter.return_value.count.return_value = 1
-
     # Mock query results
     mock_results = [
         MagicMock(
@@ -116,8 +110,8 @@ def test_get_patient_allergies(db_session_mock):
         )
     ]
 
-    # Mock `.all()`
-    db_session_mock.query.return_value.join.return_value.join.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = mock_results
+    # Mock `.all()`: each row carries the COUNT(*) OVER() total as its last column
+    db_session_mock.query.return_value.join.return_value.join.return_value.filter.return_value.order_by.return_value.add_columns.return_value.offset.return_value.limit.return_value.all.return_value = [(row, 1) for row in mock_results]
 
     # 🔹 Act: Call the function
     result, totalRecords, totalPages = get_patient_allergies(db_session_mock, patient_id, pageNo=0, pageSize=2)
@@ -190,6 +184,34 @@ def test_create_patient_allergy(db_session_mock, patient_allergy_create):
     assert result.AllergyReactionTypeID == patient_allergy_create.AllergyReactionTypeID
 
 
+def test_create_patient_allergy_queues_deferred_highlight_before_commit(db_session_mock, patient_allergy_create):
+    """In deferred mode the highlight work item is committed in the same transaction as the allergy"""
+    from app.models.highlight_work_item_model import HighlightWorkItem
+
+    first = {
+        AllergyType: AllergyType(AllergyTypeID=3, Value="Corn", IsDeleted="0"),
+        AllergyReactionType: AllergyReactionType(AllergyReactionTypeID=1, Value="Rashes", IsDeleted="0"),
+        Patient: Patient(id=1, name="Test Patient", nric="S9876543Z", isDeleted="0"),
+    }
+
+    def custom_query(model):
+        query_result = MagicMock()
+        query_result.filter.return_value.first.return_value = first.get(model)
+        return query_result
+
+    db_session_mock.query.side_effect = custom_query
+
+    with patch("app.services.highlight_queue_service.Config.Highlight.EVALUATION_MODE", "deferred"), \
+         patch("app.crud.patient_allergy_mapping_crud.create_highlight_if_needed") as evaluate:
+        result = create_patient_allergy(db_session_mock, patient_allergy_create, "1", USER_FULL_NAME)
+
+    evaluate.assert_not_called()
+    assert [name for name, _, _ in db_session_mock.mock_calls if name in ("add", "commit")] == ["add", "add", "commit"]
+    item = db_session_mock.add.call_args_list[1].args[0]
+    assert isinstance(item, HighlightWorkItem)
+    assert (item.type_code, item.source_table, item.patient_id) == ("ALLERGY", "PATIENT_ALLERGY_MAPPING", result.PatientID)
+
+
 def test_update_patient_allergy(db_session_mock, patient_allergy_update):
     """Test case for updating a patient allergy."""
     # Arrange
@@ -103,8 +103,8 @@ def test_get_all_assigned_dementias(db_session_mock):
     mock_results = [mock_result_1, mock_result_2]
     
     # Mock the main query chain
-    db_session_mock.query.return_value.options.return_value.join.return_value.filter.return_value.count.return_value = 2
-    db_session_mock.query.return_value.options.return_value.join.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = mock_results
+    # Each row carries the COUNT(*) OVER() total as its last column
+    db_session_mock.query.return_value.options.return_value.join.return_value.filter.return_value.order_by.return_value.add_columns.return_value.offset.return_value.limit.return_value.all.return_value = [(row, 2) for row in mock_results]
     
     # Mock the inner query for DementiaTypeValue
     # This needs to return different values for each call
@@ -159,8 +159,8 @@ def test_get_assigned_dementias(db_session_mock):
     mock_results = [mock_result_1, mock_result_2]
 
     # Mock the main query chain
-    db_session_mock.query.return_value.options.return_value.join.return_value.filter.return_value.count.return_value = 2
-    db_session_mock.query.return_value.options.return_value.join.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = mock_results
+    # Each row carries the COUNT(*) OVER() total as its last column
+    db_session_mock.query.return_value.options.return_value.join.return_value.filter.return_value.order_by.return_value.add_columns.return_value.offset.return_value.limit.return_value.all.return_value = [(row, 2) for row in mock_results]
     
     # Mock the inner query for DementiaTypeValue
     db_session_mock.query.return_value.filter.return_value.scalar.side_effect = ["Alzheimer's", "Vascular Dementia"]
@@ -1,13 +1,15 @@
 from datetime import datetime
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 from app.crud.patient_highlight_crud import (
+    _add_source_remarks_and_additional_fields,
     create_highlight,
     delete_highlight,
     get_all_highlights,
     get_highlights_by_patient,
+    get_highlights_paginated,
     update_highlight,
 )
 from app.models.allergy_reaction_type_model import AllergyReactionType
@@ -38,6 +40,7 @@ from app.models.patient_problem_model import PatientProblem
 from app.models.patient_social_history_model import PatientSocialHistory
 from app.models.patient_vital_model import PatientVital
 from app.schemas.patient_highlight import PatientHighlightCreate, PatientHighlightUpdate
+from app.utils.pagination import Page, decode_cursor, encode_cursor
 from tests.utils.mock_db import get_db_session_mock
 
 
@@ -113,6 +116,253 @@ def test_get_highlights_by_patient(db_session_mock):
     assert result[0].HighlightText == "Allergy: Shellfish"
 
 
+def test_highlight_enrichment_batches_per_type(db_session_mock):
+    """Should fetch remarks and additional fields once per highlight type, not once per highlight"""
+    highlights = [
+        MagicMock(Id=1, highlight_type_code="ALLERGY", SourceRecordId=101),
+        MagicMock(Id=2, highlight_type_code="VITAL", SourceRecordId=202),
+        MagicMock(Id=3, highlight_type_code="ALLERGY", SourceRecordId=102),
+    ]
+    strategies = {"ALLERGY": MagicMock(), "VITAL": MagicMock()}
+    strategies["ALLERGY"].get_source_remarks_batch.return_value = {101: "Rash", 102: "Hives"}
+    strategies["ALLERGY"].get_additional_fields_batch.return_value = {101: {"allergy_type": "Shellfish"}}
+    strategies["VITAL"].get_source_remarks_batch.side_effect = Exception("boom")
+
+    with patch("app.crud.patient_highlight_crud.HighlightStrategyFactory") as factory_cls:
+        factory_cls.return_value.get_strategy.side_effect = strategies.get
+        result = _add_source_remarks_and_additional_fields(db_session_mock, highlights)
+
+    strategies["ALLERGY"].get_source_remarks_batch.assert_called_once_with(db_session_mock, [101, 102])
+    strategies["ALLERGY"].get_additional_fields_batch.assert_called_once_with(db_session_mock, [101, 102])
+    assert [h.source_remarks for h in result] == ["Rash", None, "Hives"]
+    assert [h.additional_fields for h in result] == [{"allergy_type": "Shellfish"}, {}, {}]
+
+
+def test_vital_batch_averages_exclude_the_vital_itself():
+    """Should derive each vital's patient averages from grouped totals minus its own reading"""
+    from app.strategies.highlights.vital_strategy import VitalStrategy
+
+    strategy = VitalStrategy()
+    fields = {key: (0, 0) for key in VitalStrategy.BASELINE_COLUMNS}
+    # Four readings of 36.0, 37.0, 38.0 and 39.0 degrees
+    totals = {"records": 4, "fields": dict(fields, temperature=(150.0, 4))}
+    vital = PatientVital(Id=1, PatientId=1, Temperature=39.0, IsDeleted="0")
+
+    averages = strategy._averages_excluding(totals, vital)
+
+    assert averages == {"temperature": 37.0}
+    # With only three readings the vital's own exclusion leaves too few records for an average
+    assert strategy._averages_excluding(dict(totals, records=3), vital) is None
+    assert strategy._averages_excluding(None, vital) is None
+
+
+def test_vital_totals_fallback_sums_readings_as_float():
+    """Should cast each reading to FLOAT before summing, so SQL Server does not overflow or round the sum to the column type"""
+    from sqlalchemy.dialects import mssql
+    from app.strategies.highlights.vital_strategy import VitalStrategy
+
+    db = MagicMock()
+    db.query.return_value.filter.return_value.group_by.return_value.all.return_value = []
+    with patch("app.strategies.highlights.vital_strategy.get_vital_baselines", return_value={}):
+        VitalStrategy()._get_patient_vital_totals(db, [1])
+
+    sums = [str(column.compile(dialect=mssql.dialect())) for column in db.query.call_args.args if "sum(" in str(column)]
+    assert len(sums) == len(VitalStrategy.BASELINE_COLUMNS)
+    assert all("CAST(" in sql and "AS FLOAT)" in sql for sql in sums)
+
+
+def test_vital_averages_memoized_for_the_request():
+    """Should compute a vital's baseline once per session even though evaluation and text generation both ask"""
+    from app.strategies.highlights.vital_strategy import VitalStrategy
+
+    db = MagicMock(info={})
+    strategy = VitalStrategy()
+    vital = PatientVital(Id=5, PatientId=1, IsDeleted="0")
+
+    with patch("app.strategies.highlights.vital_strategy.Config.Vital.Baseline.MODE", "aggregate"), \
+         patch.object(VitalStrategy, "_get_aggregate_vital_averages", return_value={"temperature": 36.8}) as aggregate:
+        first = strategy._get_patient_vital_averages(db, 1, 5, vital)
+        second = VitalStrategy()._get_patient_vital_averages(db, 1, 5, vital)
+
+    assert first == second == {"temperature": 36.8}
+    aggregate.assert_called_once_with(db, 1, 5)
+
+
+def test_get_highlights_paginated_returns_cursor_and_enriches_page_only(db_session_mock):
+    """Should enrich only the highlights on the page and return a (CreatedDate, Id) cursor when more exist"""
+    page_items = [
+        MagicMock(Id=9, CreatedDate=datetime(2026, 10, 17, 9, 30), highlight_type_code="ALLERGY", SourceRecordId=1),
+        MagicMock(Id=7, CreatedDate=datetime(2026, 10, 17, 8, 0), highlight_type_code="ALLERGY", SourceRecordId=2),
+    ]
+
+    with patch("app.crud.patient_highlight_crud.paginate_query", return_value=Page(page_items, 5, 3, True)) as paginate, \
+         patch("app.crud.patient_highlight_crud._add_source_remarks_and_additional_fields", side_effect=lambda db, h: h) as enrich:
+        highlights, total, total_pages, next_cursor = get_highlights_paginated(
+            db_session_mock, pageSize=2, since=datetime(2026, 10, 1), patient_ids=[1, 2], supervisor_id="sup"
+        )
+
+    assert highlights == page_items
+    assert (total, total_pages) == (5, 3)
+    assert decode_cursor(next_cursor, 2) == ["2026-10-17T08:00:00", 7]
+    enrich.assert_called_once_with(db_session_mock, page_items)
+    assert paginate.call_args.kwargs["seek"] is None
+
+
+def test_get_highlights_paginated_cursor_pages_through_ties(tmp_path):
+    """Highlights sharing a CreatedDate across a page boundary are neither skipped nor repeated"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.dialects import mssql
+    from sqlalchemy.orm import sessionmaker
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'highlights.db'}")
+    for model in (PatientHighlightType, PatientHighlight):
+        model.__table__.create(engine)
+    batch_time = datetime(2026, 10, 17, 9, 30, 0, 123000)  # One apply_highlights batch shares its "now"
+    db = sessionmaker(bind=engine)()
+    db.add_all([
+        PatientHighlight(Id=highlight_id, PatientId=1, HighlightTypeId=1, HighlightText="h", SourceTable="PATIENT_VITAL",
+                         SourceRecordId=highlight_id, CreatedDate=batch_time if highlight_id > 1 else datetime(2026, 10, 16),
+                         IsDeleted="0", CreatedById="1", ModifiedById="1")
+        for highlight_id in range(1, 7)
+    ])
+    db.commit()
+
+    ids, cursor = [], None
+    with patch("app.crud.patient_highlight_crud._add_source_remarks_and_additional_fields", side_effect=lambda db, h: h):
+        while True:
+            highlights, _, _, cursor = get_highlights_paginated(db, pageSize=2, enabled_only=False, cursor=cursor)
+            ids += [highlight.Id for highlight in highlights]
+            if not cursor:
+                break
+
+    assert ids == [6, 5, 4, 3, 2, 1]
+    db.close()
+    engine.dispose()
+
+    mssql_db = MagicMock()
+    mssql_db.get_bind.return_value.dialect.name = "mssql"
+    with patch("app.crud.patient_highlight_crud.paginate_query", return_value=Page([], None, None, False)) as paginate:
+        get_highlights_paginated(mssql_db, cursor=encode_cursor(batch_time.isoformat(), 4), includeTotal=False)
+    seek_sql = str(paginate.call_args.kwargs["seek"].compile(dialect=mssql.dialect()))
+    assert seek_sql.count("CAST(") == 2 and "AS DATETIME)" in seek_sql
+
+
+def test_get_highlights_paginated_rejects_bad_cursor(db_session_mock):
+    """Should reject a cursor whose timestamp cannot be parsed"""
+    from fastapi import HTTPException
+    from app.utils.pagination import encode_cursor
+
+    with pytest.raises(HTTPException) as exc_info:
+        get_highlights_paginated(db_session_mock, cursor=encode_cursor("not-a-date", 1))
+
+    assert exc_info.value.status_code == 400
+
+
+def test_highlight_engine_applies_decisions_in_bulk(db_session_mock):
+    """Should look up existing highlights once and create, update and delete with one statement each, without committing"""
+    from app.services.highlight_engine import HighlightCandidate, apply_highlights
+
+    db_session_mock.query.return_value.filter.return_value.first.return_value = MagicMock(Id=4, TypeCode="VITAL", IsEnabled=True)
+    db_session_mock.query.return_value.options.return_value.filter.return_value.all.return_value = [
+        MagicMock(Id=50, SourceTable="PATIENT_VITAL", SourceRecordId=2),
+        MagicMock(Id=51, SourceTable="PATIENT_VITAL", SourceRecordId=3),
+    ]
+    records = {1: MagicMock(PatientId=7), 2: MagicMock(PatientId=7), 3: MagicMock(PatientId=8)}
+    candidates = [HighlightCandidate("PATIENT_VITAL", record_id, record) for record_id, record in records.items()]
+
+    with patch("app.services.highlight_engine.HighlightStrategyFactory") as factory_cls:
+        strategy = factory_cls.return_value.get_strategy.return_value
+        strategy.should_generate_highlight.side_effect = lambda record, db: record is not records[3]
+        strategy.generate_highlight_text.return_value = "High BP"
+        counts = apply_highlights(db_session_mock, "VITAL", candidates, "user")
+
+    assert counts == {"created": 1, "updated": 1, "deleted": 1}
+    assert db_session_mock.execute.call_count == 3
+    created_rows = db_session_mock.execute.call_args_list[0].args[1]
+    assert [(row["PatientId"], row["HighlightTypeId"], row["SourceRecordId"]) for row in created_rows] == [(7, 4, 1)]
+    assert [row["Id"] for row in db_session_mock.execute.call_args_list[1].args[1]] == [50]
+    db_session_mock.commit.assert_not_called()
+
+
+def test_highlight_type_lookup_is_cached(db_session_mock):
+    """Should query a highlight type once until the cache is invalidated"""
+    from app.services.highlight_engine import get_highlight_type, invalidate_highlight_type_cache
+
+    db_session_mock.query.return_value.filter.return_value.first.return_value = MagicMock(Id=4, TypeCode="VITAL", IsEnabled="0")
+
+    first = get_highlight_type(db_session_mock, "VITAL")
+    second = get_highlight_type(db_session_mock, "VITAL")
+    invalidate_highlight_type_cache("VITAL")
+    get_highlight_type(db_session_mock, "VITAL")
+
+    assert first == second == (4, "VITAL", False)
+    assert db_session_mock.query.call_count == 2
+
+
+def test_deferred_mode_queues_highlight_evaluation(db_session_mock):
+    """Should only add a work item to the caller's transaction instead of evaluating the highlight"""
+    from app.models.highlight_work_item_model import HighlightWorkItem, HighlightWorkStatus
+    from app.services.highlight_helper import create_highlight_if_needed
+
+    with patch("app.services.highlight_queue_service.Config.Highlight.EVALUATION_MODE", "deferred"), \
+         patch("app.services.highlight_helper.apply_highlights") as apply:
+        create_highlight_if_needed(db_session_mock, MagicMock(), "VITAL", 1, "PATIENT_VITAL", 5, "user", commit=False)
+
+    apply.assert_not_called()
+    item = db_session_mock.add.call_args.args[0]
+    assert isinstance(item, HighlightWorkItem)
+    assert (item.type_code, item.source_table, item.source_record_id, item.patient_id, item.status) == (
+        "VITAL", "PATIENT_VITAL", 5, 1, HighlightWorkStatus.PENDING
+    )
+    db_session_mock.commit.assert_not_called()
+
+
+def test_highlight_work_item_fails_after_max_retries():
+    """Should keep a failing work item pending (lease released) until its last attempt"""
+    from app.models.highlight_work_item_model import HighlightWorkItem, HighlightWorkStatus
+
+    item = HighlightWorkItem(status=HighlightWorkStatus.PENDING, retry_count=0, claimed_by="worker")
+
+    item.mark_failed("boom", max_retries=2)
+    assert (item.status, item.retry_count, item.claimed_by) == (HighlightWorkStatus.PENDING, 1, None)
+    item.mark_failed("boom again", max_retries=2)
+    assert (item.status, item.error_message) == (HighlightWorkStatus.FAILED, "boom again")
+
+
+def test_cleanup_old_highlights_deletes_in_chunks_per_type(db_session_mock):
+    """Should delete each type's expired highlights in committed chunks using the type's retention days"""
+    from app.crud.patient_highlight_crud import cleanup_old_highlights
+
+    db_session_mock.query.return_value.filter.return_value.all.return_value = [
+        MagicMock(Id=1, TypeName="Vital", TypeCode="VITAL", RetentionDays=5),
+        MagicMock(Id=2, TypeName="Allergy", TypeCode="ALLERGY", RetentionDays=10),
+    ]
+    db_session_mock.execute.side_effect = [MagicMock(rowcount=2), MagicMock(rowcount=1), MagicMock(rowcount=0)]
+
+    with patch("app.crud.patient_highlight_crud.calculate_business_days_ago", return_value=datetime(2026, 10, 12)) as days_ago:
+        result = cleanup_old_highlights(db_session_mock, chunk_size=2)
+
+    assert [call.args[0] for call in days_ago.call_args_list] == [5, 10]
+    assert [(d["type_code"], d["deleted_count"]) for d in result["details"]] == [("VITAL", 3), ("ALLERGY", 0)]
+    assert (result["total_deleted"], result["chunks"], result["complete"]) == (3, 3, True)
+    assert db_session_mock.commit.call_count == 3
+
+
+def test_cleanup_old_highlights_stops_at_chunk_bound(db_session_mock):
+    """Should stop after max_chunks and report the run as incomplete"""
+    from app.crud.patient_highlight_crud import cleanup_old_highlights
+
+    db_session_mock.query.return_value.filter.return_value.all.return_value = [
+        MagicMock(Id=1, TypeName="Vital", TypeCode="VITAL", RetentionDays=3),
+    ]
+    db_session_mock.execute.return_value = MagicMock(rowcount=2)
+
+    with patch("app.crud.patient_highlight_crud.calculate_business_days_ago", return_value=datetime(2026, 10, 12)):
+        result = cleanup_old_highlights(db_session_mock, chunk_size=2, max_chunks=2)
+
+    assert (result["total_deleted"], result["chunks"], result["complete"]) == (4, 2, False)
+
+
 def test_create_highlight(db_session_mock, patient_highlight_create):
     """Test case for creating a new patient highlight."""
     # Arrange
@@ -83,11 +83,12 @@ def test_get_medications(db_session_mock):
     # Mock the query result
     mock_query = mock.MagicMock()
     mock_query.filter.return_value = mock_query
-    mock_query.count.return_value = len(mock_medications)
     mock_query.order_by.return_value = mock_query
     mock_query.offset.return_value = mock_query
     mock_query.limit.return_value = mock_query
-    mock_query.all.return_value = mock_medications
+    mock_query.add_columns.return_value = mock_query
+    # Each row carries the COUNT(*) OVER() total as its last column
+    mock_query.all.return_value = [(row, len(mock_medications)) for row in mock_medications]
     
     db_session_mock.query.return_value = mock_query
 
@@ -147,11 +148,12 @@ def test_get_patient_medications(db_session_mock):
     # Mock the query result
     mock_query = mock.MagicMock()
     mock_query.filter.return_value = mock_query
-    mock_query.count.return_value = len(mock_medications)
     mock_query.order_by.return_value = mock_query
     mock_query.offset.return_value = mock_query
     mock_query.limit.return_value = mock_query
-    mock_query.all.return_value = mock_medications
+    mock_query.add_columns.return_value = mock_query
+    # Each row carries the COUNT(*) OVER() total as its last column
+    mock_query.all.return_value = [(row, len(mock_medications)) for row in mock_medications]
     
     db_session_mock.query.return_value = mock_query
 
@@ -311,7 +313,8 @@ def test_create_medication(db_session_mock):
                 db_session_mock.add.assert_called_once()
                 assert db_session_mock.flush.call_count == 2
                 assert db_session_mock.commit.call_count == 3
-                assert db_session_mock.refresh.call_count == 2
+                # Highlights are written with bulk statements (no refresh of the highlight row)
+                assert db_session_mock.refresh.call_count == 1
                 db_session_mock.refresh.assert_called_with(mock_medication_instance)
                 
                 # Verify outbox event was created
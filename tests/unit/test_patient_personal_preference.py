@@ -132,8 +132,9 @@ def test_get_preferences_returns_paginated_results(db_session_mock):
     mock_query.order_by.return_value = mock_query
     mock_query.offset.return_value = mock_query
     mock_query.limit.return_value = mock_query
-    mock_query.count.return_value = 3
-    mock_query.all.return_value = prefs
+    mock_query.add_columns.return_value = mock_query
+    # Each row carries the COUNT(*) OVER() total as its last column
+    mock_query.all.return_value = [(row, 3) for row in prefs]
     db_session_mock.query.return_value = mock_query
 
     result, total, pages = get_preferences(db_session_mock, pageNo=0, pageSize=10)
@@ -151,8 +152,9 @@ def test_get_preferences_empty(db_session_mock):
     mock_query.order_by.return_value = mock_query
     mock_query.offset.return_value = mock_query
     mock_query.limit.return_value = mock_query
-    mock_query.count.return_value = 0
-    mock_query.all.return_value = []
+    mock_query.add_columns.return_value = mock_query
+    # Each row carries the COUNT(*) OVER() total as its last column
+    mock_query.all.return_value = [(row, 0) for row in []]
     db_session_mock.query.return_value = mock_query
 
     result, total, pages = get_preferences(db_session_mock)
@@ -177,8 +179,9 @@ def test_get_patient_preferences_returns_for_patient(db_session_mock):
     mock_query.order_by.return_value = mock_query
     mock_query.offset.return_value = mock_query
     mock_query.limit.return_value = mock_query
-    mock_query.count.return_value = 1
-    mock_query.all.return_value = prefs
+    mock_query.add_columns.return_value = mock_query
+    # Each row carries the COUNT(*) OVER() total as its last column
+    mock_query.all.return_value = [(row, 1) for row in prefs]
     db_session_mock.query.return_value = mock_query
 
     result, total, pages = get_patient_preferences(db_session_mock, patient_id=1)
@@ -199,8 +202,9 @@ def test_get_patient_preferences_with_type_filter(db_session_mock):
     mock_query.order_by.return_value = mock_query
     mock_query.offset.return_value = mock_query
     mock_query.limit.return_value = mock_query
-    mock_query.count.return_value = 1
-    mock_query.all.return_value = prefs
+    mock_query.add_columns.return_value = mock_query
+    # Each row carries the COUNT(*) OVER() total as its last column
+    mock_query.all.return_value = [(row, 1) for row in prefs]
     db_session_mock.query.return_value = mock_query
 
     result, total, _ = get_patient_preferences(
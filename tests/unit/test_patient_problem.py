@@ -72,11 +72,12 @@ def test_get_problems(db_session_mock):
     mock_query = mock.MagicMock()
     mock_query.options.return_value = mock_query
     mock_query.filter.return_value = mock_query
-    mock_query.count.return_value = 2
     mock_query.order_by.return_value = mock_query
     mock_query.offset.return_value = mock_query
     mock_query.limit.return_value = mock_query
-    mock_query.all.return_value = mock_problems
+    mock_query.add_columns.return_value = mock_query
+    # Each row carries the COUNT(*) OVER() total as its last column
+    mock_query.all.return_value = [(row, 2) for row in mock_problems]
     db_session_mock.query.return_value = mock_query
 
     problems, totalRecords, totalPages = get_problems(db_session_mock, pageNo=0, pageSize=10)
@@ -106,11 +107,12 @@ def test_get_patient_problems(db_session_mock):
     mock_query = mock.MagicMock()
     mock_query.options.return_value = mock_query
     mock_query.filter.return_value = mock_query
-    mock_query.count.return_value = 1
     mock_query.order_by.return_value = mock_query
     mock_query.offset.return_value = mock_query
     mock_query.limit.return_value = mock_query
-    mock_query.all.return_value = mock_problems
+    mock_query.add_columns.return_value = mock_query
+    # Each row carries the COUNT(*) OVER() total as its last column
+    mock_query.all.return_value = [(row, 1) for row in mock_problems]
     db_session_mock.query.return_value = mock_query
 
     problems, totalRecords, totalPages = get_patient_problems(db_session_mock, patient_id, pageNo=0, pageSize=100)
@@ -6,6 +6,7 @@ from app.crud.patient_vital_crud import (
     create_vital,
     update_vital,
     delete_vital,
+    create_vitals_bulk,
 )
 from app.schemas.patient_vital import (
     PatientVitalCreate,
@@ -13,6 +14,13 @@ from app.schemas.patient_vital import (
     PatientVitalDelete,
 )
 from app.models.patient_vital_model import PatientVital
+from app.crud import patient_vital_baseline_crud
+from app.crud.patient_vital_baseline_crud import build_vital_baseline, get_vital_baseline, get_vital_baselines
+from app.models.patient_vital_baseline_model import PatientVitalBaseline
+from app.strategies.highlights.vital_strategy import VitalStrategy
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
 
 from tests.utils.mock_db import get_db_session_mock
 
@@ -92,8 +100,8 @@ def test_create_patient_vital(
     )
     # Assert
     db_session_mock.add.assert_called_once()
-    # Highlight integration causes 2 commits (vital + highlight)
-    assert db_session_mock.commit.call_count == 2
+    # The highlight is written in the vital's transaction (single commit)
+    db_session_mock.commit.assert_called_once()
     db_session_mock.refresh.assert_called_once_with(result)
     assert result.PatientId == vital_create.PatientId
     assert result.SystolicBP == vital_create.SystolicBP
@@ -121,8 +129,8 @@ def test_update_patient_vital(mock_patient_vital, db_session_mock, vital_update)
         user_full_name="Test User"     # <--- FIX
     )
     # Assert
-    # Highlight integration causes 2 commits (vital + highlight)
-    assert db_session_mock.commit.call_count == 2
+    # The highlight is written in the vital's transaction (single commit)
+    db_session_mock.commit.assert_called_once()
     assert result.PatientId == vital_update.PatientId
     assert result.SystolicBP == vital_update.SystolicBP
     assert result.DiastolicBP == vital_update.DiastolicBP
@@ -158,6 +166,144 @@ def test_delete_patient_vital(mock_patient_vital, db_session_mock):
     assert result.IsDeleted == "1"
 
 
+def test_vital_baseline_add_and_remove_readings():
+    """Should keep a running count and sum per metric"""
+    baseline = PatientVitalBaseline(PatientId=1, RecordCount=0)
+    first = {"Temperature": 36.0, "SystolicBP": 120, "DiastolicBP": 80, "HeartRate": 70, "SpO2": 98, "BloodSugarLevel": 6}
+    second = dict(first, Temperature=38.0, HeartRate=90)
+
+    baseline.add_readings(first)
+    baseline.add_readings(second)
+    assert baseline.RecordCount == 2
+    assert baseline.TemperatureSum == 74.0
+    assert baseline.HeartRateSum == 160
+
+    baseline.add_readings(second, sign=-1)
+    assert baseline.RecordCount == 1
+    assert baseline.HeartRateSum == 70
+    assert baseline.TemperatureSum == 36.0
+
+
+def test_build_vital_baseline_sums_as_float():
+    """Should sum each metric as FLOAT so a long history of INT readings cannot overflow"""
+    db = mock.MagicMock()
+    db.query.return_value.filter.return_value.one.return_value = (2, 74.0, 240.0, 160.0, 160.0, 196.0, 12.0)
+
+    baseline = build_vital_baseline(db, 1)
+
+    assert (baseline.RecordCount, baseline.TemperatureSum, baseline.HeartRateSum) == (2, 74.0, 160.0)
+    sums = [str(column) for column in db.query.call_args.args[1:]]
+    assert all("CAST(" in column and "AS FLOAT)" in column for column in sums)
+    db.add.assert_called_once_with(baseline)
+
+
+def test_baseline_lock_covers_a_missing_row():
+    """for_update holds the key range too, so two first vitals of a patient cannot both insert its row"""
+    db = mock.MagicMock()
+    get_vital_baseline(db, 1, for_update=True)
+    get_vital_baselines(db, [1, 2], for_update=True)
+
+    for call in db.query.return_value.with_hint.call_args_list:
+        assert "UPDLOCK" in call.args[1] and "HOLDLOCK" in call.args[1]
+    assert db.query.return_value.with_hint.call_count == 2
+
+
+def test_vital_changes_maintain_baseline(db_session_mock, vital_create, vital_update):
+    """Should add readings on create, move them on update and remove them on delete"""
+    existing = get_mock_patient_vitals()[0]
+    old_readings = PatientVitalBaseline.readings_of(existing)
+    db_session_mock.query.return_value.filter.return_value.first.return_value = existing
+
+    with mock.patch("app.crud.patient_vital_crud.apply_vital_to_baseline") as apply_baseline, \
+         mock.patch("app.crud.patient_vital_crud.create_highlight_if_needed"):
+        create_vital(db_session_mock, vital_create, created_by="test_user", user_full_name="Test User")
+        assert apply_baseline.call_args == mock.call(
+            db_session_mock, 1, added=PatientVitalBaseline.readings_of(vital_create)
+        )
+
+        apply_baseline.reset_mock()
+        update_vital(db_session_mock, 1, vital_update, modified_by="test_user", user_full_name="Test User")
+        assert apply_baseline.call_args_list == [
+            mock.call(db_session_mock, existing.PatientId, removed=old_readings),
+            mock.call(db_session_mock, 1, added=PatientVitalBaseline.readings_of(vital_update)),
+        ]
+
+        apply_baseline.reset_mock()
+        existing.IsDeleted = "0"
+        delete_vital(db_session_mock, 1, modified_by="test_user", user_full_name="Test User")
+        apply_baseline.assert_called_once_with(
+            db_session_mock, existing.PatientId, removed=PatientVitalBaseline.readings_of(vital_update)
+        )
+
+
+
+def test_create_vitals_bulk_rejects_whole_batch(db_session_mock, vital_create):
+    """Should report every invalid vital and write nothing"""
+    too_hot = vital_create.model_copy(update={"Temperature": 45.0})
+    too_fast = vital_create.model_copy(update={"HeartRate": 250})
+
+    with pytest.raises(HTTPException) as exc_info:
+        create_vitals_bulk(db_session_mock, [vital_create, too_hot, too_fast], "test_user", "Test User")
+
+    assert exc_info.value.status_code == 400
+    assert [error.split(":")[0] for error in exc_info.value.detail] == ["vitals[1]", "vitals[2]"]
+    db_session_mock.add_all.assert_not_called()
+    db_session_mock.commit.assert_not_called()
+
+
+def test_create_vitals_bulk_keeps_a_concurrent_baseline_update(tmp_path, vital_create):
+    """A vital another request commits before the bulk insert locks the baseline row is not overwritten"""
+    from app.models.patient_model import Patient
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'vitals.db'}")
+    for model in (Patient, PatientVital, PatientVitalBaseline):
+        model.__table__.create(engine)
+    session_factory = sessionmaker(bind=engine)
+    with session_factory.begin() as setup:
+        setup.add(PatientVitalBaseline(PatientId=1, RecordCount=1, TemperatureSum=36.0))
+
+    concurrent_vitals = []
+    unlocked_reads = []  # Kept referenced, so the session's identity map holds on to the rows read
+    read_baselines = patient_vital_baseline_crud.get_vital_baselines
+
+    def read_then_add_concurrent_vital(db, patient_ids, for_update=False):
+        baselines = read_baselines(db, patient_ids, for_update)
+        if not for_update:  # Another request adds a vital of the same patient after this unlocked read
+            unlocked_reads.append(baselines)
+            with session_factory.begin() as other:
+                other.get(PatientVitalBaseline, 1).add_readings(PatientVitalBaseline.readings_of(vital_create))
+            concurrent_vitals.append(1)
+        return baselines
+
+    db = session_factory()
+    with mock.patch("app.crud.patient_vital_baseline_crud.get_vital_baselines", read_then_add_concurrent_vital), \
+         mock.patch("app.strategies.highlights.vital_strategy.get_vital_baselines", read_then_add_concurrent_vital), \
+         mock.patch("app.crud.patient_vital_crud._insert_vital_highlights_bulk", return_value=0), \
+         mock.patch("app.crud.patient_vital_crud.log_crud_action"):
+        create_vitals_bulk(db, [vital_create, vital_create], "test_user", "Test User")
+    db.close()
+
+    with session_factory() as check:
+        assert check.get(PatientVitalBaseline, 1).RecordCount == 1 + len(concurrent_vitals) + 2
+    engine.dispose()
+
+
+def test_vital_evaluate_batch_flags_out_of_tolerance_readings():
+    """Should flag readings outside a baseline's tolerance (SpO2 only when low)"""
+    strategy = VitalStrategy()
+    normal, fever = get_mock_patient_vitals()
+    fever.Temperature = 38.5
+    low_spo2 = PatientVital(**{column: getattr(normal, column) for column in PatientVitalBaseline.METRICS})
+    low_spo2.SpO2 = 88
+    vitals = [normal, fever, low_spo2]
+    defaults = strategy._get_default_baselines()
+    defaults['blood_sugar'] = 90
+
+    flags = strategy.evaluate_batch(vitals, [defaults] * len(vitals))
+
+    assert flags == [False, True, True]
+
+
 # Mocking the relevant models
 # TODO: this test fails
 # @mock.patch("app.models.patient_model.Patient")
@@ -0,0 +1,127 @@
+import queue
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pika import spec
+
+from app.messaging.producer_manager import BatchPublishRequest, ProducerManager
+
+
+@pytest.fixture
+def manager():
+    with patch('app.messaging.producer_manager.RabbitMQClient'):
+        manager = ProducerManager(testing=True)
+    manager.mode = "pipelined"
+    manager.max_in_flight = 2
+    manager.is_running = True  # Driven by hand below instead of by the producer thread's I/O loop
+    manager._channel = MagicMock(is_open=True)
+    return manager
+
+
+def _confirm(manager, method, delivery_tag, multiple=False):
+    manager._on_delivery_confirmation(SimpleNamespace(method=method(delivery_tag=delivery_tag, multiple=multiple)))
+
+
+def _published_keys(manager):
+    return [c.kwargs['routing_key'] for c in manager._channel.basic_publish.call_args_list]
+
+
+def test_window_limits_in_flight_and_republishes_nacks_first(manager):
+    """At most max_in_flight unconfirmed publishes; a nacked one goes out again ahead of the backlog"""
+    for routing_key in ('a', 'b', 'c'):
+        assert manager.publish('patient.updates', routing_key, {'correlation_id': routing_key})
+    manager._drain()
+
+    assert _published_keys(manager) == ['a', 'b']
+    assert (manager.get_stats()['in_flight'], manager.get_stats()['queue_depth']) == (2, 1)
+
+    _confirm(manager, spec.Basic.Nack, 1)         # 'a' -> republished as tag 3
+    _confirm(manager, spec.Basic.Ack, 3, True)    # 'b' and 'a' -> 'c' as tag 4
+    _confirm(manager, spec.Basic.Ack, 4)
+
+    assert _published_keys(manager) == ['a', 'b', 'a', 'c']
+    manager._channel.exchange_declare.assert_called_once_with(exchange='patient.updates', exchange_type='topic', durable=True)
+    stats = manager.get_stats()
+    assert {k: stats[k] for k in ('published', 'confirmed', 'nacked', 'retried', 'failed', 'in_flight', 'peak_in_flight')} == {
+        'published': 4, 'confirmed': 3, 'nacked': 1, 'retried': 1, 'failed': 0, 'in_flight': 0, 'peak_in_flight': 2,
+    }
+
+
+def test_ordering_key_is_never_in_flight_twice(manager):
+    """A key's next message waits for the confirm of the previous one and is skipped once that fails"""
+    manager.max_in_flight = 10
+    manager.nack_max_retries = 0
+    request = BatchPublishRequest(
+        'patient.updates',
+        [('patient.updated.1', {'n': 1}), ('patient.updated.2', {'n': 2}), ('patient.updated.1', {'n': 3})],
+        ordering_keys=['1', '2', '1'],
+    )
+    manager.publish_queue.put(request)
+    manager._drain()
+
+    assert _published_keys(manager) == ['patient.updated.1', 'patient.updated.2']
+
+    _confirm(manager, spec.Basic.Nack, 1)
+    _confirm(manager, spec.Basic.Ack, 2)
+
+    assert request.results == [False, True, None]
+    assert request.done.is_set()
+    assert manager.pending_count() == 0
+
+
+def test_abandoned_batch_sends_nothing_more(manager):
+    """After the caller gives up, unsent messages stay unsent and a nacked one is not republished"""
+    request = BatchPublishRequest('patient.updates', [('a', {}), ('b', {}), ('c', {})], ordering_keys=['1', '2', '3'])
+    manager.publish_queue.put(request)
+    manager._drain()
+
+    assert request.abandon() == [False, False, None]  # 'a' and 'b' are in flight, 'c' was never sent
+
+    _confirm(manager, spec.Basic.Nack, 1)
+    _confirm(manager, spec.Basic.Ack, 2)
+
+    assert _published_keys(manager) == ['a', 'b']
+    assert request.done.is_set()
+    assert manager.pending_count() == 0
+
+
+def test_unconfirmed_publishes_go_out_again_after_reconnecting(manager):
+    """Publishes in flight when the channel drops are republished, in order, on the next channel"""
+    manager.publish('patient.updates', 'a', {})
+    manager.publish('patient.updates', 'b', {})
+    manager._drain()
+
+    manager._requeue_in_flight()
+    manager._channel = MagicMock(is_open=True)
+    manager._channel_exchanges.clear()
+    manager._drain()
+
+    assert _published_keys(manager) == ['a', 'b']
+    assert manager.get_stats()['republished_after_reconnect'] == 2
+
+
+def test_single_publishes_of_a_patient_stay_in_order(manager):
+    """Updates of one patient are never in flight together, so a nacked one cannot be overtaken"""
+    manager.max_in_flight = 10
+    manager.publish('patient.updates', 'patient.updated.7', {'patient_id': 7, 'n': 1})
+    manager.publish('patient.updates', 'patient.medication.updated.3', {'patient_id': 7, 'n': 2})
+    manager.publish('patient.updates', 'patient.updated.8', {'patient_id': 8, 'n': 3})
+    manager._drain()
+
+    assert _published_keys(manager) == ['patient.updated.7', 'patient.updated.8']
+
+    _confirm(manager, spec.Basic.Nack, 1)  # Republished before patient 7's next update
+    _confirm(manager, spec.Basic.Ack, 3)
+
+    assert _published_keys(manager) == ['patient.updated.7', 'patient.updated.8', 'patient.updated.7', 'patient.medication.updated.3']
+
+
+def test_full_queue_drops_are_counted(manager):
+    """publish() reports a full queue and the drop shows up in the stats"""
+    manager.publish_queue = queue.Queue(maxsize=1)
+
+    assert manager.publish('patient.updates', 'a', {})
+    assert not manager.publish('patient.updates', 'b', {})
+    assert manager.get_stats()['dropped_queue_full'] == 1
+    assert manager.get_stats()['queue_depth'] == 1
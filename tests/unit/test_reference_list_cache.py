@@ -0,0 +1,110 @@
+from unittest import mock
+
+import pytest
+from fastapi import Response
+from starlette.requests import Request
+
+from app.crud.patient_list_diet_crud import create_diet_type, get_all_diet_types
+from app.crud.patient_problem_list_crud import get_problem_lists
+from app.models.patient_list_diet_model import PatientDietList
+from app.schemas.patient_list_diet import PatientDietListTypeCreate
+from app.services.reference_list_cache import ReferenceList, ReferenceListCache, get_reference_list_cache
+from app.utils.http_cache import not_modified_response
+from tests.utils.mock_db import get_db_session_mock
+
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_reference_list_is_cached_until_a_write_invalidates_it(db_session_mock):
+    """The list query runs once per TTL; create_diet_type drops the cached list after its commit"""
+    db_session_mock.query.return_value.filter.return_value.all.return_value = [
+        PatientDietList(Id=1, Value="Diabetic", IsDeleted="0")
+    ]
+
+    first = get_all_diet_types(db_session_mock)
+    second = get_all_diet_types(db_session_mock)
+
+    assert second is first
+    assert db_session_mock.query.call_count == 1
+
+    create_diet_type(db_session_mock, PatientDietListTypeCreate(Value="Vegan", IsDeleted="0"), "1")
+    db_session_mock.query.reset_mock()
+    get_all_diet_types(db_session_mock)
+
+    assert db_session_mock.query.call_count == 1
+
+
+def test_paginated_reference_list_caches_each_page(db_session_mock):
+    """Pages are separate cache entries; the totals are cached with the rows"""
+    query = db_session_mock.query.return_value
+    query.filter.return_value = query
+    query.order_by.return_value = query
+    query.offset.return_value = query
+    query.limit.return_value = query
+    query.count.return_value = 3
+    query.all.return_value = [mock.MagicMock(Id=1, ProblemName="ASTHMA")]
+
+    page_0, total, pages = get_problem_lists(db_session_mock, pageNo=0, pageSize=2)
+    get_problem_lists(db_session_mock, pageNo=0, pageSize=2)
+    get_problem_lists(db_session_mock, pageNo=1, pageSize=2)
+
+    assert (len(page_0), total, pages) == (1, 3, 2)
+    assert query.count.call_count == 2
+
+    get_reference_list_cache().invalidate("PATIENT_PROBLEM_LIST")
+    get_problem_lists(db_session_mock, pageNo=0, pageSize=2)
+
+    assert query.count.call_count == 3
+
+
+def test_load_overtaken_by_an_invalidation_is_not_cached():
+    """A list loaded while it was being invalidated is returned once but not kept"""
+    cache = ReferenceListCache(ttl_seconds=60)
+
+    def load_while_invalidated():
+        cache.invalidate("PATIENT_LIST_PET")
+        return ["stale"]
+
+    assert cache.get("PATIENT_LIST_PET", None, load_while_invalidated) == ["stale"]
+    assert cache.get("PATIENT_LIST_PET", None, lambda: ["fresh"]) == ["fresh"]
+    assert cache.get("PATIENT_LIST_PET", None, lambda: ["unused"]) == ["fresh"]
+
+
+def test_not_modified_response_uses_content_etag():
+    """Equal rows give equal ETags (across replicas); a matching If-None-Match gets a 304"""
+    rows = [PatientDietList(Id=1, Value="Diabetic", IsDeleted="0")]
+    items = ReferenceList(rows)
+    etag = items.etag
+    assert ReferenceList([PatientDietList(Id=1, Value="Diabetic", IsDeleted="0")]).etag == etag
+    assert ReferenceList([PatientDietList(Id=1, Value="Halal", IsDeleted="0")]).etag != etag
+
+    response = Response()
+    assert not_modified_response(_request(), response, items) is None
+    assert response.headers["ETag"] == etag
+
+    not_modified = not_modified_response(_request(f'"other", W/{etag}'), Response(), items)
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+
+
+def test_reference_cache_consumer_ignores_its_own_broadcasts():
+    """Invalidations from other replicas drop the list; this replica's own are skipped"""
+    from app.messaging.reference_cache_consumer import ReferenceCacheConsumer
+
+    with mock.patch("app.messaging.reference_cache_consumer.RabbitMQClient"):
+        consumer = ReferenceCacheConsumer()
+    consumer.cache = mock.MagicMock()
+
+    assert consumer._handle_message({"data": {"list_name": "PATIENT_LIST_PET", "origin": consumer.instance_id}})
+    consumer.cache.invalidate.assert_not_called()
+
+    assert consumer._handle_message({"data": {"list_name": "PATIENT_LIST_PET", "origin": "other-replica"}})
+    consumer.cache.invalidate.assert_called_once_with("PATIENT_LIST_PET")
+
+
+@pytest.fixture
+def db_session_mock():
+    return get_db_session_mock()